@@ -4,8 +4,10 @@ use std::sync::atomic::{AtomicU64, Ordering};
 
 use anyhow::Result;
 use serde_json::Value;
-use tokio::sync::RwLock;
-use tonic::{transport::Server, Request, Response, Status};
+use sha2::{Digest, Sha256};
+use tokio::sync::{broadcast, mpsc, Notify, RwLock};
+use tokio_stream::wrappers::ReceiverStream;
+use tonic::{codec::CompressionEncoding, transport::Server, Request, Response, Status};
 use opentelemetry::trace::TracerProvider as _;
 use tracing_subscriber::util::SubscriberInitExt;
 use chrono::Utc;
@@ -18,8 +20,43 @@ pub mod nexum_proto {
 use nexum_proto::nexum_service_server::{NexumService, NexumServiceServer};
 use nexum_proto::*;
 
-const TASK_TIMEOUT_SECS: i64 = 60;
+/// Lease for nodes that do not declare `lease_seconds`; also the reclaim age for legacy rows without a lease.
+const DEFAULT_LEASE_SECS: i64 = 60;
+/// How often expired leases are swept back to READY.
+const RECLAIM_INTERVAL_SECS: u64 = 5;
 const CLAIM_CHECK_THRESHOLD: usize = 100 * 1024; // 100KB
+/// Where claim-checked outputs are written, relative to the server's working directory.
+const BLOB_DIR: &str = ".nexum/blobs";
+/// Key that marks a stored output as a pointer to a blob file.
+const CLAIM_CHECK_MARKER: &str = "__nexum_claim_check__";
+/// Largest slice one FetchBlob call returns; keeps responses under gRPC's 4 MB default.
+const MAX_FETCH_BLOB_BYTES: u64 = 2 * 1024 * 1024;
+/// Chunk size for DownloadPayload streams.
+const PAYLOAD_CHUNK_BYTES: usize = 1024 * 1024;
+/// `encoding` of a claim check whose blob is stored gzipped. FetchBlob and DownloadPayload
+/// serve the stored bytes, so sizes and offsets are those of the compressed file.
+const GZIP_ENCODING: &str = "gzip";
+const JSON_CONTENT_TYPE: &str = "application/json";
+/// Key of the placeholder stored as a node's output when the real output is an opaque
+/// (non-JSON) payload kept in `node_payloads`.
+const PAYLOAD_MARKER: &str = "__nexum_payload__";
+/// Key of the output stored for a MAP node whose only consumers fold its results through
+/// ReadMapResults; the results stay in `map_results` instead of being gathered into one array.
+const MAP_SUMMARY_MARKER: &str = "__nexum_map_summary__";
+/// Results one ReadMapResults call returns when the request sets no limit, and the most it will.
+const DEFAULT_MAP_READ_LIMIT: u32 = 500;
+const MAX_MAP_READ_LIMIT: u32 = 10_000;
+const MAX_POLL_BATCH: i32 = 256;
+const MAX_POLL_WAIT_MS: u32 = 60_000;
+const MAX_START_BATCH: usize = 10_000;
+const EXECUTION_UPDATES_CAPACITY: usize = 1024;
+/// Long-polls re-check at least this often so delayed tasks (TIMER, retry backoff) are not missed.
+const POLL_RECHECK_MS: u64 = 1_000;
+
+/// task_id, execution_id, node_id, version_hash, input_json, idempotency_key, node_type,
+/// map_item_json, map_index, map_total, map_parent_node_id, sub_execution_id, sub_workflow_id, sub_input_json,
+/// checkpoint_json
+type TaskRow = (String, String, String, String, Option<String>, Option<String>, Option<String>, Option<String>, Option<i32>, Option<i32>, Option<String>, Option<String>, Option<String>, Option<String>, Option<String>);
 
 struct Metrics {
     executions_started: AtomicU64,
@@ -90,6 +127,10 @@ struct NexumServer {
     is_postgres: bool,
     registry: Arc<RwLock<HashMap<String, Value>>>,
     metrics: Arc<Metrics>,
+    /// Woken whenever tasks become READY, so long-polling workers can lease them immediately.
+    task_notify: Arc<Notify>,
+    /// Carries the id of every execution that progressed or changed status, for WatchExecution.
+    execution_updates: broadcast::Sender<String>,
 }
 
 impl NexumServer {
@@ -128,6 +169,8 @@ impl NexumServer {
             is_postgres: pg,
             registry: Arc::new(RwLock::new(registry_map)),
             metrics: Metrics::new(),
+            task_notify: Arc::new(Notify::new()),
+            execution_updates: broadcast::channel(EXECUTION_UPDATES_CAPACITY).0,
         })
     }
 
@@ -141,7 +184,8 @@ impl NexumServer {
                 input_json TEXT,
                 created_at TEXT DEFAULT (datetime('now')),
                 parent_execution_id TEXT,
-                parent_node_id TEXT
+                parent_node_id TEXT,
+                idempotency_key TEXT
             )",
         )
         .execute(db)
@@ -159,6 +203,15 @@ impl NexumServer {
             sqlx::query("ALTER TABLE workflow_executions ADD COLUMN parent_node_id TEXT")
                 .execute(db).await?;
         }
+        if !exec_columns.iter().any(|c| c.1 == "idempotency_key") {
+            sqlx::query("ALTER TABLE workflow_executions ADD COLUMN idempotency_key TEXT")
+                .execute(db).await?;
+        }
+        sqlx::query(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_executions_idempotency ON workflow_executions(workflow_id, idempotency_key)"
+        )
+        .execute(db)
+        .await?;
 
         sqlx::query(
             "CREATE TABLE IF NOT EXISTS events (
@@ -197,7 +250,11 @@ impl NexumServer {
                 map_index INTEGER,
                 map_total INTEGER,
                 map_parent_node_id TEXT,
-                node_type TEXT
+                node_type TEXT,
+                lease_expires_at TEXT,
+                lease_seconds INTEGER,
+                progress TEXT,
+                checkpoint_json TEXT
             )",
         )
         .execute(db)
@@ -233,6 +290,20 @@ impl NexumServer {
             sqlx::query("ALTER TABLE task_queue ADD COLUMN map_parent_node_id TEXT").execute(db).await?;
             sqlx::query("ALTER TABLE task_queue ADD COLUMN node_type TEXT").execute(db).await?;
         }
+        if !columns.iter().any(|c| c.1 == "lease_expires_at") {
+            sqlx::query("ALTER TABLE task_queue ADD COLUMN lease_expires_at TEXT").execute(db).await?;
+            sqlx::query("ALTER TABLE task_queue ADD COLUMN lease_seconds INTEGER").execute(db).await?;
+            sqlx::query("ALTER TABLE task_queue ADD COLUMN progress TEXT").execute(db).await?;
+        }
+        if !columns.iter().any(|c| c.1 == "checkpoint_json") {
+            sqlx::query("ALTER TABLE task_queue ADD COLUMN checkpoint_json TEXT").execute(db).await?;
+        }
+        sqlx::query("CREATE INDEX IF NOT EXISTS idx_task_queue_lease ON task_queue(status, lease_expires_at)")
+            .execute(db)
+            .await?;
+        sqlx::query("CREATE INDEX IF NOT EXISTS idx_task_queue_ready ON task_queue(status, version_hash, scheduled_at)")
+            .execute(db)
+            .await?;
 
         sqlx::query(
             "CREATE TABLE IF NOT EXISTS workflow_versions (
@@ -261,6 +332,32 @@ impl NexumServer {
         .execute(db)
         .await?;
 
+        // Items fanned out per MAP node so far; sealed (1) once the coordinator has completed,
+        // 2 once the node's NodeCompleted is written.
+        sqlx::query(
+            "CREATE TABLE IF NOT EXISTS map_state (
+                execution_id TEXT NOT NULL,
+                map_node_id TEXT NOT NULL,
+                item_count INTEGER NOT NULL DEFAULT 0,
+                sealed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (execution_id, map_node_id)
+            )",
+        )
+        .execute(db)
+        .await?;
+
+        sqlx::query(
+            "CREATE TABLE IF NOT EXISTS node_payloads (
+                execution_id TEXT NOT NULL,
+                node_id TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (execution_id, node_id)
+            )",
+        )
+        .execute(db)
+        .await?;
+
         Ok(())
     }
 
@@ -275,9 +372,11 @@ impl NexumServer {
                 created_at TIMESTAMPTZ DEFAULT NOW(),
                 updated_at TIMESTAMPTZ DEFAULT NOW(),
                 parent_execution_id TEXT,
-                parent_node_id TEXT
+                parent_node_id TEXT,
+                idempotency_key TEXT
             )"
         ).execute(db).await?;
+        sqlx::query("ALTER TABLE workflow_executions ADD COLUMN IF NOT EXISTS idempotency_key TEXT").execute(db).await?;
 
         sqlx::query(
             "CREATE TABLE IF NOT EXISTS events (
@@ -317,9 +416,17 @@ impl NexumServer {
                 map_parent_node_id TEXT,
                 sub_execution_id TEXT,
                 sub_workflow_id TEXT,
-                sub_input_json TEXT
+                sub_input_json TEXT,
+                lease_expires_at TIMESTAMPTZ,
+                lease_seconds INTEGER,
+                progress TEXT,
+                checkpoint_json TEXT
             )"
         ).execute(db).await?;
+        sqlx::query("ALTER TABLE task_queue ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ").execute(db).await?;
+        sqlx::query("ALTER TABLE task_queue ADD COLUMN IF NOT EXISTS lease_seconds INTEGER").execute(db).await?;
+        sqlx::query("ALTER TABLE task_queue ADD COLUMN IF NOT EXISTS progress TEXT").execute(db).await?;
+        sqlx::query("ALTER TABLE task_queue ADD COLUMN IF NOT EXISTS checkpoint_json TEXT").execute(db).await?;
 
         sqlx::query(
             "CREATE TABLE IF NOT EXISTS workflow_versions (
@@ -344,11 +451,34 @@ impl NexumServer {
             )"
         ).execute(db).await?;
 
+        sqlx::query(
+            "CREATE TABLE IF NOT EXISTS map_state (
+                execution_id TEXT NOT NULL,
+                map_node_id TEXT NOT NULL,
+                item_count BIGINT NOT NULL DEFAULT 0,
+                sealed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (execution_id, map_node_id)
+            )"
+        ).execute(db).await?;
+
+        sqlx::query(
+            "CREATE TABLE IF NOT EXISTS node_payloads (
+                execution_id TEXT NOT NULL,
+                node_id TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                data BYTEA NOT NULL,
+                PRIMARY KEY (execution_id, node_id)
+            )"
+        ).execute(db).await?;
+
         // Indexes for performance
         sqlx::query("CREATE INDEX IF NOT EXISTS idx_task_queue_status ON task_queue(status)").execute(db).await?;
         sqlx::query("CREATE INDEX IF NOT EXISTS idx_task_queue_execution ON task_queue(execution_id)").execute(db).await?;
         sqlx::query("CREATE INDEX IF NOT EXISTS idx_events_execution ON events(execution_id)").execute(db).await?;
         sqlx::query("CREATE INDEX IF NOT EXISTS idx_executions_status ON workflow_executions(status)").execute(db).await?;
+        sqlx::query("CREATE UNIQUE INDEX IF NOT EXISTS idx_executions_idempotency ON workflow_executions(workflow_id, idempotency_key)").execute(db).await?;
+        sqlx::query("CREATE INDEX IF NOT EXISTS idx_task_queue_lease ON task_queue(status, lease_expires_at)").execute(db).await?;
+        sqlx::query("CREATE INDEX IF NOT EXISTS idx_task_queue_ready ON task_queue(status, version_hash, scheduled_at)").execute(db).await?;
 
         Ok(())
     }
@@ -358,6 +488,29 @@ impl NexumServer {
         if self.is_postgres { "NOW()" } else { "datetime('now')" }
     }
 
+    /// SQL expression for "now + delay_secs", used for TIMER scheduling.
+    fn delayed_sql(&self, delay_secs: i64) -> String {
+        if self.is_postgres {
+            format!("NOW() + INTERVAL '{} seconds'", delay_secs)
+        } else {
+            format!("datetime('now', '+{} seconds')", delay_secs)
+        }
+    }
+
+    /// SQL expression for a renewed lease: now + the task's own `lease_seconds`.
+    fn lease_renewal_sql(&self) -> String {
+        if self.is_postgres {
+            format!("NOW() + COALESCE(lease_seconds, {}) * INTERVAL '1 second'", DEFAULT_LEASE_SECS)
+        } else {
+            format!("datetime('now', '+' || COALESCE(lease_seconds, {}) || ' seconds')", DEFAULT_LEASE_SECS)
+        }
+    }
+
+    fn publish_execution_update(&self, execution_id: &str) {
+        // Err only means nobody is watching right now.
+        let _ = self.execution_updates.send(execution_id.to_string());
+    }
+
     async fn get_next_sequence_id(&self, execution_id: &str) -> Result<i64, Status> {
         let row: (i64,) =
             sqlx::query_as("SELECT COALESCE(MAX(sequence_id), 0) + 1 FROM events WHERE execution_id = ?")
@@ -421,6 +574,345 @@ impl NexumServer {
         Ok(None)
     }
 
+    /// A positive integer setting (`max_parallel`, `batch_size`) of a MAP node in the registered IR, if set.
+    async fn map_setting(&self, workflow_id: &str, version_hash: &str, node_id: &str, key: &str) -> Option<i64> {
+        let registry = self.registry.read().await;
+        registry
+            .get(&format!("{}:{}", workflow_id, version_hash))
+            .and_then(|ir| ir.get("nodes"))
+            .and_then(|n| n.get(node_id))
+            .and_then(|n| n.get(key))
+            .and_then(|m| m.as_i64())
+            .filter(|m| *m > 0)
+    }
+
+    /// `(item_count, sealed)` of a MAP node's item list, if its coordinator has fanned any out.
+    async fn map_state(&self, execution_id: &str, map_node_id: &str) -> Result<Option<(i64, bool)>, Status> {
+        let row: Option<(i64, i32)> = sqlx::query_as(
+            "SELECT item_count, sealed FROM map_state WHERE execution_id = ? AND map_node_id = ?"
+        )
+        .bind(execution_id)
+        .bind(map_node_id)
+        .fetch_optional(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        Ok(row.map(|(count, sealed)| (count, sealed != 0)))
+    }
+
+    async fn count_map_results(&self, execution_id: &str, map_node_id: &str) -> Result<i64, Status> {
+        let row: (i64,) = sqlx::query_as(
+            "SELECT COUNT(*) FROM map_results WHERE execution_id = ? AND map_node_id = ?"
+        )
+        .bind(execution_id)
+        .bind(map_node_id)
+        .fetch_one(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        Ok(row.0)
+    }
+
+    /// Fan a page of a MAP node's items out as sub-tasks, after the items it already has.
+    ///
+    /// `offset` is the index of the page's first item as the coordinator counted it; items the
+    /// server already holds (a coordinator re-run after its lease expired) are skipped. `seal`
+    /// closes the list, after which the node completes once every item has a result.
+    /// Returns the number of items fanned out so far.
+    ///
+    /// The page is one transaction: the sub-tasks go in with multi-row INSERTs and the new count
+    /// is written only if the list still has the count it was read with, so two coordinators
+    /// racing on the same list (an old one whose lease expired and its replacement) cannot
+    /// duplicate or drop items; the loser gets ABORTED and nothing it sent is kept.
+    #[allow(clippy::too_many_arguments)]
+    async fn enqueue_map_items(
+        &self,
+        execution_id: &str,
+        workflow_id: &str,
+        version_hash: &str,
+        node_id: &str,
+        items: &[Value],
+        offset: Option<u64>,
+        seal: bool,
+    ) -> Result<i64, Status> {
+        let max_parallel = self.map_setting(workflow_id, version_hash, node_id, "max_parallel").await;
+        let batch_size = self.map_setting(workflow_id, version_hash, node_id, "batch_size").await;
+
+        let mut tx = self.db.begin().await.map_err(|e| Status::internal(e.to_string()))?;
+        let insert_state_sql = if self.is_postgres {
+            "INSERT INTO map_state (execution_id, map_node_id) VALUES (?, ?) ON CONFLICT DO NOTHING"
+        } else {
+            "INSERT OR IGNORE INTO map_state (execution_id, map_node_id) VALUES (?, ?)"
+        };
+        let first_page = sqlx::query(insert_state_sql)
+            .bind(execution_id)
+            .bind(node_id)
+            .execute(&mut *tx)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+            .rows_affected()
+            > 0;
+        let (item_count, sealed): (i64, i32) = sqlx::query_as(
+            "SELECT item_count, sealed FROM map_state WHERE execution_id = ? AND map_node_id = ?"
+        )
+        .bind(execution_id)
+        .bind(node_id)
+        .fetch_one(&mut *tx)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        if sealed != 0 {
+            return Err(Status::failed_precondition(format!("MAP node '{}' item list is already closed", node_id)));
+        }
+
+        let skip = match offset {
+            Some(offset) if offset as i64 > item_count => {
+                return Err(Status::invalid_argument(format!(
+                    "MAP node '{}': page starts at item {} but only {} items were received", node_id, offset, item_count
+                )));
+            }
+            Some(offset) => (item_count - offset as i64) as usize,
+            None => 0,
+        };
+        let new_items = items.get(skip..).unwrap_or(&[]);
+        let new_count = item_count + new_items.len() as i64;
+
+        if !new_items.is_empty() {
+            // Sub-tasks beyond max_parallel wait until an earlier one completes (see MAP_SUBTASK in
+            // complete_task). With batch_size, each sub-task carries a JSON array of up to that many
+            // items and its map_index is the index of the first one. map_total counts items; it is
+            // 0 on pages fanned out before the list was closed.
+            let mut free_slots = match max_parallel {
+                Some(limit) => {
+                    let in_flight: (i64,) = sqlx::query_as(
+                        "SELECT COUNT(*) FROM task_queue
+                         WHERE execution_id = ? AND map_parent_node_id = ? AND status IN ('READY', 'RUNNING')"
+                    )
+                    .bind(execution_id)
+                    .bind(node_id)
+                    .fetch_one(&mut *tx)
+                    .await
+                    .map_err(|e| Status::internal(e.to_string()))?;
+                    Some(limit - in_flight.0)
+                }
+                None => None,
+            };
+            let sub_tasks: Vec<(i64, String)> = match batch_size {
+                Some(size) => new_items
+                    .chunks(size as usize)
+                    .enumerate()
+                    .map(|(n, chunk)| (item_count + n as i64 * size, Value::Array(chunk.to_vec()).to_string()))
+                    .collect(),
+                None => new_items
+                    .iter()
+                    .enumerate()
+                    .map(|(n, item)| (item_count + n as i64, item.to_string()))
+                    .collect(),
+            };
+
+            let now = self.now_sql();
+            let map_total = if seal { new_count as i32 } else { 0 };
+            // 10 binds per row keeps each statement under SQLite's 999-parameter limit
+            for rows in sub_tasks.chunks(90) {
+                let values = vec![format!("(?, ?, ?, ?, ?, ?, 'MAP_SUBTASK', ?, ?, ?, ?, {})", now); rows.len()].join(", ");
+                let map_insert_sql = format!(
+                    "INSERT INTO task_queue (task_id, execution_id, node_id, version_hash, idempotency_key, status, node_type, map_item_json, map_index, map_total, map_parent_node_id, scheduled_at)
+                     VALUES {values}"
+                );
+                let mut query = sqlx::query(&map_insert_sql);
+                for (index, item_json) in rows {
+                    let sub_node_id = format!("{}__{}", node_id, index);
+                    let status = match free_slots.as_mut() {
+                        Some(free) if *free <= 0 => "WAITING",
+                        Some(free) => {
+                            *free -= 1;
+                            "READY"
+                        }
+                        None => "READY",
+                    };
+                    query = query
+                        .bind(format!("task-{}", Uuid::new_v4()))
+                        .bind(execution_id)
+                        .bind(sub_node_id.clone())
+                        .bind(version_hash)
+                        .bind(format!("{}:{}:{}", execution_id, sub_node_id, version_hash))
+                        .bind(status)
+                        .bind(item_json.as_str())
+                        .bind(*index as i32)
+                        .bind(map_total)
+                        .bind(node_id);
+                }
+                query
+                    .execute(&mut *tx)
+                    .await
+                    .map_err(|e| Status::internal(e.to_string()))?;
+            }
+        }
+
+        let updated = sqlx::query(
+            "UPDATE map_state SET item_count = ?, sealed = ?
+             WHERE execution_id = ? AND map_node_id = ? AND item_count = ? AND sealed = 0"
+        )
+        .bind(new_count)
+        .bind(if seal { 1i32 } else { 0i32 })
+        .bind(execution_id)
+        .bind(node_id)
+        .bind(item_count)
+        .execute(&mut *tx)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?
+        .rows_affected();
+        if updated == 0 {
+            return Err(Status::aborted(format!(
+                "MAP node '{}' item list changed while this page was fanned out; retry", node_id
+            )));
+        }
+        tx.commit().await.map_err(|e| Status::internal(e.to_string()))?;
+
+        if !new_items.is_empty() {
+            self.task_notify.notify_waiters();
+        }
+        if first_page {
+            // Folding REDUCE nodes over this MAP can start now
+            self.schedule_ready_nodes(execution_id, workflow_id, version_hash).await?;
+        }
+
+        Ok(new_count)
+    }
+
+    /// Move a sealed MAP node's item list to finished (2); false if another caller already has.
+    async fn claim_map_finish(&self, execution_id: &str, map_node_id: &str, total: i64) -> Result<bool, Status> {
+        let claimed = sqlx::query(
+            "UPDATE map_state SET sealed = 2 WHERE execution_id = ? AND map_node_id = ? AND sealed = 1"
+        )
+        .bind(execution_id)
+        .bind(map_node_id)
+        .execute(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?
+        .rows_affected()
+            > 0;
+        if claimed {
+            return Ok(true);
+        }
+
+        // Fanned out before map_state existed: whoever inserts the row claims it
+        let insert_sql = if self.is_postgres {
+            "INSERT INTO map_state (execution_id, map_node_id, item_count, sealed) VALUES (?, ?, ?, 2) ON CONFLICT DO NOTHING"
+        } else {
+            "INSERT OR IGNORE INTO map_state (execution_id, map_node_id, item_count, sealed) VALUES (?, ?, ?, 2)"
+        };
+        let inserted = sqlx::query(insert_sql)
+            .bind(execution_id)
+            .bind(map_node_id)
+            .bind(total)
+            .execute(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+            .rows_affected();
+        Ok(inserted > 0)
+    }
+
+    /// Gather a MAP node's sub-task results in item order, emit its NodeCompleted and schedule downstream.
+    ///
+    /// The coordinator and the last sub-task can both see every result in when they race; only the
+    /// caller that claims the sealed list emits the event.
+    async fn finish_map_node(
+        &self,
+        execution_id: &str,
+        workflow_id: &str,
+        version_hash: &str,
+        parent_node_id: &str,
+        total: i64,
+    ) -> Result<(), Status> {
+        if !self.claim_map_finish(execution_id, parent_node_id, total).await? {
+            return Ok(());
+        }
+        if let Err(e) = self.emit_map_node_completed(execution_id, workflow_id, version_hash, parent_node_id, total).await {
+            // Nothing was written; hand the claim back so a retried completion can finish the node
+            sqlx::query("UPDATE map_state SET sealed = 1 WHERE execution_id = ? AND map_node_id = ? AND sealed = 2")
+                .bind(execution_id)
+                .bind(parent_node_id)
+                .execute(&self.db)
+                .await
+                .map_err(|e| Status::internal(e.to_string()))?;
+            return Err(e);
+        }
+
+        tracing::info!(
+            execution_id = execution_id,
+            node_id = parent_node_id,
+            total = total,
+            "All MAP sub-tasks complete, scheduling downstream"
+        );
+
+        self.schedule_ready_nodes(execution_id, workflow_id, version_hash).await?;
+        self.check_execution_complete(execution_id, workflow_id, version_hash).await?;
+        Ok(())
+    }
+
+    async fn emit_map_node_completed(
+        &self,
+        execution_id: &str,
+        workflow_id: &str,
+        version_hash: &str,
+        parent_node_id: &str,
+        total: i64,
+    ) -> Result<(), Status> {
+        // Folding REDUCE nodes read the results through ReadMapResults; when nothing else
+        // consumes the MAP node, skip gathering them into one array.
+        let folded_only = {
+            let registry = self.registry.read().await;
+            registry
+                .get(&format!("{}:{}", workflow_id, version_hash))
+                .and_then(|ir| ir.get("nodes"))
+                .and_then(|n| n.as_object())
+                .map(|nodes| {
+                    let mut consumers = nodes.values().filter(|n| depends_on(n, parent_node_id)).peekable();
+                    consumers.peek().is_some() && consumers.all(|n| is_fold_reduce_of(n, parent_node_id))
+                })
+                .unwrap_or(false)
+        };
+
+        let output_json = if folded_only {
+            serde_json::json!({ MAP_SUMMARY_MARKER: true, "item_count": total }).to_string()
+        } else {
+            let result_rows: Vec<(String,)> = sqlx::query_as(
+                "SELECT result_json FROM map_results WHERE execution_id = ? AND map_node_id = ? ORDER BY item_index"
+            )
+            .bind(execution_id)
+            .bind(parent_node_id)
+            .fetch_all(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?;
+
+            let results_array: Vec<serde_json::Value> = result_rows
+                .iter()
+                .map(|(rj,)| serde_json::from_str(rj).unwrap_or(Value::Null))
+                .collect();
+            serde_json::to_string(&results_array).unwrap_or_default()
+        };
+        let stored_output = self.store_payload(execution_id, parent_node_id, &output_json).await?;
+        let output: Value = serde_json::from_str(&stored_output).unwrap_or(Value::Null);
+
+        let event_id = format!("evt-{}", Uuid::new_v4());
+        let seq_id = self.get_next_sequence_id(execution_id).await?;
+        let payload = serde_json::json!({
+            "node_id": parent_node_id,
+            "output": output,
+        });
+
+        sqlx::query(
+            "INSERT INTO events (event_id, execution_id, sequence_id, event_type, payload)
+             VALUES (?, ?, ?, 'NodeCompleted', ?)"
+        )
+        .bind(&event_id)
+        .bind(execution_id)
+        .bind(seq_id)
+        .bind(serde_json::to_string(&payload).unwrap_or_default())
+        .execute(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        Ok(())
+    }
+
     async fn schedule_ready_nodes(
         &self,
         execution_id: &str,
@@ -475,8 +967,18 @@ impl NexumServer {
                 })
                 .unwrap_or_default();
 
-            // Consider ROUTER-skipped nodes as "completed" for dependency checking
-            let all_deps_done = deps.iter().all(|dep| completed.contains(dep) || skipped_nodes.contains(dep));
+            // Consider ROUTER-skipped nodes as "completed" for dependency checking. A folding
+            // REDUCE starts as soon as its MAP node fans out and reads results as they land.
+            let mut all_deps_done = true;
+            for dep in &deps {
+                let done = completed.contains(dep)
+                    || skipped_nodes.contains(dep)
+                    || (is_fold_reduce_of(node_def, dep) && self.map_state(execution_id, dep).await?.is_some());
+                if !done {
+                    all_deps_done = false;
+                    break;
+                }
+            }
 
             if all_deps_done {
                 let task_id = format!("task-{}", Uuid::new_v4());
@@ -561,6 +1063,7 @@ impl NexumServer {
             }
         }
 
+        self.task_notify.notify_waiters();
         Ok(())
     }
 
@@ -570,6 +1073,9 @@ impl NexumServer {
         workflow_id: &str,
         version_hash: &str,
     ) -> Result<(), Status> {
+        // A node just completed: let watchers pick up the new output.
+        self.publish_execution_update(execution_id);
+
         let registry = self.registry.read().await;
         let key = format!("{}:{}", workflow_id, version_hash);
         let ir = registry
@@ -621,6 +1127,7 @@ impl NexumServer {
                 .map_err(|e| Status::internal(e.to_string()))?;
 
             self.metrics.executions_completed.fetch_add(1, Ordering::Relaxed);
+            self.publish_execution_update(execution_id);
             tracing::info!(execution_id = %execution_id, "Execution completed");
 
             // Check if this was a child execution — trigger parent SUBWORKFLOW node
@@ -715,22 +1222,29 @@ impl NexumServer {
             return Ok(output_json.to_string());
         }
 
-        let blob_dir = std::path::Path::new(".nexum/blobs");
+        let blob_dir = blob_dir();
         if !blob_dir.exists() {
-            std::fs::create_dir_all(blob_dir).map_err(|e| Status::internal(e.to_string()))?;
+            std::fs::create_dir_all(&blob_dir).map_err(|e| Status::internal(e.to_string()))?;
         }
 
+        // Spilled outputs are mostly text (scraped pages, reports), so they are kept gzipped.
+        // The digest is of the JSON itself, so equal outputs of different executions share it.
+        let raw = output_json.as_bytes().to_vec();
+        let (compressed, digest) = tokio::task::spawn_blocking(move || {
+            gzip(&raw).map(|compressed| (compressed, hex::encode(Sha256::digest(&raw))))
+        })
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?
+        .map_err(|e| Status::internal(format!("Failed to compress blob: {}", e)))?;
+
         let blob_id = format!("{}-{}", execution_id, node_id);
         let blob_path = blob_dir.join(format!("{}.json", blob_id));
-        tokio::fs::write(&blob_path, output_json).await
+        tokio::fs::write(&blob_path, &compressed).await
             .map_err(|e| Status::internal(format!("Failed to write blob: {}", e)))?;
 
-        let pointer = serde_json::json!({
-            "__nexum_claim_check__": true,
-            "blob_id": blob_id,
-            "size": output_json.len(),
-            "path": blob_path.to_string_lossy()
-        });
+        let mut pointer = claim_check_pointer(&blob_id, compressed.len() as u64, &blob_path);
+        pointer["encoding"] = Value::from(GZIP_ENCODING);
+        pointer["sha256"] = Value::from(digest);
         serde_json::to_string(&pointer)
             .map_err(|e| Status::internal(format!("Failed to serialize claim check pointer: {}", e)))
     }
@@ -739,57 +1253,437 @@ impl NexumServer {
         let val: serde_json::Value = serde_json::from_str(stored_json)
             .map_err(|e| Status::internal(e.to_string()))?;
 
-        if val.get("__nexum_claim_check__").and_then(|v| v.as_bool()).unwrap_or(false) {
+        if is_claim_check(&val) {
             let path = val["path"].as_str().ok_or_else(|| Status::internal("Invalid claim check"))?;
-            let content = tokio::fs::read_to_string(path).await
+            let stored = tokio::fs::read(path).await
                 .map_err(|e| Status::internal(format!("Failed to read blob: {}", e)))?;
-            Ok(content)
+            let content = if val["encoding"] == GZIP_ENCODING {
+                tokio::task::spawn_blocking(move || gunzip(&stored))
+                    .await
+                    .map_err(|e| Status::internal(e.to_string()))?
+            } else {
+                String::from_utf8(stored).map_err(std::io::Error::other)
+            };
+            content.map_err(|e| Status::internal(format!("Failed to read blob: {}", e)))
         } else {
             Ok(stored_json.to_string())
         }
     }
-}
 
-// --- ROUTER condition evaluator (reserved for future server-side evaluation) ---
+    /// Keep a non-JSON output as-is and return the placeholder recorded in its NodeCompleted event.
+    async fn store_opaque_payload(&self, execution_id: &str, node_id: &str, payload: &Payload) -> Result<Value, Status> {
+        let upsert_sql = if self.is_postgres {
+            "INSERT INTO node_payloads (execution_id, node_id, content_type, data) VALUES (?, ?, ?, ?)
+             ON CONFLICT (execution_id, node_id) DO UPDATE SET content_type = EXCLUDED.content_type, data = EXCLUDED.data"
+        } else {
+            "INSERT OR REPLACE INTO node_payloads (execution_id, node_id, content_type, data) VALUES (?, ?, ?, ?)"
+        };
+        sqlx::query(upsert_sql)
+            .bind(execution_id)
+            .bind(node_id)
+            .bind(&payload.content_type)
+            .bind(payload.data.clone())
+            .execute(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?;
 
-#[allow(dead_code)]
-fn evaluate_condition(condition: &str, data: &serde_json::Value) -> bool {
-    let condition = condition.trim();
+        Ok(serde_json::json!({
+            "__nexum_payload__": true,
+            "content_type": payload.content_type,
+            "size": payload.data.len(),
+        }))
+    }
 
-    if let Some((path, op, expected)) = parse_condition(condition) {
-        let actual = get_json_path(data, &path);
-        match op.as_str() {
-            "==" => json_equals(&actual, &expected),
-            "!=" => !json_equals(&actual, &expected),
-            ">" => json_gt(&actual, &expected),
-            "<" => json_lt(&actual, &expected),
-            ">=" => json_gte(&actual, &expected),
-            "<=" => json_lte(&actual, &expected),
-            _ => false,
+    /// Lease up to `limit` READY tasks for any of `version_hashes` in one atomic claim.
+    /// Tasks are taken oldest-first across all versions, so no version starves
+    /// regardless of the order the worker lists them in.
+    ///
+    /// Selection and lock are a single `UPDATE ... WHERE task_id IN (SELECT ...) RETURNING`,
+    /// so two workers can never lease the same task. On PostgreSQL the inner select
+    /// uses `FOR UPDATE SKIP LOCKED`: concurrent pollers claim disjoint rows instead of
+    /// queueing on the oldest one. SQLite serialises writers, which gives the same guarantee.
+    async fn lease_tasks(&self, worker_id: &str, version_hashes: &[String], limit: i64) -> Result<Vec<TaskRow>, Status> {
+        if version_hashes.is_empty() || limit <= 0 {
+            return Ok(Vec::new());
         }
-    } else if condition == "true" {
-        true
-    } else if condition == "false" {
-        false
-    } else {
-        false
+
+        let now = self.now_sql();
+        let placeholders = vec!["?"; version_hashes.len()].join(", ");
+        let skip_locked = if self.is_postgres { "FOR UPDATE SKIP LOCKED" } else { "" };
+        let claim_sql = format!(
+            "UPDATE task_queue SET status = 'RUNNING', locked_by = ?, locked_at = {now}, lease_expires_at = {lease}
+             WHERE task_id IN (
+                 SELECT task_id FROM task_queue
+                 WHERE version_hash IN ({placeholders}) AND status = 'READY' AND scheduled_at <= {now}
+                 ORDER BY scheduled_at ASC
+                 LIMIT ?
+                 {skip_locked}
+             )
+             RETURNING task_id, execution_id, node_id, version_hash, input_json, idempotency_key, node_type, map_item_json, map_index, map_total, map_parent_node_id, sub_execution_id, sub_workflow_id, sub_input_json, checkpoint_json",
+            now = now,
+            lease = self.delayed_sql(DEFAULT_LEASE_SECS),
+            placeholders = placeholders,
+            skip_locked = skip_locked,
+        );
+
+        let mut claim = sqlx::query_as::<_, TaskRow>(&claim_sql).bind(worker_id);
+        for version_hash in version_hashes {
+            claim = claim.bind(version_hash);
+        }
+        claim
+            .bind(limit)
+            .fetch_all(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))
     }
-}
 
-#[allow(dead_code)]
-fn parse_condition(condition: &str) -> Option<(String, String, String)> {
-    for op in &[">=", "<=", "!=", "==", ">", "<"] {
-        if let Some(pos) = condition.find(op) {
-            let path = condition[..pos].trim().to_string();
-            let value = condition[pos + op.len()..].trim().trim_matches('"').to_string();
-            return Some((path, op.to_string(), value));
+    /// Lease up to `limit` tasks, holding the call for up to `wait_ms` until one is READY.
+    async fn lease_tasks_waiting(
+        &self,
+        worker_id: &str,
+        version_hashes: &[String],
+        limit: i64,
+        wait_ms: u32,
+        lazy_blobs: bool,
+    ) -> Result<Vec<PollResponse>, Status> {
+        let deadline = tokio::time::Instant::now()
+            + tokio::time::Duration::from_millis(wait_ms.min(MAX_POLL_WAIT_MS) as u64);
+
+        loop {
+            // Register for a wake-up *before* checking the queue, so a task scheduled
+            // between the check and the wait is not missed.
+            let notified = self.task_notify.notified();
+            tokio::pin!(notified);
+            notified.as_mut().enable();
+
+            let leased = self.lease_tasks(worker_id, version_hashes, limit).await?;
+            let task_ids: Vec<String> = leased.iter().map(|task| task.0.clone()).collect();
+            let mut tasks = Vec::new();
+            for task in leased {
+                match self.build_poll_response(worker_id, task, lazy_blobs).await {
+                    Ok(Some(resp)) => tasks.push(resp),
+                    Ok(None) => {}
+                    Err(e) => {
+                        // The whole batch is dropped with the error; hand it back rather than
+                        // leaving every task in it RUNNING until its lease expires.
+                        self.release_leases(worker_id, &task_ids).await?;
+                        return Err(e);
+                    }
+                }
+            }
+
+            let now = tokio::time::Instant::now();
+            if !tasks.is_empty() || now >= deadline {
+                return Ok(tasks);
+            }
+
+            let nap = (deadline - now).min(tokio::time::Duration::from_millis(POLL_RECHECK_MS));
+            let _ = tokio::time::timeout(nap, notified).await;
         }
     }
-    None
-}
 
-#[allow(dead_code)]
-fn get_json_path(data: &serde_json::Value, path: &str) -> serde_json::Value {
+    /// Put tasks `worker_id` still holds back to READY; returns how many were released.
+    ///
+    /// Unlike the reclaimer this is a clean hand-back, so retry_count is left alone.
+    async fn release_leases(&self, worker_id: &str, task_ids: &[String]) -> Result<u64, Status> {
+        if task_ids.is_empty() {
+            return Ok(0);
+        }
+
+        let placeholders = vec!["?"; task_ids.len()].join(", ");
+        let release_sql = format!(
+            "UPDATE task_queue SET status = 'READY', locked_by = NULL, locked_at = NULL, lease_expires_at = NULL
+             WHERE task_id IN ({}) AND locked_by = ? AND status = 'RUNNING'
+             AND (approval_status IS NULL OR approval_status != 'PENDING')
+             AND (sub_execution_id IS NULL OR sub_execution_id = '')",
+            placeholders
+        );
+        let mut release = sqlx::query(&release_sql);
+        for task_id in task_ids {
+            release = release.bind(task_id);
+        }
+        let released = release
+            .bind(worker_id)
+            .execute(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+            .rows_affected();
+
+        if released > 0 {
+            tracing::info!(worker = %worker_id, released, "Released leased tasks back to READY");
+            self.task_notify.notify_waiters();
+        }
+        Ok(released)
+    }
+
+    /// Turn a freshly leased task row into a PollResponse.
+    /// TIMER tasks are completed server-side and yield `None`.
+    async fn build_poll_response(&self, worker_id: &str, task: TaskRow, lazy_blobs: bool) -> Result<Option<PollResponse>, Status> {
+        let (task_id, execution_id, node_id, version_hash, _input_json, idempotency_key, db_node_type, map_item_json, map_index, map_total, map_parent_node_id, sub_execution_id, sub_workflow_id, sub_input_json, checkpoint_json) = task;
+
+        // Build input from execution input + dependency outputs
+        let exec_row: Option<(Option<String>, String)> = sqlx::query_as(
+            "SELECT input_json, workflow_id FROM workflow_executions WHERE execution_id = ?"
+        )
+        .bind(&execution_id)
+        .fetch_optional(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+
+        let (exec_input, workflow_id) = exec_row
+            .ok_or_else(|| Status::internal("Execution not found"))?;
+
+        // Get dependency outputs from events
+        let registry = self.registry.read().await;
+        let key = format!("{}:{}", workflow_id, version_hash);
+        let ir = registry.get(&key);
+
+        let mut deps_output: HashMap<String, Value> = HashMap::new();
+        let mut dep_payloads: HashMap<String, Payload> = HashMap::new();
+
+        // Resolve node type: prefer db_node_type (set for MAP_SUBTASK), then IR, then fallback
+        let is_map_subtask = db_node_type.as_deref() == Some("MAP_SUBTASK");
+        let response_node_id = if is_map_subtask {
+            map_parent_node_id.clone().unwrap_or_else(|| node_id.clone())
+        } else {
+            node_id.clone()
+        };
+        let node_type = if let Some(ref dbt) = db_node_type {
+            if !dbt.is_empty() { dbt.clone() } else {
+                ir.and_then(|ir_val| ir_val.get("nodes"))
+                    .and_then(|n| n.get(&node_id))
+                    .and_then(|n| n.get("type"))
+                    .and_then(|t| t.as_str())
+                    .unwrap_or("EFFECT")
+                    .to_string()
+            }
+        } else {
+            ir.and_then(|ir_val| ir_val.get("nodes"))
+                .and_then(|n| n.get(&node_id))
+                .and_then(|n| n.get("type"))
+                .and_then(|t| t.as_str())
+                .unwrap_or("EFFECT")
+                .to_string()
+        };
+        let ir_lookup_node_id = if is_map_subtask {
+            response_node_id.clone()
+        } else {
+            node_id.clone()
+        };
+
+        // TIMER nodes: auto-complete server-side, no worker needed
+        if node_type == "TIMER" {
+            // Read delay_seconds from IR
+            let delay_secs = ir
+                .and_then(|ir_val| ir_val.get("nodes"))
+                .and_then(|n| n.get(&node_id))
+                .and_then(|n| n.get("delay_seconds"))
+                .and_then(|d| d.as_i64())
+                .unwrap_or(0);
+
+            let output = serde_json::json!({
+                "waited_until": Utc::now().to_rfc3339(),
+                "delay_seconds": delay_secs,
+            });
+
+            // Mark task DONE
+            sqlx::query("UPDATE task_queue SET status = 'DONE' WHERE task_id = ?")
+                .bind(&task_id)
+                .execute(&self.db)
+                .await
+                .map_err(|e| Status::internal(e.to_string()))?;
+
+            self.metrics.tasks_completed.fetch_add(1, Ordering::Relaxed);
+
+            // Insert NodeCompleted event
+            let event_id = format!("evt-{}", Uuid::new_v4());
+            let seq_id = self.get_next_sequence_id(&execution_id).await?;
+            let payload = serde_json::json!({
+                "node_id": node_id,
+                "output": output,
+            });
+            sqlx::query(
+                "INSERT INTO events (event_id, execution_id, sequence_id, event_type, payload)
+                 VALUES (?, ?, ?, 'NodeCompleted', ?)"
+            )
+            .bind(&event_id)
+            .bind(&execution_id)
+            .bind(seq_id)
+            .bind(serde_json::to_string(&payload).unwrap_or_default())
+            .execute(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?;
+
+            tracing::info!(
+                execution_id = %execution_id,
+                node_id = %node_id,
+                delay_seconds = delay_secs,
+                "TIMER auto-completed"
+            );
+
+            // Schedule downstream nodes
+            self.schedule_ready_nodes(&execution_id, &workflow_id, &version_hash).await?;
+            self.check_execution_complete(&execution_id, &workflow_id, &version_hash).await?;
+
+            // No task for the worker to process
+            return Ok(None);
+        }
+
+        // Lease length is per node; the worker heartbeats to keep it alive
+        let lease_secs = ir
+            .and_then(|ir_val| ir_val.get("nodes"))
+            .and_then(|n| n.get(&ir_lookup_node_id))
+            .and_then(|n| n.get("lease_seconds"))
+            .and_then(|l| l.as_i64())
+            .filter(|l| *l > 0)
+            .unwrap_or(DEFAULT_LEASE_SECS);
+        sqlx::query(&format!(
+            "UPDATE task_queue SET lease_seconds = ?, lease_expires_at = {} WHERE task_id = ?",
+            self.delayed_sql(lease_secs)
+        ))
+        .bind(lease_secs)
+        .bind(&task_id)
+        .execute(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+
+        // For HUMAN_APPROVAL nodes, set approval_status to PENDING
+        if node_type == "HUMAN_APPROVAL" {
+            sqlx::query("UPDATE task_queue SET approval_status = 'PENDING' WHERE task_id = ?")
+                .bind(&task_id)
+                .execute(&self.db)
+                .await
+                .map_err(|e| Status::internal(e.to_string()))?;
+        }
+
+        if let Some(ir) = ir {
+            if let Some(deps) = ir
+                .get("nodes")
+                .and_then(|n| n.get(&ir_lookup_node_id))
+                .and_then(|n| n.get("dependencies"))
+                .and_then(|d| d.as_array())
+            {
+                for dep in deps {
+                    if let Some(dep_id) = dep.as_str() {
+                        if let Some(payload) = self.find_node_completed_event(&execution_id, dep_id).await? {
+                            if let Ok(payload_val) = serde_json::from_str::<Value>(&payload) {
+                                if let Some(output) = payload_val.get("output") {
+                                    if is_payload_marker(output) {
+                                        if let Some(payload) = load_node_payload(&self.db, &execution_id, dep_id).await? {
+                                            dep_payloads.insert(dep_id.to_string(), payload);
+                                        }
+                                        continue;
+                                    }
+                                    // Resolve claim check if needed
+                                    let resolved = if let Some(output_str) = output.as_str() {
+                                        if let Ok(resolved_str) = self.resolve_payload(output_str).await {
+                                            serde_json::from_str::<Value>(&resolved_str).unwrap_or(output.clone())
+                                        } else {
+                                            output.clone()
+                                        }
+                                    } else if is_claim_check(output) && lazy_blobs {
+                                        // The worker resolves the pointer itself, only if the handler reads it.
+                                        output.clone()
+                                    } else if is_claim_check(output) {
+                                        let output_str = serde_json::to_string(output).unwrap_or_default();
+                                        if let Ok(resolved_str) = self.resolve_payload(&output_str).await {
+                                            serde_json::from_str::<Value>(&resolved_str).unwrap_or(output.clone())
+                                        } else {
+                                            output.clone()
+                                        }
+                                    } else {
+                                        output.clone()
+                                    };
+                                    deps_output.insert(dep_id.to_string(), resolved);
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        let mut input = exec_input.and_then(|s| serde_json::from_str::<Value>(&s).ok()).unwrap_or(Value::Null);
+        if is_claim_check(&input) && !lazy_blobs {
+            let resolved = self.resolve_payload(&input.to_string()).await?;
+            input = serde_json::from_str(&resolved).unwrap_or(Value::Null);
+        }
+        let input_val = serde_json::json!({
+            "input": input,
+            "deps": deps_output,
+        });
+
+        tracing::info!(
+            task_id = task_id,
+            node_id = node_id,
+            worker = worker_id,
+            "Task polled"
+        );
+
+        Ok(Some(PollResponse {
+            has_task: true,
+            task_id,
+            execution_id,
+            node_id: response_node_id,
+            input_json: serde_json::to_string(&input_val).unwrap_or_default(),
+            idempotency_key: idempotency_key.unwrap_or_default(),
+            node_type,
+            map_item_json: map_item_json.unwrap_or_default(),
+            is_map_subtask,
+            map_index: map_index.unwrap_or(0),
+            map_total: map_total.unwrap_or(0),
+            sub_execution_id: sub_execution_id.unwrap_or_default(),
+            sub_workflow_id: sub_workflow_id.unwrap_or_default(),
+            sub_input_json: sub_input_json.unwrap_or_default(),
+            version_hash,
+            workflow_id,
+            lease_seconds: lease_secs as i32,
+            dep_payloads,
+            checkpoint_json: checkpoint_json.unwrap_or_default(),
+        }))
+    }
+}
+
+// --- ROUTER condition evaluator (reserved for future server-side evaluation) ---
+
+#[allow(dead_code)]
+fn evaluate_condition(condition: &str, data: &serde_json::Value) -> bool {
+    let condition = condition.trim();
+
+    if let Some((path, op, expected)) = parse_condition(condition) {
+        let actual = get_json_path(data, &path);
+        match op.as_str() {
+            "==" => json_equals(&actual, &expected),
+            "!=" => !json_equals(&actual, &expected),
+            ">" => json_gt(&actual, &expected),
+            "<" => json_lt(&actual, &expected),
+            ">=" => json_gte(&actual, &expected),
+            "<=" => json_lte(&actual, &expected),
+            _ => false,
+        }
+    } else if condition == "true" {
+        true
+    } else if condition == "false" {
+        false
+    } else {
+        false
+    }
+}
+
+#[allow(dead_code)]
+fn parse_condition(condition: &str) -> Option<(String, String, String)> {
+    for op in &[">=", "<=", "!=", "==", ">", "<"] {
+        if let Some(pos) = condition.find(op) {
+            let path = condition[..pos].trim().to_string();
+            let value = condition[pos + op.len()..].trim().trim_matches('"').to_string();
+            return Some((path, op.to_string(), value));
+        }
+    }
+    None
+}
+
+#[allow(dead_code)]
+fn get_json_path(data: &serde_json::Value, path: &str) -> serde_json::Value {
     let path = path.trim_start_matches("$.");
     let parts: Vec<&str> = path.split('.').collect();
     let mut current = data;
@@ -831,6 +1725,257 @@ fn json_gte(a: &serde_json::Value, b: &str) -> bool { !json_lt(a, b) }
 #[allow(dead_code)]
 fn json_lte(a: &serde_json::Value, b: &str) -> bool { !json_gt(a, b) }
 
+fn empty_poll_response() -> PollResponse {
+    PollResponse {
+        has_task: false,
+        task_id: String::new(),
+        execution_id: String::new(),
+        node_id: String::new(),
+        input_json: String::new(),
+        idempotency_key: String::new(),
+        node_type: String::new(),
+        map_item_json: String::new(),
+        is_map_subtask: false,
+        map_index: 0,
+        map_total: 0,
+        sub_execution_id: String::new(),
+        sub_workflow_id: String::new(),
+        sub_input_json: String::new(),
+        version_hash: String::new(),
+        workflow_id: String::new(),
+        lease_seconds: 0,
+        dep_payloads: HashMap::new(),
+        checkpoint_json: String::new(),
+    }
+}
+
+fn is_payload_marker(output: &Value) -> bool {
+    output.get(PAYLOAD_MARKER).and_then(|v| v.as_bool()).unwrap_or(false)
+}
+
+fn is_claim_check(output: &Value) -> bool {
+    output.get(CLAIM_CHECK_MARKER).and_then(|v| v.as_bool()).unwrap_or(false)
+}
+
+/// Whether an IR node is a REDUCE that folds `map_node_id`'s results as they arrive.
+fn is_fold_reduce_of(node_def: &Value, map_node_id: &str) -> bool {
+    node_def.get("type").and_then(|t| t.as_str()) == Some("REDUCE")
+        && node_def.get("fold").and_then(|f| f.as_bool()).unwrap_or(false)
+        && node_def.get("mapNodeId").and_then(|m| m.as_str()) == Some(map_node_id)
+}
+
+fn depends_on(node_def: &Value, node_id: &str) -> bool {
+    node_def
+        .get("dependencies")
+        .and_then(|d| d.as_array())
+        .map(|deps| deps.iter().any(|d| d.as_str() == Some(node_id)))
+        .unwrap_or(false)
+}
+
+fn blob_dir() -> std::path::PathBuf {
+    std::env::current_dir()
+        .map(|cwd| cwd.join(BLOB_DIR))
+        .unwrap_or_else(|_| std::path::PathBuf::from(BLOB_DIR))
+}
+
+fn blob_path(blob_id: &str) -> Result<std::path::PathBuf, Status> {
+    // Blob ids are `{execution_id}-{node_id}` or `upload-{sha256}`; refuse anything that could leave the blob directory.
+    if blob_id.is_empty() || blob_id.starts_with('.') || blob_id.contains('/') || blob_id.contains('\\') {
+        return Err(Status::invalid_argument("Invalid blob id"));
+    }
+    Ok(blob_dir().join(format!("{}.json", blob_id)))
+}
+
+/// The stored output that stands in for a blob. An absolute path lets workers on the same host map the file directly.
+fn claim_check_pointer(blob_id: &str, size: u64, path: &std::path::Path) -> Value {
+    serde_json::json!({
+        CLAIM_CHECK_MARKER: true,
+        "blob_id": blob_id,
+        "size": size,
+        "path": path.to_string_lossy()
+    })
+}
+
+fn gzip(data: &[u8]) -> std::io::Result<Vec<u8>> {
+    use std::io::Write;
+
+    let mut encoder = flate2::write::GzEncoder::new(Vec::with_capacity(data.len() / 4), flate2::Compression::default());
+    encoder.write_all(data)?;
+    encoder.finish()
+}
+
+fn gunzip(data: &[u8]) -> std::io::Result<String> {
+    use std::io::Read;
+
+    let mut text = String::new();
+    flate2::read::GzDecoder::new(data).read_to_string(&mut text)?;
+    Ok(text)
+}
+
+/// Claim-check pointer for a blob sent with UploadPayload.
+async fn uploaded_blob_pointer(blob_id: &str) -> Result<Value, Status> {
+    let path = blob_path(blob_id)?;
+    let size = tokio::fs::metadata(&path).await
+        .map_err(|_| Status::not_found(format!("Blob {} not found", blob_id)))?
+        .len();
+    let mut pointer = claim_check_pointer(blob_id, size, &path);
+    // Uploads are named by the SHA-256 of their bytes (older ones by a UUID, which carry no digest)
+    if let Some(digest) = blob_id.strip_prefix("upload-").filter(|d| d.len() == 64 && d.bytes().all(|b| b.is_ascii_hexdigit())) {
+        pointer["sha256"] = Value::from(digest);
+    }
+    Ok(pointer)
+}
+
+/// Read `length` bytes (0 = as many as allowed) at `offset` of a blob, returning them and the blob's size.
+async fn read_blob_range(blob_id: &str, offset: u64, length: u64) -> Result<(Vec<u8>, u64), Status> {
+    use tokio::io::{AsyncReadExt, AsyncSeekExt};
+
+    let path = blob_path(blob_id)?;
+    let mut file = tokio::fs::File::open(&path).await
+        .map_err(|_| Status::not_found(format!("Blob {} not found", blob_id)))?;
+    let total_size = file.metadata().await.map_err(|e| Status::internal(e.to_string()))?.len();
+    if offset >= total_size {
+        return Ok((Vec::new(), total_size));
+    }
+
+    let want = if length == 0 { MAX_FETCH_BLOB_BYTES } else { length.min(MAX_FETCH_BLOB_BYTES) };
+    let mut data = vec![0u8; want.min(total_size - offset) as usize];
+    file.seek(std::io::SeekFrom::Start(offset)).await.map_err(|e| Status::internal(e.to_string()))?;
+    file.read_exact(&mut data).await
+        .map_err(|e| Status::internal(format!("Failed to read blob: {}", e)))?;
+    Ok((data, total_size))
+}
+
+async fn load_node_payload(db: &sqlx::AnyPool, execution_id: &str, node_id: &str) -> Result<Option<Payload>, Status> {
+    let row: Option<(String, Vec<u8>)> = sqlx::query_as(
+        "SELECT content_type, data FROM node_payloads WHERE execution_id = ? AND node_id = ?"
+    )
+    .bind(execution_id)
+    .bind(node_id)
+    .fetch_optional(db)
+    .await
+    .map_err(|e| Status::internal(e.to_string()))?;
+    Ok(row.map(|(content_type, data)| Payload { content_type, data }))
+}
+
+/// The live execution started under `(workflow_id, key)`, if any. A FAILED or
+/// CANCELLED holder gives the key up, so the caller starts a fresh attempt under it.
+async fn find_by_idempotency_key(
+    conn: &mut sqlx::AnyConnection,
+    workflow_id: &str,
+    key: &str,
+) -> Result<Option<String>, Status> {
+    let row: Option<(String, String)> = sqlx::query_as(
+        "SELECT execution_id, status FROM workflow_executions WHERE workflow_id = ? AND idempotency_key = ?"
+    )
+    .bind(workflow_id)
+    .bind(key)
+    .fetch_optional(&mut *conn)
+    .await
+    .map_err(|e| Status::internal(e.to_string()))?;
+
+    match row {
+        Some((execution_id, status)) if status != "FAILED" && status != "CANCELLED" => Ok(Some(execution_id)),
+        Some((execution_id, _)) => {
+            sqlx::query("UPDATE workflow_executions SET idempotency_key = NULL WHERE execution_id = ?")
+                .bind(&execution_id)
+                .execute(&mut *conn)
+                .await
+                .map_err(|e| Status::internal(e.to_string()))?;
+            Ok(None)
+        }
+        None => Ok(None),
+    }
+}
+
+/// Return RUNNING tasks whose lease ran out (dead worker, missed heartbeats) to READY.
+/// Rows leased before leases existed fall back to `locked_at` + DEFAULT_LEASE_SECS.
+async fn reclaim_expired_tasks(db: &sqlx::AnyPool, is_postgres: bool) -> Result<u64, sqlx::Error> {
+    let (now, legacy_cutoff) = if is_postgres {
+        ("NOW()".to_string(), format!("NOW() - INTERVAL '{} seconds'", DEFAULT_LEASE_SECS))
+    } else {
+        ("datetime('now')".to_string(), format!("datetime('now', '-{} seconds')", DEFAULT_LEASE_SECS))
+    };
+    let reclaim_sql = format!(
+        "UPDATE task_queue SET status = 'READY', locked_by = NULL, locked_at = NULL, lease_expires_at = NULL,
+         retry_count = retry_count + 1
+         WHERE status = 'RUNNING'
+         AND (lease_expires_at < {} OR (lease_expires_at IS NULL AND locked_at < {}))
+         AND (approval_status IS NULL OR approval_status != 'PENDING')
+         AND (sub_execution_id IS NULL OR sub_execution_id = '')",
+        now, legacy_cutoff
+    );
+    Ok(sqlx::query(&reclaim_sql).execute(db).await?.rows_affected())
+}
+
+fn is_terminal_status(status: &str) -> bool {
+    matches!(status, "COMPLETED" | "FAILED" | "CANCELLED")
+}
+
+/// Current status of an execution plus the outputs of its completed nodes.
+async fn load_status(db: &sqlx::AnyPool, execution_id: &str) -> Result<StatusResponse, Status> {
+    let exec: (String,) = sqlx::query_as(
+        "SELECT status FROM workflow_executions WHERE execution_id = ?"
+    )
+    .bind(execution_id)
+    .fetch_one(db)
+    .await
+    .map_err(|e| Status::not_found(format!("Execution not found: {}", e)))?;
+
+    let events: Vec<(String,)> = sqlx::query_as(
+        "SELECT payload FROM events WHERE execution_id = ? AND event_type = 'NodeCompleted' ORDER BY sequence_id"
+    )
+    .bind(execution_id)
+    .fetch_all(db)
+    .await
+    .map_err(|e| Status::internal(e.to_string()))?;
+
+    let mut completed_nodes: HashMap<String, Value> = HashMap::new();
+    let mut node_payloads: HashMap<String, Payload> = HashMap::new();
+    for (payload_str,) in events {
+        if let Ok(payload) = serde_json::from_str::<Value>(&payload_str) {
+            if let (Some(node_id), Some(output)) =
+                (payload.get("node_id").and_then(|n| n.as_str()), payload.get("output"))
+            {
+                if is_payload_marker(output) {
+                    if let Some(node_payload) = load_node_payload(db, execution_id, node_id).await? {
+                        node_payloads.insert(node_id.to_string(), node_payload);
+                    }
+                }
+                completed_nodes.insert(node_id.to_string(), output.clone());
+            }
+        }
+    }
+
+    // Folding REDUCE nodes checkpoint their accumulator with each ReadMapResults call
+    let checkpoints: Vec<(String, String)> = sqlx::query_as(
+        "SELECT node_id, checkpoint_json FROM task_queue
+         WHERE execution_id = ? AND status = 'RUNNING' AND checkpoint_json IS NOT NULL"
+    )
+    .bind(execution_id)
+    .fetch_all(db)
+    .await
+    .map_err(|e| Status::internal(e.to_string()))?;
+    let partial_outputs: HashMap<String, Value> = checkpoints
+        .into_iter()
+        .filter_map(|(node_id, checkpoint)| {
+            let acc = serde_json::from_str::<Value>(&checkpoint).ok()?.get("acc")?.clone();
+            Some((node_id, acc))
+        })
+        .collect();
+
+    Ok(StatusResponse {
+        status: exec.0,
+        completed_nodes_json: serde_json::to_string(&completed_nodes).unwrap_or_default(),
+        node_payloads,
+        partial_outputs_json: if partial_outputs.is_empty() {
+            String::new()
+        } else {
+            serde_json::to_string(&partial_outputs).unwrap_or_default()
+        },
+    })
+}
+
 fn analyze_compatibility(old_ir: &Value, new_ir: &Value) -> &'static str {
     let old_nodes = old_ir.get("nodes").and_then(|n| n.as_object());
     let new_nodes = new_ir.get("nodes").and_then(|n| n.as_object());
@@ -934,9 +2079,46 @@ impl NexumService for NexumServer {
         &self,
         request: Request<StartRequest>,
     ) -> Result<Response<StartResponse>, Status> {
-        let req = request.into_inner();
+        let mut req = request.into_inner();
+        // A streamed input is kept as a claim check, like a large node output.
+        if !req.input_blob_id.is_empty() {
+            req.input_json = uploaded_blob_pointer(&req.input_blob_id).await?.to_string();
+        }
+        let idempotency_key = Some(req.idempotency_key.as_str()).filter(|k| !k.is_empty());
+
+        if let Some(key) = idempotency_key {
+            let mut conn = self.db.acquire().await.map_err(|e| Status::internal(e.to_string()))?;
+            if let Some(execution_id) = find_by_idempotency_key(&mut conn, &req.workflow_id, key).await? {
+                tracing::info!(execution_id = %execution_id, workflow_id = %req.workflow_id, "Execution deduplicated");
+                return Ok(Response::new(StartResponse { execution_id }));
+            }
+        }
+
         let execution_id = format!("exec-{}", Uuid::new_v4());
 
+        let inserted = sqlx::query(
+            "INSERT INTO workflow_executions (execution_id, workflow_id, version_hash, status, input_json, idempotency_key)
+             VALUES (?, ?, ?, 'RUNNING', ?, ?)"
+        )
+        .bind(&execution_id)
+        .bind(&req.workflow_id)
+        .bind(&req.version_hash)
+        .bind(&req.input_json)
+        .bind(idempotency_key)
+        .execute(&self.db)
+        .await;
+
+        if let Err(e) = inserted {
+            // Lost a race with a concurrent start under the same key: hand back the winner.
+            if let Some(key) = idempotency_key {
+                let mut conn = self.db.acquire().await.map_err(|e| Status::internal(e.to_string()))?;
+                if let Some(existing) = find_by_idempotency_key(&mut conn, &req.workflow_id, key).await? {
+                    return Ok(Response::new(StartResponse { execution_id: existing }));
+                }
+            }
+            return Err(Status::internal(e.to_string()));
+        }
+
         self.metrics.executions_started.fetch_add(1, Ordering::Relaxed);
         tracing::info!(
             execution_id = %execution_id,
@@ -945,278 +2127,182 @@ impl NexumService for NexumServer {
             "Execution started"
         );
 
-        sqlx::query(
-            "INSERT INTO workflow_executions (execution_id, workflow_id, version_hash, status, input_json)
-             VALUES (?, ?, ?, 'RUNNING', ?)"
-        )
-        .bind(&execution_id)
-        .bind(&req.workflow_id)
-        .bind(&req.version_hash)
-        .bind(&req.input_json)
-        .execute(&self.db)
-        .await
-        .map_err(|e| Status::internal(e.to_string()))?;
-
         self.schedule_ready_nodes(&execution_id, &req.workflow_id, &req.version_hash)
             .await?;
 
         Ok(Response::new(StartResponse { execution_id }))
     }
 
-    async fn poll_task(
+    async fn start_executions(
         &self,
-        request: Request<PollRequest>,
-    ) -> Result<Response<PollResponse>, Status> {
+        request: Request<StartExecutionsRequest>,
+    ) -> Result<Response<StartExecutionsResponse>, Status> {
         let req = request.into_inner();
+        if req.input_jsons.len() > MAX_START_BATCH {
+            return Err(Status::invalid_argument(format!(
+                "At most {} executions per StartExecutions call", MAX_START_BATCH
+            )));
+        }
+        if !req.idempotency_keys.is_empty() && req.idempotency_keys.len() != req.input_jsons.len() {
+            return Err(Status::invalid_argument("idempotency_keys must be empty or match input_jsons"));
+        }
+
+        // A fresh execution has nothing completed, so exactly the dependency-free
+        // nodes start READY — the same set schedule_ready_nodes would pick.
+        let roots: Vec<(String, String, i64)> = {
+            let registry = self.registry.read().await;
+            let key = format!("{}:{}", req.workflow_id, req.version_hash);
+            let nodes = registry
+                .get(&key)
+                .ok_or_else(|| Status::not_found("Workflow not registered"))?
+                .get("nodes")
+                .and_then(|n| n.as_object())
+                .ok_or_else(|| Status::internal("Invalid IR: missing nodes"))?;
+            nodes
+                .iter()
+                .filter(|(_, def)| {
+                    def.get("dependencies").and_then(|d| d.as_array()).map_or(true, |d| d.is_empty())
+                })
+                .map(|(node_id, def)| {
+                    (
+                        node_id.clone(),
+                        def.get("type").and_then(|t| t.as_str()).unwrap_or("COMPUTE").to_string(),
+                        def.get("delay_seconds").and_then(|d| d.as_i64()).unwrap_or(0),
+                    )
+                })
+                .collect()
+        };
 
         let now = self.now_sql();
-        let poll_sql = format!(
-            "SELECT task_id, execution_id, node_id, version_hash, input_json, idempotency_key, node_type, map_item_json, map_index, map_total, map_parent_node_id, sub_execution_id, sub_workflow_id, sub_input_json
-             FROM task_queue
-             WHERE version_hash = ? AND status = 'READY' AND scheduled_at <= {}
-             ORDER BY scheduled_at ASC
-             LIMIT 1", now
-        );
+        let mut tx = self.db.begin().await.map_err(|e| Status::internal(e.to_string()))?;
+        let mut execution_ids = Vec::with_capacity(req.input_jsons.len());
+        let mut started = 0u64;
+
+        for (i, input_json) in req.input_jsons.iter().enumerate() {
+            let idempotency_key = req.idempotency_keys.get(i).map(String::as_str).filter(|k| !k.is_empty());
+            if let Some(key) = idempotency_key {
+                // Also catches repeats within this batch: the transaction sees its own inserts.
+                if let Some(existing) = find_by_idempotency_key(&mut tx, &req.workflow_id, key).await? {
+                    execution_ids.push(existing);
+                    continue;
+                }
+            }
 
-        let task: Option<(String, String, String, String, Option<String>, Option<String>, Option<String>, Option<String>, Option<i32>, Option<i32>, Option<String>, Option<String>, Option<String>, Option<String>)> = sqlx::query_as(&poll_sql)
-        .bind(&req.version_hash)
-        .fetch_optional(&self.db)
-        .await
-        .map_err(|e| Status::internal(e.to_string()))?;
+            let execution_id = format!("exec-{}", Uuid::new_v4());
 
-        match task {
-            Some((task_id, execution_id, node_id, version_hash, _input_json, idempotency_key, db_node_type, map_item_json, map_index, map_total, map_parent_node_id, sub_execution_id, sub_workflow_id, sub_input_json)) => {
-                // Lock the task
-                let lock_sql = format!("UPDATE task_queue SET status = 'RUNNING', locked_by = ?, locked_at = {} WHERE task_id = ?", now);
-                sqlx::query(&lock_sql)
-                    .bind(&req.worker_id)
-                    .bind(&task_id)
-                    .execute(&self.db)
-                    .await
-                    .map_err(|e| Status::internal(e.to_string()))?;
+            // DO NOTHING rather than an error, which would abort the whole transaction
+            let inserted = sqlx::query(
+                "INSERT INTO workflow_executions (execution_id, workflow_id, version_hash, status, input_json, idempotency_key)
+                 VALUES (?, ?, ?, 'RUNNING', ?, ?)
+                 ON CONFLICT DO NOTHING"
+            )
+            .bind(&execution_id)
+            .bind(&req.workflow_id)
+            .bind(&req.version_hash)
+            .bind(input_json)
+            .bind(idempotency_key)
+            .execute(&mut *tx)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+            .rows_affected();
+            if inserted == 0 {
+                // Lost a race with a concurrent start under the same key: hand back the winner,
+                // as StartExecution does.
+                let key = idempotency_key.unwrap_or_default();
+                let existing = find_by_idempotency_key(&mut tx, &req.workflow_id, key)
+                    .await?
+                    .ok_or_else(|| Status::aborted(format!("Idempotency key '{}' changed hands mid-batch; retry", key)))?;
+                execution_ids.push(existing);
+                continue;
+            }
 
-                // Build input from execution input + dependency outputs
-                let exec_row: Option<(Option<String>, String)> = sqlx::query_as(
-                    "SELECT input_json, workflow_id FROM workflow_executions WHERE execution_id = ?"
-                )
-                .bind(&execution_id)
-                .fetch_optional(&self.db)
-                .await
-                .map_err(|e| Status::internal(e.to_string()))?;
-
-                let (exec_input, workflow_id) = exec_row
-                    .ok_or_else(|| Status::internal("Execution not found"))?;
-
-                // Get dependency outputs from events
-                let registry = self.registry.read().await;
-                let key = format!("{}:{}", workflow_id, version_hash);
-                let ir = registry.get(&key);
-
-                let mut deps_output: HashMap<String, Value> = HashMap::new();
-
-                // Resolve node type: prefer db_node_type (set for MAP_SUBTASK), then IR, then fallback
-                let is_map_subtask = db_node_type.as_deref() == Some("MAP_SUBTASK");
-                let response_node_id = if is_map_subtask {
-                    map_parent_node_id.clone().unwrap_or_else(|| node_id.clone())
-                } else {
-                    node_id.clone()
-                };
-                let node_type = if let Some(ref dbt) = db_node_type {
-                    if !dbt.is_empty() { dbt.clone() } else {
-                        ir.and_then(|ir_val| ir_val.get("nodes"))
-                            .and_then(|n| n.get(&node_id))
-                            .and_then(|n| n.get("type"))
-                            .and_then(|t| t.as_str())
-                            .unwrap_or("EFFECT")
-                            .to_string()
-                    }
-                } else {
-                    ir.and_then(|ir_val| ir_val.get("nodes"))
-                        .and_then(|n| n.get(&node_id))
-                        .and_then(|n| n.get("type"))
-                        .and_then(|t| t.as_str())
-                        .unwrap_or("EFFECT")
-                        .to_string()
-                };
-                let ir_lookup_node_id = if is_map_subtask {
-                    response_node_id.clone()
-                } else {
-                    node_id.clone()
-                };
-
-                // TIMER nodes: auto-complete server-side, no worker needed
-                if node_type == "TIMER" {
-                    // Read delay_seconds from IR
-                    let delay_secs = ir
-                        .and_then(|ir_val| ir_val.get("nodes"))
-                        .and_then(|n| n.get(&node_id))
-                        .and_then(|n| n.get("delay_seconds"))
-                        .and_then(|d| d.as_i64())
-                        .unwrap_or(0);
-
-                    let output = serde_json::json!({
-                        "waited_until": Utc::now().to_rfc3339(),
-                        "delay_seconds": delay_secs,
-                    });
-
-                    // Mark task DONE
-                    sqlx::query("UPDATE task_queue SET status = 'DONE' WHERE task_id = ?")
-                        .bind(&task_id)
-                        .execute(&self.db)
-                        .await
-                        .map_err(|e| Status::internal(e.to_string()))?;
-
-                    self.metrics.tasks_completed.fetch_add(1, Ordering::Relaxed);
-
-                    // Insert NodeCompleted event
-                    let event_id = format!("evt-{}", Uuid::new_v4());
-                    let seq_id = self.get_next_sequence_id(&execution_id).await?;
-                    let payload = serde_json::json!({
-                        "node_id": node_id,
-                        "output": output,
-                    });
-                    sqlx::query(
-                        "INSERT INTO events (event_id, execution_id, sequence_id, event_type, payload)
-                         VALUES (?, ?, ?, 'NodeCompleted', ?)"
-                    )
-                    .bind(&event_id)
+            for (node_id, node_type, delay_secs) in &roots {
+                let scheduled_at = if node_type == "TIMER" { self.delayed_sql(*delay_secs) } else { now.to_string() };
+                let insert_sql = format!(
+                    "INSERT INTO task_queue (task_id, execution_id, node_id, version_hash, idempotency_key, status, node_type, scheduled_at)
+                     VALUES (?, ?, ?, ?, ?, 'READY', ?, {})", scheduled_at
+                );
+                sqlx::query(&insert_sql)
+                    .bind(format!("task-{}", Uuid::new_v4()))
                     .bind(&execution_id)
-                    .bind(seq_id)
-                    .bind(serde_json::to_string(&payload).unwrap_or_default())
-                    .execute(&self.db)
+                    .bind(node_id)
+                    .bind(&req.version_hash)
+                    .bind(format!("{}:{}:{}", execution_id, node_id, req.version_hash))
+                    .bind(node_type)
+                    .execute(&mut *tx)
                     .await
                     .map_err(|e| Status::internal(e.to_string()))?;
+            }
 
-                    tracing::info!(
-                        execution_id = %execution_id,
-                        node_id = %node_id,
-                        delay_seconds = delay_secs,
-                        "TIMER auto-completed"
-                    );
+            execution_ids.push(execution_id);
+            started += 1;
+        }
 
-                    // Schedule downstream nodes
-                    self.schedule_ready_nodes(&execution_id, &workflow_id, &version_hash).await?;
-                    self.check_execution_complete(&execution_id, &workflow_id, &version_hash).await?;
-
-                    // Return empty response — no task for worker to process
-                    return Ok(Response::new(PollResponse {
-                        has_task: false,
-                        task_id: String::new(),
-                        execution_id: String::new(),
-                        node_id: String::new(),
-                        input_json: String::new(),
-                        idempotency_key: String::new(),
-                        node_type: String::new(),
-                        map_item_json: String::new(),
-                        is_map_subtask: false,
-                        map_index: 0,
-                        map_total: 0,
-                        sub_execution_id: String::new(),
-                        sub_workflow_id: String::new(),
-                        sub_input_json: String::new(),
-                    }));
-                }
+        tx.commit().await.map_err(|e| Status::internal(e.to_string()))?;
 
-                // For HUMAN_APPROVAL nodes, set approval_status to PENDING
-                if node_type == "HUMAN_APPROVAL" {
-                    sqlx::query("UPDATE task_queue SET approval_status = 'PENDING' WHERE task_id = ?")
-                        .bind(&task_id)
-                        .execute(&self.db)
-                        .await
-                        .map_err(|e| Status::internal(e.to_string()))?;
-                }
+        self.metrics.executions_started.fetch_add(started, Ordering::Relaxed);
+        self.task_notify.notify_waiters();
+        tracing::info!(
+            count = started,
+            deduplicated = execution_ids.len() as u64 - started,
+            workflow_id = %req.workflow_id,
+            version_hash = %req.version_hash.chars().take(12).collect::<String>(),
+            "Executions started (batch)"
+        );
 
-                if let Some(ir) = ir {
-                    if let Some(deps) = ir
-                        .get("nodes")
-                        .and_then(|n| n.get(&ir_lookup_node_id))
-                        .and_then(|n| n.get("dependencies"))
-                        .and_then(|d| d.as_array())
-                    {
-                        for dep in deps {
-                            if let Some(dep_id) = dep.as_str() {
-                                if let Some(payload) = self.find_node_completed_event(&execution_id, dep_id).await? {
-                                    if let Ok(payload_val) = serde_json::from_str::<Value>(&payload) {
-                                        if let Some(output) = payload_val.get("output") {
-                                            // Resolve claim check if needed
-                                            let resolved = if let Some(output_str) = output.as_str() {
-                                                if let Ok(resolved_str) = self.resolve_payload(output_str).await {
-                                                    serde_json::from_str::<Value>(&resolved_str).unwrap_or(output.clone())
-                                                } else {
-                                                    output.clone()
-                                                }
-                                            } else if output.get("__nexum_claim_check__").and_then(|v| v.as_bool()).unwrap_or(false) {
-                                                let output_str = serde_json::to_string(output).unwrap_or_default();
-                                                if let Ok(resolved_str) = self.resolve_payload(&output_str).await {
-                                                    serde_json::from_str::<Value>(&resolved_str).unwrap_or(output.clone())
-                                                } else {
-                                                    output.clone()
-                                                }
-                                            } else {
-                                                output.clone()
-                                            };
-                                            deps_output.insert(dep_id.to_string(), resolved);
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                    }
-                }
+        Ok(Response::new(StartExecutionsResponse { execution_ids }))
+    }
 
-                let input_val = serde_json::json!({
-                    "input": exec_input.and_then(|s| serde_json::from_str::<Value>(&s).ok()).unwrap_or(Value::Null),
-                    "deps": deps_output,
-                });
+    async fn poll_task(
+        &self,
+        request: Request<PollRequest>,
+    ) -> Result<Response<PollResponse>, Status> {
+        let req = request.into_inner();
 
-                tracing::info!(
-                    task_id = task_id,
-                    node_id = node_id,
-                    worker = req.worker_id,
-                    "Task polled"
-                );
+        let mut version_hashes = req.version_hashes;
+        if !req.version_hash.is_empty() && !version_hashes.contains(&req.version_hash) {
+            version_hashes.push(req.version_hash);
+        }
 
-                Ok(Response::new(PollResponse {
-                    has_task: true,
-                    task_id,
-                    execution_id,
-                    node_id: response_node_id,
-                    input_json: serde_json::to_string(&input_val).unwrap_or_default(),
-                    idempotency_key: idempotency_key.unwrap_or_default(),
-                    node_type,
-                    map_item_json: map_item_json.unwrap_or_default(),
-                    is_map_subtask,
-                    map_index: map_index.unwrap_or(0),
-                    map_total: map_total.unwrap_or(0),
-                    sub_execution_id: sub_execution_id.unwrap_or_default(),
-                    sub_workflow_id: sub_workflow_id.unwrap_or_default(),
-                    sub_input_json: sub_input_json.unwrap_or_default(),
-                }))
-            }
-            None => Ok(Response::new(PollResponse {
-                has_task: false,
-                task_id: String::new(),
-                execution_id: String::new(),
-                node_id: String::new(),
-                input_json: String::new(),
-                idempotency_key: String::new(),
-                node_type: String::new(),
-                map_item_json: String::new(),
-                is_map_subtask: false,
-                map_index: 0,
-                map_total: 0,
-                sub_execution_id: String::new(),
-                sub_workflow_id: String::new(),
-                sub_input_json: String::new(),
-            })),
+        let tasks = self
+            .lease_tasks_waiting(&req.worker_id, &version_hashes, 1, req.wait_timeout_ms, req.lazy_blobs)
+            .await?;
+        Ok(Response::new(tasks.into_iter().next().unwrap_or_else(empty_poll_response)))
+    }
+
+    async fn poll_tasks(
+        &self,
+        request: Request<PollTasksRequest>,
+    ) -> Result<Response<PollTasksResponse>, Status> {
+        let req = request.into_inner();
+        let max_tasks = req.max_tasks.clamp(1, MAX_POLL_BATCH) as i64;
+
+        let tasks = self
+            .lease_tasks_waiting(&req.worker_id, &req.version_hashes, max_tasks, req.wait_timeout_ms, req.lazy_blobs)
+            .await?;
+
+        if !tasks.is_empty() {
+            tracing::info!(count = tasks.len(), worker = req.worker_id, "Tasks polled (batch)");
         }
+
+        Ok(Response::new(PollTasksResponse { tasks }))
     }
 
     async fn complete_task(
         &self,
         request: Request<CompleteRequest>,
     ) -> Result<Response<AckResponse>, Status> {
-        let req = request.into_inner();
+        let mut req = request.into_inner();
+
+        // A JSON Payload is handled exactly like output_json; any other content type is stored opaquely.
+        let opaque_output = match req.output.take() {
+            Some(payload) if payload.content_type.is_empty() || payload.content_type == JSON_CONTENT_TYPE => {
+                req.output_json = String::from_utf8(payload.data)
+                    .map_err(|_| Status::invalid_argument("JSON payload is not valid UTF-8"))?;
+                None
+            }
+            other => other,
+        };
 
         // Get task info
         let task: (String, String, String, Option<String>, Option<i32>, Option<i32>, Option<String>, Option<String>) = sqlx::query_as(
@@ -1230,6 +2316,55 @@ impl NexumService for NexumServer {
         let (execution_id, node_id, version_hash, db_node_type, map_index, map_total, map_parent_node_id, sub_execution_id) = task;
         let db_node_type_str = db_node_type.unwrap_or_default();
 
+        // Get workflow_id for this execution
+        let exec_row: (String,) = sqlx::query_as(
+            "SELECT workflow_id FROM workflow_executions WHERE execution_id = ?"
+        )
+        .bind(&execution_id)
+        .fetch_one(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        let workflow_id = exec_row.0;
+
+        // MAP, SUBWORKFLOW and ROUTER outputs drive scheduling, so the server must be able to read them.
+        if matches!(db_node_type_str.as_str(), "MAP" | "MAP_SUBTASK" | "SUBWORKFLOW" | "ROUTER") {
+            if let Some(payload) = &opaque_output {
+                return Err(Status::invalid_argument(format!(
+                    "{} node '{}' output must be JSON, got {}", db_node_type_str, node_id, payload.content_type
+                )));
+            }
+            if !req.output_blob_id.is_empty() {
+                return Err(Status::invalid_argument(format!(
+                    "{} node '{}' output must be sent inline, not uploaded", db_node_type_str, node_id
+                )));
+            }
+        }
+
+        // A batched MAP sub-task returns one result per item, in item order.
+        let mut batch_results: Option<Vec<Value>> = None;
+        if db_node_type_str == "MAP_SUBTASK" {
+            let parent = map_parent_node_id.as_deref().unwrap_or_default();
+            if self.map_setting(&workflow_id, &version_hash, parent, "batch_size").await.is_some() {
+                let batch: (Option<String>,) = sqlx::query_as("SELECT map_item_json FROM task_queue WHERE task_id = ?")
+                    .bind(&req.task_id)
+                    .fetch_one(&self.db)
+                    .await
+                    .map_err(|e| Status::internal(e.to_string()))?;
+                let expected = serde_json::from_str::<Vec<Value>>(batch.0.as_deref().unwrap_or("[]"))
+                    .map(|items| items.len())
+                    .unwrap_or(0);
+                let results: Vec<Value> = serde_json::from_str(&req.output_json).map_err(|e| {
+                    Status::invalid_argument(format!("Batched MAP node '{}' output must be a JSON array: {}", parent, e))
+                })?;
+                if results.len() != expected {
+                    return Err(Status::invalid_argument(format!(
+                        "Batched MAP node '{}' returned {} results for {} items", parent, results.len(), expected
+                    )));
+                }
+                batch_results = Some(results);
+            }
+        }
+
         tracing::info!(
             execution_id = %execution_id,
             node_id = %node_id,
@@ -1306,56 +2441,30 @@ impl NexumService for NexumServer {
 
         self.metrics.tasks_completed.fetch_add(1, Ordering::Relaxed);
 
-        // Get workflow_id for this execution
-        let exec_row: (String,) = sqlx::query_as(
-            "SELECT workflow_id FROM workflow_executions WHERE execution_id = ?"
-        )
-        .bind(&execution_id)
-        .fetch_one(&self.db)
-        .await
-        .map_err(|e| Status::internal(e.to_string()))?;
-        let workflow_id = exec_row.0;
-
         // --- MAP coordinator (phase 1): fan-out sub-tasks ---
+        // The output is the last page of items (all of them unless the worker streamed earlier
+        // pages with AppendMapItems); completing the coordinator closes the item list.
         if db_node_type_str == "MAP" {
             let items: Vec<serde_json::Value> = serde_json::from_str(&req.output_json)
                 .map_err(|e| Status::internal(format!("MAP items not a JSON array: {}", e)))?;
-            let total = items.len() as i32;
+            let total = self
+                .enqueue_map_items(&execution_id, &workflow_id, &version_hash, &node_id, &items, None, true)
+                .await?;
 
             tracing::info!(
                 execution_id = %execution_id,
                 node_id = %node_id,
                 total = total,
-                "MAP coordinator complete, fanning out sub-tasks"
-            );
-
-            let now = self.now_sql();
-            let map_insert_sql = format!(
-                "INSERT INTO task_queue (task_id, execution_id, node_id, version_hash, idempotency_key, status, node_type, map_item_json, map_index, map_total, map_parent_node_id, scheduled_at)
-                 VALUES (?, ?, ?, ?, ?, 'READY', 'MAP_SUBTASK', ?, ?, ?, ?, {})", now
+                "MAP coordinator complete, item list closed"
             );
 
-            for (index, item) in items.iter().enumerate() {
-                let sub_task_id = format!("task-{}", Uuid::new_v4());
-                let sub_node_id = format!("{}__{}", node_id, index);
-                let idempotency_key = format!("{}:{}:{}", execution_id, sub_node_id, version_hash);
-
-                sqlx::query(&map_insert_sql)
-                .bind(&sub_task_id)
-                .bind(&execution_id)
-                .bind(&sub_node_id)
-                .bind(&version_hash)
-                .bind(&idempotency_key)
-                .bind(item.to_string())
-                .bind(index as i32)
-                .bind(total)
-                .bind(&node_id)
-                .execute(&self.db)
-                .await
-                .map_err(|e| Status::internal(e.to_string()))?;
+            // With no items, or streamed items that all finished before the list closed,
+            // no sub-task completion is left to finish the node.
+            if self.count_map_results(&execution_id, &node_id).await? == total {
+                self.finish_map_node(&execution_id, &workflow_id, &version_hash, &node_id, total).await?;
             }
 
-            // Don't insert NodeCompleted yet — wait for all sub-tasks
+            // Otherwise NodeCompleted waits for the last sub-task
             return Ok(Response::new(AckResponse { ok: true, compatibility: String::new(), message: String::new() }));
         }
 
@@ -1363,92 +2472,92 @@ impl NexumService for NexumServer {
         if db_node_type_str == "MAP_SUBTASK" {
             let parent_node_id = map_parent_node_id.unwrap_or_default();
             let idx = map_index.unwrap_or(0);
-            let total = map_total.unwrap_or(0);
 
-            // Store individual result (upsert)
-            let upsert_sql = if self.is_postgres {
-                "INSERT INTO map_results (execution_id, map_node_id, item_index, result_json)
-                 VALUES (?, ?, ?, ?)
-                 ON CONFLICT (execution_id, map_node_id, item_index) DO UPDATE SET result_json = EXCLUDED.result_json"
-            } else {
-                "INSERT OR REPLACE INTO map_results (execution_id, map_node_id, item_index, result_json)
-                 VALUES (?, ?, ?, ?)"
+            // Store individual results (upsert), one row per item
+            let results: Vec<(i32, String)> = match batch_results {
+                Some(values) => values.iter().enumerate().map(|(i, v)| (idx + i as i32, v.to_string())).collect(),
+                None => vec![(idx, req.output_json.clone())],
+            };
+            // 4 binds per row keeps each statement under SQLite's 999-parameter limit
+            for rows in results.chunks(200) {
+                let values = vec!["(?, ?, ?, ?)"; rows.len()].join(", ");
+                let upsert_sql = if self.is_postgres {
+                    format!(
+                        "INSERT INTO map_results (execution_id, map_node_id, item_index, result_json)
+                         VALUES {values}
+                         ON CONFLICT (execution_id, map_node_id, item_index) DO UPDATE SET result_json = EXCLUDED.result_json"
+                    )
+                } else {
+                    format!(
+                        "INSERT OR REPLACE INTO map_results (execution_id, map_node_id, item_index, result_json)
+                         VALUES {values}"
+                    )
+                };
+                let mut query = sqlx::query(&upsert_sql);
+                for (item_index, result_json) in rows {
+                    query = query.bind(&execution_id).bind(&parent_node_id).bind(*item_index).bind(result_json);
+                }
+                query
+                .execute(&self.db)
+                .await
+                .map_err(|e| Status::internal(e.to_string()))?;
+            }
+
+            // Read after the upsert: the coordinator seals and then counts, so either it sees this
+            // result or this sees the seal (and then both may finish; finish_map_node lets one through).
+            let total = match self.map_state(&execution_id, &parent_node_id).await? {
+                Some((item_count, true)) => Some(item_count),
+                // The coordinator is still streaming items; it finishes the node if we were last.
+                Some((_, false)) => None,
+                // Fanned out before map_state existed
+                None => Some(map_total.unwrap_or(0) as i64),
             };
-            sqlx::query(upsert_sql)
-            .bind(&execution_id)
-            .bind(&parent_node_id)
-            .bind(idx)
-            .bind(&req.output_json)
-            .execute(&self.db)
-            .await
-            .map_err(|e| Status::internal(e.to_string()))?;
 
             // Check if all sub-tasks done
-            let completed_count: (i64,) = sqlx::query_as(
-                "SELECT COUNT(*) FROM map_results WHERE execution_id = ? AND map_node_id = ?"
-            )
-            .bind(&execution_id)
-            .bind(&parent_node_id)
-            .fetch_one(&self.db)
-            .await
-            .map_err(|e| Status::internal(e.to_string()))?;
+            let completed_count = self.count_map_results(&execution_id, &parent_node_id).await?;
 
             tracing::info!(
                 execution_id = %execution_id,
                 map_node_id = %parent_node_id,
-                completed = completed_count.0,
-                total = total,
+                completed = completed_count,
+                total = ?total,
                 "MAP sub-task completed"
             );
 
-            if completed_count.0 == total as i64 {
-                // All sub-tasks done! Gather results and emit NodeCompleted for the MAP node
-                let result_rows: Vec<(String,)> = sqlx::query_as(
-                    "SELECT result_json FROM map_results WHERE execution_id = ? AND map_node_id = ? ORDER BY item_index"
+            if let Some(total) = total.filter(|t| *t == completed_count) {
+                self.finish_map_node(&execution_id, &workflow_id, &version_hash, &parent_node_id, total).await?;
+            } else if let Some(limit) = self.map_setting(&workflow_id, &version_hash, &parent_node_id, "max_parallel").await {
+                // Top the MAP node back up to max_parallel sub-tasks in flight. Counting rather than
+                // promoting exactly one keeps concurrent completions from losing a slot.
+                let in_flight: (i64,) = sqlx::query_as(
+                    "SELECT COUNT(*) FROM task_queue
+                     WHERE execution_id = ? AND map_parent_node_id = ? AND status IN ('READY', 'RUNNING')"
                 )
                 .bind(&execution_id)
                 .bind(&parent_node_id)
-                .fetch_all(&self.db)
-                .await
-                .map_err(|e| Status::internal(e.to_string()))?;
-
-                let results_array: Vec<serde_json::Value> = result_rows
-                    .iter()
-                    .map(|(rj,)| serde_json::from_str(rj).unwrap_or(Value::Null))
-                    .collect();
-
-                let output_json = serde_json::to_string(&results_array).unwrap_or_default();
-                let stored_output = self.store_payload(&execution_id, &parent_node_id, &output_json).await?;
-                let output: Value = serde_json::from_str(&stored_output).unwrap_or(Value::Null);
-
-                let event_id = format!("evt-{}", Uuid::new_v4());
-                let seq_id = self.get_next_sequence_id(&execution_id).await?;
-                let payload = serde_json::json!({
-                    "node_id": parent_node_id,
-                    "output": output,
-                });
-
-                sqlx::query(
-                    "INSERT INTO events (event_id, execution_id, sequence_id, event_type, payload)
-                     VALUES (?, ?, ?, 'NodeCompleted', ?)"
-                )
-                .bind(&event_id)
-                .bind(&execution_id)
-                .bind(seq_id)
-                .bind(serde_json::to_string(&payload).unwrap_or_default())
-                .execute(&self.db)
+                .fetch_one(&self.db)
                 .await
                 .map_err(|e| Status::internal(e.to_string()))?;
 
-                tracing::info!(
-                    execution_id = %execution_id,
-                    node_id = %parent_node_id,
-                    total = total,
-                    "All MAP sub-tasks complete, scheduling downstream"
-                );
-
-                self.schedule_ready_nodes(&execution_id, &workflow_id, &version_hash).await?;
-                self.check_execution_complete(&execution_id, &workflow_id, &version_hash).await?;
+                let free = limit - in_flight.0;
+                if free > 0 {
+                    let promoted = sqlx::query(
+                        "UPDATE task_queue SET status = 'READY' WHERE task_id IN (
+                             SELECT task_id FROM task_queue
+                             WHERE execution_id = ? AND map_parent_node_id = ? AND status = 'WAITING'
+                             ORDER BY map_index LIMIT ?
+                         )"
+                    )
+                    .bind(&execution_id)
+                    .bind(&parent_node_id)
+                    .bind(free)
+                    .execute(&self.db)
+                    .await
+                    .map_err(|e| Status::internal(e.to_string()))?;
+                    if promoted.rows_affected() > 0 {
+                        self.task_notify.notify_waiters();
+                    }
+                }
             }
 
             return Ok(Response::new(AckResponse { ok: true, compatibility: String::new(), message: String::new() }));
@@ -1456,9 +2565,15 @@ impl NexumService for NexumServer {
 
         // --- Normal task completion (COMPUTE/EFFECT/REDUCE/ROUTER) ---
 
-        // Store payload with claim check for large outputs
-        let stored_output = self.store_payload(&execution_id, &node_id, &req.output_json).await?;
-        let output: Value = serde_json::from_str(&stored_output).unwrap_or(Value::Null);
+        // Store payload with claim check for large outputs; opaque payloads go to node_payloads
+        let output: Value = if let Some(payload) = &opaque_output {
+            self.store_opaque_payload(&execution_id, &node_id, payload).await?
+        } else if !req.output_blob_id.is_empty() {
+            uploaded_blob_pointer(&req.output_blob_id).await?
+        } else {
+            let stored_output = self.store_payload(&execution_id, &node_id, &req.output_json).await?;
+            serde_json::from_str(&stored_output).unwrap_or(Value::Null)
+        };
 
         // Insert NodeCompleted event
         let event_id = format!("evt-{}", Uuid::new_v4());
@@ -1524,6 +2639,7 @@ impl NexumService for NexumServer {
                 .await
                 .map_err(|e| Status::internal(e.to_string()))?;
 
+                self.task_notify.notify_waiters();
                 tracing::info!(router = %node_id, routed_to = routed_to, "Router decision");
             }
         } else {
@@ -1640,6 +2756,7 @@ impl NexumService for NexumServer {
 
             self.metrics.tasks_failed.fetch_add(1, Ordering::Relaxed);
             self.metrics.executions_failed.fetch_add(1, Ordering::Relaxed);
+            self.publish_execution_update(&execution_id);
             tracing::error!(
                 task_id = %req.task_id,
                 node_id = %node_id,
@@ -1651,128 +2768,489 @@ impl NexumService for NexumServer {
         Ok(Response::new(AckResponse { ok: true, compatibility: String::new(), message: String::new() }))
     }
 
-    async fn get_status(
+    async fn complete_tasks(
         &self,
-        request: Request<StatusRequest>,
-    ) -> Result<Response<StatusResponse>, Status> {
+        request: Request<CompleteTasksRequest>,
+    ) -> Result<Response<BatchAckResponse>, Status> {
         let req = request.into_inner();
-
-        let exec: (String,) = sqlx::query_as(
-            "SELECT status FROM workflow_executions WHERE execution_id = ?"
-        )
-        .bind(&req.execution_id)
-        .fetch_one(&self.db)
-        .await
-        .map_err(|e| Status::not_found(format!("Execution not found: {}", e)))?;
-
-        let events: Vec<(String,)> = sqlx::query_as(
-            "SELECT payload FROM events WHERE execution_id = ? AND event_type = 'NodeCompleted' ORDER BY sequence_id"
-        )
-        .bind(&req.execution_id)
-        .fetch_all(&self.db)
-        .await
-        .map_err(|e| Status::internal(e.to_string()))?;
-
-        let mut completed_nodes: HashMap<String, Value> = HashMap::new();
-        for (payload_str,) in events {
-            if let Ok(payload) = serde_json::from_str::<Value>(&payload_str) {
-                if let (Some(node_id), Some(output)) =
-                    (payload.get("node_id").and_then(|n| n.as_str()), payload.get("output"))
-                {
-                    completed_nodes.insert(node_id.to_string(), output.clone());
-                }
-            }
+        let mut acks = Vec::with_capacity(req.items.len());
+
+        // Each item is applied independently so one bad task id cannot lose the rest.
+        for item in req.items {
+            let task_id = item.task_id.clone();
+            acks.push(match self.complete_task(Request::new(item)).await {
+                Ok(_) => TaskAck { task_id, ok: true, message: String::new() },
+                Err(status) => TaskAck { task_id, ok: false, message: status.message().to_string() },
+            });
         }
 
-        Ok(Response::new(StatusResponse {
-            status: exec.0,
-            completed_nodes_json: serde_json::to_string(&completed_nodes).unwrap_or_default(),
-        }))
+        Ok(Response::new(BatchAckResponse { acks }))
     }
 
-    async fn list_executions(
+    async fn fail_tasks(
         &self,
-        request: Request<ListRequest>,
-    ) -> Result<Response<ListResponse>, Status> {
+        request: Request<FailTasksRequest>,
+    ) -> Result<Response<BatchAckResponse>, Status> {
         let req = request.into_inner();
-        let limit = if req.limit > 0 { req.limit } else { 20 };
+        let mut acks = Vec::with_capacity(req.items.len());
 
-        let executions: Vec<(String, String, String, String, String)> = if !req.workflow_id.is_empty() && !req.status.is_empty() {
-            sqlx::query_as(
-                "SELECT execution_id, workflow_id, version_hash, status, created_at
-                 FROM workflow_executions WHERE workflow_id = ? AND status = ?
-                 ORDER BY created_at DESC LIMIT ?"
-            ).bind(&req.workflow_id).bind(&req.status).bind(limit)
-            .fetch_all(&self.db)
-            .await
-            .map_err(|e| Status::internal(e.to_string()))?
-        } else if !req.workflow_id.is_empty() {
-            sqlx::query_as(
-                "SELECT execution_id, workflow_id, version_hash, status, created_at
-                 FROM workflow_executions WHERE workflow_id = ?
-                 ORDER BY created_at DESC LIMIT ?"
-            ).bind(&req.workflow_id).bind(limit)
-            .fetch_all(&self.db)
-            .await
-            .map_err(|e| Status::internal(e.to_string()))?
-        } else if !req.status.is_empty() {
-            sqlx::query_as(
-                "SELECT execution_id, workflow_id, version_hash, status, created_at
-                 FROM workflow_executions WHERE status = ?
-                 ORDER BY created_at DESC LIMIT ?"
-            ).bind(&req.status).bind(limit)
-            .fetch_all(&self.db)
-            .await
-            .map_err(|e| Status::internal(e.to_string()))?
-        } else {
-            sqlx::query_as(
-                "SELECT execution_id, workflow_id, version_hash, status, created_at
-                 FROM workflow_executions ORDER BY created_at DESC LIMIT ?"
-            ).bind(limit)
-            .fetch_all(&self.db)
-            .await
-            .map_err(|e| Status::internal(e.to_string()))?
-        };
+        for item in req.items {
+            let task_id = item.task_id.clone();
+            acks.push(match self.fail_task(Request::new(item)).await {
+                Ok(_) => TaskAck { task_id, ok: true, message: String::new() },
+                Err(status) => TaskAck { task_id, ok: false, message: status.message().to_string() },
+            });
+        }
 
-        Ok(Response::new(ListResponse {
-            executions: executions.into_iter().map(|(execution_id, workflow_id, version_hash, status, created_at)| {
-                ExecutionSummary { execution_id, workflow_id, version_hash, status, created_at }
-            }).collect(),
-        }))
+        Ok(Response::new(BatchAckResponse { acks }))
     }
 
-    async fn cancel_execution(
+    async fn heartbeat(
         &self,
-        request: Request<CancelRequest>,
-    ) -> Result<Response<AckResponse>, Status> {
+        request: Request<HeartbeatRequest>,
+    ) -> Result<Response<HeartbeatResponse>, Status> {
         let req = request.into_inner();
-
-        // Cancel all READY and RUNNING tasks
-        sqlx::query(
-            "UPDATE task_queue SET status = 'CANCELLED'
-             WHERE execution_id = ? AND status IN ('READY', 'RUNNING')"
-        )
-        .bind(&req.execution_id)
+        let progress = Some(req.progress.as_str()).filter(|p| !p.is_empty());
+
+        // A task whose execution has ended (failed, cancelled) is not renewed, so its worker stops.
+        let result = sqlx::query(&format!(
+            "UPDATE task_queue SET lease_expires_at = {}, progress = COALESCE(?, progress)
+             WHERE task_id = ? AND locked_by = ? AND status = 'RUNNING'
+             AND execution_id IN (SELECT execution_id FROM workflow_executions WHERE status = 'RUNNING')",
+            self.lease_renewal_sql()
+        ))
+        .bind(progress)
+        .bind(&req.task_id)
+        .bind(&req.worker_id)
         .execute(&self.db)
         .await
         .map_err(|e| Status::internal(e.to_string()))?;
 
-        // Mark execution as CANCELLED
-        sqlx::query(
-            "UPDATE workflow_executions SET status = 'CANCELLED' WHERE execution_id = ?"
-        )
-        .bind(&req.execution_id)
-        .execute(&self.db)
-        .await
-        .map_err(|e| Status::internal(e.to_string()))?;
+        let ok = result.rows_affected() == 1;
+        if !ok {
+            tracing::warn!(task_id = %req.task_id, worker = %req.worker_id, "Heartbeat for a task no longer leased to this worker or whose execution ended");
+        }
+        Ok(Response::new(HeartbeatResponse { ok }))
+    }
 
-        // Insert cancellation event
-        let event_id = format!("evt-{}", Uuid::new_v4());
-        let seq_id = self.get_next_sequence_id(&req.execution_id).await?;
-        sqlx::query(
-            "INSERT INTO events (event_id, execution_id, sequence_id, event_type, payload)
-             VALUES (?, ?, ?, 'ExecutionCancelled', '{}')"
-        )
+    async fn release_tasks(
+        &self,
+        request: Request<ReleaseTasksRequest>,
+    ) -> Result<Response<ReleaseTasksResponse>, Status> {
+        let req = request.into_inner();
+        let released = self.release_leases(&req.worker_id, &req.task_ids).await?;
+        Ok(Response::new(ReleaseTasksResponse { released: released as i32 }))
+    }
+
+    async fn fetch_blob(
+        &self,
+        request: Request<FetchBlobRequest>,
+    ) -> Result<Response<FetchBlobResponse>, Status> {
+        let req = request.into_inner();
+        let (data, total_size) = read_blob_range(&req.blob_id, req.offset, req.length).await?;
+        Ok(Response::new(FetchBlobResponse { data, total_size }))
+    }
+
+    /// Write a client stream of chunks to a new blob. The file only appears under its
+    /// final name once the stream has ended cleanly, so a broken upload is never referenced.
+    /// That name is the SHA-256 of the bytes: the same payload uploaded twice is one blob, and
+    /// its claim checks carry the digest that result caches key on.
+    async fn upload_payload(
+        &self,
+        request: Request<tonic::Streaming<PayloadChunk>>,
+    ) -> Result<Response<UploadPayloadResponse>, Status> {
+        use tokio::io::AsyncWriteExt;
+
+        let mut chunks = request.into_inner();
+        let dir = blob_dir();
+        tokio::fs::create_dir_all(&dir).await.map_err(|e| Status::internal(e.to_string()))?;
+        let part_path = dir.join(format!("upload-{}.part", Uuid::new_v4()));
+        let mut file = tokio::fs::File::create(&part_path).await
+            .map_err(|e| Status::internal(format!("Failed to create blob: {}", e)))?;
+
+        let mut size: u64 = 0;
+        let mut hasher = Sha256::new();
+        let written: Result<(), Status> = async {
+            while let Some(chunk) = chunks.message().await? {
+                file.write_all(&chunk.data).await
+                    .map_err(|e| Status::internal(format!("Failed to write blob: {}", e)))?;
+                hasher.update(&chunk.data);
+                size += chunk.data.len() as u64;
+            }
+            file.flush().await.map_err(|e| Status::internal(format!("Failed to write blob: {}", e)))
+        }
+        .await;
+        drop(file);
+        if let Err(status) = written {
+            let _ = tokio::fs::remove_file(&part_path).await;
+            return Err(status);
+        }
+
+        let blob_id = format!("upload-{}", hex::encode(hasher.finalize()));
+        tokio::fs::rename(&part_path, blob_path(&blob_id)?).await
+            .map_err(|e| Status::internal(format!("Failed to store blob: {}", e)))?;
+        tracing::info!(blob_id = %blob_id, size, "Payload uploaded");
+        Ok(Response::new(UploadPayloadResponse { blob_id, size }))
+    }
+
+    type DownloadPayloadStream = ReceiverStream<Result<PayloadChunk, Status>>;
+
+    async fn download_payload(
+        &self,
+        request: Request<DownloadPayloadRequest>,
+    ) -> Result<Response<Self::DownloadPayloadStream>, Status> {
+        use tokio::io::AsyncReadExt;
+
+        let blob_id = request.into_inner().blob_id;
+        let mut file = tokio::fs::File::open(blob_path(&blob_id)?).await
+            .map_err(|_| Status::not_found(format!("Blob {} not found", blob_id)))?;
+
+        // A small channel keeps at most a few chunks in memory however large the blob is.
+        let (tx, rx) = mpsc::channel(4);
+        tokio::spawn(async move {
+            loop {
+                let mut data = vec![0u8; PAYLOAD_CHUNK_BYTES];
+                match file.read(&mut data).await {
+                    Ok(0) => return,
+                    Ok(n) => {
+                        data.truncate(n);
+                        if tx.send(Ok(PayloadChunk { data })).await.is_err() {
+                            return;
+                        }
+                    }
+                    Err(e) => {
+                        let _ = tx.send(Err(Status::internal(format!("Failed to read blob: {}", e)))).await;
+                        return;
+                    }
+                }
+            }
+        });
+        Ok(Response::new(ReceiverStream::new(rx)))
+    }
+
+    /// Fan out a page of items from a MAP coordinator that is still enumerating them.
+    async fn append_map_items(
+        &self,
+        request: Request<AppendMapItemsRequest>,
+    ) -> Result<Response<AppendMapItemsResponse>, Status> {
+        let req = request.into_inner();
+        let task: Option<(String, String, String, Option<String>, String, Option<String>)> = sqlx::query_as(
+            "SELECT execution_id, node_id, version_hash, node_type, status, locked_by FROM task_queue WHERE task_id = ?"
+        )
+        .bind(&req.task_id)
+        .fetch_optional(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        let (execution_id, node_id, version_hash, node_type, status, locked_by) =
+            task.ok_or_else(|| Status::not_found(format!("Task not found: {}", req.task_id)))?;
+        if node_type.as_deref() != Some("MAP") {
+            return Err(Status::invalid_argument(format!("Task {} is not a MAP coordinator", req.task_id)));
+        }
+        if status != "RUNNING" {
+            return Err(Status::failed_precondition(format!("Task {} is {}, not RUNNING", req.task_id, status)));
+        }
+        // A coordinator whose lease expired must not keep feeding the list its replacement now owns
+        if locked_by.as_deref() != Some(req.worker_id.as_str()) {
+            return Err(Status::failed_precondition(format!(
+                "Task {} is not leased to worker {}", req.task_id, req.worker_id
+            )));
+        }
+
+        let items: Vec<Value> = if req.items_json.is_empty() {
+            Vec::new()
+        } else {
+            serde_json::from_str(&req.items_json)
+                .map_err(|e| Status::invalid_argument(format!("MAP items not a JSON array: {}", e)))?
+        };
+        let workflow_id: (String,) = sqlx::query_as("SELECT workflow_id FROM workflow_executions WHERE execution_id = ?")
+            .bind(&execution_id)
+            .fetch_one(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?;
+
+        let item_count = self
+            .enqueue_map_items(&execution_id, &workflow_id.0, &version_hash, &node_id, &items, Some(req.offset), false)
+            .await?;
+        let completed = self.count_map_results(&execution_id, &node_id).await?;
+
+        tracing::info!(
+            execution_id = %execution_id,
+            node_id = %node_id,
+            item_count = item_count,
+            completed = completed,
+            "MAP items appended"
+        );
+
+        Ok(Response::new(AppendMapItemsResponse {
+            item_count: item_count as u64,
+            pending: (item_count - completed).max(0) as u64,
+        }))
+    }
+
+    /// Next chunk of a MAP node's results, in item order, for a REDUCE that folds them as they arrive.
+    ///
+    /// A non-empty `partial_json` is the REDUCE's accumulator over every item before `from_index`;
+    /// it is checkpointed on the task (handed back on re-lease) and shown by GetStatus. Checkpoints
+    /// are not published to WatchExecution, which only wakes on node state changes. Reads are
+    /// refused with FAILED_PRECONDITION unless the task is leased to `worker_id` and its
+    /// execution is still running.
+    async fn read_map_results(
+        &self,
+        request: Request<ReadMapResultsRequest>,
+    ) -> Result<Response<ReadMapResultsResponse>, Status> {
+        let req = request.into_inner();
+        let task: Option<(String, String, String, String, Option<String>)> = sqlx::query_as(
+            "SELECT execution_id, node_id, version_hash, status, locked_by FROM task_queue WHERE task_id = ?"
+        )
+        .bind(&req.task_id)
+        .fetch_optional(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        let (execution_id, node_id, version_hash, status, locked_by) =
+            task.ok_or_else(|| Status::not_found(format!("Task not found: {}", req.task_id)))?;
+        if status != "RUNNING" {
+            return Err(Status::failed_precondition(format!("Task {} is {}, not RUNNING", req.task_id, status)));
+        }
+        if locked_by.as_deref() != Some(req.worker_id.as_str()) {
+            return Err(Status::failed_precondition(format!(
+                "Task {} is not leased to worker {}", req.task_id, req.worker_id
+            )));
+        }
+        let (workflow_id, execution_status): (String, String) =
+            sqlx::query_as("SELECT workflow_id, status FROM workflow_executions WHERE execution_id = ?")
+                .bind(&execution_id)
+                .fetch_one(&self.db)
+                .await
+                .map_err(|e| Status::internal(e.to_string()))?;
+        // A failed MAP item fails the execution but leaves this task RUNNING; the results it is
+        // waiting for will never all arrive, so tell the folder to stop.
+        if is_terminal_status(&execution_status) {
+            return Err(Status::failed_precondition(format!(
+                "Execution {} is {}", execution_id, execution_status
+            )));
+        }
+        let map_node_id = {
+            let registry = self.registry.read().await;
+            registry
+                .get(&format!("{}:{}", workflow_id, version_hash))
+                .and_then(|ir| ir.get("nodes"))
+                .and_then(|n| n.get(&node_id))
+                .filter(|n| n.get("fold").and_then(|f| f.as_bool()).unwrap_or(false))
+                .and_then(|n| n.get("mapNodeId"))
+                .and_then(|m| m.as_str())
+                .map(String::from)
+        }
+        .ok_or_else(|| Status::invalid_argument(format!("Task {} is not a folding REDUCE", req.task_id)))?;
+
+        if !req.partial_json.is_empty() {
+            let partial: Value = serde_json::from_str(&req.partial_json)
+                .map_err(|e| Status::invalid_argument(format!("partial_json is not JSON: {}", e)))?;
+            let checkpoint = serde_json::json!({ "next_index": req.from_index, "acc": partial });
+            // Guarded like Heartbeat, so a folder whose lease was reclaimed since the check above
+            // cannot overwrite its replacement's checkpoint
+            let updated = sqlx::query(
+                "UPDATE task_queue SET checkpoint_json = ?
+                 WHERE task_id = ? AND locked_by = ? AND status = 'RUNNING'"
+            )
+            .bind(checkpoint.to_string())
+            .bind(&req.task_id)
+            .bind(&req.worker_id)
+            .execute(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+            .rows_affected();
+            if updated == 0 {
+                return Err(Status::failed_precondition(format!(
+                    "Task {} is no longer leased to worker {}", req.task_id, req.worker_id
+                )));
+            }
+        }
+
+        let limit = match req.limit {
+            0 => DEFAULT_MAP_READ_LIMIT,
+            n => n.min(MAX_MAP_READ_LIMIT),
+        };
+        let rows: Vec<(i32, String)> = sqlx::query_as(
+            "SELECT item_index, result_json FROM map_results
+             WHERE execution_id = ? AND map_node_id = ? AND item_index >= ?
+             ORDER BY item_index LIMIT ?"
+        )
+        .bind(&execution_id)
+        .bind(&map_node_id)
+        .bind(req.from_index as i64)
+        .bind(limit as i64)
+        .fetch_all(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+
+        // Stop at the first item still running, so the caller folds in item order
+        let mut results_json = Vec::with_capacity(rows.len());
+        for (index, result_json) in rows {
+            if index as u64 != req.from_index + results_json.len() as u64 {
+                break;
+            }
+            results_json.push(result_json);
+        }
+
+        let (item_count, sealed) = match self.map_state(&execution_id, &map_node_id).await? {
+            Some(state) => state,
+            None => (0, self.find_node_completed_event(&execution_id, &map_node_id).await?.is_some()),
+        };
+        let done = sealed && req.from_index + results_json.len() as u64 >= item_count as u64;
+
+        Ok(Response::new(ReadMapResultsResponse {
+            results_json,
+            item_count: item_count as u64,
+            done,
+        }))
+    }
+
+    async fn get_status(
+        &self,
+        request: Request<StatusRequest>,
+    ) -> Result<Response<StatusResponse>, Status> {
+        let req = request.into_inner();
+        Ok(Response::new(load_status(&self.db, &req.execution_id).await?))
+    }
+
+    type WatchExecutionStream = ReceiverStream<Result<StatusResponse, Status>>;
+
+    async fn watch_execution(
+        &self,
+        request: Request<StatusRequest>,
+    ) -> Result<Response<Self::WatchExecutionStream>, Status> {
+        let execution_id = request.into_inner().execution_id;
+
+        // Subscribe before the first read so no update can slip in between.
+        let mut updates = self.execution_updates.subscribe();
+        let mut status = load_status(&self.db, &execution_id).await?;
+
+        let (tx, rx) = mpsc::channel(16);
+        let db = self.db.clone();
+        tokio::spawn(async move {
+            let mut last: Option<StatusResponse> = None;
+            loop {
+                if last.as_ref() != Some(&status) {
+                    let done = is_terminal_status(&status.status);
+                    if tx.send(Ok(status.clone())).await.is_err() || done {
+                        return;
+                    }
+                    last = Some(status);
+                }
+
+                // Wait for this execution to change. The periodic re-check covers
+                // updates made by other server instances sharing the database.
+                let recheck = tokio::time::sleep(tokio::time::Duration::from_millis(POLL_RECHECK_MS));
+                tokio::pin!(recheck);
+                loop {
+                    tokio::select! {
+                        update = updates.recv() => match update {
+                            Ok(id) if id != execution_id => continue,
+                            Ok(_) | Err(broadcast::error::RecvError::Lagged(_)) => break,
+                            Err(broadcast::error::RecvError::Closed) => return,
+                        },
+                        _ = &mut recheck => break,
+                        _ = tx.closed() => return,
+                    }
+                }
+
+                status = match load_status(&db, &execution_id).await {
+                    Ok(status) => status,
+                    Err(e) => {
+                        let _ = tx.send(Err(e)).await;
+                        return;
+                    }
+                };
+            }
+        });
+
+        Ok(Response::new(ReceiverStream::new(rx)))
+    }
+
+    async fn list_executions(
+        &self,
+        request: Request<ListRequest>,
+    ) -> Result<Response<ListResponse>, Status> {
+        let req = request.into_inner();
+        let limit = if req.limit > 0 { req.limit } else { 20 };
+
+        let executions: Vec<(String, String, String, String, String)> = if !req.workflow_id.is_empty() && !req.status.is_empty() {
+            sqlx::query_as(
+                "SELECT execution_id, workflow_id, version_hash, status, created_at
+                 FROM workflow_executions WHERE workflow_id = ? AND status = ?
+                 ORDER BY created_at DESC LIMIT ?"
+            ).bind(&req.workflow_id).bind(&req.status).bind(limit)
+            .fetch_all(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+        } else if !req.workflow_id.is_empty() {
+            sqlx::query_as(
+                "SELECT execution_id, workflow_id, version_hash, status, created_at
+                 FROM workflow_executions WHERE workflow_id = ?
+                 ORDER BY created_at DESC LIMIT ?"
+            ).bind(&req.workflow_id).bind(limit)
+            .fetch_all(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+        } else if !req.status.is_empty() {
+            sqlx::query_as(
+                "SELECT execution_id, workflow_id, version_hash, status, created_at
+                 FROM workflow_executions WHERE status = ?
+                 ORDER BY created_at DESC LIMIT ?"
+            ).bind(&req.status).bind(limit)
+            .fetch_all(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+        } else {
+            sqlx::query_as(
+                "SELECT execution_id, workflow_id, version_hash, status, created_at
+                 FROM workflow_executions ORDER BY created_at DESC LIMIT ?"
+            ).bind(limit)
+            .fetch_all(&self.db)
+            .await
+            .map_err(|e| Status::internal(e.to_string()))?
+        };
+
+        Ok(Response::new(ListResponse {
+            executions: executions.into_iter().map(|(execution_id, workflow_id, version_hash, status, created_at)| {
+                ExecutionSummary { execution_id, workflow_id, version_hash, status, created_at }
+            }).collect(),
+        }))
+    }
+
+    async fn cancel_execution(
+        &self,
+        request: Request<CancelRequest>,
+    ) -> Result<Response<AckResponse>, Status> {
+        let req = request.into_inner();
+
+        // Cancel all READY and RUNNING tasks
+        sqlx::query(
+            "UPDATE task_queue SET status = 'CANCELLED'
+             WHERE execution_id = ? AND status IN ('READY', 'WAITING', 'RUNNING')"
+        )
+        .bind(&req.execution_id)
+        .execute(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+
+        // Mark execution as CANCELLED
+        sqlx::query(
+            "UPDATE workflow_executions SET status = 'CANCELLED' WHERE execution_id = ?"
+        )
+        .bind(&req.execution_id)
+        .execute(&self.db)
+        .await
+        .map_err(|e| Status::internal(e.to_string()))?;
+        self.publish_execution_update(&req.execution_id);
+
+        // Insert cancellation event
+        let event_id = format!("evt-{}", Uuid::new_v4());
+        let seq_id = self.get_next_sequence_id(&req.execution_id).await?;
+        sqlx::query(
+            "INSERT INTO events (event_id, execution_id, sequence_id, event_type, payload)
+             VALUES (?, ?, ?, 'ExecutionCancelled', '{}')"
+        )
         .bind(&event_id)
         .bind(&req.execution_id)
         .bind(seq_id)
@@ -1961,6 +3439,7 @@ impl NexumService for NexumServer {
             .execute(&self.db)
             .await
             .map_err(|e| Status::internal(e.to_string()))?;
+        self.publish_execution_update(&req.execution_id);
 
         tracing::warn!(
             execution_id = %req.execution_id,
@@ -2052,41 +3531,19 @@ async fn main() -> Result<()> {
     let server = NexumServer::new().await?;
     let reclaim_db = server.db.clone();
     let reclaim_is_postgres = server.is_postgres;
+    let reclaim_notify = server.task_notify.clone();
 
-    // Background task: reclaim stale RUNNING tasks
+    // Background task: reclaim RUNNING tasks whose lease expired
     tokio::spawn(async move {
         loop {
-            tokio::time::sleep(tokio::time::Duration::from_secs(30)).await;
-            let reclaim_sql = if reclaim_is_postgres {
-                format!(
-                    "UPDATE task_queue SET status = 'READY', locked_by = NULL, locked_at = NULL,
-                     retry_count = retry_count + 1
-                     WHERE status = 'RUNNING'
-                     AND locked_at < NOW() - INTERVAL '{} seconds'
-                     AND (approval_status IS NULL OR approval_status != 'PENDING')
-                     AND (sub_execution_id IS NULL OR sub_execution_id = '')",
-                    TASK_TIMEOUT_SECS
-                )
-            } else {
-                format!(
-                    "UPDATE task_queue SET status = 'READY', locked_by = NULL, locked_at = NULL,
-                     retry_count = retry_count + 1
-                     WHERE status = 'RUNNING'
-                     AND locked_at < datetime('now', '-{} seconds')
-                     AND (approval_status IS NULL OR approval_status != 'PENDING')
-                     AND (sub_execution_id IS NULL OR sub_execution_id = '')",
-                    TASK_TIMEOUT_SECS
-                )
-            };
-            let result = sqlx::query(&reclaim_sql)
-                .execute(&reclaim_db)
-                .await;
-
-            match result {
-                Ok(r) if r.rows_affected() > 0 => {
-                    tracing::warn!(count = r.rows_affected(), "Reclaimed stale tasks");
+            tokio::time::sleep(tokio::time::Duration::from_secs(RECLAIM_INTERVAL_SECS)).await;
+            match reclaim_expired_tasks(&reclaim_db, reclaim_is_postgres).await {
+                Ok(count) if count > 0 => {
+                    tracing::warn!(count, "Reclaimed tasks with expired leases");
+                    reclaim_notify.notify_waiters();
                 }
-                _ => {}
+                Ok(_) => {}
+                Err(e) => tracing::error!("Reclaim failed: {}", e),
             }
         }
     });
@@ -2117,7 +3574,14 @@ async fn main() -> Result<()> {
     tracing::info!("Nexum server listening on {}", addr);
 
     Server::builder()
-        .add_service(NexumServiceServer::new(server))
+        .add_service(
+            // Clients opt in per channel; responses are compressed only for clients that accept it.
+            NexumServiceServer::new(server)
+                .accept_compressed(CompressionEncoding::Gzip)
+                .accept_compressed(CompressionEncoding::Zstd)
+                .send_compressed(CompressionEncoding::Gzip)
+                .send_compressed(CompressionEncoding::Zstd),
+        )
         .serve(addr)
         .await?;
 
@@ -2157,8 +3621,10 @@ mod tests {
                 input_json TEXT,
                 created_at TEXT DEFAULT (datetime('now')),
                 parent_execution_id TEXT,
-                parent_node_id TEXT
+                parent_node_id TEXT,
+                idempotency_key TEXT
             )",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_executions_idempotency ON workflow_executions(workflow_id, idempotency_key)",
             "CREATE TABLE IF NOT EXISTS events (
                 event_id TEXT PRIMARY KEY,
                 execution_id TEXT NOT NULL,
@@ -2190,7 +3656,11 @@ mod tests {
                 map_index INTEGER,
                 map_total INTEGER,
                 map_parent_node_id TEXT,
-                node_type TEXT
+                node_type TEXT,
+                lease_expires_at TEXT,
+                lease_seconds INTEGER,
+                progress TEXT,
+                checkpoint_json TEXT
             )",
             "CREATE TABLE IF NOT EXISTS workflow_versions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -2209,6 +3679,20 @@ mod tests {
                 result_json TEXT NOT NULL,
                 UNIQUE(execution_id, map_node_id, item_index)
             )",
+            "CREATE TABLE IF NOT EXISTS node_payloads (
+                execution_id TEXT NOT NULL,
+                node_id TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (execution_id, node_id)
+            )",
+            "CREATE TABLE IF NOT EXISTS map_state (
+                execution_id TEXT NOT NULL,
+                map_node_id TEXT NOT NULL,
+                item_count INTEGER NOT NULL DEFAULT 0,
+                sealed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (execution_id, map_node_id)
+            )",
         ] {
             sqlx::query(ddl).execute(&db).await.unwrap();
         }
@@ -2218,6 +3702,8 @@ mod tests {
             is_postgres: false,
             registry: Arc::new(RwLock::new(HashMap::new())),
             metrics: Metrics::new(),
+            task_notify: Arc::new(Notify::new()),
+            execution_updates: broadcast::channel(EXECUTION_UPDATES_CAPACITY).0,
         }
     }
 
@@ -2305,6 +3791,8 @@ mod tests {
                 workflow_id: "wf1".into(),
                 version_hash: "h1".into(),
                 input_json: r#"{"x":1}"#.into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
             }))
             .await
             .unwrap()
@@ -2352,6 +3840,8 @@ mod tests {
                 workflow_id: "wf1".into(),
                 version_hash: "h1".into(),
                 input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
             }))
             .await
             .unwrap()
@@ -2362,6 +3852,9 @@ mod tests {
             .poll_task(Request::new(PollRequest {
                 worker_id: "w1".into(),
                 version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
             }))
             .await
             .unwrap()
@@ -2386,6 +3879,9 @@ mod tests {
             .poll_task(Request::new(PollRequest {
                 worker_id: "w2".into(),
                 version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
             }))
             .await
             .unwrap()
@@ -2408,6 +3904,8 @@ mod tests {
                 workflow_id: "wf1".into(),
                 version_hash: "h1".into(),
                 input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
             }))
             .await
             .unwrap()
@@ -2418,6 +3916,9 @@ mod tests {
             .poll_task(Request::new(PollRequest {
                 worker_id: "w1".into(),
                 version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
             }))
             .await
             .unwrap()
@@ -2439,6 +3940,8 @@ mod tests {
         srv.complete_task(Request::new(CompleteRequest {
             task_id: poll.task_id.clone(),
             output_json: r#"{"result":"ok"}"#.into(),
+            output: None,
+            output_blob_id: String::new(),
         }))
         .await
         .unwrap();
@@ -2459,6 +3962,9 @@ mod tests {
             .poll_task(Request::new(PollRequest {
                 worker_id: "w1".into(),
                 version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
             }))
             .await
             .unwrap()
@@ -2469,6 +3975,8 @@ mod tests {
         srv.complete_task(Request::new(CompleteRequest {
             task_id: poll_b.task_id.clone(),
             output_json: r#"{"final":"done"}"#.into(),
+            output: None,
+            output_blob_id: String::new(),
         }))
         .await
         .unwrap();
@@ -2482,4 +3990,1466 @@ mod tests {
         .unwrap();
         assert_eq!(exec_status.0, "COMPLETED");
     }
+
+    // ---------------------------------------------------------------
+    // 5. PollTasks → leases up to max_tasks, never the same task twice
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_poll_tasks_leases_batch() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        for _ in 0..3 {
+            srv.start_execution(Request::new(StartRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap();
+        }
+
+        let poll = |max_tasks: i32| PollTasksRequest {
+            worker_id: "w1".into(),
+            version_hashes: vec!["h1".into()],
+            max_tasks,
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+
+        let batch1 = srv.poll_tasks(Request::new(poll(2))).await.unwrap().into_inner();
+        assert_eq!(batch1.tasks.len(), 2);
+        assert!(batch1.tasks.iter().all(|t| t.has_task && t.node_id == "A" && t.version_hash == "h1"));
+
+        let batch2 = srv.poll_tasks(Request::new(poll(2))).await.unwrap().into_inner();
+        assert_eq!(batch2.tasks.len(), 1);
+        assert!(batch1.tasks.iter().all(|t| t.task_id != batch2.tasks[0].task_id));
+
+        let batch3 = srv.poll_tasks(Request::new(poll(2))).await.unwrap().into_inner();
+        assert!(batch3.tasks.is_empty());
+
+        let running: (i64,) = sqlx::query_as("SELECT COUNT(*) FROM task_queue WHERE status = 'RUNNING'")
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(running.0, 3);
+    }
+
+    // ---------------------------------------------------------------
+    // 6. CompleteTasks → per-item acks, one bad item does not block others
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_complete_tasks_per_item_acks() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        for _ in 0..2 {
+            srv.start_execution(Request::new(StartRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap();
+        }
+
+        let leased = srv
+            .poll_tasks(Request::new(PollTasksRequest {
+                worker_id: "w1".into(),
+                version_hashes: vec!["h1".into()],
+                max_tasks: 2,
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
+            }))
+            .await
+            .unwrap()
+            .into_inner()
+            .tasks;
+        assert_eq!(leased.len(), 2);
+
+        let mut items: Vec<CompleteRequest> = leased
+            .iter()
+            .map(|t| CompleteRequest { task_id: t.task_id.clone(), output_json: r#"{"ok":true}"#.into(), output: None, output_blob_id: String::new() })
+            .collect();
+        items.insert(1, CompleteRequest { task_id: "task-missing".into(), output_json: "{}".into(), output: None, output_blob_id: String::new() });
+
+        let acks = srv
+            .complete_tasks(Request::new(CompleteTasksRequest { items }))
+            .await
+            .unwrap()
+            .into_inner()
+            .acks;
+
+        assert_eq!(acks.len(), 3);
+        assert!(acks[0].ok);
+        assert!(!acks[1].ok);
+        assert_eq!(acks[1].task_id, "task-missing");
+        assert!(acks[2].ok);
+
+        let done: (i64,) = sqlx::query_as("SELECT COUNT(*) FROM task_queue WHERE node_id = 'A' AND status = 'DONE'")
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(done.0, 2);
+    }
+
+    // ---------------------------------------------------------------
+    // 7. Long-poll: a waiting PollTask is woken as soon as a task is scheduled
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_long_poll_wakes_on_schedule() {
+        let srv = Arc::new(test_server().await);
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        // Nothing is READY: the call holds for the full wait and returns empty.
+        let started = std::time::Instant::now();
+        let empty = srv
+            .poll_task(Request::new(PollRequest {
+                worker_id: "w1".into(),
+                version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 100,
+                lazy_blobs: false,
+            }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert!(!empty.has_task);
+        assert!(started.elapsed() >= std::time::Duration::from_millis(100));
+
+        let waiter = {
+            let srv = srv.clone();
+            tokio::spawn(async move {
+                let started = std::time::Instant::now();
+                let resp = srv
+                    .poll_task(Request::new(PollRequest {
+                        worker_id: "w1".into(),
+                        version_hash: "h1".into(),
+                        version_hashes: vec![],
+                        wait_timeout_ms: 10_000,
+                        lazy_blobs: false,
+                    }))
+                    .await
+                    .unwrap()
+                    .into_inner();
+                (resp, started.elapsed())
+            })
+        };
+
+        tokio::time::sleep(std::time::Duration::from_millis(50)).await;
+        srv.start_execution(Request::new(StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: "{}".into(),
+            idempotency_key: String::new(),
+            input_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+
+        let (resp, waited) = waiter.await.unwrap();
+        assert!(resp.has_task);
+        assert_eq!(resp.node_id, "A");
+        // Woken by the notification, not by the periodic re-check.
+        assert!(waited < std::time::Duration::from_millis(POLL_RECHECK_MS));
+    }
+
+    // ---------------------------------------------------------------
+    // 8. PollTask with several version hashes → oldest task across all versions
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_poll_task_multi_version() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+        register(&srv, "wf2", "h2", &ir).await;
+
+        for (workflow_id, version_hash) in [("wf1", "h1"), ("wf2", "h2")] {
+            srv.start_execution(Request::new(StartRequest {
+                workflow_id: workflow_id.into(),
+                version_hash: version_hash.into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap();
+        }
+
+        let mut seen = Vec::new();
+        for _ in 0..3 {
+            let resp = srv
+                .poll_task(Request::new(PollRequest {
+                    worker_id: "w1".into(),
+                    version_hash: String::new(),
+                    wait_timeout_ms: 0,
+                    lazy_blobs: false,
+                    version_hashes: vec!["h2".into(), "h1".into()],
+                }))
+                .await
+                .unwrap()
+                .into_inner();
+            if resp.has_task {
+                seen.push((resp.workflow_id, resp.version_hash));
+            }
+        }
+
+        seen.sort();
+        assert_eq!(seen, vec![("wf1".to_string(), "h1".to_string()), ("wf2".to_string(), "h2".to_string())]);
+    }
+
+    // ---------------------------------------------------------------
+    // 9. WatchExecution → streams progress and ends on the terminal status
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_watch_execution_streams_until_complete() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let exec = srv
+            .start_execution(Request::new(StartRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap()
+            .into_inner();
+
+        let mut updates = srv
+            .watch_execution(Request::new(StatusRequest { execution_id: exec.execution_id.clone() }))
+            .await
+            .unwrap()
+            .into_inner()
+            .into_inner();
+
+        let first = updates.recv().await.unwrap().unwrap();
+        assert_eq!(first.status, "RUNNING");
+
+        for _ in 0..2 {
+            let poll = srv
+                .poll_task(Request::new(PollRequest {
+                    worker_id: "w1".into(),
+                    version_hash: "h1".into(),
+                    version_hashes: vec![],
+                    wait_timeout_ms: 0,
+                    lazy_blobs: false,
+                }))
+                .await
+                .unwrap()
+                .into_inner();
+            srv.complete_task(Request::new(CompleteRequest {
+                task_id: poll.task_id,
+                output_json: r#"{"ok":true}"#.into(),
+                output: None,
+                output_blob_id: String::new(),
+            }))
+            .await
+            .unwrap();
+        }
+
+        let mut statuses = Vec::new();
+        while let Some(update) = updates.recv().await {
+            statuses.push(update.unwrap().status);
+        }
+        assert_eq!(statuses.last().map(String::as_str), Some("COMPLETED"));
+
+        let missing = srv
+            .watch_execution(Request::new(StatusRequest { execution_id: "exec-missing".into() }))
+            .await;
+        assert_eq!(missing.err().unwrap().code(), tonic::Code::NotFound);
+    }
+
+    // ---------------------------------------------------------------
+    // 10. StartExecutions → all executions and their root tasks in one call
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_start_executions_batch() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let ids = srv
+            .start_executions(Request::new(StartExecutionsRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_jsons: (0..3).map(|i| format!(r#"{{"i":{}}}"#, i)).collect(),
+                idempotency_keys: vec![],
+            }))
+            .await
+            .unwrap()
+            .into_inner()
+            .execution_ids;
+        assert_eq!(ids.len(), 3);
+
+        for (i, id) in ids.iter().enumerate() {
+            let row: (String, String) = sqlx::query_as(
+                "SELECT status, input_json FROM workflow_executions WHERE execution_id = ?"
+            )
+            .bind(id)
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+            assert_eq!(row.0, "RUNNING");
+            assert_eq!(row.1, format!(r#"{{"i":{}}}"#, i));
+        }
+
+        let ready: Vec<(String,)> = sqlx::query_as("SELECT node_id FROM task_queue WHERE status = 'READY'")
+            .fetch_all(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(ready.len(), 3);
+        assert!(ready.iter().all(|(node_id,)| node_id == "A"));
+
+        let missing = srv
+            .start_executions(Request::new(StartExecutionsRequest {
+                workflow_id: "wf-missing".into(),
+                version_hash: "h1".into(),
+                input_jsons: vec!["{}".into()],
+                idempotency_keys: vec![],
+            }))
+            .await;
+        assert_eq!(missing.unwrap_err().code(), tonic::Code::NotFound);
+    }
+
+    // ---------------------------------------------------------------
+    // 11. Idempotency keys → same key returns the live execution; a failed one frees the key
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_start_execution_idempotency_key() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let start = |key: &str| StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: "{}".into(),
+            idempotency_key: key.into(),
+            input_blob_id: String::new(),
+        };
+
+        let first = srv.start_execution(Request::new(start("k1"))).await.unwrap().into_inner().execution_id;
+        let again = srv.start_execution(Request::new(start("k1"))).await.unwrap().into_inner().execution_id;
+        let other = srv.start_execution(Request::new(start("k2"))).await.unwrap().into_inner().execution_id;
+        assert_eq!(first, again);
+        assert_ne!(first, other);
+
+        // Only one set of root tasks for the deduplicated start
+        let tasks: (i64,) = sqlx::query_as("SELECT COUNT(*) FROM task_queue WHERE execution_id = ?")
+            .bind(&first)
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(tasks.0, 1);
+
+        // Batch: existing key, a repeat within the batch, and a fresh key
+        let ids = srv
+            .start_executions(Request::new(StartExecutionsRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_jsons: vec!["{}".into(), "{}".into(), "{}".into()],
+                idempotency_keys: vec!["k1".into(), "k3".into(), "k3".into()],
+            }))
+            .await
+            .unwrap()
+            .into_inner()
+            .execution_ids;
+        assert_eq!(ids[0], first);
+        assert_eq!(ids[1], ids[2]);
+        assert_ne!(ids[1], first);
+
+        // A FAILED execution gives its key up to the next start
+        sqlx::query("UPDATE workflow_executions SET status = 'FAILED' WHERE execution_id = ?")
+            .bind(&first)
+            .execute(&srv.db)
+            .await
+            .unwrap();
+        let retry = srv.start_execution(Request::new(start("k1"))).await.unwrap().into_inner().execution_id;
+        assert_ne!(retry, first);
+    }
+
+    // ---------------------------------------------------------------
+    // 12. Heartbeat → extends the lease; an expired lease is reclaimed
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_heartbeat_and_lease_reclaim() {
+        let srv = test_server().await;
+        let ir = serde_json::json!({
+            "nodes": {
+                "A": { "type": "EFFECT", "dependencies": [], "lease_seconds": 30 },
+                "B": { "type": "COMPUTE", "dependencies": ["A"] }
+            }
+        })
+        .to_string();
+        register(&srv, "wf1", "h1", &ir).await;
+        srv.start_execution(Request::new(StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: "{}".into(),
+            idempotency_key: String::new(),
+            input_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+
+        let task = srv
+            .poll_task(Request::new(PollRequest {
+                worker_id: "w1".into(),
+                version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
+            }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert!(task.has_task);
+        assert_eq!(task.lease_seconds, 30);
+
+        let beat = |worker: &str, progress: &str| HeartbeatRequest {
+            task_id: task.task_id.clone(),
+            worker_id: worker.into(),
+            progress: progress.into(),
+        };
+        assert!(srv.heartbeat(Request::new(beat("w1", "3/10"))).await.unwrap().into_inner().ok);
+        assert!(!srv.heartbeat(Request::new(beat("w2", ""))).await.unwrap().into_inner().ok);
+
+        // An empty progress keeps the last report
+        assert!(srv.heartbeat(Request::new(beat("w1", ""))).await.unwrap().into_inner().ok);
+        let progress: (Option<String>,) = sqlx::query_as("SELECT progress FROM task_queue WHERE task_id = ?")
+            .bind(&task.task_id)
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(progress.0.as_deref(), Some("3/10"));
+
+        // Once the execution has ended the lease is not renewed, so the worker stops
+        sqlx::query("UPDATE workflow_executions SET status = 'FAILED' WHERE execution_id = ?")
+            .bind(&task.execution_id)
+            .execute(&srv.db)
+            .await
+            .unwrap();
+        assert!(!srv.heartbeat(Request::new(beat("w1", ""))).await.unwrap().into_inner().ok);
+        sqlx::query("UPDATE workflow_executions SET status = 'RUNNING' WHERE execution_id = ?")
+            .bind(&task.execution_id)
+            .execute(&srv.db)
+            .await
+            .unwrap();
+
+        // A live lease is left alone
+        assert_eq!(reclaim_expired_tasks(&srv.db, false).await.unwrap(), 0);
+
+        // Missed heartbeats: once the lease has run out the task goes back to READY
+        sqlx::query("UPDATE task_queue SET lease_expires_at = datetime('now', '-1 seconds') WHERE task_id = ?")
+            .bind(&task.task_id)
+            .execute(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(reclaim_expired_tasks(&srv.db, false).await.unwrap(), 1);
+        let status: (String,) = sqlx::query_as("SELECT status FROM task_queue WHERE task_id = ?")
+            .bind(&task.task_id)
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(status.0, "READY");
+        assert!(!srv.heartbeat(Request::new(beat("w1", ""))).await.unwrap().into_inner().ok);
+    }
+
+    // ---------------------------------------------------------------
+    // 13. Concurrent pollers → every task leased exactly once
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_concurrent_pollers_never_share_a_task() {
+        let srv = Arc::new(test_server().await);
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+        srv.start_executions(Request::new(StartExecutionsRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_jsons: vec!["{}".into(); 40],
+            idempotency_keys: vec![],
+        }))
+        .await
+        .unwrap();
+
+        let pollers: Vec<_> = (0..8)
+            .map(|w| {
+                let srv = srv.clone();
+                tokio::spawn(async move {
+                    let mut leased = Vec::new();
+                    loop {
+                        let batch = srv
+                            .poll_tasks(Request::new(PollTasksRequest {
+                                worker_id: format!("w{}", w),
+                                version_hashes: vec!["h1".into()],
+                                max_tasks: 3,
+                                wait_timeout_ms: 0,
+                                lazy_blobs: false,
+                            }))
+                            .await
+                            .unwrap()
+                            .into_inner()
+                            .tasks;
+                        if batch.is_empty() {
+                            return leased;
+                        }
+                        leased.extend(batch.into_iter().map(|t| t.task_id));
+                    }
+                })
+            })
+            .collect();
+
+        let mut all = Vec::new();
+        for poller in pollers {
+            all.extend(poller.await.unwrap());
+        }
+        let unique: std::collections::HashSet<_> = all.iter().cloned().collect();
+        assert_eq!(all.len(), 40);
+        assert_eq!(unique.len(), 40);
+
+        let owners: (i64,) = sqlx::query_as(
+            "SELECT COUNT(*) FROM task_queue WHERE status = 'RUNNING' AND locked_by IS NOT NULL AND lease_expires_at IS NOT NULL"
+        )
+        .fetch_one(&srv.db)
+        .await
+        .unwrap();
+        assert_eq!(owners.0, 40);
+    }
+
+    // ---------------------------------------------------------------
+    // 14. ReleaseTasks → back to READY without a retry; other workers' leases untouched
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_release_tasks_returns_leases() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+        srv.start_execution(Request::new(StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: "{}".into(),
+            idempotency_key: String::new(),
+            input_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+
+        let task = srv
+            .poll_task(Request::new(PollRequest {
+                worker_id: "w1".into(),
+                version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
+            }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert!(task.has_task);
+
+        let release = |worker: &str| ReleaseTasksRequest {
+            worker_id: worker.into(),
+            task_ids: vec![task.task_id.clone(), "no-such-task".into()],
+        };
+        // Only the worker holding the lease can hand it back
+        assert_eq!(srv.release_tasks(Request::new(release("w2"))).await.unwrap().into_inner().released, 0);
+        assert_eq!(srv.release_tasks(Request::new(release("w1"))).await.unwrap().into_inner().released, 1);
+
+        let row: (String, Option<String>, i64) =
+            sqlx::query_as("SELECT status, locked_by, retry_count FROM task_queue WHERE task_id = ?")
+                .bind(&task.task_id)
+                .fetch_one(&srv.db)
+                .await
+                .unwrap();
+        assert_eq!(row, ("READY".to_string(), None, 0));
+
+        // Immediately leasable by another worker
+        let again = srv
+            .poll_task(Request::new(PollRequest {
+                worker_id: "w2".into(),
+                version_hash: "h1".into(),
+                version_hashes: vec![],
+                wait_timeout_ms: 0,
+                lazy_blobs: false,
+            }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert_eq!(again.task_id, task.task_id);
+    }
+
+    // ---------------------------------------------------------------
+    // 15. Opaque payloads → stored as bytes, handed to dependents and GetStatus unchanged
+    // ---------------------------------------------------------------
+    #[tokio::test]
+    async fn test_opaque_payload_round_trip() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+        let exec = srv
+            .start_execution(Request::new(StartRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap()
+            .into_inner();
+
+        let poll = |worker: &str| PollRequest {
+            worker_id: worker.into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        let task_a = srv.poll_task(Request::new(poll("w1"))).await.unwrap().into_inner();
+        // Not valid UTF-8, let alone JSON: must come back byte-for-byte
+        let blob = Payload { content_type: "application/msgpack".into(), data: vec![0x81, 0xa1, 0x76, 0xc4, 0x02, 0xff, 0x00] };
+        srv.complete_task(Request::new(CompleteRequest {
+            task_id: task_a.task_id,
+            output_json: String::new(),
+            output: Some(blob.clone()),
+            output_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+
+        let task_b = srv.poll_task(Request::new(poll("w1"))).await.unwrap().into_inner();
+        assert_eq!(task_b.node_id, "B");
+        assert_eq!(task_b.dep_payloads.get("A"), Some(&blob));
+        let input: Value = serde_json::from_str(&task_b.input_json).unwrap();
+        assert!(input["deps"].get("A").is_none());
+
+        // A JSON Payload is treated exactly like output_json
+        srv.complete_task(Request::new(CompleteRequest {
+            task_id: task_b.task_id,
+            output_json: String::new(),
+            output: Some(Payload { content_type: "application/json".into(), data: br#"{"done":true}"#.to_vec() }),
+            output_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+
+        let status = srv
+            .get_status(Request::new(StatusRequest { execution_id: exec.execution_id }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert_eq!(status.status, "COMPLETED");
+        assert_eq!(status.node_payloads.get("A"), Some(&blob));
+        assert!(status.node_payloads.get("B").is_none());
+        let nodes: Value = serde_json::from_str(&status.completed_nodes_json).unwrap();
+        assert_eq!(nodes["B"]["done"], true);
+        assert_eq!(nodes["A"]["__nexum_payload__"], true);
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 16. lazy_blobs → claim-check pointers pass through; FetchBlob reads ranges
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_lazy_blobs_and_fetch_blob() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+        srv.start_execution(Request::new(StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: "{}".into(),
+            idempotency_key: String::new(),
+            input_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+
+        let poll = |lazy_blobs: bool| PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs,
+        };
+        let task_a = srv.poll_task(Request::new(poll(true))).await.unwrap().into_inner();
+        let big = serde_json::json!({ "text": "x".repeat(CLAIM_CHECK_THRESHOLD + 1) }).to_string();
+        srv.complete_task(Request::new(CompleteRequest {
+            task_id: task_a.task_id,
+            output_json: big.clone(),
+            output: None,
+            output_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+
+        // A lazy poll gets the pointer, not the blob
+        let task_b = srv.poll_task(Request::new(poll(true))).await.unwrap().into_inner();
+        assert!(task_b.input_json.len() < 1024);
+        let input: Value = serde_json::from_str(&task_b.input_json).unwrap();
+        let pointer = &input["deps"]["A"];
+        assert_eq!(pointer[CLAIM_CHECK_MARKER], true);
+        assert!(std::path::Path::new(pointer["path"].as_str().unwrap()).is_absolute());
+        let stored = std::fs::read(pointer["path"].as_str().unwrap()).unwrap();
+        assert_eq!(pointer["size"], stored.len());
+
+        // Ranged reads return exactly the requested slice of the stored file and its full size
+        let blob_id = pointer["blob_id"].as_str().unwrap().to_string();
+        let head = srv
+            .fetch_blob(Request::new(FetchBlobRequest { blob_id: blob_id.clone(), offset: 0, length: 9 }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert_eq!(head.data, stored[..9].to_vec());
+        assert_eq!(head.total_size, stored.len() as u64);
+        let tail = srv
+            .fetch_blob(Request::new(FetchBlobRequest { blob_id: blob_id.clone(), offset: stored.len() as u64 - 2, length: 0 }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert_eq!(tail.data, stored[stored.len() - 2..].to_vec());
+        let escape = srv
+            .fetch_blob(Request::new(FetchBlobRequest { blob_id: "../nexum".into(), offset: 0, length: 0 }))
+            .await;
+        assert_eq!(escape.unwrap_err().code(), tonic::Code::InvalidArgument);
+
+        // Without lazy_blobs the blob is still inlined
+        srv.release_tasks(Request::new(ReleaseTasksRequest { worker_id: "w1".into(), task_ids: vec![task_b.task_id] }))
+            .await
+            .unwrap();
+        let task_b = srv.poll_task(Request::new(poll(false))).await.unwrap().into_inner();
+        let input: Value = serde_json::from_str(&task_b.input_json).unwrap();
+        assert_eq!(input["deps"]["A"]["text"].as_str().unwrap().len(), CLAIM_CHECK_THRESHOLD + 1);
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 17. Uploaded blobs → used as execution input / node output; DownloadPayload streams them
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_uploaded_payloads_and_download() {
+        let srv = test_server().await;
+        let ir = two_node_ir();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        // What UploadPayload leaves behind once a stream has finished
+        std::fs::create_dir_all(blob_dir()).unwrap();
+        let input_blob = format!("upload-{}", Uuid::new_v4());
+        std::fs::write(blob_path(&input_blob).unwrap(), r#"{"url":"https://example.com"}"#).unwrap();
+        let output_blob = format!("upload-{}", Uuid::new_v4());
+        let big = serde_json::json!({ "html": "x".repeat(PAYLOAD_CHUNK_BYTES * 2) }).to_string();
+        std::fs::write(blob_path(&output_blob).unwrap(), &big).unwrap();
+
+        srv.start_execution(Request::new(StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: String::new(),
+            idempotency_key: String::new(),
+            input_blob_id: input_blob.clone(),
+        }))
+        .await
+        .unwrap();
+
+        let poll = |lazy_blobs: bool| PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs,
+        };
+        // A lazy poll sees the input as a claim check
+        let task_a = srv.poll_task(Request::new(poll(true))).await.unwrap().into_inner();
+        let input: Value = serde_json::from_str(&task_a.input_json).unwrap();
+        assert_eq!(input["input"]["blob_id"], input_blob.as_str());
+
+        srv.complete_task(Request::new(CompleteRequest {
+            task_id: task_a.task_id,
+            output_json: String::new(),
+            output: None,
+            output_blob_id: output_blob.clone(),
+        }))
+        .await
+        .unwrap();
+
+        // A non-lazy poll gets both inlined
+        let task_b = srv.poll_task(Request::new(poll(false))).await.unwrap().into_inner();
+        let input: Value = serde_json::from_str(&task_b.input_json).unwrap();
+        assert_eq!(input["input"]["url"], "https://example.com");
+        assert_eq!(input["deps"]["A"]["html"].as_str().unwrap().len(), PAYLOAD_CHUNK_BYTES * 2);
+
+        let mut chunks = srv
+            .download_payload(Request::new(DownloadPayloadRequest { blob_id: output_blob.clone() }))
+            .await
+            .unwrap()
+            .into_inner()
+            .into_inner();
+        let mut downloaded = Vec::new();
+        let mut count = 0;
+        while let Some(chunk) = chunks.recv().await {
+            downloaded.extend(chunk.unwrap().data);
+            count += 1;
+        }
+        assert_eq!(downloaded, big.as_bytes());
+        assert_eq!(count, 3);
+
+        let missing = srv
+            .complete_task(Request::new(CompleteRequest {
+                task_id: task_b.task_id,
+                output_json: String::new(),
+                output: None,
+                output_blob_id: "upload-missing".into(),
+            }))
+            .await;
+        assert_eq!(missing.unwrap_err().code(), tonic::Code::NotFound);
+
+        // Content-named uploads carry their digest in the claim check; UUID-named ones do not
+        let digest = hex::encode(Sha256::digest(big.as_bytes()));
+        let named_blob = format!("upload-{}", digest);
+        std::fs::write(blob_path(&named_blob).unwrap(), &big).unwrap();
+        assert_eq!(uploaded_blob_pointer(&named_blob).await.unwrap()["sha256"], digest.as_str());
+        assert!(uploaded_blob_pointer(&output_blob).await.unwrap().get("sha256").is_none());
+
+        let _ = std::fs::remove_file(blob_path(&input_blob).unwrap());
+        let _ = std::fs::remove_file(blob_path(&output_blob).unwrap());
+        let _ = std::fs::remove_file(blob_path(&named_blob).unwrap());
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 18. Claim-check blobs are gzipped at rest and inflated when inlined
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_claim_check_blobs_are_compressed() {
+        let srv = test_server().await;
+        let text = "# Heading\n\nSome crawled markdown with [links](https://example.com).\n".repeat(4_000);
+        let output_json = serde_json::json!({ "markdown": text }).to_string();
+        assert!(output_json.len() > CLAIM_CHECK_THRESHOLD);
+
+        let stored = srv.store_payload("exec-gz", "crawl", &output_json).await.unwrap();
+        let pointer: Value = serde_json::from_str(&stored).unwrap();
+        assert_eq!(pointer["encoding"], GZIP_ENCODING);
+        let on_disk = std::fs::read(pointer["path"].as_str().unwrap()).unwrap();
+        assert_eq!(&on_disk[..2], &[0x1f, 0x8b]);
+        assert!(on_disk.len() * 10 < output_json.len());
+        assert_eq!(pointer["size"], on_disk.len());
+        assert_eq!(pointer["sha256"], hex::encode(Sha256::digest(output_json.as_bytes())));
+        let again: Value = serde_json::from_str(&srv.store_payload("exec-gz-2", "crawl", &output_json).await.unwrap()).unwrap();
+        assert_eq!(again["sha256"], pointer["sha256"]);
+        let _ = std::fs::remove_file(again["path"].as_str().unwrap());
+
+        assert_eq!(srv.resolve_payload(&stored).await.unwrap(), output_json);
+        let _ = std::fs::remove_file(pointer["path"].as_str().unwrap());
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 19. MAP max_parallel → extra sub-tasks wait and are promoted as others finish
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_map_max_parallel_and_empty_map() {
+        let srv = test_server().await;
+        let ir = serde_json::json!({
+            "nodes": {
+                "M": { "type": "MAP", "dependencies": [], "max_parallel": 2 },
+                "R": { "type": "REDUCE", "dependencies": ["M"], "mapNodeId": "M" }
+            }
+        })
+        .to_string();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let start = || StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: r#"{"n":3}"#.into(),
+            idempotency_key: String::new(),
+            input_blob_id: String::new(),
+        };
+        let poll = || PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        let complete = |task_id: String, output_json: &str| CompleteRequest {
+            task_id,
+            output_json: output_json.to_string(),
+            output: None,
+            output_blob_id: String::new(),
+        };
+        let statuses = |exec_id: String| {
+            let db = srv.db.clone();
+            async move {
+                let rows: Vec<(String,)> = sqlx::query_as(
+                    "SELECT status FROM task_queue
+                     WHERE execution_id = ? AND node_type = 'MAP_SUBTASK' ORDER BY status"
+                )
+                .bind(exec_id)
+                .fetch_all(&db)
+                .await
+                .unwrap();
+                rows.into_iter().map(|(s,)| s).collect::<Vec<_>>()
+            }
+        };
+        let upper = |task: &PollResponse| task.map_item_json.to_uppercase();
+
+        let exec_id = srv.start_execution(Request::new(start())).await.unwrap().into_inner().execution_id;
+        let coordinator = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(coordinator.node_type, "MAP");
+        srv.complete_task(Request::new(complete(coordinator.task_id, r#"["a","b","c"]"#))).await.unwrap();
+        assert_eq!(statuses(exec_id.clone()).await, vec!["READY", "READY", "WAITING"]);
+
+        // Only two are handed out; finishing one releases the third
+        let first = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        let second = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert!(first.is_map_subtask && second.is_map_subtask);
+        assert_eq!(first.node_id, "M");
+        assert!(srv.poll_task(Request::new(poll())).await.unwrap().into_inner().task_id.is_empty());
+        srv.complete_task(Request::new(complete(first.task_id.clone(), &upper(&first)))).await.unwrap();
+        assert_eq!(statuses(exec_id.clone()).await, vec!["DONE", "READY", "RUNNING"]);
+
+        let third = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(third.map_item_json, r#""c""#);
+        srv.complete_task(Request::new(complete(third.task_id.clone(), &upper(&third)))).await.unwrap();
+        srv.complete_task(Request::new(complete(second.task_id.clone(), &upper(&second)))).await.unwrap();
+
+        // The reducer sees results in item order, not completion order
+        let reduce = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(reduce.node_id, "R");
+        let input: Value = serde_json::from_str(&reduce.input_json).unwrap();
+        assert_eq!(input["deps"]["M"], serde_json::json!(["A", "B", "C"]));
+        srv.complete_task(Request::new(complete(reduce.task_id, r#"{"joined":"ABC"}"#))).await.unwrap();
+
+        // An empty item list completes the MAP node immediately with []
+        let exec_id = srv.start_execution(Request::new(start())).await.unwrap().into_inner().execution_id;
+        let coordinator = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        srv.complete_task(Request::new(complete(coordinator.task_id, "[]"))).await.unwrap();
+        assert!(statuses(exec_id).await.is_empty());
+        let reduce = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(reduce.node_id, "R");
+        let input: Value = serde_json::from_str(&reduce.input_json).unwrap();
+        assert_eq!(input["deps"]["M"], serde_json::json!([]));
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 20. MAP batch_size → one sub-task per batch, results stored per item
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_map_batch_size() {
+        let srv = test_server().await;
+        let ir = serde_json::json!({
+            "nodes": {
+                "M": { "type": "MAP", "dependencies": [], "batch_size": 2 },
+                "R": { "type": "REDUCE", "dependencies": ["M"], "mapNodeId": "M" }
+            }
+        })
+        .to_string();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let poll = || PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        let complete = |task_id: String, output_json: &str| CompleteRequest {
+            task_id,
+            output_json: output_json.to_string(),
+            output: None,
+            output_blob_id: String::new(),
+        };
+
+        srv.start_execution(Request::new(StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: "{}".into(),
+            idempotency_key: String::new(),
+            input_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+        let coordinator = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        srv.complete_task(Request::new(complete(coordinator.task_id, "[1,2,3]"))).await.unwrap();
+
+        let mut batches = vec![
+            srv.poll_task(Request::new(poll())).await.unwrap().into_inner(),
+            srv.poll_task(Request::new(poll())).await.unwrap().into_inner(),
+        ];
+        batches.sort_by_key(|t| t.map_index);
+        assert_eq!(
+            batches.iter().map(|t| (t.map_index, t.map_item_json.as_str(), t.map_total)).collect::<Vec<_>>(),
+            vec![(0, "[1,2]", 3), (2, "[3]", 3)]
+        );
+
+        // A result count that does not match the batch is rejected and the task stays leased
+        let err = srv
+            .complete_task(Request::new(complete(batches[0].task_id.clone(), "[10]")))
+            .await
+            .unwrap_err();
+        assert_eq!(err.code(), tonic::Code::InvalidArgument);
+
+        srv.complete_task(Request::new(complete(batches[1].task_id.clone(), "[30]"))).await.unwrap();
+        srv.complete_task(Request::new(complete(batches[0].task_id.clone(), r#"[10,{"e":20}]"#))).await.unwrap();
+
+        let reduce = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(reduce.node_id, "R");
+        let input: Value = serde_json::from_str(&reduce.input_json).unwrap();
+        assert_eq!(input["deps"]["M"], serde_json::json!([10, {"e": 20}, 30]));
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 21. AppendMapItems → sub-tasks start while the coordinator is still enumerating
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_append_map_items_streams_fan_out() {
+        let srv = test_server().await;
+        let ir = serde_json::json!({
+            "nodes": {
+                "M": { "type": "MAP", "dependencies": [] },
+                "R": { "type": "REDUCE", "dependencies": ["M"], "mapNodeId": "M" }
+            }
+        })
+        .to_string();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let poll = || PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        let complete = |task_id: String, output_json: &str| CompleteRequest {
+            task_id,
+            output_json: output_json.to_string(),
+            output: None,
+            output_blob_id: String::new(),
+        };
+        let append = |task_id: &str, items_json: &str, offset: u64| AppendMapItemsRequest {
+            task_id: task_id.to_string(),
+            items_json: items_json.to_string(),
+            offset,
+            worker_id: "w1".into(),
+        };
+
+        srv.start_execution(Request::new(StartRequest {
+            workflow_id: "wf1".into(),
+            version_hash: "h1".into(),
+            input_json: "{}".into(),
+            idempotency_key: String::new(),
+            input_blob_id: String::new(),
+        }))
+        .await
+        .unwrap();
+        let coordinator = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+
+        let page = srv.append_map_items(Request::new(append(&coordinator.task_id, r#"["a","b"]"#, 0))).await.unwrap().into_inner();
+        assert_eq!((page.item_count, page.pending), (2, 2));
+        for _ in 0..2 {
+            let sub = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+            assert!(sub.is_map_subtask);
+            assert_eq!(sub.map_total, 0);
+            srv.complete_task(Request::new(complete(sub.task_id.clone(), &sub.map_item_json.to_uppercase()))).await.unwrap();
+        }
+
+        // A re-run coordinator resending from the start only adds what is new; a gap is rejected
+        let page = srv.append_map_items(Request::new(append(&coordinator.task_id, r#"["a","b","c"]"#, 0))).await.unwrap().into_inner();
+        assert_eq!((page.item_count, page.pending), (3, 1));
+        let gap = srv.append_map_items(Request::new(append(&coordinator.task_id, r#"["z"]"#, 5))).await.unwrap_err();
+        assert_eq!(gap.code(), tonic::Code::InvalidArgument);
+        // Only the worker holding the coordinator's lease may add to its list
+        let stranger = AppendMapItemsRequest { worker_id: "w2".into(), ..append(&coordinator.task_id, r#"["d"]"#, 3) };
+        let stranger = srv.append_map_items(Request::new(stranger)).await.unwrap_err();
+        assert_eq!(stranger.code(), tonic::Code::FailedPrecondition);
+
+        // Every item done but the list still open: the MAP node is not complete yet
+        let sub = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(sub.map_index, 2);
+        srv.complete_task(Request::new(complete(sub.task_id.clone(), r#""C""#))).await.unwrap();
+        assert!(srv.poll_task(Request::new(poll())).await.unwrap().into_inner().task_id.is_empty());
+
+        // Completing the coordinator closes the list and finishes the node straight away
+        srv.complete_task(Request::new(complete(coordinator.task_id.clone(), "[]"))).await.unwrap();
+        let reduce = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(reduce.node_id, "R");
+        let input: Value = serde_json::from_str(&reduce.input_json).unwrap();
+        assert_eq!(input["deps"]["M"], serde_json::json!(["A", "B", "C"]));
+
+        let closed = srv.append_map_items(Request::new(append(&coordinator.task_id, r#"["d"]"#, 3))).await.unwrap_err();
+        assert_eq!(closed.code(), tonic::Code::FailedPrecondition);
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 22. ReadMapResults → a folding REDUCE reads results in order while the MAP runs
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_fold_reduce_reads_results_as_they_land() {
+        let srv = test_server().await;
+        let ir = serde_json::json!({
+            "nodes": {
+                "M": { "type": "MAP", "dependencies": [] },
+                "R": { "type": "REDUCE", "dependencies": ["M"], "mapNodeId": "M", "fold": true }
+            }
+        })
+        .to_string();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let poll = || PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        let complete = |task_id: String, output_json: &str| CompleteRequest {
+            task_id,
+            output_json: output_json.to_string(),
+            output: None,
+            output_blob_id: String::new(),
+        };
+        let read = |task_id: &str, from_index: u64, partial_json: &str| ReadMapResultsRequest {
+            task_id: task_id.to_string(),
+            from_index,
+            limit: 0,
+            partial_json: partial_json.to_string(),
+            worker_id: "w1".into(),
+        };
+
+        let execution_id = srv
+            .start_execution(Request::new(StartRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap()
+            .into_inner()
+            .execution_id;
+        let coordinator = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        srv.append_map_items(Request::new(AppendMapItemsRequest {
+            task_id: coordinator.task_id.clone(),
+            items_json: r#"["a","b","c"]"#.into(),
+            offset: 0,
+            worker_id: "w1".into(),
+        }))
+        .await
+        .unwrap();
+
+        // The REDUCE is scheduled as soon as the MAP node fans out
+        let mut subs = HashMap::new();
+        let mut reduce = None;
+        for _ in 0..4 {
+            let task = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+            if task.is_map_subtask {
+                subs.insert(task.map_index, task);
+            } else {
+                reduce = Some(task);
+            }
+        }
+        let reduce = reduce.expect("REDUCE leased before the MAP node completed");
+        assert_eq!(reduce.node_id, "R");
+        assert!(reduce.checkpoint_json.is_empty());
+
+        let chunk = srv.read_map_results(Request::new(read(&reduce.task_id, 0, ""))).await.unwrap().into_inner();
+        assert!(chunk.results_json.is_empty());
+        assert_eq!((chunk.item_count, chunk.done), (3, false));
+
+        // Results come back in item order, up to the first item still running
+        for index in [0, 2] {
+            let sub = &subs[&index];
+            srv.complete_task(Request::new(complete(sub.task_id.clone(), &sub.map_item_json.to_uppercase()))).await.unwrap();
+        }
+        let chunk = srv.read_map_results(Request::new(read(&reduce.task_id, 0, ""))).await.unwrap().into_inner();
+        assert_eq!(chunk.results_json, vec![r#""A""#.to_string()]);
+        assert!(!chunk.done);
+
+        // The accumulator sent with the next read is checkpointed and shown as a partial output
+        srv.read_map_results(Request::new(read(&reduce.task_id, 1, r#""A""#))).await.unwrap();
+        let status = srv
+            .get_status(Request::new(StatusRequest { execution_id: execution_id.clone() }))
+            .await
+            .unwrap()
+            .into_inner();
+        let partials: Value = serde_json::from_str(&status.partial_outputs_json).unwrap();
+        assert_eq!(partials, serde_json::json!({ "R": "A" }));
+        let checkpoint: (String,) = sqlx::query_as("SELECT checkpoint_json FROM task_queue WHERE task_id = ?")
+            .bind(&reduce.task_id)
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(serde_json::from_str::<Value>(&checkpoint.0).unwrap(), serde_json::json!({ "next_index": 1, "acc": "A" }));
+
+        let sub = &subs[&1];
+        srv.complete_task(Request::new(complete(sub.task_id.clone(), r#""B""#))).await.unwrap();
+        srv.complete_task(Request::new(complete(coordinator.task_id.clone(), "[]"))).await.unwrap();
+        let chunk = srv.read_map_results(Request::new(read(&reduce.task_id, 1, ""))).await.unwrap().into_inner();
+        assert_eq!(chunk.results_json, vec![r#""B""#.to_string(), r#""C""#.to_string()]);
+        assert!(chunk.done);
+
+        // Only the folding REDUCE consumes M, so its output is a summary, not the gathered array
+        let status = srv
+            .get_status(Request::new(StatusRequest { execution_id: execution_id.clone() }))
+            .await
+            .unwrap()
+            .into_inner();
+        let completed: Value = serde_json::from_str(&status.completed_nodes_json).unwrap();
+        assert_eq!(completed["M"], serde_json::json!({ MAP_SUMMARY_MARKER: true, "item_count": 3 }));
+
+        srv.complete_task(Request::new(complete(reduce.task_id.clone(), r#""ABC""#))).await.unwrap();
+        let status = srv
+            .get_status(Request::new(StatusRequest { execution_id }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert_eq!(status.status, "COMPLETED");
+        assert!(status.partial_outputs_json.is_empty());
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 23. MAP fan-in → the last sub-task lands between the seal and the coordinator's count
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_map_finishes_once_when_last_result_lands_after_seal() {
+        let srv = test_server().await;
+        let ir = serde_json::json!({
+            "nodes": {
+                "M": { "type": "MAP", "dependencies": [] },
+                "R": { "type": "REDUCE", "dependencies": ["M"], "mapNodeId": "M" }
+            }
+        })
+        .to_string();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let poll = || PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        let complete = |task_id: String, output_json: &str| CompleteRequest {
+            task_id,
+            output_json: output_json.to_string(),
+            output: None,
+            output_blob_id: String::new(),
+        };
+
+        let execution_id = srv
+            .start_execution(Request::new(StartRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap()
+            .into_inner()
+            .execution_id;
+        let coordinator = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        srv.append_map_items(Request::new(AppendMapItemsRequest {
+            task_id: coordinator.task_id.clone(),
+            items_json: r#"["a","b"]"#.into(),
+            offset: 0,
+            worker_id: "w1".into(),
+        }))
+        .await
+        .unwrap();
+        let first = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        let last = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        srv.complete_task(Request::new(complete(first.task_id.clone(), r#""A""#))).await.unwrap();
+
+        // The coordinator's completion, split where the last sub-task slips in: seal, then count
+        let total = srv.enqueue_map_items(&execution_id, "wf1", "h1", "M", &[], None, true).await.unwrap();
+        srv.complete_task(Request::new(complete(last.task_id.clone(), r#""B""#))).await.unwrap();
+        assert_eq!(srv.count_map_results(&execution_id, "M").await.unwrap(), total);
+        srv.finish_map_node(&execution_id, "wf1", "h1", "M", total).await.unwrap();
+
+        let payloads: Vec<(String,)> = sqlx::query_as(
+            "SELECT payload FROM events WHERE execution_id = ? AND event_type = 'NodeCompleted'"
+        )
+        .bind(&execution_id)
+        .fetch_all(&srv.db)
+        .await
+        .unwrap();
+        let map_completions = payloads
+            .iter()
+            .filter(|(p,)| serde_json::from_str::<Value>(p).unwrap()["node_id"] == "M")
+            .count();
+        assert_eq!(map_completions, 1);
+
+        let reduce = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        assert_eq!(reduce.node_id, "R");
+        let input: Value = serde_json::from_str(&reduce.input_json).unwrap();
+        assert_eq!(input["deps"]["M"], serde_json::json!(["A", "B"]));
+        assert!(srv.poll_task(Request::new(poll())).await.unwrap().into_inner().task_id.is_empty());
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 24. PollTasks → a row that cannot be built hands the whole leased batch back
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_poll_tasks_releases_batch_on_error() {
+        let srv = test_server().await;
+        register(&srv, "wf1", "h1", &two_node_ir()).await;
+
+        let mut execution_ids = Vec::new();
+        for _ in 0..2 {
+            let resp = srv
+                .start_execution(Request::new(StartRequest {
+                    workflow_id: "wf1".into(),
+                    version_hash: "h1".into(),
+                    input_json: "{}".into(),
+                    idempotency_key: String::new(),
+                    input_blob_id: String::new(),
+                }))
+                .await
+                .unwrap()
+                .into_inner();
+            execution_ids.push(resp.execution_id);
+        }
+        // An orphaned task: building its PollResponse fails with "Execution not found"
+        sqlx::query("DELETE FROM workflow_executions WHERE execution_id = ?")
+            .bind(&execution_ids[1])
+            .execute(&srv.db)
+            .await
+            .unwrap();
+
+        let poll = PollTasksRequest {
+            worker_id: "w1".into(),
+            version_hashes: vec!["h1".into()],
+            max_tasks: 2,
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        assert!(srv.poll_tasks(Request::new(poll.clone())).await.is_err());
+
+        let leased: (i64,) = sqlx::query_as("SELECT COUNT(*) FROM task_queue WHERE status != 'READY' OR locked_by IS NOT NULL")
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert_eq!(leased.0, 0);
+
+        // Once the bad row is gone the healthy task is leased again straight away
+        sqlx::query("DELETE FROM task_queue WHERE execution_id = ?")
+            .bind(&execution_ids[1])
+            .execute(&srv.db)
+            .await
+            .unwrap();
+        let batch = srv.poll_tasks(Request::new(poll)).await.unwrap().into_inner();
+        assert_eq!(batch.tasks.len(), 1);
+        assert_eq!(batch.tasks[0].execution_id, execution_ids[0]);
+    }
+
+    // ──────────────────────────────────────────────────────────────
+    // 25. ReadMapResults → only the lease holder checkpoints; a failed item stops the fold
+    // ──────────────────────────────────────────────────────────────
+    #[tokio::test]
+    async fn test_fold_read_rejected_after_lease_loss_or_item_failure() {
+        let srv = test_server().await;
+        let ir = serde_json::json!({
+            "nodes": {
+                "M": { "type": "MAP", "dependencies": [] },
+                "R": { "type": "REDUCE", "dependencies": ["M"], "mapNodeId": "M", "fold": true }
+            }
+        })
+        .to_string();
+        register(&srv, "wf1", "h1", &ir).await;
+
+        let poll = || PollRequest {
+            worker_id: "w1".into(),
+            version_hash: "h1".into(),
+            version_hashes: vec![],
+            wait_timeout_ms: 0,
+            lazy_blobs: false,
+        };
+        let read = |task_id: &str, worker_id: &str, partial_json: &str| ReadMapResultsRequest {
+            task_id: task_id.to_string(),
+            from_index: 0,
+            limit: 0,
+            partial_json: partial_json.to_string(),
+            worker_id: worker_id.into(),
+        };
+
+        let execution_id = srv
+            .start_execution(Request::new(StartRequest {
+                workflow_id: "wf1".into(),
+                version_hash: "h1".into(),
+                input_json: "{}".into(),
+                idempotency_key: String::new(),
+                input_blob_id: String::new(),
+            }))
+            .await
+            .unwrap()
+            .into_inner()
+            .execution_id;
+        let coordinator = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+        srv.append_map_items(Request::new(AppendMapItemsRequest {
+            task_id: coordinator.task_id.clone(),
+            items_json: r#"["a","b"]"#.into(),
+            offset: 0,
+            worker_id: "w1".into(),
+        }))
+        .await
+        .unwrap();
+        let mut sub = None;
+        let mut reduce = None;
+        for _ in 0..3 {
+            let task = srv.poll_task(Request::new(poll())).await.unwrap().into_inner();
+            if task.is_map_subtask {
+                sub = Some(task);
+            } else {
+                reduce = Some(task);
+            }
+        }
+        let (sub, reduce) = (sub.unwrap(), reduce.unwrap());
+        srv.read_map_results(Request::new(read(&reduce.task_id, "w1", ""))).await.unwrap();
+
+        // The REDUCE was reclaimed and re-leased to w2: w1's stale accumulator is not checkpointed
+        sqlx::query("UPDATE task_queue SET locked_by = 'w2' WHERE task_id = ?")
+            .bind(&reduce.task_id)
+            .execute(&srv.db)
+            .await
+            .unwrap();
+        let stale = srv.read_map_results(Request::new(read(&reduce.task_id, "w1", r#""x""#))).await.unwrap_err();
+        assert_eq!(stale.code(), tonic::Code::FailedPrecondition);
+        let checkpoint: (Option<String>,) = sqlx::query_as("SELECT checkpoint_json FROM task_queue WHERE task_id = ?")
+            .bind(&reduce.task_id)
+            .fetch_one(&srv.db)
+            .await
+            .unwrap();
+        assert!(checkpoint.0.unwrap_or_default().is_empty());
+        srv.read_map_results(Request::new(read(&reduce.task_id, "w2", ""))).await.unwrap();
+
+        // A sub-task out of retries fails the execution; the REDUCE is still RUNNING but its
+        // reads and heartbeats are refused, so the fold stops instead of waiting forever
+        sqlx::query("UPDATE task_queue SET retry_count = 3 WHERE task_id = ?")
+            .bind(&sub.task_id)
+            .execute(&srv.db)
+            .await
+            .unwrap();
+        srv.fail_task(Request::new(FailRequest { task_id: sub.task_id.clone(), error_message: "boom".into() }))
+            .await
+            .unwrap();
+        let status = srv
+            .get_status(Request::new(StatusRequest { execution_id }))
+            .await
+            .unwrap()
+            .into_inner();
+        assert_eq!(status.status, "FAILED");
+        let ended = srv.read_map_results(Request::new(read(&reduce.task_id, "w2", ""))).await.unwrap_err();
+        assert_eq!(ended.code(), tonic::Code::FailedPrecondition);
+        let beat = HeartbeatRequest { task_id: reduce.task_id.clone(), worker_id: "w2".into(), progress: String::new() };
+        assert!(!srv.heartbeat(Request::new(beat)).await.unwrap().into_inner().ok);
+    }
 }
@@ -205,8 +205,7 @@ async def main():
 
     logger.info("Worker ready. Waiting for tasks on localhost:50051 ...")
     w = Worker([pipeline_workflow], concurrency=1, poll_interval=0.1)
-    w._running = True
-    await w._run()
+    await w.run()
 
 
 if __name__ == "__main__":
@@ -90,8 +90,7 @@ async def main():
 
     logger.info("Worker started. Waiting for tasks on localhost:50051 ...")
     w = Worker([tool_call_workflow], concurrency=4, poll_interval=0.1)
-    w._running = True
-    await w._run()
+    await w.run()
 
 
 if __name__ == "__main__":
@@ -55,11 +55,11 @@ async def _run_browser_task(task: str) -> tuple[str, str]:
     return content, url
 
 
-def research_handler(ctx):
+async def research_handler(ctx):
     topic = ctx.input.get("topic", "AI agents")
     task = f"Search the web and find detailed information about: {topic}. Read the top 2-3 sources and summarize the key information."
     logger.info(f"Browsing: {task[:80]}")
-    content, url = asyncio.get_event_loop().run_until_complete(_run_browser_task(task))
+    content, url = await _run_browser_task(task)
     return BrowseResult(content=content[:5000], url=url)
 
 
@@ -73,7 +73,7 @@ def summarize_handler(ctx):
     return Summary(text=summary, key_points=key_points[:5])
 
 
-def follow_up_handler(ctx):
+async def follow_up_handler(ctx):
     summary = ctx.get("summarize")
     topic = ctx.input.get("topic", "AI agents")
     # Browse for follow-up based on key points
@@ -81,7 +81,7 @@ def follow_up_handler(ctx):
     if summary.key_points:
         follow_up_query += f" Specifically: {summary.key_points[0]}"
     logger.info(f"Follow-up browse: {follow_up_query[:80]}")
-    content, url = asyncio.get_event_loop().run_until_complete(_run_browser_task(follow_up_query))
+    content, url = await _run_browser_task(follow_up_query)
     return BrowseResult(content=content[:5000], url=url)
 
 
@@ -113,9 +113,9 @@ Each step was persisted atomically — crash recovery is automatic.
 # Workflow with real handlers
 browser_research_workflow = (
     workflow("browser-research")
-    .effect("research", BrowseResult, handler=research_handler, depends_on=[])
+    .effect("research", BrowseResult, handler=research_handler, depends_on=[], lease_seconds=30)
     .compute("summarize", Summary, handler=summarize_handler, depends_on=["research"])
-    .effect("follow_up", BrowseResult, handler=follow_up_handler, depends_on=["summarize"])
+    .effect("follow_up", BrowseResult, handler=follow_up_handler, depends_on=["summarize"], lease_seconds=30)
     .compute("report", Report, handler=report_handler, depends_on=["research", "summarize", "follow_up"])
     .build()
 )
@@ -127,8 +127,7 @@ async def main():
     logger.info(f"Registered 'browser-research' workflow (compatibility: {compat})")
     logger.info("Worker started on localhost:50051 ...")
     w = Worker([browser_research_workflow], concurrency=1, poll_interval=0.5)
-    w._running = True
-    await w._run()
+    await w.run()
 
 
 if __name__ == "__main__":
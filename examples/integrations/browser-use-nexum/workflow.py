@@ -38,9 +38,9 @@ def _compute_handler(ctx):
 
 browser_research_workflow = (
     workflow("browser-research")
-    .effect("research", BrowseResult, handler=_browser_handler, depends_on=[])
+    .effect("research", BrowseResult, handler=_browser_handler, depends_on=[], lease_seconds=30)
     .compute("summarize", Summary, handler=_compute_handler, depends_on=["research"])
-    .effect("follow_up", BrowseResult, handler=_browser_handler, depends_on=["summarize"])
+    .effect("follow_up", BrowseResult, handler=_browser_handler, depends_on=["summarize"], lease_seconds=30)
     .compute("report", Report, handler=_compute_handler, depends_on=["research", "summarize", "follow_up"])
     .build()
 )
@@ -14,10 +14,7 @@ Usage:
 
 import concurrent.futures
 import hashlib
-import json
-import os
 import sys
-import time
 
 
 from pydantic import BaseModel
@@ -44,26 +41,6 @@ crawl_workflow = (
 )
 
 
-# -- Session persistence -------------------------------------------------------
-
-def _session_file(session_prefix: str) -> str:
-    return os.path.join(os.path.dirname(__file__), f".session-{session_prefix}.json")
-
-
-def _load_session(session_prefix: str) -> dict:
-    path = _session_file(session_prefix)
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-
-def _save_session(session_prefix: str, data: dict) -> None:
-    path = _session_file(session_prefix)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-
 # -- Core functions ------------------------------------------------------------
 
 def _make_key(url: str) -> str:
@@ -85,62 +62,34 @@ def submit_crawl_url(
     Returns a CrawlOutput dict.
     """
     key = _make_key(url)
-    session = _load_session(session_prefix)
-
     client = NexumClient()
 
-    # Check if we already have an execution_id for this URL
-    exec_id = session.get(key)
-    if exec_id:
-        status = client.get_status(exec_id)
-        if status["status"] == "COMPLETED":
-            result = status["completedNodes"].get("crawl_url", {})
-            print(f"[Nexum] {key} already COMPLETED (cached) [done]")
-            client.close()
-            return result
-        if status["status"] in ("FAILED", "CANCELLED"):
-            print(f"[Nexum] {key} previous attempt {status['status']}, retrying...")
-            exec_id = None
-
     # Register workflow (idempotent)
     client.register_workflow(crawl_workflow)
 
-    if exec_id is None:
-        exec_id = client.start_execution(
-            crawl_workflow.workflow_id,
-            {"url": url},
-            version_hash=crawl_workflow.version_hash,
-        )
-        session[key] = exec_id
-        _save_session(session_prefix, session)
-        print(f"[Nexum] Submitted {exec_id[:16]}... ({url})")
-
-    # Adaptive polling: tight (50ms) for first 2s, then relaxed (200ms)
-    deadline = time.time() + timeout
-    fast_until = time.time() + 2.0
-    last_log = 0.0
-
-    while time.time() < deadline:
-        status = client.get_status(exec_id)
-        st = status["status"]
-        if st == "COMPLETED":
-            result = status["completedNodes"].get("crawl_url", {})
-            print(f"[Nexum] {exec_id[:16]}... done ({url})")
-            client.close()
-            return result
-        if st in ("FAILED", "CANCELLED"):
-            client.close()
-            raise RuntimeError(f"Nexum execution {exec_id} {st}")
-
-        now = time.time()
-        if now - last_log >= 1.0:
-            print(f"[Nexum] {exec_id[:16]}... waiting ({st})")
-            last_log = now
-
-        time.sleep(0.05 if time.time() < fast_until else 0.2)
-
-    client.close()
-    raise TimeoutError(f"Nexum execution {exec_id} did not complete within {timeout}s")
+    # The server dedupes on the key: a repeat call returns the existing execution
+    # (already COMPLETED on a re-run), a FAILED/CANCELLED one is started afresh.
+    exec_id = client.start_execution(
+        crawl_workflow.workflow_id,
+        {"url": url},
+        version_hash=crawl_workflow.version_hash,
+        idempotency_key=f"{session_prefix}:{key}",
+    )
+    print(f"[Nexum] Submitted {exec_id[:16]}... ({url})")
+
+    # Block on the WatchExecution stream until the execution finishes
+    try:
+        status = client.wait_for(exec_id, timeout)
+    finally:
+        client.close()
+
+    st = status["status"]
+    if st in ("FAILED", "CANCELLED"):
+        raise RuntimeError(f"Nexum execution {exec_id} {st}")
+
+    result = status["completedNodes"].get("crawl_url", {})
+    print(f"[Nexum] {exec_id[:16]}... done ({url})")
+    return result
 
 
 def crawl_all(
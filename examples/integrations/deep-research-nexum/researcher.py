@@ -19,7 +19,6 @@ import hashlib
 import json
 import os
 import sys
-import time
 
 
 from openai import OpenAI
@@ -42,12 +41,12 @@ def _placeholder(ctx):
 
 research_workflow = (
     workflow("deep-research")
-    .effect("search_and_learn", LearnResult, handler=_placeholder, depends_on=[])
+    .effect("search_and_learn", LearnResult, handler=_placeholder, depends_on=[], lease_seconds=30)
     .build()
 )
 
 
-# --- Session persistence (crash recovery) ---
+# --- Session persistence (generated sub-queries) ---
 
 def _session_file(session_prefix: str) -> str:
     return os.path.join(os.path.dirname(os.path.abspath(__file__)), f".session-{session_prefix}.json")
@@ -156,58 +155,34 @@ def submit_query(
     Returns cached result immediately if already completed.
     """
     key = _make_key(query, research_goal)
-    session = _load_session(session_prefix)
     client = NexumClient()
 
-    exec_id = session.get(key)
-    if exec_id:
-        status = client.get_status(exec_id)
-        if status["status"] == "COMPLETED":
-            result = status["completedNodes"].get("search_and_learn", {})
-            print(f"[Nexum] {key} already COMPLETED (cached) [done]")
-            client.close()
-            return result
-        if status["status"] in ("FAILED", "CANCELLED"):
-            print(f"[Nexum] {key} previous attempt {status['status']}, retrying...")
-            exec_id = None
-
+    # Register workflow (idempotent)
     client.register_workflow(research_workflow)
 
-    if exec_id is None:
-        exec_id = client.start_execution(
-            research_workflow.workflow_id,
-            {"query": query, "research_goal": research_goal},
-            version_hash=research_workflow.version_hash,
-        )
-        session[key] = exec_id
-        _save_session(session_prefix, session)
-        print(f"[Nexum] Submitted {exec_id[:16]}... ({query[:50]})")
-
-    deadline = time.time() + timeout
-    fast_until = time.time() + 2.0
-    last_log = 0.0
-
-    while time.time() < deadline:
-        status = client.get_status(exec_id)
-        st = status["status"]
-        if st == "COMPLETED":
-            result = status["completedNodes"].get("search_and_learn", {})
-            print(f"[Nexum] {exec_id[:16]}... done")
-            client.close()
-            return result
-        if st in ("FAILED", "CANCELLED"):
-            client.close()
-            raise RuntimeError(f"Nexum execution {exec_id} {st}")
-
-        now = time.time()
-        if now - last_log >= 1.0:
-            print(f"[Nexum] {exec_id[:16]}... waiting ({st})")
-            last_log = now
-
-        time.sleep(0.05 if time.time() < fast_until else 0.2)
-
-    client.close()
-    raise TimeoutError(f"Nexum execution {exec_id} timed out")
+    # The server dedupes on the key: a repeat call returns the existing execution
+    # (already COMPLETED on a re-run), a FAILED/CANCELLED one is started afresh.
+    exec_id = client.start_execution(
+        research_workflow.workflow_id,
+        {"query": query, "research_goal": research_goal},
+        version_hash=research_workflow.version_hash,
+        idempotency_key=f"{session_prefix}:{key}",
+    )
+    print(f"[Nexum] Submitted {exec_id[:16]}... ({query[:50]})")
+
+    # Block on the WatchExecution stream until the execution finishes
+    try:
+        status = client.wait_for(exec_id, timeout)
+    finally:
+        client.close()
+
+    st = status["status"]
+    if st in ("FAILED", "CANCELLED"):
+        raise RuntimeError(f"Nexum execution {exec_id} {st}")
+
+    result = status["completedNodes"].get("search_and_learn", {})
+    print(f"[Nexum] {exec_id[:16]}... done")
+    return result
 
 
 def research_all(
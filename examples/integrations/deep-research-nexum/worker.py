@@ -118,7 +118,8 @@ def handle_search_and_learn(ctx) -> LearnResult:
 # --- Workflow definition ---
 research_workflow = (
     workflow("deep-research")
-    .effect("search_and_learn", LearnResult, handler=handle_search_and_learn, depends_on=[])
+    .effect("search_and_learn", LearnResult, handler=handle_search_and_learn, depends_on=[],
+        executor="thread", lease_seconds=30)
     .build()
 )
 
@@ -129,8 +130,7 @@ async def main():
     logger.info(f"Registered workflow: {research_workflow.workflow_id} (compatibility: {compat})")
     logger.info("Worker started. Waiting for tasks on localhost:50051 ...")
     w = Worker([research_workflow], concurrency=4, poll_interval=0.1)
-    w._running = True
-    await w._run()
+    await w.run()
 
 
 if __name__ == "__main__":
@@ -65,8 +65,7 @@ async def main():
     logger.info(f"Registered workflow (compatibility: {compat})")
     logger.info("Worker started on localhost:50051 ...")
     w = Worker([tool_call_workflow], concurrency=4, poll_interval=0.1)
-    w._running = True
-    await w._run()
+    await w.run()
 
 
 if __name__ == "__main__":
@@ -13,8 +13,6 @@ Usage:
 import argparse
 import concurrent.futures
 import hashlib
-import json
-import os
 import sys
 import time
 
@@ -46,22 +44,6 @@ eval_workflow = (
 )
 
 
-# --- Session persistence ---
-
-def _session_file(prefix: str) -> str:
-    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f".session-{prefix}.json")
-
-
-def _load_session(prefix: str) -> dict:
-    path = _session_file(prefix)
-    return json.load(open(path, "r", encoding="utf-8")) if os.path.exists(path) else {}
-
-
-def _save_session(prefix: str, data: dict) -> None:
-    with open(_session_file(prefix), "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-
 def _make_key(sample: dict) -> str:
     payload = sample["sample_id"] + sample["question"] + sample["answer"]
     return hashlib.sha256(payload.encode()).hexdigest()[:16]
@@ -72,64 +54,41 @@ def _make_key(sample: dict) -> str:
 def submit_eval(sample: dict, session_prefix: str = "default", timeout: float = 120) -> dict:
     """Submit a single QA evaluation to Nexum. Returns cached result if already done."""
     key = _make_key(sample)
-    session = _load_session(session_prefix)
     client = NexumClient()
 
-    exec_id = session.get(key)
-    if exec_id:
-        status = client.get_status(exec_id)
-        if status["status"] == "COMPLETED":
-            result = status["completedNodes"].get("evaluate", {})
-            print(f"[Nexum] {sample['sample_id']} cached [done]")
-            client.close()
-            return result
-        if status["status"] in ("FAILED", "CANCELLED"):
-            exec_id = None
-
+    # Register workflow (idempotent)
     client.register_workflow(eval_workflow)
 
-    if exec_id is None:
-        exec_id = client.start_execution(
-            eval_workflow.workflow_id,
-            {
-                "sample_id": sample["sample_id"],
-                "question": sample["question"],
-                "answer": sample["answer"],
-                "contexts": sample["contexts"],
-            },
-            version_hash=eval_workflow.version_hash,
-        )
-        session[key] = exec_id
-        _save_session(session_prefix, session)
-        print(f"[Nexum] {sample['sample_id']} submitted ({exec_id[:12]}...)")
-
-    deadline = time.time() + timeout
-    fast_until = time.time() + 2.0
-    last_log = 0.0
-
-    while time.time() < deadline:
-        status = client.get_status(exec_id)
-        st = status["status"]
-        if st == "COMPLETED":
-            result = status["completedNodes"].get("evaluate", {})
-            faith = result.get("faithfulness", 0.0)
-            relev = result.get("answer_relevancy", 0.0)
-            print(f"[Nexum] {sample['sample_id']} done  faithfulness={faith:.2f}  relevancy={relev:.2f}")
-            client.close()
-            return result
-        if st in ("FAILED", "CANCELLED"):
-            client.close()
-            raise RuntimeError(f"Nexum execution {exec_id} {st}")
-
-        now = time.time()
-        if now - last_log >= 2.0:
-            print(f"[Nexum] {sample['sample_id']} waiting ({st})...")
-            last_log = now
-
-        time.sleep(0.05 if time.time() < fast_until else 0.2)
-
-    client.close()
-    raise TimeoutError(f"Nexum execution {exec_id} timed out")
+    # The server dedupes on the key: a repeat call returns the existing execution
+    # (already COMPLETED on a re-run), a FAILED/CANCELLED one is started afresh.
+    exec_id = client.start_execution(
+        eval_workflow.workflow_id,
+        {
+            "sample_id": sample["sample_id"],
+            "question": sample["question"],
+            "answer": sample["answer"],
+            "contexts": sample["contexts"],
+        },
+        version_hash=eval_workflow.version_hash,
+        idempotency_key=f"{session_prefix}:{key}",
+    )
+    print(f"[Nexum] {sample['sample_id']} submitted ({exec_id[:12]}...)")
+
+    # Block on the WatchExecution stream until the execution finishes
+    try:
+        status = client.wait_for(exec_id, timeout)
+    finally:
+        client.close()
+
+    st = status["status"]
+    if st in ("FAILED", "CANCELLED"):
+        raise RuntimeError(f"Nexum execution {exec_id} {st}")
+
+    result = status["completedNodes"].get("evaluate", {})
+    faith = result.get("faithfulness", 0.0)
+    relev = result.get("answer_relevancy", 0.0)
+    print(f"[Nexum] {sample['sample_id']} done  faithfulness={faith:.2f}  relevancy={relev:.2f}")
+    return result
 
 
 def evaluate_all(
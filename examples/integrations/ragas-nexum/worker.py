@@ -154,8 +154,7 @@ async def main():
     logger.info(f"Registered workflow: {eval_workflow.workflow_id} (compatibility: {compat})")
     logger.info("Worker started. Waiting for tasks on localhost:50051 ...")
     w = Worker([eval_workflow], concurrency=8, poll_interval=0.1)
-    w._running = True
-    await w._run()
+    await w.run()
 
 
 if __name__ == "__main__":
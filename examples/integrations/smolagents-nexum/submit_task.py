@@ -4,14 +4,12 @@ submit_task.py  ESubmit a smolagents tool call as a Nexum workflow execution.
 Uses a deterministic key (sha256 of tool_name + args) so that re-running the
 same agent session reuses completed results (crash recovery).
 
-Execution-id mappings are persisted in a local JSON session file so they
-survive process restarts.
+The key is sent as the execution's idempotency key, so the server hands back
+the existing execution to any process or host that submits the same call.
 """
 
 import hashlib
 import json
-import os
-import time
 import sys
 
 
@@ -19,24 +17,6 @@ from nexum import NexumClient
 from workflow import tool_call_workflow
 
 
-def _session_file(session_id: str) -> str:
-    return os.path.join(os.path.dirname(__file__), f".session-{session_id}.json")
-
-
-def _load_session(session_id: str) -> dict:
-    path = _session_file(session_id)
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return {}
-
-
-def _save_session(session_id: str, data: dict) -> None:
-    path = _session_file(session_id)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-
-
 def _make_key(tool_name: str, tool_args: dict) -> str:
     """Deterministic key for a tool call (tool_name + canonical args)."""
     payload = tool_name + json.dumps(tool_args, sort_keys=True)
@@ -56,70 +36,37 @@ def submit_tool_call(
     previous run of the same session, the cached result is returned
     immediately  Ethis is the crash-recovery mechanism.
 
-    Polling strategy: tight loop (50ms) for first 2s, then 200ms thereafter.
-    This minimises latency for fast EFFECTs while not hammering the server
-    for long-running ones.
+    Completion is pushed over the WatchExecution stream, so fast EFFECTs
+    return as soon as they finish without polling the server.
 
     Returns the tool result as a string.
     """
     key = _make_key(tool_name, tool_args)
-    session = _load_session(session_id)
-
     client = NexumClient()
 
-    # Check if we already have an execution_id for this key
-    exec_id = session.get(key)
-    if exec_id:
-        status = client.get_status(exec_id)
-        if status["status"] == "COMPLETED":
-            result = status["completedNodes"].get("tool_call", {}).get("result", "")
-            print(f"[Nexum] {key} already COMPLETED (cached) [done]")
-            client.close()
-            return result
-        if status["status"] in ("FAILED", "CANCELLED"):
-            # Previous attempt failed; start fresh
-            print(f"[Nexum] {key} previous attempt {status['status']}, retrying...")
-            exec_id = None
-
     # Register workflow (idempotent)
     client.register_workflow(tool_call_workflow)
 
-    if exec_id is None:
-        # Start a new execution
-        exec_id = client.start_execution(
-            tool_call_workflow.workflow_id,
-            {"tool_name": tool_name, "tool_args": tool_args},
-            version_hash=tool_call_workflow.version_hash,
-        )
-        # Persist mapping immediately so a crash right after submit still recovers
-        session[key] = exec_id
-        _save_session(session_id, session)
-        print(f"[Nexum] Submitted {exec_id[:16]}... ({tool_name})")
-
-    # Adaptive polling: tight (50ms) for first 2s ↁErelaxed (200ms) after
-    deadline = time.time() + timeout
-    fast_until = time.time() + 2.0
-    last_log = 0.0
-
-    while time.time() < deadline:
-        status = client.get_status(exec_id)
-        st = status["status"]
-        if st == "COMPLETED":
-            result = status["completedNodes"].get("tool_call", {}).get("result", "")
-            print(f"[Nexum] {exec_id[:16]}... done")
-            client.close()
-            return result
-        if st in ("FAILED", "CANCELLED"):
-            client.close()
-            raise RuntimeError(f"Nexum execution {exec_id} {st}")
-
-        # Log at most once per second to reduce noise
-        now = time.time()
-        if now - last_log >= 1.0:
-            print(f"[Nexum] {exec_id[:16]}... waiting ({st})")
-            last_log = now
-
-        time.sleep(0.05 if time.time() < fast_until else 0.2)
-
-    client.close()
-    raise TimeoutError(f"Nexum execution {exec_id} did not complete within {timeout}s")
+    # The server dedupes on the key: a repeat call returns the existing execution
+    # (already COMPLETED on a re-run), a FAILED/CANCELLED one is started afresh.
+    exec_id = client.start_execution(
+        tool_call_workflow.workflow_id,
+        {"tool_name": tool_name, "tool_args": tool_args},
+        version_hash=tool_call_workflow.version_hash,
+        idempotency_key=f"{session_id}:{key}",
+    )
+    print(f"[Nexum] Submitted {exec_id[:16]}... ({tool_name})")
+
+    # Block on the WatchExecution stream until the execution finishes
+    try:
+        status = client.wait_for(exec_id, timeout)
+    finally:
+        client.close()
+
+    st = status["status"]
+    if st in ("FAILED", "CANCELLED"):
+        raise RuntimeError(f"Nexum execution {exec_id} {st}")
+
+    result = status["completedNodes"].get("tool_call", {}).get("result", "")
+    print(f"[Nexum] {exec_id[:16]}... done")
+    return result
@@ -0,0 +1,121 @@
+"""
+bench_async_transport.py — blocking vs grpc.aio worker transport
+
+Runs N executions of a single I/O-bound async EFFECT (``asyncio.sleep``)
+through one worker process and reports tasks/sec for:
+
+  * blocking — the worker calls the synchronous ``NexumClient`` from inside
+    the event loop (the previous behaviour): every RPC stalls all in-flight
+    handlers for a full round-trip.
+  * aio      — the worker uses ``AsyncNexumClient`` end-to-end.
+
+Prerequisites:
+  - Nexum server running on localhost:50051
+  - pip install -e packages/sdk-python
+
+Usage:
+    python benchmarks/bench_async_transport.py --tasks 500 --concurrency 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from pydantic import BaseModel
+
+from nexum import workflow, NexumClient, Worker
+from nexum.client import AsyncNexumClient
+
+
+class Echo(BaseModel):
+    value: int
+
+
+def build_workflow(io_ms: float):
+    async def io_bound(ctx):
+        await asyncio.sleep(io_ms / 1000)
+        return Echo(value=ctx.input["i"])
+
+    return (
+        workflow(f"bench-async-transport-{int(io_ms)}ms")
+        .effect("io", Echo, io_bound)
+        .build()
+    )
+
+
+class _BlockingClient:
+    """Async facade over the sync client: awaits nothing, blocks the loop."""
+
+    def __init__(self, host: str, port: int):
+        self._sync = NexumClient(host=host, port=port)
+
+    async def poll_task(self, worker_id, version_hash="", wait_timeout_ms=0, *, version_hashes=None):
+        return self._sync.poll_task(worker_id, version_hash, wait_timeout_ms, version_hashes=version_hashes)
+
+    async def complete_task(self, task_id, output):
+        self._sync.complete_task(task_id, output)
+
+    async def fail_task(self, task_id, error):
+        self._sync.fail_task(task_id, error)
+
+    async def get_status(self, execution_id):
+        return self._sync.get_status(execution_id)
+
+    async def close(self):
+        self._sync.close()
+
+
+class BlockingWorker(Worker):
+    def _make_client(self):
+        return _BlockingClient(self._host, self._port)
+
+
+async def run_mode(mode: str, wf, tasks: int, concurrency: int) -> float:
+    client = NexumClient()
+    client.register_workflow(wf)
+    exec_ids = [
+        client.start_execution(wf.workflow_id, {"i": i}, version_hash=wf.version_hash)
+        for i in range(tasks)
+    ]
+
+    worker_cls = BlockingWorker if mode == "blocking" else Worker
+    w = worker_cls([wf], concurrency=concurrency, poll_interval=0.01)
+    started = time.perf_counter()
+    worker_task = asyncio.create_task(w.run(handle_signals=False))
+
+    status_client = AsyncNexumClient()
+    pending = set(exec_ids)
+    while pending:
+        await asyncio.sleep(0.05)
+        for exec_id in list(pending):
+            status = await status_client.get_status(exec_id)
+            if status["status"] in ("COMPLETED", "FAILED", "CANCELLED"):
+                pending.discard(exec_id)
+    elapsed = time.perf_counter() - started
+
+    await w.shutdown()
+    await worker_task
+    await status_client.close()
+    client.close()
+    return tasks / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--io-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    wf = build_workflow(args.io_ms)
+    print(f"{args.tasks} tasks, {args.io_ms:.0f} ms I/O each, concurrency={args.concurrency}")
+    print(f"{'mode':<10} {'tasks/sec':>10}")
+    for mode in ("blocking", "aio"):
+        rate = await run_mode(mode, wf, args.tasks, args.concurrency)
+        print(f"{mode:<10} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+bench_bulk_start.py — submission throughput, StartExecution loop vs StartExecutions
+
+Submits N executions of a one-node workflow and reports executions/sec for:
+
+  * single — one ``start_execution`` RPC per input (the previous pattern,
+    optionally fanned out over a thread pool like the ragas / scrapegraph
+    integrations do).
+  * bulk   — ``start_executions``: inputs go ``--batch-size`` at a time, each
+    batch inserted in one server-side transaction.
+
+No worker is started; only the submission path is measured.
+
+Prerequisites:
+  - Nexum server running on localhost:50051
+  - pip install -e packages/sdk-python
+
+Usage:
+    python benchmarks/bench_bulk_start.py --items 10000 --threads 8 --batch-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import time
+
+from pydantic import BaseModel
+
+from nexum import workflow, NexumClient
+
+
+class Score(BaseModel):
+    value: float
+
+
+def build_workflow():
+    return (
+        workflow("bench-bulk-start")
+        .compute("score", Score, lambda ctx: Score(value=0.0))
+        .build()
+    )
+
+
+def run_single(client: NexumClient, wf, inputs: list[dict], threads: int) -> float:
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(
+            lambda data: client.start_execution(wf.workflow_id, data, version_hash=wf.version_hash),
+            inputs,
+        ))
+    return len(inputs) / (time.perf_counter() - started)
+
+
+def run_bulk(client: NexumClient, wf, inputs: list[dict], batch_size: int) -> float:
+    started = time.perf_counter()
+    client.start_executions(wf.workflow_id, inputs, wf.version_hash, batch_size=batch_size)
+    return len(inputs) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    wf = build_workflow()
+    client = NexumClient()
+    client.register_workflow(wf)
+    inputs = [{"sample_id": f"s{i}", "question": "q" * 64} for i in range(args.items)]
+
+    print(f"{args.items} executions")
+    print(f"{'mode':<24} {'exec/sec':>10}")
+    rate = run_single(client, wf, inputs, threads=1)
+    print(f"{'single':<24} {rate:>10.1f}")
+    rate = run_single(client, wf, inputs, threads=args.threads)
+    print(f"{f'single x{args.threads} threads':<24} {rate:>10.1f}")
+    rate = run_bulk(client, wf, inputs, args.batch_size)
+    print(f"{f'bulk (batch {args.batch_size})':<24} {rate:>10.1f}")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+bench_compression.py — compression ratio and CPU cost for typical node outputs
+
+Encodes crawl-style payloads (markdown pages, extracted JSON records) of each
+size and measures, without a server:
+
+  * gzip level 1 / 6 — what ``NexumClient(compression="gzip")`` sends on the wire
+    (grpc uses zlib's default level) and what the server stores for claim-check blobs
+  * deflate           — ``compression="deflate"``
+  * zstd level 3      — only if ``zstandard`` is installed; the server accepts zstd
+    from clients that offer it, grpc-python does not
+
+For each codec it prints the compressed size as a percentage of the original and
+the compress / decompress time per payload.
+
+Prerequisites:
+  - pip install -e packages/sdk-python
+  - optional: pip install zstandard
+
+Usage:
+    python benchmarks/bench_compression.py --sizes 10240 102400 1048576 10485760
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import time
+import zlib
+
+
+WORDS = (
+    "agent workflow crawl result page markdown research learning source summary "
+    "the of and to in is for with on that by this from as are be an at"
+).split()
+
+
+def make_markdown(size: int, rng: random.Random) -> str:
+    lines = []
+    total = 0
+    while total < size:
+        if rng.random() < 0.1:
+            line = "## " + " ".join(rng.choices(WORDS, k=5)).title()
+        elif rng.random() < 0.2:
+            line = f"- [{rng.choice(WORDS)}](https://example.com/{rng.randrange(10**6)})"
+        else:
+            line = " ".join(rng.choices(WORDS, k=rng.randrange(8, 30))) + "."
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+def make_payload(kind: str, size: int) -> bytes:
+    rng = random.Random(size)
+    if kind == "markdown":
+        return json.dumps({"url": "https://example.com", "markdown": make_markdown(size, rng)}).encode()
+    records = []
+    while sum(len(r) for r in records) < size:
+        records.append(json.dumps({
+            "id": rng.randrange(10**9),
+            "title": " ".join(rng.choices(WORDS, k=6)),
+            "score": round(rng.random(), 4),
+            "tags": rng.sample(WORDS, 3),
+        }))
+    return ("[" + ",".join(records) + "]").encode()
+
+
+def codecs() -> dict:
+    found = {
+        "gzip-1": (lambda d: gzip.compress(d, 1), gzip.decompress),
+        "gzip-6": (lambda d: gzip.compress(d, 6), gzip.decompress),
+        "deflate": (zlib.compress, zlib.decompress),
+    }
+    try:
+        import zstandard
+    except ImportError:
+        return found
+    compressor, decompressor = zstandard.ZstdCompressor(level=3), zstandard.ZstdDecompressor()
+    found["zstd-3"] = (compressor.compress, decompressor.decompress)
+    return found
+
+
+def time_per_call(fn, min_seconds: float) -> float:
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < min_seconds:
+        fn()
+        calls += 1
+    return elapsed / calls * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10240, 102400, 1048576, 10485760])
+    parser.add_argument("--kinds", nargs="+", default=["markdown", "records"], choices=["markdown", "records"])
+    parser.add_argument("--seconds", type=float, default=0.5, help="minimum time per measurement")
+    args = parser.parse_args()
+
+    print(f"{'payload':>18} {'codec':>8} {'size %':>7} {'compress ms':>12} {'decompress ms':>14}")
+    for kind in args.kinds:
+        for size in args.sizes:
+            data = make_payload(kind, size)
+            label = f"{kind} {len(data) / 1024:.0f} KB"
+            for name, (compress, decompress) in codecs().items():
+                packed = compress(data)
+                assert decompress(packed) == data
+                ratio = len(packed) / len(data) * 100
+                compress_ms = time_per_call(lambda: compress(data), args.seconds)
+                decompress_ms = time_per_call(lambda: decompress(packed), args.seconds)
+                print(f"{label:>18} {name:>8} {ratio:>6.1f}% {compress_ms:>12.3f} {decompress_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+bench_lease_contention.py — task leasing with many concurrent Worker processes
+
+Starts ``--items`` executions of a one-node workflow, then drains them with N
+separate ``Worker`` processes all polling the same version hash. For each N in
+``--workers`` it reports:
+
+  * tasks/sec    — wall-clock drain throughput
+  * duplicates   — handler runs beyond one per execution (must be 0: a task
+    leased twice would run twice)
+  * empty polls  — polls that came back empty; with a select-then-update
+    lease this climbs with N as workers collide on the same oldest rows
+
+Run it against PostgreSQL (``DATABASE_URL=postgres://…``) to exercise the
+``FOR UPDATE SKIP LOCKED`` claim; SQLite serialises writers, so it shows the
+single-node ceiling instead.
+
+Prerequisites:
+  - Nexum server running on localhost:50051
+  - pip install -e packages/sdk-python
+
+Usage:
+    python benchmarks/bench_lease_contention.py --items 5000 --workers 1 4 16 32 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import multiprocessing
+import time
+
+from pydantic import BaseModel
+
+from nexum import workflow, NexumClient, Worker
+from nexum.client import AsyncNexumClient
+
+
+class Done(BaseModel):
+    item: int
+
+
+_runs: collections.Counter = collections.Counter()
+
+
+def record(ctx) -> Done:
+    _runs[ctx.input["item"]] += 1
+    return Done(item=ctx.input["item"])
+
+
+def build_workflow(n_workers: int):
+    return (
+        workflow(f"bench-lease-contention-{n_workers}")
+        .compute("record", Done, record)
+        .build()
+    )
+
+
+class _CountingClient(AsyncNexumClient):
+    empty_polls = 0
+
+    async def poll_tasks(self, *args, **kwargs):
+        tasks = await super().poll_tasks(*args, **kwargs)
+        if not tasks:
+            _CountingClient.empty_polls += 1
+        return tasks
+
+
+class CountingWorker(Worker):
+    def _make_client(self):
+        return _CountingClient(host=self._host, port=self._port)
+
+
+async def _serve(n_workers: int, concurrency: int, stop) -> None:
+    w = CountingWorker(
+        [build_workflow(n_workers)],
+        concurrency=concurrency,
+        poll_batch_size=concurrency,
+        poll_interval=0.005,
+    )
+    runner = asyncio.create_task(w.run(handle_signals=False))
+    while not stop.is_set():
+        await asyncio.sleep(0.05)
+    await w.shutdown()
+    await runner
+
+
+def worker_process(n_workers: int, concurrency: int, stop, results) -> None:
+    asyncio.run(_serve(n_workers, concurrency, stop))
+    results.put((dict(_runs), _CountingClient.empty_polls))
+
+
+def run(n_workers: int, items: int, concurrency: int) -> tuple[float, int, int]:
+    wf = build_workflow(n_workers)
+    client = NexumClient()
+    client.register_workflow(wf)
+    exec_ids = client.start_executions(wf.workflow_id, [{"item": i} for i in range(items)], wf.version_hash)
+
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker_process, args=(n_workers, concurrency, stop, results))
+        for _ in range(n_workers)
+    ]
+    started = time.perf_counter()
+    for p in procs:
+        p.start()
+    for exec_id in exec_ids:
+        client.wait_for(exec_id, timeout=600)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    runs: collections.Counter = collections.Counter()
+    empty_polls = 0
+    for _ in procs:
+        counts, empties = results.get()
+        runs.update(counts)
+        empty_polls += empties
+    for p in procs:
+        p.join()
+    client.close()
+
+    duplicates = sum(runs.values()) - len(runs)
+    return items / elapsed, duplicates, empty_polls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{args.items} executions, concurrency={args.concurrency} per worker")
+    print(f"{'workers':>8} {'tasks/sec':>10} {'duplicates':>11} {'empty polls':>12}")
+    for n in args.workers:
+        rate, duplicates, empty_polls = run(n, args.items, args.concurrency)
+        print(f"{n:>8} {rate:>10.1f} {duplicates:>11} {empty_polls:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_long_poll.py — end-to-end latency of a sequential chain, interval vs long-poll
+
+Runs a 10-node sequential COMPUTE chain (n0 → n1 → … → n9) one execution at a
+time and reports p50 / p95 wall-clock latency from StartExecution to
+COMPLETED, plus the number of PollTask / PollTasks calls the worker made:
+
+  * interval  — empty polls sleep ``poll_interval`` before retrying, so each
+    hop waits up to one interval for the next node to be picked up.
+  * long-poll — ``Worker(long_poll_timeout=…)``: the server holds the poll
+    open and answers as soon as the next node is scheduled.
+
+Prerequisites:
+  - Nexum server running on localhost:50051
+  - pip install -e packages/sdk-python
+
+Usage:
+    python benchmarks/bench_long_poll.py --runs 20 --nodes 10 --poll-interval 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from pydantic import BaseModel
+
+from nexum import workflow, NexumClient, Worker
+from nexum.client import AsyncNexumClient
+
+
+class Step(BaseModel):
+    value: int
+
+
+def build_workflow(nodes: int):
+    builder = workflow(f"bench-long-poll-{nodes}")
+    builder = builder.compute("n0", Step, lambda ctx: Step(value=0))
+    for i in range(1, nodes):
+        prev = f"n{i - 1}"
+        builder = builder.compute(
+            f"n{i}", Step, lambda ctx, prev=prev: Step(value=ctx.get(prev).value + 1),
+            depends_on=[prev],
+        )
+    return builder.build()
+
+
+class _CountingClient(AsyncNexumClient):
+    polls = 0
+
+    async def poll_task(self, *args, **kwargs):
+        _CountingClient.polls += 1
+        return await super().poll_task(*args, **kwargs)
+
+    async def poll_tasks(self, *args, **kwargs):
+        _CountingClient.polls += 1
+        return await super().poll_tasks(*args, **kwargs)
+
+
+class CountingWorker(Worker):
+    def _make_client(self):
+        return _CountingClient(host=self._host, port=self._port)
+
+
+async def run_mode(mode: str, wf, runs: int, poll_interval: float) -> tuple[list[float], int]:
+    client = NexumClient()
+    client.register_workflow(wf)
+
+    long_poll = 5.0 if mode == "long-poll" else 0.0
+    w = CountingWorker([wf], concurrency=4, poll_interval=poll_interval, long_poll_timeout=long_poll)
+    worker_task = asyncio.create_task(w.run(handle_signals=False))
+    _CountingClient.polls = 0
+
+    status_client = AsyncNexumClient()
+    latencies = []
+    for i in range(runs):
+        started = time.perf_counter()
+        exec_id = client.start_execution(wf.workflow_id, {"run": i}, version_hash=wf.version_hash)
+        while True:
+            status = await status_client.get_status(exec_id)
+            if status["status"] in ("COMPLETED", "FAILED", "CANCELLED"):
+                break
+            await asyncio.sleep(0.002)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    polls = _CountingClient.polls
+    await w.shutdown()
+    await worker_task
+    await status_client.close()
+    client.close()
+    return latencies, polls
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--nodes", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    args = parser.parse_args()
+
+    wf = build_workflow(args.nodes)
+    print(f"{args.nodes}-node chain, {args.runs} runs, poll_interval={args.poll_interval}s")
+    print(f"{'mode':<10} {'p50 ms':>9} {'p95 ms':>9} {'polls':>7}")
+    for mode in ("interval", "long-poll"):
+        latencies, polls = await run_mode(mode, wf, args.runs, args.poll_interval)
+        p50 = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        print(f"{mode:<10} {p50:>9.1f} {p95:>9.1f} {polls:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
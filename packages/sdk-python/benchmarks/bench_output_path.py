@@ -0,0 +1,90 @@
+"""
+bench_output_path.py — per-task serialization cost, 1 KB to 5 MB payloads
+
+Measures the worker's JSON handling for a task of each payload size, without
+a server (the protobuf message is built but not sent):
+
+  * output, before — ``model_dump_json`` -> ``json.loads`` -> ``json.dumps``
+    into ``CompleteRequest`` (three full passes)
+  * output, after  — ``model_dump_json`` passed straight into ``CompleteRequest``
+  * input, before  — ``json.loads(input_json)``
+  * input, after   — ``pydantic_core.from_json(input_json)``
+
+Prerequisites:
+  - pip install -e packages/sdk-python
+
+Usage:
+    python benchmarks/bench_output_path.py --sizes 1024 102400 1048576 5242880
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import pydantic_core
+from pydantic import BaseModel
+
+from nexum.client import _complete_request
+
+
+class Chunk(BaseModel):
+    id: int
+    text: str
+    score: float
+
+
+class Document(BaseModel):
+    url: str
+    chunks: list[Chunk]
+
+
+def make_document(size: int) -> Document:
+    chunk = Chunk(id=0, text="x" * 200, score=0.5)
+    per_chunk = len(chunk.model_dump_json()) + 1
+    return Document(
+        url="https://example.com/doc",
+        chunks=[Chunk(id=i, text="x" * 200, score=i / 7) for i in range(max(1, size // per_chunk))],
+    )
+
+
+def time_per_call(fn, min_seconds: float) -> float:
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < min_seconds:
+        fn()
+        calls += 1
+    return elapsed / calls * 1000
+
+
+def output_before(doc: Document):
+    return _complete_request("t", json.loads(doc.model_dump_json()))
+
+
+def output_after(doc: Document):
+    return _complete_request("t", doc.model_dump_json())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 10240, 102400, 1048576, 5242880])
+    parser.add_argument("--seconds", type=float, default=1.0, help="minimum time per measurement")
+    args = parser.parse_args()
+
+    print(f"{'payload':>10} {'out before ms':>14} {'out after ms':>13} {'in before ms':>13} {'in after ms':>12}")
+    for size in args.sizes:
+        doc = make_document(size)
+        envelope = json.dumps({"input": {"n": 1}, "deps": {"fetch": doc.model_dump(mode="json")}})
+        timings = [
+            time_per_call(lambda: output_before(doc), args.seconds),
+            time_per_call(lambda: output_after(doc), args.seconds),
+            time_per_call(lambda: json.loads(envelope), args.seconds),
+            time_per_call(lambda: pydantic_core.from_json(envelope), args.seconds),
+        ]
+        label = f"{len(envelope) / 1024:.0f} KB"
+        print(f"{label:>10} {timings[0]:>14.3f} {timings[1]:>13.3f} {timings[2]:>13.3f} {timings[3]:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
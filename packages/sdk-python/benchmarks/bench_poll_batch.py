@@ -0,0 +1,84 @@
+"""
+bench_poll_batch.py — task drain throughput vs PollTasks batch size
+
+Queues N tiny COMPUTE tasks and drains them with one worker at
+``poll_batch_size`` 1 / 8 / 64, reporting tasks/sec. Batch size 1 uses the
+single-task PollTask RPC; larger sizes lease up to that many tasks per
+PollTasks round-trip.
+
+Prerequisites:
+  - Nexum server running on localhost:50051
+  - pip install -e packages/sdk-python
+
+Usage:
+    python benchmarks/bench_poll_batch.py --items 2000 --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from pydantic import BaseModel
+
+from nexum import workflow, NexumClient, Worker
+from nexum.client import AsyncNexumClient
+
+
+class Doubled(BaseModel):
+    value: int
+
+
+def build_workflow():
+    return (
+        workflow("bench-poll-batch")
+        .compute("double", Doubled, lambda ctx: Doubled(value=ctx.input["i"] * 2))
+        .build()
+    )
+
+
+async def drain(wf, items: int, concurrency: int, batch_size: int) -> float:
+    client = NexumClient()
+    client.register_workflow(wf)
+    exec_ids = client.start_executions(wf.workflow_id, ({"i": i} for i in range(items)), wf.version_hash)
+
+    w = Worker([wf], concurrency=concurrency, poll_interval=0.01, poll_batch_size=batch_size)
+    started = time.perf_counter()
+    worker_task = asyncio.create_task(w.run(handle_signals=False))
+
+    status_client = AsyncNexumClient()
+    pending = list(exec_ids)
+    while pending:
+        await asyncio.sleep(0.05)
+        # Executions finish roughly in submission order; check from the tail.
+        status = await status_client.get_status(pending[-1])
+        if status["status"] in ("COMPLETED", "FAILED", "CANCELLED"):
+            results = await asyncio.gather(*(status_client.get_status(e) for e in pending))
+            pending = [e for e, r in zip(pending, results) if r["status"] == "RUNNING"]
+    elapsed = time.perf_counter() - started
+
+    await w.shutdown()
+    await worker_task
+    await status_client.close()
+    client.close()
+    return items / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64])
+    args = parser.parse_args()
+
+    wf = build_workflow()
+    print(f"{args.items} tasks, concurrency={args.concurrency}")
+    print(f"{'batch':>6} {'tasks/sec':>10}")
+    for batch_size in args.batch_sizes:
+        rate = await drain(wf, args.items, args.concurrency, batch_size)
+        print(f"{batch_size:>6} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+bench_process_pool.py — CPU-bound COMPUTE throughput per executor
+
+Runs N executions of a single CPU-bound COMPUTE node (a pure-Python loop of
+``--work`` iterations) through one worker process and reports tasks/sec for
+each ``executor`` setting:
+
+  * inline  — the handler runs on the worker's event loop, so every task
+    also stalls polling and completions.
+  * thread  — the handler runs in a worker thread; frees the loop, but the
+    GIL still serialises pure-Python work.
+  * process — the handler runs in the worker's process pool and uses all
+    cores (``--processes`` pool processes, default: one per core).
+
+Prerequisites:
+  - Nexum server running on localhost:50051
+  - pip install -e packages/sdk-python
+
+Usage:
+    python benchmarks/bench_process_pool.py --tasks 200 --work 2000000 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+from pydantic import BaseModel
+
+from nexum import workflow, NexumClient, Worker
+
+
+class Score(BaseModel):
+    value: int
+
+
+def burn(ctx) -> Score:
+    total = 0
+    for i in range(ctx.input["work"]):
+        total = (total + i * i) % 1_000_003
+    return Score(value=total)
+
+
+def build_workflow(executor: str):
+    return (
+        workflow(f"bench-process-pool-{executor}")
+        .compute("burn", Score, burn, executor=executor)
+        .build()
+    )
+
+
+async def run_mode(executor: str, tasks: int, work: int, concurrency: int, processes: int | None) -> float:
+    wf = build_workflow(executor)
+    client = NexumClient()
+    client.register_workflow(wf)
+    exec_ids = client.start_executions(wf.workflow_id, [{"work": work} for _ in range(tasks)], wf.version_hash)
+
+    w = Worker([wf], concurrency=concurrency, long_poll_timeout=1.0, process_pool_size=processes)
+    started = time.perf_counter()
+    worker_task = asyncio.create_task(w.run(handle_signals=False))
+    for exec_id in exec_ids:
+        await asyncio.to_thread(client.wait_for, exec_id, 600)
+    elapsed = time.perf_counter() - started
+
+    await w.shutdown()
+    await worker_task
+    client.close()
+    return tasks / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--work", type=int, default=2_000_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{args.tasks} tasks, {args.work} iterations each, concurrency={args.concurrency}, cores={os.cpu_count()}")
+    print(f"{'executor':<10} {'tasks/sec':>10}")
+    for executor in ("inline", "thread", "process"):
+        rate = await run_mode(executor, args.tasks, args.work, args.concurrency, args.processes)
+        print(f"{executor:<10} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
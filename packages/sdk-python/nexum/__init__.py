@@ -1,5 +1,7 @@
 from .builder import workflow, WorkflowDef
-from .client import NexumClient
+from .client import NexumClient, AsyncNexumClient
 from .worker import worker, Worker
+from .limiter import AdaptiveLimiter
+from .cache import ResultCache
 
-__all__ = ["workflow", "WorkflowDef", "NexumClient", "worker", "Worker"]
+__all__ = ["workflow", "WorkflowDef", "NexumClient", "AsyncNexumClient", "worker", "Worker", "AdaptiveLimiter", "ResultCache"]
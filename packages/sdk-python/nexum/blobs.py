@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+import threading
+from typing import Any
+
+import pydantic_core
+
+# Key the server sets on a stored output that points at a blob file instead of holding it.
+CLAIM_CHECK_MARKER = "__nexum_claim_check__"
+
+# Bytes asked for per FetchBlob call; the server caps each reply at 2 MB.
+FETCH_CHUNK_SIZE = 2 * 1024 * 1024
+
+
+def is_claim_check(value: Any) -> bool:
+    return isinstance(value, dict) and value.get(CLAIM_CHECK_MARKER) is True
+
+
+def decode_blob(pointer: dict, data: bytes) -> Any:
+    """Decode a blob's stored bytes; server-spilled outputs are gzipped at rest (``"encoding": "gzip"``)."""
+    if pointer.get("encoding") == "gzip":
+        data = gzip.decompress(data)
+    return pydantic_core.from_json(data)
+
+
+class BlobStore:
+    """
+    Resolves claim-check pointers to the outputs they stand for.
+
+    A blob whose file is visible from this host (the pointer's absolute path, or
+    ``blob_dir`` when the server's blob directory is mounted elsewhere) is read
+    from disk. A gzipped blob (what the server spills) is memory-mapped and
+    inflated straight out of the page cache, so no copy of the compressed file
+    is made. Plain JSON is read into bytes: the JSON parser only takes bytes, so
+    mapping it would add a copy rather than save one. Anything else is pulled
+    from the server with ranged ``FetchBlob`` calls over a blocking channel,
+    opened on first use; the worker only makes them off the event loop (see
+    ``ContextView.aget``).
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 50051, *, blob_dir: str | None = None):
+        self._host = host
+        self._port = port
+        self._blob_dir = blob_dir
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # Shipped to process-pool workers without the gRPC channel; each opens its own.
+        state = self.__dict__.copy()
+        state["_client"] = None
+        del state["_client_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._client_lock = threading.Lock()
+
+    def is_local(self, pointer: dict) -> bool:
+        """Whether ``pointer``'s blob file is visible from this host, so reading it makes no RPC."""
+        return self._local_path(pointer) is not None
+
+    def load(self, pointer: dict) -> Any:
+        """The decoded JSON output behind ``pointer``."""
+        path = self._local_path(pointer)
+        if path is not None and pointer.get("encoding") == "gzip":
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pydantic_core.from_json(gzip.decompress(mm))
+        return decode_blob(pointer, self.read(pointer))
+
+    def read(self, pointer: dict, offset: int = 0, length: int | None = None) -> bytes:
+        """
+        ``length`` bytes of the blob from ``offset`` (to the end when ``length`` is None).
+
+        Offsets are into the stored file, which is compressed when the pointer has an ``encoding``.
+        """
+        path = self._local_path(pointer)
+        if path is not None:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                return f.read() if length is None else f.read(length)
+        return self._fetch(pointer["blob_id"], offset, length)
+
+    def _local_path(self, pointer: dict) -> str | None:
+        candidates = []
+        if self._blob_dir is not None:
+            candidates.append(os.path.join(self._blob_dir, f"{pointer['blob_id']}.json"))
+        path = pointer.get("path")
+        if path and os.path.isabs(path):
+            candidates.append(path)
+        size = pointer.get("size")
+        for candidate in candidates:
+            try:
+                # A size mismatch means another server's file (or a partial write); go remote.
+                if size and os.path.getsize(candidate) == size:
+                    return candidate
+            except OSError:
+                continue
+        return None
+
+    def _fetch(self, blob_id: str, offset: int, length: int | None) -> bytes:
+        with self._client_lock:
+            if self._client is None:
+                from .client import NexumClient  # client imports this module
+
+                self._client = NexumClient(host=self._host, port=self._port)
+        chunks = []
+        remaining = length
+        while remaining is None or remaining > 0:
+            want = FETCH_CHUNK_SIZE if remaining is None else min(remaining, FETCH_CHUNK_SIZE)
+            data, total_size = self._client.fetch_blob(blob_id, offset, want)
+            if not data:
+                break
+            chunks.append(data)
+            offset += len(data)
+            if remaining is not None:
+                remaining -= len(data)
+            if offset >= total_size:
+                break
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
@@ -1,23 +1,40 @@
 from __future__ import annotations
 
 import hashlib
+import inspect
 import json
 from typing import Any, Callable, Type
 
 from pydantic import BaseModel
 
+from .codec import JSON_CONTENT_TYPE, Codec, get_codec
 from .context import ContextView
 
+# Where a synchronous handler runs on the worker (async handlers always run on the event loop).
+EXECUTORS = ("inline", "thread", "process")
+
 
 class NodeDef:
     def __init__(
         self,
         node_id: str,
-        node_type: str,  # COMPUTE, EFFECT, ROUTER, HUMAN_APPROVAL, TIMER
+        node_type: str,  # COMPUTE, EFFECT, ROUTER, HUMAN_APPROVAL, TIMER, MAP, REDUCE
         output_model: Type[BaseModel] | None,
         handler: Callable | None,
         dependencies: list[str],
         delay_seconds: int | None = None,
+        executor: str = "inline",
+        lease_seconds: int | None = None,
+        cache: bool = False,
+        items_fn: Callable | None = None,
+        max_parallel: int | None = None,
+        batch_size: int | None = None,
+        page_size: int = 1000,
+        max_pending: int = 10_000,
+        map_node_id: str | None = None,
+        fold: Callable | None = None,
+        initial: Any = None,
+        fold_chunk: int = 500,
     ):
         self.id = node_id
         self.type = node_type
@@ -25,15 +42,41 @@ class NodeDef:
         self.handler = handler
         self.dependencies = dependencies
         self.delay_seconds = delay_seconds
+        self.executor = executor
+        self.lease_seconds = lease_seconds
+        self.cache = cache
+        # MAP: items_fn(ctx) lists the items, handler(ctx, item, index) runs once per item.
+        self.items_fn = items_fn
+        self.max_parallel = max_parallel
+        # With batch_size, handler(ctx, items, start_index) runs once per batch and returns a list.
+        self.batch_size = batch_size
+        # Streaming an items_fn iterator: items per AppendMapItems page, and how many may await a result.
+        self.page_size = page_size
+        self.max_pending = max_pending
+        # REDUCE: the MAP node whose results it aggregates.
+        self.map_node_id = map_node_id
+        # Folding REDUCE: fold(ctx, acc, results) per chunk of up to fold_chunk results, from initial.
+        self.fold = fold
+        self.initial = initial
+        self.fold_chunk = fold_chunk
 
 
 class WorkflowDef:
-    def __init__(self, workflow_id: str, version_hash: str, ir_json: str, nodes: list[NodeDef]):
+    def __init__(
+        self,
+        workflow_id: str,
+        version_hash: str,
+        ir_json: str,
+        nodes: list[NodeDef],
+        codec: Codec | None = None,
+    ):
         self.workflow_id = workflow_id
         self.version_hash = version_hash
         self.ir_json = ir_json
         self.nodes = nodes
+        self.codec = codec or get_codec("json")
         self._node_map = {n.id: n for n in nodes}
+        self.output_models = {n.id: n.output_model for n in nodes if n.output_model is not None}
 
     def get_node(self, node_id: str) -> NodeDef | None:
         return self._node_map.get(node_id)
@@ -62,8 +105,9 @@ class WorkflowBuilder:
         )
     """
 
-    def __init__(self, workflow_id: str):
+    def __init__(self, workflow_id: str, codec: str = "json"):
         self.workflow_id = workflow_id
+        self._codec = get_codec(codec)
         self._nodes: list[NodeDef] = []
         self._node_order: list[str] = []
 
@@ -71,6 +115,18 @@ class WorkflowBuilder:
         """Default dependency = all previous nodes (matches TS SDK behavior)."""
         return list(self._node_order)
 
+    @staticmethod
+    def _check_executor(node_id: str, handler: Callable, executor: str) -> None:
+        if executor not in EXECUTORS:
+            raise ValueError(f"Node '{node_id}': executor must be one of {EXECUTORS}, got {executor!r}")
+        if executor != "inline" and inspect.iscoroutinefunction(handler):
+            raise ValueError(f"Node '{node_id}': async handlers run on the event loop; executor={executor!r} needs a sync handler")
+
+    @staticmethod
+    def _check_lease(node_id: str, lease_seconds: int | None) -> None:
+        if lease_seconds is not None and lease_seconds < 1:
+            raise ValueError(f"Node '{node_id}': lease_seconds must be at least 1, got {lease_seconds}")
+
     def effect(
         self,
         node_id: str,
@@ -78,6 +134,8 @@ class WorkflowBuilder:
         handler: Callable,
         *,
         depends_on: list[str] | None = None,
+        executor: str = "inline",
+        lease_seconds: int | None = None,
     ) -> WorkflowBuilder:
         """
         Add an **EFFECT** node — a side-effectful async operation (API call, DB write, etc.).
@@ -89,9 +147,18 @@ class WorkflowBuilder:
         :param output_model: Pydantic BaseModel class defining the output schema.
         :param handler: Async callable receiving a ``ContextView`` and returning ``output_model``.
         :param depends_on: Explicit list of node IDs to depend on (overrides sequential default).
+        :param executor: Where a sync handler runs — ``"inline"`` (event loop), ``"thread"`` or ``"process"``.
+        :param lease_seconds: How long the server waits without a heartbeat before handing the
+            task to another worker (server default: 60). The worker heartbeats every third of
+            this while the handler runs, so long handlers are never re-leased. Heartbeats
+            are sent from the event loop: give long sync handlers ``executor="thread"``.
         """
+        self._check_executor(node_id, handler, executor)
+        self._check_lease(node_id, lease_seconds)
         deps = depends_on if depends_on is not None else self._current_deps()
-        self._nodes.append(NodeDef(node_id, "EFFECT", output_model, handler, deps))
+        self._nodes.append(NodeDef(
+            node_id, "EFFECT", output_model, handler, deps, executor=executor, lease_seconds=lease_seconds
+        ))
         self._node_order.append(node_id)
         return self
 
@@ -102,6 +169,9 @@ class WorkflowBuilder:
         handler: Callable,
         *,
         depends_on: list[str] | None = None,
+        executor: str = "inline",
+        lease_seconds: int | None = None,
+        cache: bool = False,
     ) -> WorkflowBuilder:
         """
         Add a **COMPUTE** node — a pure, deterministic function.
@@ -113,9 +183,166 @@ class WorkflowBuilder:
         :param output_model: Pydantic BaseModel class defining the output schema.
         :param handler: Callable receiving a ``ContextView`` and returning ``output_model``.
         :param depends_on: Explicit list of node IDs to depend on.
+        :param executor: Where the handler runs — ``"inline"`` (on the worker's event loop,
+            the default), ``"thread"`` (worker thread pool, for blocking I/O or GIL-releasing
+            code) or ``"process"`` (worker process pool, for CPU-bound work). With
+            ``"process"`` the handler and its output model must be importable at module level.
+        :param lease_seconds: Heartbeat lease for the task (see :meth:`effect`).
+        :param cache: Memoize the output on the worker, keyed by node id, version hash and
+            a hash of the task's input and dependency outputs; a hit completes the task
+            without calling the handler. Only for handlers that really are pure. Like
+            ``executor`` this is a worker-side choice and does not change ``version_hash``.
         """
+        self._check_executor(node_id, handler, executor)
+        self._check_lease(node_id, lease_seconds)
         deps = depends_on if depends_on is not None else self._current_deps()
-        self._nodes.append(NodeDef(node_id, "COMPUTE", output_model, handler, deps))
+        self._nodes.append(NodeDef(
+            node_id, "COMPUTE", output_model, handler, deps,
+            executor=executor, lease_seconds=lease_seconds, cache=cache,
+        ))
+        self._node_order.append(node_id)
+        return self
+
+    def map(
+        self,
+        node_id: str,
+        items_fn: Callable,
+        item_handler: Callable,
+        *,
+        output_model: Type[BaseModel] | None = None,
+        depends_on: list[str] | None = None,
+        max_parallel: int | None = None,
+        batch_size: int | None = None,
+        page_size: int = 1000,
+        max_pending: int = 10_000,
+        executor: str = "inline",
+        lease_seconds: int | None = None,
+    ) -> WorkflowBuilder:
+        """
+        Add a **MAP** node — fans out over a list, running ``item_handler`` once per item.
+
+        ``items_fn(ctx)`` runs first and returns the items; the server then queues one
+        sub-task per item, so any worker in the fleet can pick them up, and completes
+        the node with the per-item results in item order. Pair with :meth:`reduce`.
+
+        ``items_fn`` may also return a generator or async iterator (say, every URL in a
+        sitemap). The worker then sends the items in pages of ``page_size`` while it is
+        still enumerating them, so the first sub-tasks start early and memory stays flat;
+        it pauses while more than ``max_pending`` items are waiting for a result.
+
+        Items and results travel as JSON whatever the workflow's codec, since the server
+        splits and gathers them. A handler that returns an exception instead of raising
+        records that item as failed (see ``ctx.get_map_errors``) without failing the node.
+
+        :param node_id: Unique node identifier within this workflow.
+        :param items_fn: Callable receiving a ``ContextView`` and returning a list of items.
+        :param item_handler: Callable receiving ``(ctx, item, index)`` and returning one result.
+        :param output_model: Pydantic model for a single item's result; ``ctx.get_map_results``
+            validates into it.
+        :param depends_on: Explicit list of node IDs to depend on.
+        :param max_parallel: At most this many item sub-tasks of one execution are queued or
+            running at once (default: all of them). Use it to stay under a rate limit.
+        :param batch_size: Hand items out in batches of up to this many: ``item_handler``
+            receives ``(ctx, items, start_index)`` and returns a list with one result (or
+            exception) per item. ``items`` is a NumPy array when every item is a number and
+            NumPy is installed. ``max_parallel`` then counts batches.
+        :param page_size: Items per page when ``items_fn`` returns an iterator or a longer list.
+        :param max_pending: Items fanned out but not yet finished before the worker stops
+            pulling from ``items_fn``. Like ``page_size``, a worker-side choice that does not
+            change ``version_hash``.
+        :param executor: Where sync ``items_fn`` / ``item_handler`` run (see :meth:`compute`);
+            with ``"thread"`` a generator is also advanced in a thread. ``"process"`` needs
+            ``items_fn`` to return a list.
+        :param lease_seconds: Heartbeat lease for each task (see :meth:`effect`).
+        """
+        self._check_executor(node_id, items_fn, executor)
+        self._check_executor(node_id, item_handler, executor)
+        self._check_lease(node_id, lease_seconds)
+        if max_parallel is not None and max_parallel < 1:
+            raise ValueError(f"Node '{node_id}': max_parallel must be at least 1, got {max_parallel}")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"Node '{node_id}': batch_size must be at least 1, got {batch_size}")
+        if page_size < 1 or max_pending < 1:
+            raise ValueError(f"Node '{node_id}': page_size and max_pending must be at least 1")
+        if executor == "process" and (inspect.isgeneratorfunction(items_fn) or inspect.isasyncgenfunction(items_fn)):
+            raise ValueError(f"Node '{node_id}': a generator items_fn cannot run with executor='process'")
+        deps = depends_on if depends_on is not None else self._current_deps()
+        self._nodes.append(NodeDef(
+            node_id, "MAP", output_model, item_handler, deps,
+            executor=executor, lease_seconds=lease_seconds,
+            items_fn=items_fn, max_parallel=max_parallel, batch_size=batch_size,
+            page_size=page_size, max_pending=max_pending,
+        ))
+        self._node_order.append(node_id)
+        return self
+
+    def reduce(
+        self,
+        node_id: str,
+        output_model: Type[BaseModel],
+        handler: Callable | None = None,
+        *,
+        map_node: str | None = None,
+        depends_on: list[str] | None = None,
+        fold: Callable | None = None,
+        initial: Any = None,
+        fold_chunk: int = 500,
+        executor: str = "inline",
+        lease_seconds: int | None = None,
+    ) -> WorkflowBuilder:
+        """
+        Add a **REDUCE** node — aggregates the results of a MAP node.
+
+        The handler reads them with ``ctx.get_map_results(map_node_id)`` once every item is done.
+
+        With ``fold``, the node instead starts as soon as the MAP node fans out and folds the
+        results in item order as they arrive: ``fold(ctx, acc, results)`` returns the new
+        accumulator for each chunk, starting from a copy of ``initial``. Failed items are
+        ``None`` in ``results``. The worker never holds more than a chunk, and each chunk
+        checkpoints the accumulator on the server: a re-leased task resumes from it, and
+        ``get_status`` shows it under ``partialOutputs`` while the node runs. The accumulator
+        must be JSON-serializable (a Pydantic model is revalidated into ``initial``'s class on
+        resume). ``handler(ctx, acc)``, if given, turns the final accumulator into the output;
+        otherwise the accumulator is the output.
+
+        :param node_id: Unique node identifier within this workflow.
+        :param output_model: Pydantic BaseModel class defining the output schema.
+        :param handler: Callable receiving a ``ContextView`` and returning ``output_model``;
+            with ``fold``, an optional finalizer receiving ``(ctx, acc)``.
+        :param map_node: The MAP node to aggregate (default: the most recent one).
+        :param depends_on: Explicit list of node IDs to depend on (default: just the MAP
+            node); must include it.
+        :param fold: Callable receiving ``(ctx, acc, results)`` and returning the accumulator.
+        :param initial: The accumulator before the first chunk.
+        :param fold_chunk: Results per chunk, at most 10,000 (the server's cap).
+        :param executor: Where sync ``handler`` / ``fold`` run (see :meth:`compute`);
+            ``"process"`` is not available with ``fold``.
+        :param lease_seconds: Heartbeat lease for the task (see :meth:`effect`).
+        """
+        if handler is None and fold is None:
+            raise ValueError(f"Node '{node_id}': reduce() needs a handler or a fold")
+        for fn in (handler, fold):
+            if fn is not None:
+                self._check_executor(node_id, fn, executor)
+        if fold is not None and executor == "process":
+            raise ValueError(f"Node '{node_id}': fold cannot run with executor='process'")
+        if not 1 <= fold_chunk <= 10_000:
+            raise ValueError(f"Node '{node_id}': fold_chunk must be between 1 and 10000, got {fold_chunk}")
+        self._check_lease(node_id, lease_seconds)
+        if map_node is None:
+            map_node = next((n.id for n in reversed(self._nodes) if n.type == "MAP"), None)
+            if map_node is None:
+                raise ValueError(f"Node '{node_id}': reduce() must follow a map() node")
+        elif not any(n.id == map_node and n.type == "MAP" for n in self._nodes):
+            raise ValueError(f"Node '{node_id}': '{map_node}' is not a MAP node")
+        deps = depends_on if depends_on is not None else [map_node]
+        if map_node not in deps:
+            raise ValueError(f"Node '{node_id}': depends_on must include the MAP node '{map_node}'")
+        self._nodes.append(NodeDef(
+            node_id, "REDUCE", output_model, handler, deps,
+            executor=executor, lease_seconds=lease_seconds, map_node_id=map_node,
+            fold=fold, initial=initial, fold_chunk=fold_chunk,
+        ))
         self._node_order.append(node_id)
         return self
 
@@ -158,21 +385,38 @@ class WorkflowBuilder:
             }
             if n.delay_seconds is not None:
                 node_ir["delay_seconds"] = n.delay_seconds
+            if n.lease_seconds is not None:
+                node_ir["lease_seconds"] = n.lease_seconds
+            if n.max_parallel is not None:
+                node_ir["max_parallel"] = n.max_parallel
+            if n.batch_size is not None:
+                node_ir["batch_size"] = n.batch_size
+            if n.map_node_id is not None:
+                node_ir["mapNodeId"] = n.map_node_id
+            if n.fold is not None:
+                node_ir["fold"] = True
             ir_nodes[n.id] = node_ir
-        ir_json = json.dumps({"nodes": ir_nodes})
+        ir: dict[str, Any] = {"nodes": ir_nodes}
+        # Outputs in a binary format are a different contract for readers, so they change the hash.
+        if self._codec.content_type != JSON_CONTENT_TYPE:
+            ir["content_type"] = self._codec.content_type
+        ir_json = json.dumps(ir)
         version_hash = "sha256:" + hashlib.sha256(ir_json.encode()).hexdigest()
-        return WorkflowDef(self.workflow_id, version_hash, ir_json, list(self._nodes))
+        return WorkflowDef(self.workflow_id, version_hash, ir_json, list(self._nodes), self._codec)
 
 
-def workflow(workflow_id: str) -> WorkflowBuilder:
+def workflow(workflow_id: str, *, codec: str = "json") -> WorkflowBuilder:
     """
     Entry point for the Nexum Python SDK. Returns a :class:`WorkflowBuilder`.
 
     :param workflow_id: Globally unique identifier for this workflow.
+    :param codec: How node outputs are encoded on the wire and at rest: ``"json"``
+        (default), ``"orjson"`` (same JSON, faster encoder) or ``"msgpack"`` (binary;
+        ``bytes`` fields are not base64-inflated). See :mod:`nexum.codec`.
 
     Example::
 
         from nexum.builder import workflow
         wf = workflow("my-workflow").effect(...).compute(...).build()
     """
-    return WorkflowBuilder(workflow_id)
+    return WorkflowBuilder(workflow_id, codec=codec)
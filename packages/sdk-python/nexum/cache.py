@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+import pydantic_core
+
+from .blobs import CLAIM_CHECK_MARKER, is_claim_check
+
+# A cached output: (content_type, encoded bytes), exactly what was sent to CompleteTask.
+CachedOutput = tuple[str, bytes]
+
+
+def _canonical_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode()}
+    return pydantic_core.to_jsonable_python(value)
+
+
+def _dependency_identity(value: Any) -> Any:
+    # A claim check's blob_id names the execution that wrote it; its digest names the content.
+    if is_claim_check(value) and value.get("sha256"):
+        return {CLAIM_CHECK_MARKER: True, "sha256": value["sha256"]}
+    return value
+
+
+def cache_key(node_id: str, version_hash: str, input_data: Any, deps: dict[str, Any]) -> str:
+    """
+    SHA-256 over the node, its workflow version and a canonical (key-sorted) encoding of what it reads.
+
+    Claim-checked dependencies count by the content digest the server puts in the pointer, so
+    the same output spilled by another execution gives the same key.
+    """
+    deps = {dep_id: _dependency_identity(value) for dep_id, value in deps.items()}
+    canonical = json.dumps(
+        [node_id, version_hash, input_data, deps],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_canonical_default,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier memo of COMPUTE outputs for ``compute(..., cache=True)`` nodes.
+
+    The memory tier is an LRU bounded by the total size of the encoded outputs
+    (``max_bytes``). With ``path`` set, a SQLite file adds a disk tier that every
+    worker process on the host can share; it is trimmed to ``max_disk_bytes`` by
+    least-recent use. Disk hits are promoted into memory.
+
+    ``get`` / ``put`` block on the SQLite file (up to its 10 s lock timeout when
+    another process is writing); on an event loop use ``aget`` / ``aput``, which
+    touch the disk tier from a worker thread.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, *, path: str | None = None, max_disk_bytes: int = 1024**3):
+        self._max_bytes = max_bytes
+        self._entries: collections.OrderedDict[str, CachedOutput] = collections.OrderedDict()
+        self._size = 0
+        self._max_disk_bytes = max_disk_bytes
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+        self._puts_since_trim = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, content_type TEXT NOT NULL, data BLOB NOT NULL,"
+                " size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed_at)")
+
+    def get(self, key: str) -> CachedOutput | None:
+        entry = self._from_memory(key)
+        if entry is not None:
+            return entry
+        return self._promote(key, self._read_disk(key) if self._db is not None else None)
+
+    async def aget(self, key: str) -> CachedOutput | None:
+        """:meth:`get` with the disk lookup in a worker thread."""
+        entry = self._from_memory(key)
+        if entry is not None:
+            return entry
+        return self._promote(key, await asyncio.to_thread(self._read_disk, key) if self._db is not None else None)
+
+    def put(self, key: str, output: CachedOutput) -> None:
+        self._remember(key, output)
+        if self._db is not None:
+            self._write_disk(key, output)
+
+    async def aput(self, key: str, output: CachedOutput) -> None:
+        """:meth:`put` with the disk write in a worker thread."""
+        self._remember(key, output)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_disk, key, output)
+
+    def _from_memory(self, key: str) -> CachedOutput | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+        return entry
+
+    def _promote(self, key: str, entry: CachedOutput | None) -> CachedOutput | None:
+        if entry is None:
+            self.misses += 1
+            return None
+        self._remember(key, entry)
+        self.disk_hits += 1
+        return entry
+
+    def _read_disk(self, key: str) -> CachedOutput | None:
+        with self._db_lock:
+            if self._db is None:  # closed while the lookup waited for a thread
+                return None
+            row = self._db.execute("SELECT content_type, data FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return (row[0], bytes(row[1]))
+
+    def _write_disk(self, key: str, output: CachedOutput) -> None:
+        content_type, data = output
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, content_type, data, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, content_type, data, len(data), time.time()),
+            )
+            self._puts_since_trim += 1
+            if self._puts_since_trim >= 100:
+                self._trim_disk()
+
+    def _remember(self, key: str, output: CachedOutput) -> None:
+        size = len(output[1])
+        if size > self._max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old[1])
+        self._entries[key] = output
+        self._size += size
+        while self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted[1])
+
+    def _trim_disk(self) -> None:
+        self._puts_since_trim = 0
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total <= self._max_disk_bytes:
+            return
+        excess = total - self._max_disk_bytes
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "cache_hits": self.memory_hits + self.disk_hits,
+            "cache_memory_hits": self.memory_hits,
+            "cache_disk_hits": self.disk_hits,
+            "cache_misses": self.misses,
+            "cache_bytes": self._size,
+        }
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
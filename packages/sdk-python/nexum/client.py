@@ -1,67 +1,339 @@
 from __future__ import annotations
 
+import itertools
 import json
-from typing import Any
+from typing import Any, Iterable
 
 import grpc
 
+from .blobs import decode_blob, is_claim_check
+from .codec import decode_payload
 from .proto import nexum_pb2, nexum_pb2_grpc
 
 
+_COMPRESSION = {
+    None: grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+
+def _channel_compression(name: str | None) -> grpc.Compression:
+    try:
+        return _COMPRESSION[name]
+    except KeyError:
+        raise ValueError(f"Unsupported compression {name!r}; grpc supports 'gzip' and 'deflate'") from None
+
+
+def _workflow_ir(wf) -> nexum_pb2.WorkflowIR:
+    return nexum_pb2.WorkflowIR(
+        workflow_id=wf.workflow_id,
+        version_hash=wf.version_hash,
+        ir_json=wf.ir_json,
+    )
+
+
+def _status_dict(resp) -> dict:
+    completed_nodes: dict[str, Any] = {}
+    if resp.completed_nodes_json:
+        try:
+            completed_nodes = json.loads(resp.completed_nodes_json)
+        except json.JSONDecodeError:
+            pass
+    # Outputs stored in a binary codec arrive alongside the JSON, one Payload per node.
+    for node_id, payload in resp.node_payloads.items():
+        completed_nodes[node_id] = decode_payload(payload)
+    status = {
+        "status": resp.status,
+        "completedNodes": completed_nodes,
+    }
+    # Accumulators checkpointed by folding REDUCE nodes that are still running.
+    if resp.partial_outputs_json:
+        status["partialOutputs"] = json.loads(resp.partial_outputs_json)
+    return status
+
+
+_TERMINAL_STATUSES = ("COMPLETED", "FAILED", "CANCELLED")
+
+# Inputs per StartExecutions call; keeps each request well under gRPC's 4 MB default.
+START_BATCH_SIZE = 1000
+
+# JSON longer than this many characters is streamed with UploadPayload instead of sent
+# inline. A character is at most 4 bytes of UTF-8, so anything below it fits in 4 MB.
+STREAM_THRESHOLD = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _start_request(workflow_id: str, input_data: dict, version_hash: str, idempotency_key: str):
+    return nexum_pb2.StartRequest(
+        workflow_id=workflow_id,
+        version_hash=version_hash,
+        input_json=json.dumps(input_data),
+        idempotency_key=idempotency_key,
+    )
+
+
+def _start_batches(
+    workflow_id: str,
+    inputs: Iterable[dict],
+    version_hash: str,
+    idempotency_keys: Iterable[str] | None,
+    batch_size: int,
+):
+    items = zip(inputs, idempotency_keys, strict=True) if idempotency_keys is not None else ((i, "") for i in inputs)
+    while chunk := list(itertools.islice(items, batch_size)):
+        yield nexum_pb2.StartExecutionsRequest(
+            workflow_id=workflow_id,
+            version_hash=version_hash,
+            input_jsons=[json.dumps(data) for data, _ in chunk],
+            idempotency_keys=[key for _, key in chunk] if idempotency_keys is not None else [],
+        )
+
+
+def _payload_chunks(data: bytes):
+    view = memoryview(data)
+    for start in range(0, len(view), UPLOAD_CHUNK_SIZE):
+        yield nexum_pb2.PayloadChunk(data=bytes(view[start:start + UPLOAD_CHUNK_SIZE]))
+
+
+def _complete_request(task_id: str, output: Any) -> nexum_pb2.CompleteRequest:
+    if isinstance(output, nexum_pb2.Payload):
+        return nexum_pb2.CompleteRequest(task_id=task_id, output=output)
+    if isinstance(output, nexum_pb2.UploadPayloadResponse):
+        return nexum_pb2.CompleteRequest(task_id=task_id, output_blob_id=output.blob_id)
+    # A str is already-encoded JSON (the worker passes model_dump_json() output straight through).
+    output_json = json.dumps(output) if not isinstance(output, str) else output
+    return nexum_pb2.CompleteRequest(
+        task_id=task_id,
+        output_json=output_json,
+    )
+
+
+def _complete_tasks_request(items) -> nexum_pb2.CompleteTasksRequest:
+    return nexum_pb2.CompleteTasksRequest(
+        items=[_complete_request(task_id, output) for task_id, output in items],
+    )
+
+
+def _fail_tasks_request(items) -> nexum_pb2.FailTasksRequest:
+    return nexum_pb2.FailTasksRequest(
+        items=[nexum_pb2.FailRequest(task_id=task_id, error_message=error) for task_id, error in items],
+    )
+
+
 class NexumClient:
-    def __init__(self, host: str = "localhost", port: int = 50051):
-        self._channel = grpc.insecure_channel(f"{host}:{port}")
+    def __init__(self, host: str = "localhost", port: int = 50051, *, compression: str | None = None):
+        """
+        ``compression="gzip"`` (or ``"deflate"``) compresses every request on the channel.
+        Replies are compressed by the server when the client accepts it, whatever this is
+        set to. The server also accepts zstd, which grpc-python does not offer.
+        """
+        self._channel = grpc.insecure_channel(f"{host}:{port}", compression=_channel_compression(compression))
         self._stub = nexum_pb2_grpc.NexumServiceStub(self._channel)
 
     def register_workflow(self, wf) -> str:
         """Register a workflow and return compatibility status."""
-        req = nexum_pb2.WorkflowIR(
-            workflow_id=wf.workflow_id,
-            version_hash=wf.version_hash,
-            ir_json=wf.ir_json,
-        )
-        resp = self._stub.RegisterWorkflow(req)
+        resp = self._stub.RegisterWorkflow(_workflow_ir(wf))
         if not resp.ok:
             raise RuntimeError(f"RegisterWorkflow failed: {resp.message}")
         return resp.compatibility
 
-    def start_execution(self, workflow_id: str, input_data: dict, version_hash: str = "") -> str:
-        req = nexum_pb2.StartRequest(
-            workflow_id=workflow_id,
-            version_hash=version_hash,
-            input_json=json.dumps(input_data),
-        )
+    def start_execution(
+        self, workflow_id: str, input_data: dict, version_hash: str = "", *, idempotency_key: str = ""
+    ) -> str:
+        """
+        Start an execution and return its id.
+
+        With ``idempotency_key``, a repeat start of the same workflow under that key
+        returns the existing execution (running or completed) instead of starting
+        another. A FAILED or CANCELLED execution releases its key for a fresh attempt.
+        """
+        req = _start_request(workflow_id, input_data, version_hash, idempotency_key)
+        if len(req.input_json) > STREAM_THRESHOLD:
+            req.input_blob_id = self.upload_payload(req.input_json.encode()).blob_id
+            req.input_json = ""
         resp = self._stub.StartExecution(req)
         return resp.execution_id
 
+    def start_executions(
+        self,
+        workflow_id: str,
+        inputs: Iterable[dict],
+        version_hash: str = "",
+        *,
+        idempotency_keys: Iterable[str] | None = None,
+        batch_size: int = START_BATCH_SIZE,
+    ) -> list[str]:
+        """
+        Start one execution per input with as few round-trips as possible.
+
+        Inputs are sent ``batch_size`` at a time; each batch is inserted in a single
+        server-side transaction. ``idempotency_keys`` (one per input) dedupe as in
+        :meth:`start_execution`. Returns execution ids in input order.
+        """
+        execution_ids: list[str] = []
+        for req in _start_batches(workflow_id, inputs, version_hash, idempotency_keys, batch_size):
+            execution_ids.extend(self._stub.StartExecutions(req).execution_ids)
+        return execution_ids
+
     def get_status(self, execution_id: str) -> dict:
         req = nexum_pb2.StatusRequest(execution_id=execution_id)
-        resp = self._stub.GetStatus(req)
-        completed_nodes: dict[str, Any] = {}
-        if resp.completed_nodes_json:
-            try:
-                completed_nodes = json.loads(resp.completed_nodes_json)
-            except json.JSONDecodeError:
-                pass
-        return {
-            "status": resp.status,
-            "completedNodes": completed_nodes,
-        }
-
-    def poll_task(self, worker_id: str, version_hash: str):
+        return self._download_blobs(_status_dict(self._stub.GetStatus(req)))
+
+    def wait_for(self, execution_id: str, timeout: float | None = None) -> dict:
+        """
+        Block until the execution reaches COMPLETED, FAILED or CANCELLED and return its status.
+
+        Uses the WatchExecution stream, so the result arrives as soon as the server
+        records it instead of on the next poll. Raises ``TimeoutError`` after ``timeout`` seconds.
+        """
+        req = nexum_pb2.StatusRequest(execution_id=execution_id)
+        status: dict | None = None
+        try:
+            for resp in self._stub.WatchExecution(req, timeout=timeout):
+                status = _status_dict(resp)
+                if status["status"] in _TERMINAL_STATUSES:
+                    return self._download_blobs(status)
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                raise TimeoutError(f"Execution {execution_id} did not complete within {timeout}s") from None
+            raise
+        return self._download_blobs(status) if status is not None else self.get_status(execution_id)
+
+    def _download_blobs(self, status: dict) -> dict:
+        # Claim-checked outputs are streamed back with DownloadPayload in place of their pointers.
+        nodes = status["completedNodes"]
+        for node_id, output in nodes.items():
+            if is_claim_check(output):
+                nodes[node_id] = decode_blob(output, self.download_payload(output["blob_id"]))
+        return status
+
+    def poll_task(
+        self,
+        worker_id: str,
+        version_hash: str = "",
+        wait_timeout_ms: int = 0,
+        *,
+        version_hashes: list[str] | None = None,
+        lazy_blobs: bool = False,
+    ):
+        """
+        Lease one task for ``version_hash`` and/or any of ``version_hashes``.
+
+        The server picks the oldest READY task across all given versions. With
+        ``wait_timeout_ms`` it holds the call until a task is READY. With
+        ``lazy_blobs`` claim-checked dependency outputs arrive as pointers
+        (see :class:`nexum.blobs.BlobStore`) instead of inlined.
+        """
         req = nexum_pb2.PollRequest(
             worker_id=worker_id,
             version_hash=version_hash,
+            wait_timeout_ms=wait_timeout_ms,
+            version_hashes=version_hashes or [],
+            lazy_blobs=lazy_blobs,
         )
         return self._stub.PollTask(req)
 
-    def complete_task(self, task_id: str, output: Any) -> None:
-        output_json = json.dumps(output) if not isinstance(output, str) else output
-        req = nexum_pb2.CompleteRequest(
-            task_id=task_id,
-            output_json=output_json,
+    def poll_tasks(
+        self,
+        worker_id: str,
+        version_hashes: list[str],
+        max_tasks: int,
+        wait_timeout_ms: int = 0,
+        *,
+        lazy_blobs: bool = False,
+    ) -> list:
+        """Lease up to ``max_tasks`` tasks across ``version_hashes`` in one round-trip."""
+        req = nexum_pb2.PollTasksRequest(
+            worker_id=worker_id,
+            version_hashes=version_hashes,
+            max_tasks=max_tasks,
+            wait_timeout_ms=wait_timeout_ms,
+            lazy_blobs=lazy_blobs,
+        )
+        return list(self._stub.PollTasks(req).tasks)
+
+    def heartbeat(self, task_id: str, worker_id: str, progress: str = "") -> bool:
+        """
+        Extend the lease on a RUNNING task and optionally record its progress.
+
+        Returns ``False`` once the task is no longer leased to ``worker_id`` (it was
+        reclaimed after missed heartbeats) or its execution has ended (failed or
+        cancelled); the ``Worker`` then abandons the handler.
+        """
+        req = nexum_pb2.HeartbeatRequest(task_id=task_id, worker_id=worker_id, progress=progress)
+        return self._stub.Heartbeat(req).ok
+
+    def release_tasks(self, worker_id: str, task_ids: list[str]) -> int:
+        """
+        Hand tasks leased to ``worker_id`` back to READY without counting a retry.
+
+        Used when a worker shuts down holding tasks it will not finish. Returns the
+        number released; tasks no longer leased to ``worker_id`` are skipped.
+        """
+        req = nexum_pb2.ReleaseTasksRequest(worker_id=worker_id, task_ids=task_ids)
+        return self._stub.ReleaseTasks(req).released
+
+    def fetch_blob(self, blob_id: str, offset: int = 0, length: int = 0) -> tuple[bytes, int]:
+        """
+        Read part of a claim-checked output and return ``(data, total_size)``.
+
+        ``length=0`` reads as much as one reply allows (2 MB); call again from
+        ``offset + len(data)`` for the rest.
+        """
+        resp = self._stub.FetchBlob(nexum_pb2.FetchBlobRequest(blob_id=blob_id, offset=offset, length=length))
+        return resp.data, resp.total_size
+
+    def upload_payload(self, data: bytes) -> nexum_pb2.UploadPayloadResponse:
+        """
+        Stream encoded JSON into the server's blob store, ``UPLOAD_CHUNK_SIZE`` bytes per message.
+
+        Pass the response to :meth:`complete_task` as the output, or set its ``blob_id``
+        as a ``StartRequest.input_blob_id``; :meth:`start_execution` does this itself for
+        inputs over ``STREAM_THRESHOLD``.
+        """
+        return self._stub.UploadPayload(_payload_chunks(data))
+
+    def download_payload(self, blob_id: str) -> bytes:
+        """Stream a whole blob back from the server."""
+        chunks = self._stub.DownloadPayload(nexum_pb2.DownloadPayloadRequest(blob_id=blob_id))
+        return b"".join(chunk.data for chunk in chunks)
+
+    def append_map_items(
+        self, task_id: str, worker_id: str, items_json: str, offset: int
+    ) -> nexum_pb2.AppendMapItemsResponse:
+        """
+        Fan out a page of a running MAP coordinator's items (a JSON array starting at item ``offset``).
+
+        The response's ``pending`` counts items still without a result, for backpressure.
+        Complete the coordinator with the last page (``"[]"`` if none) to close the list.
+        Fails with FAILED_PRECONDITION unless the coordinator is leased to ``worker_id``, and
+        with ABORTED if another append changed the list meanwhile (resend the same page).
+        """
+        return self._stub.AppendMapItems(
+            nexum_pb2.AppendMapItemsRequest(task_id=task_id, items_json=items_json, offset=offset, worker_id=worker_id)
         )
-        self._stub.CompleteTask(req)
+
+    def read_map_results(
+        self, task_id: str, worker_id: str, from_index: int, limit: int = 0, partial_json: str = ""
+    ) -> nexum_pb2.ReadMapResultsResponse:
+        """
+        The next results of a folding REDUCE's MAP node from item ``from_index``, stopping at the first
+        item still running (``limit`` 0 = the server's default chunk).
+
+        ``partial_json`` is the accumulator over every item before ``from_index``; when set, the
+        server checkpoints it for a re-leased task and shows it in the execution's status.
+        Fails with FAILED_PRECONDITION once the REDUCE is no longer leased to ``worker_id`` or its
+        execution has ended (e.g. a MAP item ran out of retries).
+        """
+        return self._stub.ReadMapResults(
+            nexum_pb2.ReadMapResultsRequest(
+                task_id=task_id, from_index=from_index, limit=limit, partial_json=partial_json, worker_id=worker_id
+            )
+        )
+
+    def complete_task(self, task_id: str, output: Any) -> None:
+        self._stub.CompleteTask(_complete_request(task_id, output))
 
     def fail_task(self, task_id: str, error: str) -> None:
         req = nexum_pb2.FailRequest(
@@ -70,5 +342,187 @@ class NexumClient:
         )
         self._stub.FailTask(req)
 
+    def complete_tasks(self, items: list[tuple[str, Any]]) -> list:
+        """Complete several tasks in one RPC. Returns one ``TaskAck`` per item, in order."""
+        return list(self._stub.CompleteTasks(_complete_tasks_request(items)).acks)
+
+    def fail_tasks(self, items: list[tuple[str, str]]) -> list:
+        """Fail several tasks in one RPC. Returns one ``TaskAck`` per item, in order."""
+        return list(self._stub.FailTasks(_fail_tasks_request(items)).acks)
+
     def close(self) -> None:
         self._channel.close()
+
+
+class AsyncNexumClient:
+    """
+    Asyncio counterpart of :class:`NexumClient`, built on ``grpc.aio``.
+
+    Every RPC is awaitable, so polling and completions never block the event
+    loop while other handlers are in flight. The channel binds to the running
+    loop, so create the client from inside a coroutine.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 50051, *, compression: str | None = None):
+        self._channel = grpc.aio.insecure_channel(f"{host}:{port}", compression=_channel_compression(compression))
+        self._stub = nexum_pb2_grpc.NexumServiceStub(self._channel)
+
+    async def register_workflow(self, wf) -> str:
+        """Register a workflow and return compatibility status."""
+        resp = await self._stub.RegisterWorkflow(_workflow_ir(wf))
+        if not resp.ok:
+            raise RuntimeError(f"RegisterWorkflow failed: {resp.message}")
+        return resp.compatibility
+
+    async def start_execution(
+        self, workflow_id: str, input_data: dict, version_hash: str = "", *, idempotency_key: str = ""
+    ) -> str:
+        """Start an execution and return its id. See :meth:`NexumClient.start_execution`."""
+        req = _start_request(workflow_id, input_data, version_hash, idempotency_key)
+        if len(req.input_json) > STREAM_THRESHOLD:
+            req.input_blob_id = (await self.upload_payload(req.input_json.encode())).blob_id
+            req.input_json = ""
+        resp = await self._stub.StartExecution(req)
+        return resp.execution_id
+
+    async def start_executions(
+        self,
+        workflow_id: str,
+        inputs: Iterable[dict],
+        version_hash: str = "",
+        *,
+        idempotency_keys: Iterable[str] | None = None,
+        batch_size: int = START_BATCH_SIZE,
+    ) -> list[str]:
+        """Start one execution per input. See :meth:`NexumClient.start_executions`."""
+        execution_ids: list[str] = []
+        for req in _start_batches(workflow_id, inputs, version_hash, idempotency_keys, batch_size):
+            execution_ids.extend((await self._stub.StartExecutions(req)).execution_ids)
+        return execution_ids
+
+    async def get_status(self, execution_id: str) -> dict:
+        req = nexum_pb2.StatusRequest(execution_id=execution_id)
+        return await self._download_blobs(_status_dict(await self._stub.GetStatus(req)))
+
+    async def wait_for(self, execution_id: str, timeout: float | None = None) -> dict:
+        """Await the terminal status of an execution. See :meth:`NexumClient.wait_for`."""
+        req = nexum_pb2.StatusRequest(execution_id=execution_id)
+        status: dict | None = None
+        try:
+            async for resp in self._stub.WatchExecution(req, timeout=timeout):
+                status = _status_dict(resp)
+                if status["status"] in _TERMINAL_STATUSES:
+                    return await self._download_blobs(status)
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                raise TimeoutError(f"Execution {execution_id} did not complete within {timeout}s") from None
+            raise
+        return await self._download_blobs(status) if status is not None else await self.get_status(execution_id)
+
+    async def _download_blobs(self, status: dict) -> dict:
+        nodes = status["completedNodes"]
+        for node_id, output in nodes.items():
+            if is_claim_check(output):
+                nodes[node_id] = decode_blob(output, await self.download_payload(output["blob_id"]))
+        return status
+
+    async def poll_task(
+        self,
+        worker_id: str,
+        version_hash: str = "",
+        wait_timeout_ms: int = 0,
+        *,
+        version_hashes: list[str] | None = None,
+        lazy_blobs: bool = False,
+    ):
+        """Lease one task. See :meth:`NexumClient.poll_task`."""
+        req = nexum_pb2.PollRequest(
+            worker_id=worker_id,
+            version_hash=version_hash,
+            wait_timeout_ms=wait_timeout_ms,
+            version_hashes=version_hashes or [],
+            lazy_blobs=lazy_blobs,
+        )
+        return await self._stub.PollTask(req)
+
+    async def poll_tasks(
+        self,
+        worker_id: str,
+        version_hashes: list[str],
+        max_tasks: int,
+        wait_timeout_ms: int = 0,
+        *,
+        lazy_blobs: bool = False,
+    ) -> list:
+        """Lease up to ``max_tasks`` tasks across ``version_hashes`` in one round-trip."""
+        req = nexum_pb2.PollTasksRequest(
+            worker_id=worker_id,
+            version_hashes=version_hashes,
+            max_tasks=max_tasks,
+            wait_timeout_ms=wait_timeout_ms,
+            lazy_blobs=lazy_blobs,
+        )
+        return list((await self._stub.PollTasks(req)).tasks)
+
+    async def heartbeat(self, task_id: str, worker_id: str, progress: str = "") -> bool:
+        """Extend a task's lease. See :meth:`NexumClient.heartbeat`."""
+        req = nexum_pb2.HeartbeatRequest(task_id=task_id, worker_id=worker_id, progress=progress)
+        return (await self._stub.Heartbeat(req)).ok
+
+    async def release_tasks(self, worker_id: str, task_ids: list[str]) -> int:
+        """Hand leased tasks back to READY. See :meth:`NexumClient.release_tasks`."""
+        req = nexum_pb2.ReleaseTasksRequest(worker_id=worker_id, task_ids=task_ids)
+        return (await self._stub.ReleaseTasks(req)).released
+
+    async def fetch_blob(self, blob_id: str, offset: int = 0, length: int = 0) -> tuple[bytes, int]:
+        """Read part of a claim-checked output. See :meth:`NexumClient.fetch_blob`."""
+        resp = await self._stub.FetchBlob(nexum_pb2.FetchBlobRequest(blob_id=blob_id, offset=offset, length=length))
+        return resp.data, resp.total_size
+
+    async def upload_payload(self, data: bytes) -> nexum_pb2.UploadPayloadResponse:
+        """Stream encoded JSON into the blob store. See :meth:`NexumClient.upload_payload`."""
+        return await self._stub.UploadPayload(_payload_chunks(data))
+
+    async def download_payload(self, blob_id: str) -> bytes:
+        """Stream a whole blob back from the server."""
+        chunks = self._stub.DownloadPayload(nexum_pb2.DownloadPayloadRequest(blob_id=blob_id))
+        return b"".join([chunk.data async for chunk in chunks])
+
+    async def append_map_items(
+        self, task_id: str, worker_id: str, items_json: str, offset: int
+    ) -> nexum_pb2.AppendMapItemsResponse:
+        """Fan out a page of MAP items. See :meth:`NexumClient.append_map_items`."""
+        return await self._stub.AppendMapItems(
+            nexum_pb2.AppendMapItemsRequest(task_id=task_id, items_json=items_json, offset=offset, worker_id=worker_id)
+        )
+
+    async def read_map_results(
+        self, task_id: str, worker_id: str, from_index: int, limit: int = 0, partial_json: str = ""
+    ) -> nexum_pb2.ReadMapResultsResponse:
+        """Read the next chunk of MAP results for a folding REDUCE. See :meth:`NexumClient.read_map_results`."""
+        return await self._stub.ReadMapResults(
+            nexum_pb2.ReadMapResultsRequest(
+                task_id=task_id, from_index=from_index, limit=limit, partial_json=partial_json, worker_id=worker_id
+            )
+        )
+
+    async def complete_task(self, task_id: str, output: Any) -> None:
+        await self._stub.CompleteTask(_complete_request(task_id, output))
+
+    async def fail_task(self, task_id: str, error: str) -> None:
+        req = nexum_pb2.FailRequest(
+            task_id=task_id,
+            error_message=error,
+        )
+        await self._stub.FailTask(req)
+
+    async def complete_tasks(self, items: list[tuple[str, Any]]) -> list:
+        """Complete several tasks in one RPC. Returns one ``TaskAck`` per item, in order."""
+        return list((await self._stub.CompleteTasks(_complete_tasks_request(items))).acks)
+
+    async def fail_tasks(self, items: list[tuple[str, str]]) -> list:
+        """Fail several tasks in one RPC. Returns one ``TaskAck`` per item, in order."""
+        return list((await self._stub.FailTasks(_fail_tasks_request(items))).acks)
+
+    async def close(self) -> None:
+        await self._channel.close()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pydantic_core
+from pydantic import BaseModel
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+class Codec:
+    """
+    Encodes node outputs to bytes and back.
+
+    ``content_type`` travels with every encoded payload, so the server can store
+    it opaquely and any worker can decode it by looking the type up in the registry.
+    """
+
+    name = ""
+    content_type = ""
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    name = "json"
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            return value.__pydantic_serializer__.to_json(value)
+        return pydantic_core.to_json(value)
+
+    def decode(self, data: bytes) -> Any:
+        return pydantic_core.from_json(data)
+
+
+class OrjsonCodec(Codec):
+    """JSON through ``orjson``; same wire format as :class:`JsonCodec`."""
+
+    name = "orjson"
+    content_type = JSON_CONTENT_TYPE
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            value = value.model_dump(mode="json")
+        return self._orjson.dumps(value, default=pydantic_core.to_jsonable_python)
+
+    def decode(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack; ``bytes`` fields (embeddings, screenshots) travel as raw binary instead of base64."""
+
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+        return self._msgpack.packb(value, default=pydantic_core.to_jsonable_python)
+
+    def decode(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+_CODEC_TYPES: dict[str, type[Codec]] = {c.name: c for c in (JsonCodec, OrjsonCodec, MsgpackCodec)}
+_codecs: dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Make a codec available under ``codec.name`` (and for decoding, ``codec.content_type``)."""
+    _codecs[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Look up a codec by name, instantiating a built-in one on first use.
+
+    Raises ``ValueError`` for an unknown name and ``ImportError`` when the codec's
+    optional dependency is missing (``pip install "nexum-py[msgpack]"`` / ``"nexum-py[orjson]"``).
+    """
+    codec = _codecs.get(name)
+    if codec is not None:
+        return codec
+    codec_type = _CODEC_TYPES.get(name)
+    if codec_type is None:
+        raise ValueError(f"Unknown codec {name!r}; available: {sorted(set(_CODEC_TYPES) | set(_codecs))}")
+    try:
+        codec = codec_type()
+    except ImportError as e:
+        raise ImportError(f'Codec {name!r} needs an optional dependency: pip install "nexum-py[{name}]"') from e
+    register_codec(codec)
+    return codec
+
+
+def decode_payload(payload) -> Any:
+    """Decode a ``nexum_pb2.Payload`` with whichever registered codec handles its content type."""
+    content_type = payload.content_type or JSON_CONTENT_TYPE
+    if content_type == JSON_CONTENT_TYPE:
+        return pydantic_core.from_json(payload.data)
+    for codec in _codecs.values():
+        if codec.content_type == content_type:
+            return codec.decode(payload.data)
+    for codec_type in _CODEC_TYPES.values():
+        if codec_type.content_type == content_type:
+            return get_codec(codec_type.name).decode(payload.data)
+    raise ValueError(f"No codec registered for content type {content_type!r}")
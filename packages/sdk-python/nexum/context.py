@@ -1,18 +1,212 @@
+import asyncio
+import collections
+import functools
+import logging
 from typing import Any
 
+from pydantic import TypeAdapter
+
+from .blobs import BlobStore, is_claim_check
+
+logger = logging.getLogger("nexum")
+
+_MISSING = object()
+
+# Key of the per-item result recorded for a MAP item whose handler returned an exception.
+MAP_ERROR_MARKER = "__nexum_map_error__"
+
+
+def map_error(exc: BaseException) -> dict:
+    return {MAP_ERROR_MARKER: True, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def is_map_error(value: Any) -> bool:
+    return isinstance(value, dict) and value.get(MAP_ERROR_MARKER) is True
+
+
+# Key the server sets on a MAP node's output when its results were folded by a REDUCE instead of gathered.
+MAP_SUMMARY_MARKER = "__nexum_map_summary__"
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def validate_map_results(results: list, model: type | None) -> list:
+    """Raw MAP results with failed items as ``None``, validated into ``model`` when there is one."""
+    results = [None if is_map_error(r) else r for r in results]
+    if model is None:
+        return results
+    try:
+        return _adapter(list[model | None]).validate_python(results)
+    except Exception:
+        return results
+
+
+class DependencyCache:
+    """
+    LRU of validated dependency outputs keyed by ``(execution_id, node_id)``.
+
+    A completed node's output never changes, so a worker can share the validated
+    object between every downstream task of the same execution instead of
+    re-validating it for each one. Handlers must treat ``ctx.get()`` results as
+    read-only when the cache is enabled.
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: collections.OrderedDict[tuple[str, str], Any] = collections.OrderedDict()
+
+    def get(self, key: tuple[str, str]) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple[str, str], value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class ContextView:
-    def __init__(self, input_data: dict, outputs: dict[str, Any]):
+    def __init__(
+        self,
+        input_data: dict,
+        outputs: dict[str, Any],
+        models: dict[str, type] | None = None,
+        *,
+        execution_id: str = "",
+        cache: DependencyCache | None = None,
+        blobs: BlobStore | None = None,
+    ):
         self.input = input_data
         self._outputs = outputs
+        # Dependency outputs arrive as plain JSON data and are validated into
+        # their node's output model on first get(), not up front.
+        self._models = models or {}
+        self._execution_id = execution_id
+        self._cache = cache
+        # Claim-checked outputs arrive as pointers and are read from the blob store on first get().
+        self._blobs = blobs
+        self._remote: bool | None = None
+        self._validated: dict[str, Any] = {}
+        self._map_outputs: dict[str, list] = {}
+        self.progress: Any = None
+
+    def report_progress(self, progress: Any) -> None:
+        """
+        Record how far the handler has got; sent with the next heartbeat.
+
+        A string is sent as-is, anything else as JSON. Handlers running with
+        ``executor="process"`` report into their own copy, so it is not sent.
+        """
+        self.progress = progress
 
     def get(self, node_id: str) -> Any:
+        value = self._validated.get(node_id, _MISSING)
+        if value is _MISSING:
+            value = self._resolve(node_id, self._output(node_id))
+            self._validated[node_id] = value
+        return value
+
+    async def aget(self, node_id: str) -> Any:
+        """
+        :meth:`get` for async handlers: a claim-checked output is read from its blob in a
+        worker thread, so the event loop keeps running while it is fetched.
+        """
+        value = self._validated.get(node_id, _MISSING)
+        if value is _MISSING:
+            raw = self._output(node_id)
+            if self._blobs is not None and is_claim_check(raw) and not self._is_cached(node_id):
+                raw = await asyncio.to_thread(self._blobs.load, raw)
+            value = self._resolve(node_id, raw)
+            self._validated[node_id] = value
+        return value
+
+    def has_remote_blobs(self) -> bool:
+        """Whether a dependency is a claim check whose blob is not on this host, so reading it makes RPCs."""
+        if self._remote is None:
+            self._remote = self._blobs is not None and any(
+                is_claim_check(raw) and not self._blobs.is_local(raw) for raw in self._outputs.values()
+            )
+        return self._remote
+
+    def _output(self, node_id: str) -> Any:
         if node_id not in self._outputs:
             raise KeyError(f"Node '{node_id}' not completed yet. Available: {list(self._outputs.keys())}")
         return self._outputs[node_id]
 
+    def _resolve(self, node_id: str, raw: Any) -> Any:
+        model = self._models.get(node_id)
+        key = (self._execution_id, node_id)
+        shared = model is not None and self._cache is not None and bool(self._execution_id)
+        # Checked before loading, so a cached claim-checked output is never read again.
+        if shared:
+            cached = self._cache.get(key)
+            if cached is not _MISSING:
+                return cached
+        raw = self._load(node_id, raw)
+        if model is None or not isinstance(raw, dict):
+            return raw
+        try:
+            value = _adapter(model).validate_python(raw)
+        except Exception:
+            return raw
+        if shared:
+            self._cache.put(key, value)
+        return value
+
+    def _load(self, node_id: str, raw: Any) -> Any:
+        if self._blobs is None or not is_claim_check(raw):
+            return raw
+        if _on_event_loop() and not self._blobs.is_local(raw):
+            logger.warning(
+                f"ctx.get('{node_id}') is fetching a claim-checked output on the event loop; "
+                f"use `await ctx.aget('{node_id}')` in async handlers"
+            )
+        return self._blobs.load(raw)
+
+    def _is_cached(self, node_id: str) -> bool:
+        if self._models.get(node_id) is None or self._cache is None or not self._execution_id:
+            return False
+        return (self._execution_id, node_id) in self._cache
+
     def get_map_results(self, map_node_id: str) -> list:
-        result = self._outputs.get(map_node_id)
-        if not isinstance(result, list):
-            raise TypeError(f"'{map_node_id}' is not a MAP node or not completed")
+        """
+        A MAP node's per-item results in item order, validated into its ``output_model`` if it has one.
+
+        Failed items (see :meth:`get_map_errors`) are ``None``, so indexes still line up with the items.
+        """
+        return validate_map_results(self._map_output(map_node_id), self._models.get(map_node_id))
+
+    def get_map_errors(self, map_node_id: str) -> dict[int, str]:
+        """Error messages of a MAP node's failed items, by item index."""
+        return {i: r["error"] for i, r in enumerate(self._map_output(map_node_id)) if is_map_error(r)}
+
+    def _map_output(self, map_node_id: str) -> list:
+        result = self._map_outputs.get(map_node_id)
+        if result is None:
+            result = self._load(map_node_id, self._outputs.get(map_node_id))
+            if isinstance(result, dict) and result.get(MAP_SUMMARY_MARKER) is True:
+                raise TypeError(f"'{map_node_id}' results are only available to its folding REDUCE")
+            if not isinstance(result, list):
+                raise TypeError(f"'{map_node_id}' is not a MAP node or not completed")
+            self._map_outputs[map_node_id] = result
         return result
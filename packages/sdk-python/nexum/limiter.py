@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+from typing import Callable
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """
+    Whether a handler error means the downstream is overloaded rather than the task being bad.
+
+    Timeouts and rate-limit errors count: anything with a 429 / 503 ``status_code``
+    or ``status`` attribute (httpx, openai, anthropic, aiohttp all expose one), or a
+    class name containing ``RateLimit``.
+    """
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    for attr in ("status_code", "status"):
+        if getattr(exc, attr, None) in (429, 503):
+            return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) in (429, 503):
+        return True
+    return "RateLimit" in type(exc).__name__
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to handler latency and overload errors (AIMD).
+
+    Drop-in for the worker's semaphore: ``acquire`` / ``release`` / ``locked``
+    gate task slots against the current limit, and every finished task is fed
+    back through :meth:`record`. While the limit is in use and tasks finish
+    within ``latency_tolerance`` x the smoothed latency (and under
+    ``latency_target`` if set), it grows by one per task. A slow task or an
+    overload error (see :func:`is_overload_error`) multiplies it by
+    ``backoff``, at most once per round of tasks started before the previous
+    cut, so one burst of 429s does not collapse it to ``min_limit``. Other
+    handler errors leave it unchanged.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_limit: int = 2,
+        max_limit: int = 200,
+        initial_limit: int | None = None,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        latency_target: float | None = None,
+        is_overload: Callable[[BaseException], bool] = is_overload_error,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Need 1 <= min_limit <= max_limit, got {min_limit} / {max_limit}")
+        if not 0 < backoff < 1:
+            raise ValueError(f"backoff must be between 0 and 1, got {backoff}")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._limit = float(min(max(initial_limit or min_limit, min_limit), max_limit))
+        self._backoff = backoff
+        self._latency_tolerance = latency_tolerance
+        self._latency_target = latency_target
+        self._is_overload = is_overload
+        self._inflight = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+        self._baseline: float | None = None
+        self._last_cut = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def locked(self) -> bool:
+        return self._inflight >= self.limit
+
+    async def acquire(self) -> None:
+        if not self._waiters and not self.locked():
+            self._inflight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # woken and cancelled in the same step: pass the slot on
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self._inflight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and not self.locked():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._inflight += 1
+                waiter.set_result(None)
+
+    def record(self, started_at: float, latency: float, error: BaseException | None = None) -> None:
+        """Feed back one finished task (``started_at`` on the event-loop clock) and adjust the limit."""
+        if error is not None:
+            if self._is_overload(error):
+                self._cut(started_at)
+            return
+
+        slow = self._latency_target is not None and latency > self._latency_target
+        if self._baseline is None:
+            self._baseline = latency
+        else:
+            slow = slow or latency > self._baseline * self._latency_tolerance
+            # Slow EWMA so a lasting shift in provider latency becomes the new normal.
+            self._baseline += 0.05 * (latency - self._baseline)
+
+        if slow:
+            self._cut(started_at)
+        elif self._inflight * 2 >= self._limit:
+            # Only grow while the limit is actually the bottleneck.
+            self._limit = min(self._limit + 1, self.max_limit)
+            self._wake()
+
+    def _cut(self, started_at: float) -> None:
+        if started_at < self._last_cut:
+            return  # started under the old, higher limit: already accounted for
+        self._limit = max(self._limit * self._backoff, self.min_limit)
+        self._last_cut = asyncio.get_running_loop().time()
@@ -24,57 +24,109 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bnexum.proto\x12\x05nexum\"H\n\nWorkflowIR\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x0f\n\x07ir_json\x18\x03 \x01(\t\"A\n\x0b\x41\x63kResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x15\n\rcompatibility\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"M\n\x0cStartRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x12\n\ninput_json\x18\x03 \x01(\t\"%\n\rStartResponse\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\"6\n\x0bPollRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\"\xb8\x02\n\x0cPollResponse\x12\x10\n\x08has_task\x18\x01 \x01(\x08\x12\x0f\n\x07task_id\x18\x02 \x01(\t\x12\x14\n\x0c\x65xecution_id\x18\x03 \x01(\t\x12\x0f\n\x07node_id\x18\x04 \x01(\t\x12\x12\n\ninput_json\x18\x05 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x06 \x01(\t\x12\x11\n\tnode_type\x18\x07 \x01(\t\x12\x15\n\rmap_item_json\x18\n \x01(\t\x12\x16\n\x0eis_map_subtask\x18\x0b \x01(\x08\x12\x11\n\tmap_index\x18\x0c \x01(\x05\x12\x11\n\tmap_total\x18\r \x01(\x05\x12\x18\n\x10sub_execution_id\x18\x0e \x01(\t\x12\x17\n\x0fsub_workflow_id\x18\x0f \x01(\t\x12\x16\n\x0esub_input_json\x18\x10 \x01(\t\"7\n\x0f\x43ompleteRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x13\n\x0boutput_json\x18\x02 \x01(\t\"5\n\x0b\x46\x61ilRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x15\n\rerror_message\x18\x02 \x01(\t\"%\n\rStatusRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\">\n\x0eStatusResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x1c\n\x14\x63ompleted_nodes_json\x18\x02 \x01(\t\"A\n\x0bListRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\x05\"w\n\x10\x45xecutionSummary\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x02 \x01(\t\x12\x14\n\x0cversion_hash\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x12\n\ncreated_at\x18\x05 \x01(\t\";\n\x0cListResponse\x12+\n\nexecutions\x18\x01 \x03(\x0b\x32\x17.nexum.ExecutionSummary\"%\n\rCancelRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\"*\n\x13ListVersionsRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\"\x81\x01\n\x0bVersionInfo\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x15\n\rcompatibility\x18\x03 \x01(\t\x12\x15\n\rregistered_at\x18\x04 \x01(\t\x12\x19\n\x11\x61\x63tive_executions\x18\x05 \x01(\x05\"<\n\x14ListVersionsResponse\x12$\n\x08versions\x18\x01 \x03(\x0b\x32\x12.nexum.VersionInfo\"Z\n\x0e\x41pproveRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x10\n\x08\x61pprover\x18\x03 \x01(\t\x12\x0f\n\x07\x63omment\x18\x04 \x01(\t\"X\n\rRejectRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x10\n\x08\x61pprover\x18\x03 \x01(\t\x12\x0e\n\x06reason\x18\x04 \x01(\t\"\x0e\n\x0c\x45mptyRequest\"e\n\x13PendingApprovalItem\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x03 \x01(\t\x12\x12\n\nstarted_at\x18\x04 \x01(\t\"E\n\x18PendingApprovalsResponse\x12)\n\x05items\x18\x01 \x03(\x0b\x32\x1a.nexum.PendingApprovalItem2\xed\x05\n\x0cNexumService\x12\x39\n\x10RegisterWorkflow\x12\x11.nexum.WorkflowIR\x1a\x12.nexum.AckResponse\x12;\n\x0eStartExecution\x12\x13.nexum.StartRequest\x1a\x14.nexum.StartResponse\x12\x33\n\x08PollTask\x12\x12.nexum.PollRequest\x1a\x13.nexum.PollResponse\x12:\n\x0c\x43ompleteTask\x12\x16.nexum.CompleteRequest\x1a\x12.nexum.AckResponse\x12\x32\n\x08\x46\x61ilTask\x12\x12.nexum.FailRequest\x1a\x12.nexum.AckResponse\x12\x38\n\tGetStatus\x12\x14.nexum.StatusRequest\x1a\x15.nexum.StatusResponse\x12\x39\n\x0eListExecutions\x12\x12.nexum.ListRequest\x1a\x13.nexum.ListResponse\x12;\n\x0f\x43\x61ncelExecution\x12\x14.nexum.CancelRequest\x1a\x12.nexum.AckResponse\x12O\n\x14ListWorkflowVersions\x12\x1a.nexum.ListVersionsRequest\x1a\x1b.nexum.ListVersionsResponse\x12\x38\n\x0b\x41pproveTask\x12\x15.nexum.ApproveRequest\x1a\x12.nexum.AckResponse\x12\x36\n\nRejectTask\x12\x14.nexum.RejectRequest\x1a\x12.nexum.AckResponse\x12K\n\x13GetPendingApprovals\x12\x13.nexum.EmptyRequest\x1a\x1f.nexum.PendingApprovalsResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bnexum.proto\x12\x05nexum\"H\n\nWorkflowIR\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x0f\n\x07ir_json\x18\x03 \x01(\t\"A\n\x0b\x41\x63kResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x15\n\rcompatibility\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"-\n\x07Payload\x12\x14\n\x0c\x63ontent_type\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\"}\n\x0cStartRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x12\n\ninput_json\x18\x03 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x04 \x01(\t\x12\x15\n\rinput_blob_id\x18\x05 \x01(\t\"%\n\rStartResponse\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\"r\n\x16StartExecutionsRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x13\n\x0binput_jsons\x18\x03 \x03(\t\x12\x18\n\x10idempotency_keys\x18\x04 \x03(\t\"0\n\x17StartExecutionsResponse\x12\x15\n\rexecution_ids\x18\x01 \x03(\t\"{\n\x0bPollRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x17\n\x0fwait_timeout_ms\x18\x03 \x01(\r\x12\x16\n\x0eversion_hashes\x18\x04 \x03(\t\x12\x12\n\nlazy_blobs\x18\x05 \x01(\x08\"\x93\x04\n\x0cPollResponse\x12\x10\n\x08has_task\x18\x01 \x01(\x08\x12\x0f\n\x07task_id\x18\x02 \x01(\t\x12\x14\n\x0c\x65xecution_id\x18\x03 \x01(\t\x12\x0f\n\x07node_id\x18\x04 \x01(\t\x12\x12\n\ninput_json\x18\x05 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x06 \x01(\t\x12\x11\n\tnode_type\x18\x07 \x01(\t\x12\x15\n\rmap_item_json\x18\n \x01(\t\x12\x16\n\x0eis_map_subtask\x18\x0b \x01(\x08\x12\x11\n\tmap_index\x18\x0c \x01(\x05\x12\x11\n\tmap_total\x18\r \x01(\x05\x12\x18\n\x10sub_execution_id\x18\x0e \x01(\t\x12\x17\n\x0fsub_workflow_id\x18\x0f \x01(\t\x12\x16\n\x0esub_input_json\x18\x10 \x01(\t\x12\x14\n\x0cversion_hash\x18\x11 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x12 \x01(\t\x12\x15\n\rlease_seconds\x18\x13 \x01(\x05\x12:\n\x0c\x64\x65p_payloads\x18\x14 \x03(\x0b\x32$.nexum.PollResponse.DepPayloadsEntry\x12\x17\n\x0f\x63heckpoint_json\x18\x15 \x01(\t\x1a\x42\n\x10\x44\x65pPayloadsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1d\n\x05value\x18\x02 \x01(\x0b\x32\x0e.nexum.Payload:\x02\x38\x01\"H\n\x10HeartbeatRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x11\n\tworker_id\x18\x02 \x01(\t\x12\x10\n\x08progress\x18\x03 \x01(\t\"\x1f\n\x11HeartbeatResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\":\n\x13ReleaseTasksRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x10\n\x08task_ids\x18\x02 \x03(\t\"(\n\x14ReleaseTasksResponse\x12\x10\n\x08released\x18\x01 \x01(\x05\"C\n\x10\x46\x65tchBlobRequest\x12\x0f\n\x07\x62lob_id\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x04\x12\x0e\n\x06length\x18\x03 \x01(\x04\"5\n\x11\x46\x65tchBlobResponse\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x12\n\ntotal_size\x18\x02 \x01(\x04\"\x1c\n\x0cPayloadChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"6\n\x15UploadPayloadResponse\x12\x0f\n\x07\x62lob_id\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x04\")\n\x16\x44ownloadPayloadRequest\x12\x0f\n\x07\x62lob_id\x18\x01 \x01(\t\"_\n\x15\x41ppendMapItemsRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x12\n\nitems_json\x18\x02 \x01(\t\x12\x0e\n\x06offset\x18\x03 \x01(\x04\x12\x11\n\tworker_id\x18\x04 \x01(\t\"=\n\x16\x41ppendMapItemsResponse\x12\x12\n\nitem_count\x18\x01 \x01(\x04\x12\x0f\n\x07pending\x18\x02 \x01(\x04\"t\n\x15ReadMapResultsRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x12\n\nfrom_index\x18\x02 \x01(\x04\x12\r\n\x05limit\x18\x03 \x01(\r\x12\x14\n\x0cpartial_json\x18\x04 \x01(\t\x12\x11\n\tworker_id\x18\x05 \x01(\t\"P\n\x16ReadMapResultsResponse\x12\x14\n\x0cresults_json\x18\x01 \x03(\t\x12\x12\n\nitem_count\x18\x02 \x01(\x04\x12\x0c\n\x04\x64one\x18\x03 \x01(\x08\"}\n\x10PollTasksRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x16\n\x0eversion_hashes\x18\x02 \x03(\t\x12\x11\n\tmax_tasks\x18\x03 \x01(\x05\x12\x17\n\x0fwait_timeout_ms\x18\x04 \x01(\r\x12\x12\n\nlazy_blobs\x18\x05 \x01(\x08\"7\n\x11PollTasksResponse\x12\"\n\x05tasks\x18\x01 \x03(\x0b\x32\x13.nexum.PollResponse\"o\n\x0f\x43ompleteRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x13\n\x0boutput_json\x18\x02 \x01(\t\x12\x1e\n\x06output\x18\x03 \x01(\x0b\x32\x0e.nexum.Payload\x12\x16\n\x0eoutput_blob_id\x18\x04 \x01(\t\"5\n\x0b\x46\x61ilRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\x15\n\rerror_message\x18\x02 \x01(\t\"=\n\x14\x43ompleteTasksRequest\x12%\n\x05items\x18\x01 \x03(\x0b\x32\x16.nexum.CompleteRequest\"5\n\x10\x46\x61ilTasksRequest\x12!\n\x05items\x18\x01 \x03(\x0b\x32\x12.nexum.FailRequest\"7\n\x07TaskAck\x12\x0f\n\x07task_id\x18\x01 \x01(\t\x12\n\n\x02ok\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\"0\n\x10\x42\x61tchAckResponse\x12\x1c\n\x04\x61\x63ks\x18\x01 \x03(\x0b\x32\x0e.nexum.TaskAck\"%\n\rStatusRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\"\xe1\x01\n\x0eStatusResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x1c\n\x14\x63ompleted_nodes_json\x18\x02 \x01(\t\x12>\n\rnode_payloads\x18\x03 \x03(\x0b\x32\'.nexum.StatusResponse.NodePayloadsEntry\x12\x1c\n\x14partial_outputs_json\x18\x04 \x01(\t\x1a\x43\n\x11NodePayloadsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1d\n\x05value\x18\x02 \x01(\x0b\x32\x0e.nexum.Payload:\x02\x38\x01\"A\n\x0bListRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\x05\"w\n\x10\x45xecutionSummary\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x02 \x01(\t\x12\x14\n\x0cversion_hash\x18\x03 \x01(\t\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x12\n\ncreated_at\x18\x05 \x01(\t\";\n\x0cListResponse\x12+\n\nexecutions\x18\x01 \x03(\x0b\x32\x17.nexum.ExecutionSummary\"%\n\rCancelRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\"*\n\x13ListVersionsRequest\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\"\x81\x01\n\x0bVersionInfo\x12\x13\n\x0bworkflow_id\x18\x01 \x01(\t\x12\x14\n\x0cversion_hash\x18\x02 \x01(\t\x12\x15\n\rcompatibility\x18\x03 \x01(\t\x12\x15\n\rregistered_at\x18\x04 \x01(\t\x12\x19\n\x11\x61\x63tive_executions\x18\x05 \x01(\x05\"<\n\x14ListVersionsResponse\x12$\n\x08versions\x18\x01 \x03(\x0b\x32\x12.nexum.VersionInfo\"Z\n\x0e\x41pproveRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x10\n\x08\x61pprover\x18\x03 \x01(\t\x12\x0f\n\x07\x63omment\x18\x04 \x01(\t\"X\n\rRejectRequest\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x10\n\x08\x61pprover\x18\x03 \x01(\t\x12\x0e\n\x06reason\x18\x04 \x01(\t\"\x0e\n\x0c\x45mptyRequest\"e\n\x13PendingApprovalItem\x12\x14\n\x0c\x65xecution_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x13\n\x0bworkflow_id\x18\x03 \x01(\t\x12\x12\n\nstarted_at\x18\x04 \x01(\t\"E\n\x18PendingApprovalsResponse\x12)\n\x05items\x18\x01 \x03(\x0b\x32\x1a.nexum.PendingApprovalItem2\xbc\x0c\n\x0cNexumService\x12\x39\n\x10RegisterWorkflow\x12\x11.nexum.WorkflowIR\x1a\x12.nexum.AckResponse\x12;\n\x0eStartExecution\x12\x13.nexum.StartRequest\x1a\x14.nexum.StartResponse\x12P\n\x0fStartExecutions\x12\x1d.nexum.StartExecutionsRequest\x1a\x1e.nexum.StartExecutionsResponse\x12\x33\n\x08PollTask\x12\x12.nexum.PollRequest\x1a\x13.nexum.PollResponse\x12>\n\tPollTasks\x12\x17.nexum.PollTasksRequest\x1a\x18.nexum.PollTasksResponse\x12:\n\x0c\x43ompleteTask\x12\x16.nexum.CompleteRequest\x1a\x12.nexum.AckResponse\x12\x32\n\x08\x46\x61ilTask\x12\x12.nexum.FailRequest\x1a\x12.nexum.AckResponse\x12\x45\n\rCompleteTasks\x12\x1b.nexum.CompleteTasksRequest\x1a\x17.nexum.BatchAckResponse\x12=\n\tFailTasks\x12\x17.nexum.FailTasksRequest\x1a\x17.nexum.BatchAckResponse\x12>\n\tHeartbeat\x12\x17.nexum.HeartbeatRequest\x1a\x18.nexum.HeartbeatResponse\x12G\n\x0cReleaseTasks\x12\x1a.nexum.ReleaseTasksRequest\x1a\x1b.nexum.ReleaseTasksResponse\x12>\n\tFetchBlob\x12\x17.nexum.FetchBlobRequest\x1a\x18.nexum.FetchBlobResponse\x12\x44\n\rUploadPayload\x12\x13.nexum.PayloadChunk\x1a\x1c.nexum.UploadPayloadResponse(\x01\x12G\n\x0f\x44ownloadPayload\x12\x1d.nexum.DownloadPayloadRequest\x1a\x13.nexum.PayloadChunk0\x01\x12M\n\x0e\x41ppendMapItems\x12\x1c.nexum.AppendMapItemsRequest\x1a\x1d.nexum.AppendMapItemsResponse\x12M\n\x0eReadMapResults\x12\x1c.nexum.ReadMapResultsRequest\x1a\x1d.nexum.ReadMapResultsResponse\x12\x38\n\tGetStatus\x12\x14.nexum.StatusRequest\x1a\x15.nexum.StatusResponse\x12?\n\x0eWatchExecution\x12\x14.nexum.StatusRequest\x1a\x15.nexum.StatusResponse0\x01\x12\x39\n\x0eListExecutions\x12\x12.nexum.ListRequest\x1a\x13.nexum.ListResponse\x12;\n\x0f\x43\x61ncelExecution\x12\x14.nexum.CancelRequest\x1a\x12.nexum.AckResponse\x12O\n\x14ListWorkflowVersions\x12\x1a.nexum.ListVersionsRequest\x1a\x1b.nexum.ListVersionsResponse\x12\x38\n\x0b\x41pproveTask\x12\x15.nexum.ApproveRequest\x1a\x12.nexum.AckResponse\x12\x36\n\nRejectTask\x12\x14.nexum.RejectRequest\x1a\x12.nexum.AckResponse\x12K\n\x13GetPendingApprovals\x12\x13.nexum.EmptyRequest\x1a\x1f.nexum.PendingApprovalsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'nexum_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_POLLRESPONSE_DEPPAYLOADSENTRY']._loaded_options = None
+  _globals['_POLLRESPONSE_DEPPAYLOADSENTRY']._serialized_options = b'8\001'
+  _globals['_STATUSRESPONSE_NODEPAYLOADSENTRY']._loaded_options = None
+  _globals['_STATUSRESPONSE_NODEPAYLOADSENTRY']._serialized_options = b'8\001'
   _globals['_WORKFLOWIR']._serialized_start=22
   _globals['_WORKFLOWIR']._serialized_end=94
   _globals['_ACKRESPONSE']._serialized_start=96
   _globals['_ACKRESPONSE']._serialized_end=161
-  _globals['_STARTREQUEST']._serialized_start=163
-  _globals['_STARTREQUEST']._serialized_end=240
-  _globals['_STARTRESPONSE']._serialized_start=242
-  _globals['_STARTRESPONSE']._serialized_end=279
-  _globals['_POLLREQUEST']._serialized_start=281
-  _globals['_POLLREQUEST']._serialized_end=335
-  _globals['_POLLRESPONSE']._serialized_start=338
-  _globals['_POLLRESPONSE']._serialized_end=650
-  _globals['_COMPLETEREQUEST']._serialized_start=652
-  _globals['_COMPLETEREQUEST']._serialized_end=707
-  _globals['_FAILREQUEST']._serialized_start=709
-  _globals['_FAILREQUEST']._serialized_end=762
-  _globals['_STATUSREQUEST']._serialized_start=764
-  _globals['_STATUSREQUEST']._serialized_end=801
-  _globals['_STATUSRESPONSE']._serialized_start=803
-  _globals['_STATUSRESPONSE']._serialized_end=865
-  _globals['_LISTREQUEST']._serialized_start=867
-  _globals['_LISTREQUEST']._serialized_end=932
-  _globals['_EXECUTIONSUMMARY']._serialized_start=934
-  _globals['_EXECUTIONSUMMARY']._serialized_end=1053
-  _globals['_LISTRESPONSE']._serialized_start=1055
-  _globals['_LISTRESPONSE']._serialized_end=1114
-  _globals['_CANCELREQUEST']._serialized_start=1116
-  _globals['_CANCELREQUEST']._serialized_end=1153
-  _globals['_LISTVERSIONSREQUEST']._serialized_start=1155
-  _globals['_LISTVERSIONSREQUEST']._serialized_end=1197
-  _globals['_VERSIONINFO']._serialized_start=1200
-  _globals['_VERSIONINFO']._serialized_end=1329
-  _globals['_LISTVERSIONSRESPONSE']._serialized_start=1331
-  _globals['_LISTVERSIONSRESPONSE']._serialized_end=1391
-  _globals['_APPROVEREQUEST']._serialized_start=1393
-  _globals['_APPROVEREQUEST']._serialized_end=1483
-  _globals['_REJECTREQUEST']._serialized_start=1485
-  _globals['_REJECTREQUEST']._serialized_end=1573
-  _globals['_EMPTYREQUEST']._serialized_start=1575
-  _globals['_EMPTYREQUEST']._serialized_end=1589
-  _globals['_PENDINGAPPROVALITEM']._serialized_start=1591
-  _globals['_PENDINGAPPROVALITEM']._serialized_end=1692
-  _globals['_PENDINGAPPROVALSRESPONSE']._serialized_start=1694
-  _globals['_PENDINGAPPROVALSRESPONSE']._serialized_end=1763
-  _globals['_NEXUMSERVICE']._serialized_start=1766
-  _globals['_NEXUMSERVICE']._serialized_end=2515
+  _globals['_PAYLOAD']._serialized_start=163
+  _globals['_PAYLOAD']._serialized_end=208
+  _globals['_STARTREQUEST']._serialized_start=210
+  _globals['_STARTREQUEST']._serialized_end=335
+  _globals['_STARTRESPONSE']._serialized_start=337
+  _globals['_STARTRESPONSE']._serialized_end=374
+  _globals['_STARTEXECUTIONSREQUEST']._serialized_start=376
+  _globals['_STARTEXECUTIONSREQUEST']._serialized_end=490
+  _globals['_STARTEXECUTIONSRESPONSE']._serialized_start=492
+  _globals['_STARTEXECUTIONSRESPONSE']._serialized_end=540
+  _globals['_POLLREQUEST']._serialized_start=542
+  _globals['_POLLREQUEST']._serialized_end=665
+  _globals['_POLLRESPONSE']._serialized_start=668
+  _globals['_POLLRESPONSE']._serialized_end=1199
+  _globals['_POLLRESPONSE_DEPPAYLOADSENTRY']._serialized_start=1133
+  _globals['_POLLRESPONSE_DEPPAYLOADSENTRY']._serialized_end=1199
+  _globals['_HEARTBEATREQUEST']._serialized_start=1201
+  _globals['_HEARTBEATREQUEST']._serialized_end=1273
+  _globals['_HEARTBEATRESPONSE']._serialized_start=1275
+  _globals['_HEARTBEATRESPONSE']._serialized_end=1306
+  _globals['_RELEASETASKSREQUEST']._serialized_start=1308
+  _globals['_RELEASETASKSREQUEST']._serialized_end=1366
+  _globals['_RELEASETASKSRESPONSE']._serialized_start=1368
+  _globals['_RELEASETASKSRESPONSE']._serialized_end=1408
+  _globals['_FETCHBLOBREQUEST']._serialized_start=1410
+  _globals['_FETCHBLOBREQUEST']._serialized_end=1477
+  _globals['_FETCHBLOBRESPONSE']._serialized_start=1479
+  _globals['_FETCHBLOBRESPONSE']._serialized_end=1532
+  _globals['_PAYLOADCHUNK']._serialized_start=1534
+  _globals['_PAYLOADCHUNK']._serialized_end=1562
+  _globals['_UPLOADPAYLOADRESPONSE']._serialized_start=1564
+  _globals['_UPLOADPAYLOADRESPONSE']._serialized_end=1618
+  _globals['_DOWNLOADPAYLOADREQUEST']._serialized_start=1620
+  _globals['_DOWNLOADPAYLOADREQUEST']._serialized_end=1661
+  _globals['_APPENDMAPITEMSREQUEST']._serialized_start=1663
+  _globals['_APPENDMAPITEMSREQUEST']._serialized_end=1758
+  _globals['_APPENDMAPITEMSRESPONSE']._serialized_start=1760
+  _globals['_APPENDMAPITEMSRESPONSE']._serialized_end=1821
+  _globals['_READMAPRESULTSREQUEST']._serialized_start=1823
+  _globals['_READMAPRESULTSREQUEST']._serialized_end=1939
+  _globals['_READMAPRESULTSRESPONSE']._serialized_start=1941
+  _globals['_READMAPRESULTSRESPONSE']._serialized_end=2021
+  _globals['_POLLTASKSREQUEST']._serialized_start=2023
+  _globals['_POLLTASKSREQUEST']._serialized_end=2148
+  _globals['_POLLTASKSRESPONSE']._serialized_start=2150
+  _globals['_POLLTASKSRESPONSE']._serialized_end=2205
+  _globals['_COMPLETEREQUEST']._serialized_start=2207
+  _globals['_COMPLETEREQUEST']._serialized_end=2318
+  _globals['_FAILREQUEST']._serialized_start=2320
+  _globals['_FAILREQUEST']._serialized_end=2373
+  _globals['_COMPLETETASKSREQUEST']._serialized_start=2375
+  _globals['_COMPLETETASKSREQUEST']._serialized_end=2436
+  _globals['_FAILTASKSREQUEST']._serialized_start=2438
+  _globals['_FAILTASKSREQUEST']._serialized_end=2491
+  _globals['_TASKACK']._serialized_start=2493
+  _globals['_TASKACK']._serialized_end=2548
+  _globals['_BATCHACKRESPONSE']._serialized_start=2550
+  _globals['_BATCHACKRESPONSE']._serialized_end=2598
+  _globals['_STATUSREQUEST']._serialized_start=2600
+  _globals['_STATUSREQUEST']._serialized_end=2637
+  _globals['_STATUSRESPONSE']._serialized_start=2640
+  _globals['_STATUSRESPONSE']._serialized_end=2865
+  _globals['_STATUSRESPONSE_NODEPAYLOADSENTRY']._serialized_start=2798
+  _globals['_STATUSRESPONSE_NODEPAYLOADSENTRY']._serialized_end=2865
+  _globals['_LISTREQUEST']._serialized_start=2867
+  _globals['_LISTREQUEST']._serialized_end=2932
+  _globals['_EXECUTIONSUMMARY']._serialized_start=2934
+  _globals['_EXECUTIONSUMMARY']._serialized_end=3053
+  _globals['_LISTRESPONSE']._serialized_start=3055
+  _globals['_LISTRESPONSE']._serialized_end=3114
+  _globals['_CANCELREQUEST']._serialized_start=3116
+  _globals['_CANCELREQUEST']._serialized_end=3153
+  _globals['_LISTVERSIONSREQUEST']._serialized_start=3155
+  _globals['_LISTVERSIONSREQUEST']._serialized_end=3197
+  _globals['_VERSIONINFO']._serialized_start=3200
+  _globals['_VERSIONINFO']._serialized_end=3329
+  _globals['_LISTVERSIONSRESPONSE']._serialized_start=3331
+  _globals['_LISTVERSIONSRESPONSE']._serialized_end=3391
+  _globals['_APPROVEREQUEST']._serialized_start=3393
+  _globals['_APPROVEREQUEST']._serialized_end=3483
+  _globals['_REJECTREQUEST']._serialized_start=3485
+  _globals['_REJECTREQUEST']._serialized_end=3573
+  _globals['_EMPTYREQUEST']._serialized_start=3575
+  _globals['_EMPTYREQUEST']._serialized_end=3589
+  _globals['_PENDINGAPPROVALITEM']._serialized_start=3591
+  _globals['_PENDINGAPPROVALITEM']._serialized_end=3692
+  _globals['_PENDINGAPPROVALSRESPONSE']._serialized_start=3694
+  _globals['_PENDINGAPPROVALSRESPONSE']._serialized_end=3763
+  _globals['_NEXUMSERVICE']._serialized_start=3766
+  _globals['_NEXUMSERVICE']._serialized_end=5362
 # @@protoc_insertion_point(module_scope)
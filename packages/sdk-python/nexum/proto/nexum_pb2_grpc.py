@@ -44,11 +44,21 @@ class NexumServiceStub(object):
                 request_serializer=nexum__pb2.StartRequest.SerializeToString,
                 response_deserializer=nexum__pb2.StartResponse.FromString,
                 _registered_method=True)
+        self.StartExecutions = channel.unary_unary(
+                '/nexum.NexumService/StartExecutions',
+                request_serializer=nexum__pb2.StartExecutionsRequest.SerializeToString,
+                response_deserializer=nexum__pb2.StartExecutionsResponse.FromString,
+                _registered_method=True)
         self.PollTask = channel.unary_unary(
                 '/nexum.NexumService/PollTask',
                 request_serializer=nexum__pb2.PollRequest.SerializeToString,
                 response_deserializer=nexum__pb2.PollResponse.FromString,
                 _registered_method=True)
+        self.PollTasks = channel.unary_unary(
+                '/nexum.NexumService/PollTasks',
+                request_serializer=nexum__pb2.PollTasksRequest.SerializeToString,
+                response_deserializer=nexum__pb2.PollTasksResponse.FromString,
+                _registered_method=True)
         self.CompleteTask = channel.unary_unary(
                 '/nexum.NexumService/CompleteTask',
                 request_serializer=nexum__pb2.CompleteRequest.SerializeToString,
@@ -59,11 +69,61 @@ class NexumServiceStub(object):
                 request_serializer=nexum__pb2.FailRequest.SerializeToString,
                 response_deserializer=nexum__pb2.AckResponse.FromString,
                 _registered_method=True)
+        self.CompleteTasks = channel.unary_unary(
+                '/nexum.NexumService/CompleteTasks',
+                request_serializer=nexum__pb2.CompleteTasksRequest.SerializeToString,
+                response_deserializer=nexum__pb2.BatchAckResponse.FromString,
+                _registered_method=True)
+        self.FailTasks = channel.unary_unary(
+                '/nexum.NexumService/FailTasks',
+                request_serializer=nexum__pb2.FailTasksRequest.SerializeToString,
+                response_deserializer=nexum__pb2.BatchAckResponse.FromString,
+                _registered_method=True)
+        self.Heartbeat = channel.unary_unary(
+                '/nexum.NexumService/Heartbeat',
+                request_serializer=nexum__pb2.HeartbeatRequest.SerializeToString,
+                response_deserializer=nexum__pb2.HeartbeatResponse.FromString,
+                _registered_method=True)
+        self.ReleaseTasks = channel.unary_unary(
+                '/nexum.NexumService/ReleaseTasks',
+                request_serializer=nexum__pb2.ReleaseTasksRequest.SerializeToString,
+                response_deserializer=nexum__pb2.ReleaseTasksResponse.FromString,
+                _registered_method=True)
+        self.FetchBlob = channel.unary_unary(
+                '/nexum.NexumService/FetchBlob',
+                request_serializer=nexum__pb2.FetchBlobRequest.SerializeToString,
+                response_deserializer=nexum__pb2.FetchBlobResponse.FromString,
+                _registered_method=True)
+        self.UploadPayload = channel.stream_unary(
+                '/nexum.NexumService/UploadPayload',
+                request_serializer=nexum__pb2.PayloadChunk.SerializeToString,
+                response_deserializer=nexum__pb2.UploadPayloadResponse.FromString,
+                _registered_method=True)
+        self.DownloadPayload = channel.unary_stream(
+                '/nexum.NexumService/DownloadPayload',
+                request_serializer=nexum__pb2.DownloadPayloadRequest.SerializeToString,
+                response_deserializer=nexum__pb2.PayloadChunk.FromString,
+                _registered_method=True)
+        self.AppendMapItems = channel.unary_unary(
+                '/nexum.NexumService/AppendMapItems',
+                request_serializer=nexum__pb2.AppendMapItemsRequest.SerializeToString,
+                response_deserializer=nexum__pb2.AppendMapItemsResponse.FromString,
+                _registered_method=True)
+        self.ReadMapResults = channel.unary_unary(
+                '/nexum.NexumService/ReadMapResults',
+                request_serializer=nexum__pb2.ReadMapResultsRequest.SerializeToString,
+                response_deserializer=nexum__pb2.ReadMapResultsResponse.FromString,
+                _registered_method=True)
         self.GetStatus = channel.unary_unary(
                 '/nexum.NexumService/GetStatus',
                 request_serializer=nexum__pb2.StatusRequest.SerializeToString,
                 response_deserializer=nexum__pb2.StatusResponse.FromString,
                 _registered_method=True)
+        self.WatchExecution = channel.unary_stream(
+                '/nexum.NexumService/WatchExecution',
+                request_serializer=nexum__pb2.StatusRequest.SerializeToString,
+                response_deserializer=nexum__pb2.StatusResponse.FromString,
+                _registered_method=True)
         self.ListExecutions = channel.unary_unary(
                 '/nexum.NexumService/ListExecutions',
                 request_serializer=nexum__pb2.ListRequest.SerializeToString,
@@ -111,12 +171,24 @@ class NexumServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StartExecutions(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def PollTask(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PollTasks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def CompleteTask(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -129,12 +201,80 @@ class NexumServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CompleteTasks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FailTasks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Heartbeat(self, request, context):
+        """extend a RUNNING task's lease
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReleaseTasks(self, request, context):
+        """hand unfinished leases back to READY
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FetchBlob(self, request, context):
+        """byte range of a claim-checked output
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UploadPayload(self, request_iterator, context):
+        """stream a large JSON input/output into the blob store
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DownloadPayload(self, request, context):
+        """stream a whole blob back
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AppendMapItems(self, request, context):
+        """a page of a running MAP coordinator's items
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReadMapResults(self, request, context):
+        """a folding REDUCE's next chunk of MAP results
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetStatus(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def WatchExecution(self, request, context):
+        """current status, then every change until terminal
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ListExecutions(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -184,11 +324,21 @@ def add_NexumServiceServicer_to_server(servicer, server):
                     request_deserializer=nexum__pb2.StartRequest.FromString,
                     response_serializer=nexum__pb2.StartResponse.SerializeToString,
             ),
+            'StartExecutions': grpc.unary_unary_rpc_method_handler(
+                    servicer.StartExecutions,
+                    request_deserializer=nexum__pb2.StartExecutionsRequest.FromString,
+                    response_serializer=nexum__pb2.StartExecutionsResponse.SerializeToString,
+            ),
             'PollTask': grpc.unary_unary_rpc_method_handler(
                     servicer.PollTask,
                     request_deserializer=nexum__pb2.PollRequest.FromString,
                     response_serializer=nexum__pb2.PollResponse.SerializeToString,
             ),
+            'PollTasks': grpc.unary_unary_rpc_method_handler(
+                    servicer.PollTasks,
+                    request_deserializer=nexum__pb2.PollTasksRequest.FromString,
+                    response_serializer=nexum__pb2.PollTasksResponse.SerializeToString,
+            ),
             'CompleteTask': grpc.unary_unary_rpc_method_handler(
                     servicer.CompleteTask,
                     request_deserializer=nexum__pb2.CompleteRequest.FromString,
@@ -199,11 +349,61 @@ def add_NexumServiceServicer_to_server(servicer, server):
                     request_deserializer=nexum__pb2.FailRequest.FromString,
                     response_serializer=nexum__pb2.AckResponse.SerializeToString,
             ),
+            'CompleteTasks': grpc.unary_unary_rpc_method_handler(
+                    servicer.CompleteTasks,
+                    request_deserializer=nexum__pb2.CompleteTasksRequest.FromString,
+                    response_serializer=nexum__pb2.BatchAckResponse.SerializeToString,
+            ),
+            'FailTasks': grpc.unary_unary_rpc_method_handler(
+                    servicer.FailTasks,
+                    request_deserializer=nexum__pb2.FailTasksRequest.FromString,
+                    response_serializer=nexum__pb2.BatchAckResponse.SerializeToString,
+            ),
+            'Heartbeat': grpc.unary_unary_rpc_method_handler(
+                    servicer.Heartbeat,
+                    request_deserializer=nexum__pb2.HeartbeatRequest.FromString,
+                    response_serializer=nexum__pb2.HeartbeatResponse.SerializeToString,
+            ),
+            'ReleaseTasks': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReleaseTasks,
+                    request_deserializer=nexum__pb2.ReleaseTasksRequest.FromString,
+                    response_serializer=nexum__pb2.ReleaseTasksResponse.SerializeToString,
+            ),
+            'FetchBlob': grpc.unary_unary_rpc_method_handler(
+                    servicer.FetchBlob,
+                    request_deserializer=nexum__pb2.FetchBlobRequest.FromString,
+                    response_serializer=nexum__pb2.FetchBlobResponse.SerializeToString,
+            ),
+            'UploadPayload': grpc.stream_unary_rpc_method_handler(
+                    servicer.UploadPayload,
+                    request_deserializer=nexum__pb2.PayloadChunk.FromString,
+                    response_serializer=nexum__pb2.UploadPayloadResponse.SerializeToString,
+            ),
+            'DownloadPayload': grpc.unary_stream_rpc_method_handler(
+                    servicer.DownloadPayload,
+                    request_deserializer=nexum__pb2.DownloadPayloadRequest.FromString,
+                    response_serializer=nexum__pb2.PayloadChunk.SerializeToString,
+            ),
+            'AppendMapItems': grpc.unary_unary_rpc_method_handler(
+                    servicer.AppendMapItems,
+                    request_deserializer=nexum__pb2.AppendMapItemsRequest.FromString,
+                    response_serializer=nexum__pb2.AppendMapItemsResponse.SerializeToString,
+            ),
+            'ReadMapResults': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReadMapResults,
+                    request_deserializer=nexum__pb2.ReadMapResultsRequest.FromString,
+                    response_serializer=nexum__pb2.ReadMapResultsResponse.SerializeToString,
+            ),
             'GetStatus': grpc.unary_unary_rpc_method_handler(
                     servicer.GetStatus,
                     request_deserializer=nexum__pb2.StatusRequest.FromString,
                     response_serializer=nexum__pb2.StatusResponse.SerializeToString,
             ),
+            'WatchExecution': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchExecution,
+                    request_deserializer=nexum__pb2.StatusRequest.FromString,
+                    response_serializer=nexum__pb2.StatusResponse.SerializeToString,
+            ),
             'ListExecutions': grpc.unary_unary_rpc_method_handler(
                     servicer.ListExecutions,
                     request_deserializer=nexum__pb2.ListRequest.FromString,
@@ -299,6 +499,33 @@ class NexumService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StartExecutions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/StartExecutions',
+            nexum__pb2.StartExecutionsRequest.SerializeToString,
+            nexum__pb2.StartExecutionsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def PollTask(request,
             target,
@@ -326,6 +553,33 @@ class NexumService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def PollTasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/PollTasks',
+            nexum__pb2.PollTasksRequest.SerializeToString,
+            nexum__pb2.PollTasksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def CompleteTask(request,
             target,
@@ -380,6 +634,249 @@ class NexumService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def CompleteTasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/CompleteTasks',
+            nexum__pb2.CompleteTasksRequest.SerializeToString,
+            nexum__pb2.BatchAckResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def FailTasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/FailTasks',
+            nexum__pb2.FailTasksRequest.SerializeToString,
+            nexum__pb2.BatchAckResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Heartbeat(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/Heartbeat',
+            nexum__pb2.HeartbeatRequest.SerializeToString,
+            nexum__pb2.HeartbeatResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReleaseTasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/ReleaseTasks',
+            nexum__pb2.ReleaseTasksRequest.SerializeToString,
+            nexum__pb2.ReleaseTasksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def FetchBlob(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/FetchBlob',
+            nexum__pb2.FetchBlobRequest.SerializeToString,
+            nexum__pb2.FetchBlobResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UploadPayload(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/nexum.NexumService/UploadPayload',
+            nexum__pb2.PayloadChunk.SerializeToString,
+            nexum__pb2.UploadPayloadResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DownloadPayload(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/nexum.NexumService/DownloadPayload',
+            nexum__pb2.DownloadPayloadRequest.SerializeToString,
+            nexum__pb2.PayloadChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AppendMapItems(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/AppendMapItems',
+            nexum__pb2.AppendMapItemsRequest.SerializeToString,
+            nexum__pb2.AppendMapItemsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReadMapResults(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nexum.NexumService/ReadMapResults',
+            nexum__pb2.ReadMapResultsRequest.SerializeToString,
+            nexum__pb2.ReadMapResultsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetStatus(request,
             target,
@@ -407,6 +904,33 @@ class NexumService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def WatchExecution(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/nexum.NexumService/WatchExecution',
+            nexum__pb2.StatusRequest.SerializeToString,
+            nexum__pb2.StatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ListExecutions(request,
             target,
@@ -1,20 +1,197 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import inspect
+import itertools
 import json
-import time
+import multiprocessing
+import pickle
+import signal
 import uuid
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
+import grpc
+import pydantic_core
 from pydantic import BaseModel
 
-from .context import ContextView
-from .client import NexumClient
+from .blobs import BlobStore, is_claim_check
+from .cache import CachedOutput, ResultCache, cache_key
+from .codec import JSON_CONTENT_TYPE, decode_payload
+from .context import ContextView, DependencyCache, map_error, validate_map_results
+from .client import STREAM_THRESHOLD, AsyncNexumClient
+from .proto import nexum_pb2
+from .limiter import AdaptiveLimiter
 
 logger = logging.getLogger("nexum")
 
+# Server-side lease for nodes without ``lease_seconds``; used if a PollResponse carries none.
+DEFAULT_LEASE_SECONDS = 60
+
+# Tries at a CompleteTasks / FailTasks batch before falling back to one RPC per task.
+BATCH_SEND_ATTEMPTS = 3
+
+
+def _call_in_process(
+    handler, input_data: dict, outputs: dict[str, Any], models: dict[str, type], blobs: BlobStore | None, *args
+) -> Any:
+    """Entry point in a pool process: rebuild the ContextView from its data and run the handler."""
+    return handler(ContextView(input_data=input_data, outputs=outputs, models=models, blobs=blobs), *args)
+
+
+def _to_cache_entry(output: Any) -> CachedOutput:
+    """A completion value (JSON str or Payload) as a cache entry."""
+    if isinstance(output, str):
+        return (JSON_CONTENT_TYPE, output.encode())
+    return (output.content_type, output.data)
+
+
+def _from_cache_entry(entry: CachedOutput) -> Any:
+    content_type, data = entry
+    if content_type == JSON_CONTENT_TYPE:
+        return data.decode()
+    return nexum_pb2.Payload(content_type=content_type, data=data)
+
+
+def _batch_items(items: list) -> Any:
+    """A MAP batch as handed to the handler: a NumPy array when every item is a number and NumPy is installed."""
+    if not items or not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in items):
+        return items
+    try:
+        import numpy
+    except ImportError:
+        return items
+    return numpy.asarray(items)
+
+
+async def _pages(items: Any, size: int, in_thread: bool):
+    """Lists of up to ``size`` items from a list, iterator or async iterator, pulled one page at a time."""
+    if hasattr(items, "__aiter__"):
+        page = []
+        async for item in items:
+            page.append(item)
+            if len(page) == size:
+                yield page
+                page = []
+        if page:
+            yield page
+        return
+    iterator = iter(items)
+
+    def take() -> list:
+        return list(itertools.islice(iterator, size))
+
+    while page := (await asyncio.to_thread(take) if in_thread else take()):
+        yield page
+
+
+class _LeaseLost(Exception):
+    """The task was reclaimed or its execution ended while the handler ran; its result is not wanted."""
+
+
+async def _while_leased(task_id: str, call) -> Any:
+    """Await an RPC made on a task's behalf; FAILED_PRECONDITION (the task is no longer ours) raises ``_LeaseLost``."""
+    try:
+        return await call
+    except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.FAILED_PRECONDITION:
+            raise _LeaseLost(f"Task {task_id}: {e.details()}; abandoned its handler") from None
+        raise
+
+
+class _CompletionBuffer:
+    """
+    Coalesces task results into CompleteTasks / FailTasks batches.
+
+    A batch is sent once ``max_items`` results are queued or ``flush_ms`` after
+    the first queued result, whichever comes first. Sends run in the background
+    so handlers hand off their result and free their slot immediately.
+
+    A batch that cannot be sent is retried with backoff, then sent one task at a
+    time; a result that still cannot be delivered fails its task, as an unbatched
+    ``complete_task`` error would, rather than leaving it RUNNING until its lease
+    expires and it runs again.
+    """
+
+    def __init__(self, client, max_items: int, flush_ms: float):
+        self._client = client
+        self._max_items = max_items
+        self._flush_delay = flush_ms / 1000
+        self._completions: list[tuple[str, Any]] = []
+        self._failures: list[tuple[str, str]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._sending: set[asyncio.Task] = set()
+
+    def complete(self, task_id: str, output: Any) -> None:
+        self._completions.append((task_id, output))
+        self._schedule()
+
+    def fail(self, task_id: str, error: str) -> None:
+        self._failures.append((task_id, error))
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if len(self._completions) + len(self._failures) >= self._max_items:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._flush_delay, self._flush_now)
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._completions:
+            self._spawn(self._client.complete_tasks, self._completions, self._complete_one)
+            self._completions = []
+        if self._failures:
+            self._spawn(self._client.fail_tasks, self._failures, self._fail_one)
+            self._failures = []
+
+    def _spawn(self, rpc, items: list, send_one) -> None:
+        sender = asyncio.create_task(self._send(rpc, items, send_one))
+        self._sending.add(sender)
+        sender.add_done_callback(self._sending.discard)
+
+    async def _send(self, rpc, items: list, send_one) -> None:
+        delay = 0.1
+        for attempt in range(1, BATCH_SEND_ATTEMPTS + 1):
+            try:
+                acks = await rpc(items)
+                break
+            except Exception as e:
+                logger.warning(f"Batch of {len(items)} results not delivered (attempt {attempt}): {e}")
+                if attempt < BATCH_SEND_ATTEMPTS:
+                    await asyncio.sleep(delay)
+                    delay *= 2
+        else:
+            for item in items:
+                await send_one(*item)
+            return
+        for ack in acks:
+            if not ack.ok:
+                logger.error(f"Task {ack.task_id} result rejected: {ack.message}")
+
+    async def _complete_one(self, task_id: str, output: Any) -> None:
+        try:
+            await self._client.complete_task(task_id, output)
+        except Exception as e:
+            logger.error(f"Task {task_id} result not delivered: {e}")
+            await self._fail_one(task_id, f"Result not delivered: {e}")
+
+    async def _fail_one(self, task_id: str, error: str) -> None:
+        try:
+            await self._client.fail_task(task_id, error)
+        except Exception as e:
+            logger.error(f"Task {task_id} failure not delivered, left to lease expiry: {e}")
+
+    async def flush(self) -> None:
+        """Send everything still queued and wait for in-flight batches."""
+        self._flush_now()
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+
 
 class Worker:
     def __init__(
@@ -22,71 +199,362 @@ class Worker:
         workflows: list,
         *,
         concurrency: int = 4,
+        limiter: AdaptiveLimiter | None = None,
         poll_interval: float = 0.1,
+        poll_batch_size: int = 1,
+        long_poll_timeout: float = 0.0,
+        completion_batch_size: int = 1,
+        completion_flush_ms: float = 5.0,
+        process_pool_size: int | None = None,
+        drain_timeout: float = 30.0,
+        dependency_cache_size: int = 0,
+        result_cache: ResultCache | None = None,
+        lazy_blobs: bool = True,
+        blob_dir: str | None = None,
+        upload_threshold: int = STREAM_THRESHOLD,
+        compression: str | None = None,
         host: str = "localhost",
         port: int = 50051,
     ):
         self._workflows = workflows
         self._workflow_map = {wf.workflow_id: wf for wf in workflows}
-        self._version_hashes = {wf.version_hash: wf for wf in workflows}
+        # version_hash is shape-based, so route on (workflow_id, version_hash).
+        self._versions = {(wf.workflow_id, wf.version_hash): wf for wf in workflows}
+        self._version_hashes = list(dict.fromkeys(wf.version_hash for wf in workflows))
+        # An adaptive limiter replaces the fixed semaphore; pollers follow its current limit.
+        self._limiter = limiter
         self._concurrency = concurrency
         self._poll_interval = poll_interval
-        self._client = NexumClient(host=host, port=port)
+        self._poll_batch_size = max(1, poll_batch_size)
+        self._long_poll_ms = int(long_poll_timeout * 1000)
+        self._completion_batch_size = completion_batch_size
+        self._completion_flush_ms = completion_flush_ms
+        self._process_nodes = [n for wf in workflows for n in wf.nodes if n.executor == "process"]
+        for node in self._process_nodes:
+            try:
+                pickle.dumps((node.handler, node.items_fn))
+            except Exception as e:
+                raise ValueError(
+                    f"Node '{node.id}' uses executor='process' but its handler cannot be pickled "
+                    f"(define it at module level): {e}"
+                ) from None
+        self._process_pool_size = process_pool_size
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._drain_timeout = drain_timeout
+        self._drain_deadline: float | None = None
+        # Validated dependency outputs shared across tasks of the same execution (0 = off).
+        self._dependency_cache = DependencyCache(dependency_cache_size) if dependency_cache_size > 0 else None
+        # Memo for compute(cache=True) nodes; in-memory only unless a ResultCache with a path is given.
+        if result_cache is None and any(n.cache for wf in workflows for n in wf.nodes):
+            result_cache = ResultCache()
+        self._result_cache = result_cache
+        # Large dependency outputs stay on the server as claim checks until a handler reads them.
+        self._blobs = BlobStore(host, port, blob_dir=blob_dir) if lazy_blobs else None
+        self._upload_threshold = upload_threshold
+        self._compression = compression
+        self._host = host
+        self._port = port
+        self._client: AsyncNexumClient | None = None
         self._worker_id = f"py-worker-{uuid.uuid4().hex[:8]}"
         self._running = False
-        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore: asyncio.Semaphore | AdaptiveLimiter | None = None
+        self._inflight: dict[asyncio.Task, str] = {}
+        self._completions: _CompletionBuffer | None = None
+        self._pollers: list[asyncio.Task] = []
+        self._leasing: set[asyncio.Task] = set()
+        self._stopped: asyncio.Event | None = None
+        self._signal_shutdown: asyncio.Task | None = None
+
+    def _make_client(self) -> AsyncNexumClient:
+        return AsyncNexumClient(host=self._host, port=self._port, compression=self._compression)
+
+    def _ensure_client(self) -> AsyncNexumClient:
+        # grpc.aio channels bind to the running loop, so connect lazily.
+        if self._client is None:
+            self._client = self._make_client()
+        return self._client
+
+    async def run(self, *, handle_signals: bool = True) -> None:
+        """
+        Poll and execute tasks until :meth:`shutdown` is called.
+
+        With ``handle_signals`` (the default) SIGTERM and SIGINT start a graceful
+        :meth:`shutdown`, so a rolling restart hands its leased work straight back.
+        """
+        loop = asyncio.get_running_loop()
+        signals = self._install_signal_handlers(loop) if handle_signals else []
+        self._running = True
+        try:
+            await self._run()
+        finally:
+            for sig in signals:
+                loop.remove_signal_handler(sig)
+
+    async def shutdown(self, drain_timeout: float | None = None) -> None:
+        """
+        Stop leasing, let in-flight handlers finish, and return once the worker has stopped.
+
+        Handlers get up to ``drain_timeout`` seconds (default: the ``drain_timeout``
+        the worker was created with). Completions are flushed, and any task this
+        worker still holds without a result — leased by a poll that was in flight,
+        or whose handler outlived the timeout — is released back to READY at once
+        instead of waiting for its lease to expire. A long-poll still open at the
+        deadline is cancelled, so shutdown never outlasts ``drain_timeout`` waiting
+        on ``long_poll_timeout``; anything it leased returns when the lease expires.
+        """
+        if self._stopped is None:
+            self._running = False
+            return
+        if self._running:
+            self._running = False
+            timeout = self._drain_timeout if drain_timeout is None else drain_timeout
+            loop = asyncio.get_running_loop()
+            self._drain_deadline = loop.time() + timeout
+            # Pollers mid-RPC finish their call and hand back what it leased; the rest hold nothing.
+            for poller in self._pollers:
+                if poller not in self._leasing:
+                    poller.cancel()
+            loop.call_at(self._drain_deadline, self._cancel_pollers)
+        await self._stopped.wait()
+
+    def _cancel_pollers(self) -> None:
+        for poller in self._pollers:
+            poller.cancel()
+
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> list[int]:
+        installed = []
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self._on_signal, sig)
+            except (NotImplementedError, RuntimeError, ValueError):
+                continue  # not supported on this platform / not the main thread
+            installed.append(sig)
+        return installed
+
+    def _on_signal(self, sig: int) -> None:
+        logger.info(f"{signal.Signals(sig).name} received, draining worker {self._worker_id}")
+        if self._signal_shutdown is None:
+            self._signal_shutdown = asyncio.ensure_future(self.shutdown())
+
+    def metrics(self) -> dict[str, int]:
+        """Current concurrency limit (adaptive or fixed), running handlers and, with a result cache, its hit/miss counts."""
+        metrics = {"concurrency_limit": self._limit(), "inflight": len(self._inflight)}
+        if self._result_cache is not None:
+            metrics.update(self._result_cache.stats())
+        return metrics
+
+    def _limit(self) -> int:
+        return self._limiter.limit if self._limiter is not None else self._concurrency
+
+    def _poller_target(self) -> int:
+        return max(1, -(-self._limit() // self._poll_batch_size))
 
     async def run_until_complete(self, execution_id: str, timeout: float = 60) -> dict:
         """Start worker and wait for specific execution to complete."""
-        self._running = True
-        worker_task = asyncio.create_task(self._run())
+        client = self._ensure_client()
+        worker_task = asyncio.create_task(self.run(handle_signals=False))
 
-        deadline = time.time() + timeout
         try:
-            while time.time() < deadline:
-                status = self._client.get_status(execution_id)
-                if status["status"] in ("COMPLETED", "FAILED", "CANCELLED"):
-                    self._running = False
-                    worker_task.cancel()
-                    if status["status"] == "FAILED":
-                        raise RuntimeError(f"Execution {execution_id} failed")
-                    return status["completedNodes"]
-                await asyncio.sleep(0.5)
+            status = await client.wait_for(execution_id, timeout)
         finally:
-            self._running = False
-            worker_task.cancel()
+            await self.shutdown()
+            await worker_task
 
-        raise TimeoutError(f"Execution {execution_id} did not complete within {timeout}s")
+        if status["status"] == "FAILED":
+            raise RuntimeError(f"Execution {execution_id} failed")
+        return status["completedNodes"]
 
     async def _run(self) -> None:
-        self._semaphore = asyncio.Semaphore(self._concurrency)
+        self._stopped = asyncio.Event()
+        self._drain_deadline = None
+        self._ensure_client()
+        self._semaphore = self._limiter or asyncio.Semaphore(self._concurrency)
+        if self._process_nodes and self._process_pool is None:
+            # spawn, not fork: a forked child would inherit the parent's gRPC threads.
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self._process_pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        if self._completion_batch_size > 1:
+            self._completions = _CompletionBuffer(
+                self._client, self._completion_batch_size, self._completion_flush_ms
+            )
+
+        # Pollers reserve slots *before* leasing, so the worker never holds a
+        # task it cannot start right away. With batching, each poller fills
+        # up to poll_batch_size free slots per round-trip.
+        self._pollers = []
+        self._resize_pollers()
+        try:
+            while self._pollers:
+                await asyncio.wait(list(self._pollers))
+            await self._drain()
+        finally:
+            for p in list(self._pollers):
+                p.cancel()
+            if self._completions is not None:
+                await self._completions.flush()
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+            if self._blobs is not None:
+                self._blobs.close()
+            self._stopped.set()
 
+    async def _drain(self) -> None:
+        """Wait for in-flight handlers until the drain deadline, then cancel and release the rest."""
+        if not self._inflight:
+            return
+        now = asyncio.get_running_loop().time()
+        deadline = self._drain_deadline if self._drain_deadline is not None else now + self._drain_timeout
+        remaining = max(0.0, deadline - now)
+        _, pending = await asyncio.wait(list(self._inflight), timeout=remaining)
+        if not pending:
+            return
+        abandoned = [self._inflight[h] for h in pending if h in self._inflight]
+        logger.warning(f"{len(abandoned)} handler(s) still running after the drain timeout; releasing their tasks")
+        for handler in pending:
+            handler.cancel()
+        await asyncio.wait(pending)
+        await self._release_leases(abandoned)
+
+    async def _release_leases(self, task_ids: list[str]) -> None:
+        if not task_ids:
+            return
+        try:
+            released = await self._client.release_tasks(self._worker_id, task_ids)
+            logger.info(f"Released {released} task(s) back to READY")
+        except Exception as e:
+            logger.warning(f"Could not release {len(task_ids)} task(s); they return when their lease expires: {e}")
+
+    def _resize_pollers(self) -> None:
+        """
+        Start pollers up to one per ``poll_batch_size`` slots of the current limit. With an
+        adaptive limiter this follows the limit as it grows; surplus pollers exit by themselves.
+        """
+        while self._running and len(self._pollers) < self._poller_target():
+            self._pollers.append(asyncio.create_task(self._poll_loop()))
+
+    async def _poll_loop(self) -> None:
+        me = asyncio.current_task()
+        try:
+            await self._poll_rounds(me)
+        finally:
+            if me in self._pollers:
+                self._pollers.remove(me)
+
+    async def _poll_rounds(self, me: asyncio.Task) -> None:
         while self._running:
+            if len(self._pollers) > self._poller_target():
+                self._pollers.remove(me)  # the limit shrank
+                return
+            await self._semaphore.acquire()
+            slots = 1 + await self._take_free_slots(self._poll_batch_size - 1)
+            if not self._running:
+                self._release_slots(slots)
+                break
+            # While in _leasing, shutdown lets this poller finish instead of cancelling it,
+            # so tasks leased by an in-flight poll are handed back rather than lost.
+            self._leasing.add(me)
             try:
-                # Poll for each registered workflow version
-                for wf in self._workflows:
-                    if not self._running:
-                        return
-                    resp = self._client.poll_task(self._worker_id, wf.version_hash)
-                    if resp.has_task:
-                        asyncio.ensure_future(self._handle_task(resp, wf))
-                        break
-                else:
-                    await asyncio.sleep(self._poll_interval)
+                leased = await self._poll(slots)
+                if not self._running:
+                    await self._release_leases([task.task_id for task, _ in leased])
+                    leased = []
             except Exception as e:
                 logger.error(f"Poll error: {e}")
+                self._release_slots(slots)
                 await asyncio.sleep(1.0)
+                continue
+            except BaseException:
+                self._release_slots(slots)
+                raise
+            finally:
+                self._leasing.discard(me)
+
+            self._release_slots(slots - len(leased))
+            if not leased:
+                # A long-poll already waited server-side; go straight back.
+                if not self._long_poll_ms:
+                    await asyncio.sleep(self._poll_interval)
+                continue
+
+            # Each handler owns one slot from here and releases it when done.
+            for task, wf in leased:
+                handler = asyncio.create_task(self._handle_task(task, wf))
+                self._inflight[handler] = task.task_id
+                handler.add_done_callback(lambda h: self._inflight.pop(h, None))
+
+    async def _take_free_slots(self, n: int) -> int:
+        """Grab up to ``n`` additional slots that are free right now, without waiting."""
+        taken = 0
+        while taken < n and not self._semaphore.locked():
+            await self._semaphore.acquire()
+            taken += 1
+        return taken
+
+    def _release_slots(self, n: int) -> None:
+        for _ in range(n):
+            self._semaphore.release()
+
+    async def _poll(self, max_tasks: int) -> list:
+        """
+        Lease up to ``max_tasks`` tasks across the registered workflow versions.
+
+        Every version is sent in one request and the server picks the oldest
+        READY task among them, so the cost of an empty poll does not grow with
+        the number of workflows and none of them is favoured.
+        """
+        if self._poll_batch_size > 1:
+            tasks = await self._client.poll_tasks(
+                self._worker_id, self._version_hashes, max_tasks, self._long_poll_ms,
+                lazy_blobs=self._blobs is not None,
+            )
+        else:
+            resp = await self._client.poll_task(
+                self._worker_id,
+                wait_timeout_ms=self._long_poll_ms,
+                version_hashes=self._version_hashes,
+                lazy_blobs=self._blobs is not None,
+            )
+            tasks = [resp] if resp.has_task else []
+        return [(t, self._versions[(t.workflow_id, t.version_hash)]) for t in tasks]
 
     async def _handle_task(self, task, wf) -> None:
-        async with self._semaphore:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            await self._execute_task(task, wf)
+            if self._limiter is not None:
+                self._limiter.record(started, loop.time() - started)
+        except _LeaseLost as e:
+            logger.warning(str(e))
+        except Exception as e:
+            if self._limiter is not None:
+                self._limiter.record(started, loop.time() - started, e)
+            logger.error(f"Task {task.task_id} failed: {e}")
             try:
-                await self._execute_task(task, wf)
-            except Exception as e:
-                logger.error(f"Task {task.task_id} failed: {e}")
-                try:
-                    self._client.fail_task(task.task_id, str(e))
-                except Exception:
-                    pass
+                await self._fail(task.task_id, str(e))
+            except Exception:
+                pass
+        finally:
+            self._semaphore.release()
+            self._resize_pollers()
+
+    async def _complete(self, task_id: str, output: Any, *, upload: bool = True) -> None:
+        if upload and isinstance(output, str) and len(output) > self._upload_threshold:
+            # Too big for one message: stream it into the blob store and complete with a reference.
+            output = await self._client.upload_payload(output.encode())
+        if self._completions is not None:
+            self._completions.complete(task_id, output)
+        else:
+            await self._client.complete_task(task_id, output)
+
+    async def _fail(self, task_id: str, error: str) -> None:
+        if self._completions is not None:
+            self._completions.fail(task_id, error)
+        else:
+            await self._client.fail_task(task_id, error)
 
     async def _execute_task(self, task, wf) -> None:
         node = wf.get_node(task.node_id)
@@ -100,54 +568,259 @@ class Worker:
                 "waited_until": datetime.now(timezone.utc).isoformat(),
                 "delay_seconds": node.delay_seconds or 0,
             }
-            self._client.complete_task(task.task_id, output)
+            await self._complete(task.task_id, output)
             logger.info(f"[NEXUM] TIMER {node.id} → completed ({node.delay_seconds}s)")
             return
 
         # Parse input_json — server sends { input: {...}, deps: {...} }
-        input_data_raw = json.loads(task.input_json) if task.input_json else {}
+        input_data_raw = pydantic_core.from_json(task.input_json) if task.input_json else {}
         input_data = input_data_raw.get("input", input_data_raw)
+        if self._blobs is not None and is_claim_check(input_data):
+            # A streamed execution input; every handler sees ctx.input, so load it up front.
+            input_data = await asyncio.to_thread(self._blobs.load, input_data)
         deps_raw = input_data_raw.get("deps", {})
+        for dep_id, payload in task.dep_payloads.items():
+            deps_raw[dep_id] = decode_payload(payload)
 
-        # Deserialize deps into Pydantic models where possible
-        outputs: dict[str, Any] = {}
-        for k, v in deps_raw.items():
-            dep_node = wf.get_node(k)
-            if dep_node and dep_node.output_model and isinstance(v, dict):
-                try:
-                    outputs[k] = dep_node.output_model.model_validate(v)
-                except Exception:
-                    outputs[k] = v
-            else:
-                outputs[k] = v
+        # Deps stay raw here; ContextView validates each into its Pydantic model on first get()
+        ctx = ContextView(
+            input_data=input_data,
+            outputs=deps_raw,
+            models=wf.output_models,
+            execution_id=task.execution_id,
+            cache=self._dependency_cache,
+            blobs=self._blobs,
+        )
+
+        if node.handler is None and node.fold is None:
+            raise RuntimeError(f"Node {node.id} has no handler")
+
+        if node.type == "MAP":
+            await self._execute_map(task, node, ctx)
+            return
 
-        ctx = ContextView(input_data=input_data, outputs=outputs)
+        key = None
+        if node.cache and self._result_cache is not None:
+            key = cache_key(node.id, wf.version_hash, input_data, deps_raw)
+            cached = await self._result_cache.aget(key)
+            if cached is not None:
+                await self._complete(task.task_id, _from_cache_entry(cached))
+                logger.info(f"[NEXUM] {node.type} {node.id} → completed from cache")
+                return
 
         logger.info(f"[NEXUM] {node.type} {node.id} → executing")
 
-        if node.handler is None:
-            raise RuntimeError(f"Node {node.id} has no handler")
+        if node.fold is not None:
+            result = await self._with_heartbeat(task, ctx, self._fold_map_results(task, node, ctx, wf))
+        else:
+            result = await self._with_heartbeat(task, ctx, self._call_handler(node, ctx))
+
+        result = self._validate_output(node, result)
 
-        if inspect.iscoroutinefunction(node.handler):
-            result = await node.handler(ctx)
+        # Serialize output once; the JSON string (or the codec's bytes) goes into CompleteRequest as-is
+        codec = wf.codec
+        if codec.name != "json":
+            output = nexum_pb2.Payload(content_type=codec.content_type, data=codec.encode(result))
+        elif isinstance(result, BaseModel):
+            output = result.model_dump_json()
         else:
-            result = node.handler(ctx)
+            output = pydantic_core.to_json(result).decode()
 
-        # Validate output with Pydantic
-        if node.output_model and not isinstance(result, node.output_model):
-            if isinstance(result, dict):
-                result = node.output_model.model_validate(result)
-            else:
-                raise TypeError(f"Handler for {node.id} returned wrong type: {type(result)}")
+        if key is not None:
+            await self._result_cache.aput(key, _to_cache_entry(output))
+        await self._complete(task.task_id, output)
+        logger.info(f"[NEXUM] {node.type} {node.id} → completed")
+
+    async def _execute_map(self, task, node, ctx: ContextView) -> None:
+        """MAP coordinator: list the items for the server to fan out. MAP_SUBTASK: handle one item."""
+        if task.is_map_subtask:
+            item = pydantic_core.from_json(task.map_item_json) if task.map_item_json else None
+            if node.batch_size is not None:
+                item = _batch_items(item)
+            result = await self._with_heartbeat(task, ctx, self._call_handler(node, ctx, item, task.map_index))
+        else:
+            result, item_count = await self._with_heartbeat(task, ctx, self._list_map_items(task, node, ctx))
 
-        # Serialize output
+        if task.is_map_subtask and node.batch_size is not None:
+            if hasattr(result, "tolist"):
+                result = result.tolist()
+            if not isinstance(result, (list, tuple)) or len(result) != len(item):
+                raise TypeError(f"Batch handler for MAP node {node.id} must return a list of {len(item)} results")
+            result = [self._map_item_result(node, r) for r in result]
+        elif task.is_map_subtask:
+            result = self._map_item_result(node, result)
+
+        # The server splits the item list and gathers the results, so both go inline as JSON.
         if isinstance(result, BaseModel):
-            output_json = result.model_dump_json()
+            output = result.model_dump_json()
+        else:
+            output = pydantic_core.to_json(result).decode()
+        await self._complete(task.task_id, output, upload=False)
+        if task.is_map_subtask:
+            logger.info(f"[NEXUM] MAP {node.id}[{task.map_index}] → completed")
         else:
-            output_json = json.dumps(result)
+            logger.info(f"[NEXUM] MAP {node.id} → {item_count} items")
 
-        self._client.complete_task(task.task_id, json.loads(output_json))
-        logger.info(f"[NEXUM] {node.type} {node.id} → completed")
+    async def _list_map_items(self, task, node, ctx: ContextView) -> tuple[list, int]:
+        items = await self._call_handler(node, ctx, handler=node.items_fn)
+        if isinstance(items, (str, bytes, dict)) or not (hasattr(items, "__iter__") or hasattr(items, "__aiter__")):
+            raise TypeError(f"items_fn for MAP node {node.id} must return a list or iterator, got {type(items)}")
+        if isinstance(items, (list, tuple)) and len(items) <= node.page_size:
+            return items, len(items)
+        return await self._stream_map_items(task, node, items)
+
+    async def _stream_map_items(self, task, node, items: Any) -> tuple[list, int]:
+        """
+        Send a MAP source's items with AppendMapItems one page at a time, holding back the last
+        page for CompleteTask (which closes the list). Returns that page and the item count.
+        """
+        offset = 0
+        held: list | None = None
+        async for page in _pages(items, node.page_size, in_thread=node.executor == "thread"):
+            if held is not None:
+                await self._append_map_page(task.task_id, node, held, offset)
+                offset += len(held)
+            held = page
+        held = held or []
+        return held, offset + len(held)
+
+    async def _append_map_page(self, task_id: str, node, page: list, offset: int) -> None:
+        items_json = pydantic_core.to_json(page).decode()
+        try:
+            resp = await self._append_map_items(task_id, items_json, offset)
+        except grpc.RpcError as e:
+            # ABORTED: the list grew under us (a reclaimed coordinator's last page) and nothing was
+            # kept; resending from the same offset adds only what is still missing.
+            if e.code() != grpc.StatusCode.ABORTED:
+                raise
+            resp = await self._append_map_items(task_id, items_json, offset)
+        # Backpressure: stop enumerating while too many items are still waiting for a result.
+        delay = 0.05
+        while resp.pending > node.max_pending:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            resp = await self._append_map_items(task_id, "[]", offset + len(page))
+
+    async def _append_map_items(self, task_id: str, items_json: str, offset: int):
+        return await _while_leased(task_id, self._client.append_map_items(task_id, self._worker_id, items_json, offset))
+
+    async def _fold_map_results(self, task, node, ctx: ContextView, wf) -> Any:
+        """
+        Folding REDUCE: read the MAP node's results in item order as sub-tasks finish and fold
+        each chunk into the accumulator. Each read checkpoints the accumulator so far, and a
+        re-leased task resumes from the last checkpoint instead of item 0.
+        """
+        if task.checkpoint_json:
+            checkpoint = pydantic_core.from_json(task.checkpoint_json)
+            index, acc = checkpoint["next_index"], checkpoint["acc"]
+            if isinstance(node.initial, BaseModel):
+                acc = type(node.initial).model_validate(acc)
+        else:
+            index, acc = 0, copy.deepcopy(node.initial)
+        map_model = wf.output_models.get(node.map_node_id)
+
+        partial = ""
+        delay = 0.05
+        while True:
+            # Refused once the task is reclaimed or the execution ends (a MAP item ran out of
+            # retries), which ends the loop with _LeaseLost instead of waiting for results forever
+            resp = await _while_leased(
+                task.task_id,
+                self._client.read_map_results(task.task_id, self._worker_id, index, node.fold_chunk, partial),
+            )
+            partial = ""
+            if resp.results_json:
+                results = validate_map_results([pydantic_core.from_json(r) for r in resp.results_json], map_model)
+                acc = await self._call_handler(node, ctx, acc, results, handler=node.fold)
+                index += len(results)
+                ctx.report_progress({"folded": index, "item_count": resp.item_count})
+                delay = 0.05
+            if resp.done:
+                break
+            if resp.results_json:
+                partial = acc.model_dump_json() if isinstance(acc, BaseModel) else pydantic_core.to_json(acc).decode()
+            else:
+                # Nothing new past the first item still running
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 1.0)
+
+        logger.info(f"[NEXUM] REDUCE {node.id} → folded {index} results")
+        if node.handler is not None:
+            return await self._call_handler(node, ctx, acc)
+        return acc
+
+    def _map_item_result(self, node, result: Any) -> Any:
+        # A returned (not raised) exception fails just this item.
+        if isinstance(result, Exception):
+            return map_error(result)
+        return self._validate_output(node, result)
+
+    @staticmethod
+    def _validate_output(node, result: Any) -> Any:
+        if node.output_model and not isinstance(result, node.output_model):
+            if isinstance(result, dict):
+                return node.output_model.model_validate(result)
+            raise TypeError(f"Handler for {node.id} returned wrong type: {type(result)}")
+        return result
+
+    async def _with_heartbeat(self, task, ctx: ContextView, work) -> Any:
+        """
+        Await ``work`` while renewing the task's lease. If the lease is lost the work is cancelled
+        (a thread or process handler is abandoned and runs to completion unobserved) and
+        ``_LeaseLost`` is raised, so the task is neither completed nor failed.
+        """
+        job = asyncio.ensure_future(work)
+        heartbeat = asyncio.create_task(self._heartbeat(task, ctx))
+        try:
+            await asyncio.wait({job, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            job.cancel()
+            raise
+        finally:
+            heartbeat.cancel()
+        if not job.done():
+            job.cancel()
+            raise _LeaseLost(f"Task {task.task_id} is no longer leased to this worker; abandoned its handler")
+        return job.result()
+
+    async def _heartbeat(self, task, ctx: ContextView) -> None:
+        """
+        Renew the task's lease every third of its length while the handler runs, with ``ctx.progress``.
+        Returns once the server refuses: the task was reclaimed or its execution ended.
+        """
+        interval = (task.lease_seconds or DEFAULT_LEASE_SECONDS) / 3
+        while True:
+            await asyncio.sleep(interval)
+            progress = ctx.progress
+            if progress is None:
+                progress = ""
+            elif not isinstance(progress, str):
+                progress = json.dumps(progress, default=str)
+            try:
+                if not await self._client.heartbeat(task.task_id, self._worker_id, progress):
+                    return
+            except Exception as e:
+                logger.warning(f"Heartbeat for task {task.task_id} failed: {e}")
+
+    async def _call_handler(self, node, ctx: ContextView, *args, handler=None) -> Any:
+        """
+        Run ``handler(ctx, *args)`` on the event loop, a worker thread or the process pool per
+        ``node.executor``; the handler defaults to ``node.handler``.
+        """
+        handler = handler or node.handler
+        if inspect.iscoroutinefunction(handler):
+            return await handler(ctx, *args)
+        # An inline handler that may read a blob from the server runs in a thread, so ctx.get()
+        # fetches only what it reads without blocking the event loop.
+        if node.executor == "thread" or (node.executor == "inline" and ctx.has_remote_blobs()):
+            return await asyncio.to_thread(handler, ctx, *args)
+        if node.executor == "process":
+            # Ship the plain context data; the child rebuilds its own ContextView.
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._process_pool, _call_in_process, handler, ctx.input, ctx._outputs, ctx._models, ctx._blobs, *args
+            )
+        return handler(ctx, *args)
 
 
 def worker(workflows: list, *, concurrency: int = 4, **kwargs) -> Worker:
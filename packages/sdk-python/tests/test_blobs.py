@@ -0,0 +1,64 @@
+"""
+test_blobs.py — クレームチェック (大きな出力のポインタ) を解決する BlobStore のユニットテスト
+"""
+
+import gzip
+import json
+import pickle
+
+from nexum.blobs import BlobStore, is_claim_check
+
+
+def write_blob(directory, blob_id, value):
+    body = json.dumps(value).encode()
+    path = directory / f"{blob_id}.json"
+    path.write_bytes(body)
+    return {"__nexum_claim_check__": True, "blob_id": blob_id, "size": len(body), "path": str(path)}
+
+
+# ──────────────────────────────────────────────────────────────────
+# 1. ローカルのブロブはファイルから直接読む
+# ──────────────────────────────────────────────────────────────────
+
+def test_local_blob_is_read_from_disk(tmp_path):
+    """絶対パスのファイルが見えればサーバーに問い合わせずに読み、範囲読み出しもできる"""
+    pointer = write_blob(tmp_path, "exec-1-crawl", {"pages": ["a" * 10, "b" * 10]})
+    store = BlobStore(port=1)  # 接続先はない: リモートに行けば失敗する
+    assert is_claim_check(pointer)
+    assert store.load(pointer) == {"pages": ["a" * 10, "b" * 10]}
+    assert store.read(pointer, offset=0, length=9) == b'{"pages":'
+
+
+def test_blob_dir_overrides_pointer_path(tmp_path):
+    """サーバーのブロブディレクトリが別の場所にマウントされていれば blob_dir で指定できる"""
+    pointer = write_blob(tmp_path, "exec-1-crawl", {"ok": True})
+    pointer["path"] = "/srv/nexum/.nexum/blobs/exec-1-crawl.json"
+    assert BlobStore(port=1, blob_dir=str(tmp_path)).load(pointer) == {"ok": True}
+
+
+def test_store_pickles_without_its_channel(tmp_path):
+    """プロセスプールへ渡すときは gRPC チャネルを持たずに複製される"""
+    store = BlobStore(port=1, blob_dir=str(tmp_path))
+    store._client = object()
+    clone = pickle.loads(pickle.dumps(store))
+    assert clone._client is None and clone._blob_dir == str(tmp_path)
+    assert not clone.is_local({"blob_id": "missing", "size": 1})
+    clone.close()
+
+
+# ──────────────────────────────────────────────────────────────────
+# 2. サーバーが gzip で保存したブロブは展開して読む
+# ──────────────────────────────────────────────────────────────────
+
+def test_gzipped_blob_is_decompressed(tmp_path):
+    """encoding=gzip のポインタは保存されたバイト列を展開してからデコードする"""
+    value = {"markdown": "# Title\n\n" + "crawled text. " * 500}
+    body = gzip.compress(json.dumps(value).encode())
+    (tmp_path / "exec-1-crawl.json").write_bytes(body)
+    pointer = {
+        "__nexum_claim_check__": True, "blob_id": "exec-1-crawl", "size": len(body),
+        "path": str(tmp_path / "exec-1-crawl.json"), "encoding": "gzip",
+    }
+    store = BlobStore(port=1)
+    assert store.load(pointer) == value
+    assert store.read(pointer, length=2) == b"\x1f\x8b"
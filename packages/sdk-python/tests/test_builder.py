@@ -189,3 +189,75 @@ def test_ir_version_hash_matches_ir_json():
     wf = workflow("verify").compute("a", ValueOut, lambda ctx: ValueOut(value=1)).build()
     expected = "sha256:" + hashlib.sha256(wf.ir_json.encode()).hexdigest()
     assert wf.version_hash == expected
+
+
+# ──────────────────────────────────────────────────────────────────
+# 6. MAP / REDUCE ノード
+# ──────────────────────────────────────────────────────────────────
+
+def test_map_reduce_ir():
+    """MAP は max_parallel、REDUCE は直前の MAP だけに依存し mapNodeId を持つ"""
+    wf = (
+        workflow("map-reduce")
+        .compute("urls", ValueOut, lambda ctx: ValueOut(value=3))
+        .map("scrape", lambda ctx: list(range(ctx.get("urls").value)), lambda ctx, item, i: ValueOut(value=item),
+             output_model=ValueOut, max_parallel=2)
+        .reduce("total", ValueOut, lambda ctx: ValueOut(value=sum(r.value for r in ctx.get_map_results("scrape"))))
+        .build()
+    )
+    nodes = json.loads(wf.ir_json)["nodes"]
+    assert nodes["scrape"] == {"type": "MAP", "dependencies": ["urls"], "max_parallel": 2}
+    assert nodes["total"] == {"type": "REDUCE", "dependencies": ["scrape"], "mapNodeId": "scrape"}
+    assert wf.get_node("scrape").items_fn is not None
+
+
+def test_reduce_requires_map():
+    """MAP より前の reduce、MAP を含まない depends_on、不正な max_parallel はエラー"""
+    with pytest.raises(ValueError, match="must follow a map"):
+        workflow("bad").compute("a", ValueOut, lambda ctx: ValueOut(value=1)).reduce("r", ValueOut, lambda ctx: None)
+    builder = workflow("bad").compute("a", ValueOut, lambda ctx: ValueOut(value=1)).map("m", lambda ctx: [], lambda ctx, x, i: x)
+    with pytest.raises(ValueError, match="must include the MAP node"):
+        builder.reduce("r", ValueOut, lambda ctx: None, depends_on=["a"])
+    with pytest.raises(ValueError, match="is not a MAP node"):
+        builder.reduce("r", ValueOut, lambda ctx: None, map_node="a")
+    with pytest.raises(ValueError, match="max_parallel"):
+        workflow("bad").map("m", lambda ctx: [], lambda ctx, x, i: x, max_parallel=0)
+    with pytest.raises(ValueError, match="batch_size"):
+        workflow("bad").map("m", lambda ctx: [], lambda ctx, x, i: x, batch_size=0)
+
+
+def test_map_batch_size_in_ir():
+    """batch_size は IR に入り、version_hash も変わる"""
+    items, handler = (lambda ctx: [1, 2, 3]), (lambda ctx, xs, start: list(xs))
+    plain = workflow("batch").map("m", items, handler).build()
+    batched = workflow("batch").map("m", items, handler, batch_size=64).build()
+    assert json.loads(batched.ir_json)["nodes"]["m"]["batch_size"] == 64
+    assert batched.version_hash != plain.version_hash
+
+
+def test_map_streaming_options_stay_out_of_ir():
+    """page_size / max_pending はワーカー側の設定で version_hash を変えない。ジェネレーターは process 不可"""
+    def items(ctx):
+        yield 1
+
+    plain = workflow("stream").map("m", items, lambda ctx, x, i: x).build()
+    tuned = workflow("stream").map("m", items, lambda ctx, x, i: x, page_size=10, max_pending=50).build()
+    assert tuned.version_hash == plain.version_hash
+    assert tuned.get_node("m").page_size == 10
+    with pytest.raises(ValueError, match="generator"):
+        workflow("stream").map("m", items, lambda ctx, x, i: x, executor="process")
+
+
+def test_fold_reduce_in_ir():
+    """fold は IR に "fold": true を入れ、handler なしでもよい。fold なしなら handler 必須、process 不可"""
+    builder = workflow("fold").map("m", lambda ctx: [], lambda ctx, x, i: x)
+    wf = builder.reduce("r", ValueOut, fold=lambda ctx, acc, rs: acc + len(rs), initial=0).build()
+    assert json.loads(wf.ir_json)["nodes"]["r"] == {"type": "REDUCE", "dependencies": ["m"], "mapNodeId": "m", "fold": True}
+    assert wf.get_node("r").handler is None and wf.get_node("r").fold_chunk == 500
+    builder = workflow("fold").map("m", lambda ctx: [], lambda ctx, x, i: x)
+    with pytest.raises(ValueError, match="handler or a fold"):
+        builder.reduce("r", ValueOut)
+    with pytest.raises(ValueError, match="executor='process'"):
+        builder.reduce("r", ValueOut, fold=lambda ctx, acc, rs: acc, executor="process")
+    with pytest.raises(ValueError, match="fold_chunk"):
+        builder.reduce("r", ValueOut, fold=lambda ctx, acc, rs: acc, fold_chunk=0)
@@ -0,0 +1,121 @@
+"""
+test_cache.py — compute(cache=True) 用 ResultCache とキャッシュキーのユニットテスト
+"""
+
+import asyncio
+import sqlite3
+
+from nexum.cache import ResultCache, cache_key
+
+
+# ──────────────────────────────────────────────────────────────────
+# 1. cache_key: 辞書の順序に依存せず、入力・依存・バージョンで変わる
+# ──────────────────────────────────────────────────────────────────
+
+def test_key_is_canonical_over_dict_order():
+    """キーの挿入順が違うだけの入力は同じキーになる"""
+    k1 = cache_key("embed", "v1", {"a": 1, "b": [1, 2]}, {"fetch": {"x": "y", "z": b"\x00"}})
+    k2 = cache_key("embed", "v1", {"b": [1, 2], "a": 1}, {"fetch": {"z": b"\x00", "x": "y"}})
+    assert k1 == k2
+
+
+def test_key_changes_with_dependency_version_or_node():
+    """依存の値・ワークフローバージョン・ノード ID のどれかが変わればキーも変わる"""
+    base = cache_key("embed", "v1", {"a": 1}, {"fetch": {"text": "hello"}})
+    assert cache_key("embed", "v1", {"a": 1}, {"fetch": {"text": "hello!"}}) != base
+    assert cache_key("embed", "v2", {"a": 1}, {"fetch": {"text": "hello"}}) != base
+    assert cache_key("other", "v1", {"a": 1}, {"fetch": {"text": "hello"}}) != base
+
+
+def test_claim_checked_dependencies_key_on_their_digest():
+    """クレームチェックの依存は blob_id (実行ごとに違う) ではなく内容のダイジェストでキーになる"""
+    def pointer(blob_id, digest=None):
+        p = {"__nexum_claim_check__": True, "blob_id": blob_id, "size": 10, "path": f"/blobs/{blob_id}.json"}
+        if digest:
+            p["sha256"] = digest
+        return p
+
+    key = cache_key("embed", "v1", {}, {"fetch": pointer("exec-1-fetch", "ab" * 32)})
+    assert cache_key("embed", "v1", {}, {"fetch": pointer("exec-2-fetch", "ab" * 32)}) == key
+    assert cache_key("embed", "v1", {}, {"fetch": pointer("exec-2-fetch", "cd" * 32)}) != key
+    # ダイジェストのない古いポインタは同じ実行内でしか一致しない
+    assert cache_key("embed", "v1", {}, {"fetch": pointer("exec-1-fetch")}) != cache_key(
+        "embed", "v1", {}, {"fetch": pointer("exec-2-fetch")})
+
+
+# ──────────────────────────────────────────────────────────────────
+# 2. メモリ層: バイト数で上限を切る LRU
+# ──────────────────────────────────────────────────────────────────
+
+def test_memory_tier_evicts_by_size():
+    """合計サイズが max_bytes を超えたら最も古いエントリから捨てる"""
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", ("application/json", b"1234"))
+    cache.put("b", ("application/json", b"5678"))
+    assert cache.get("a") == ("application/json", b"1234")
+    cache.put("c", ("application/json", b"9999"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["cache_bytes"] == 8
+
+    cache.put("huge", ("application/json", b"x" * 11))
+    assert cache.get("huge") is None
+    assert cache.stats() == {
+        "cache_hits": 3,
+        "cache_memory_hits": 3,
+        "cache_disk_hits": 0,
+        "cache_misses": 2,
+        "cache_bytes": 8,
+    }
+
+
+# ──────────────────────────────────────────────────────────────────
+# 3. ディスク層: 同じファイルを使うプロセス間で共有される
+# ──────────────────────────────────────────────────────────────────
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    """別インスタンス(= 別ワーカープロセス)の put がディスク経由でヒットし、メモリへ昇格する"""
+    path = str(tmp_path / "cache" / "results.db")
+    writer = ResultCache(path=path)
+    writer.put("k", ("application/msgpack", b"\x81\xa1a\x01"))
+
+    reader = ResultCache(path=path)
+    assert reader.get("k") == ("application/msgpack", b"\x81\xa1a\x01")
+    assert reader.get("k") is not None
+    assert reader.stats()["cache_disk_hits"] == 1
+    assert reader.stats()["cache_memory_hits"] == 1
+    writer.close()
+    reader.close()
+
+
+def test_disk_tier_trims_least_recently_used(tmp_path):
+    """max_disk_bytes を超えたら最後に使われた時刻の古いものから削る"""
+    cache = ResultCache(max_bytes=0, path=str(tmp_path / "results.db"), max_disk_bytes=500)
+    for i in range(100):
+        cache.put(f"k{i}", ("application/json", b"x" * 10))
+    assert cache.get("k0") is None
+    assert cache.get("k99") is not None
+    cache.close()
+
+
+def test_async_disk_access_does_not_block_the_event_loop(tmp_path):
+    """aput / aget はディスク層をスレッドで扱い、別プロセスがロック中でもイベントループは進む"""
+    path = str(tmp_path / "results.db")
+    cache = ResultCache(path=path)
+    blocker = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+    ticks = []
+
+    async def scenario():
+        put = asyncio.create_task(cache.aput("k", ("application/json", b"1")))
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+            ticks.append(put.done())
+        blocker.execute("COMMIT")
+        await put
+        return await ResultCache(max_bytes=0, path=path).aget("k")
+
+    assert asyncio.run(scenario()) == ("application/json", b"1")
+    assert ticks == [False] * 5
+    blocker.close()
+    cache.close()
@@ -0,0 +1,274 @@
+"""
+test_client.py — NexumClient / AsyncNexumClient のユニットテスト (プロセス内の gRPC スタブサーバーを使用)
+"""
+
+import asyncio
+import json
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+
+from nexum import blobs, client as client_module
+from nexum.blobs import BlobStore
+from nexum.client import AsyncNexumClient, NexumClient
+from nexum.proto import nexum_pb2, nexum_pb2_grpc
+
+
+class StubServicer(nexum_pb2_grpc.NexumServiceServicer):
+    """テストで使う RPC だけを実装したスタブ"""
+
+    def __init__(self):
+        self.start_batches: list[int] = []
+        self.start_keys: list[str] = []
+        self.blobs: dict[str, bytes] = {}
+        self.blob_reads: list[tuple[int, int]] = []
+        self.upload_chunks: list[int] = []
+        self.started: list = []
+
+    def StartExecutions(self, request, context):
+        self.start_batches.append(len(request.input_jsons))
+        self.start_keys.extend(request.idempotency_keys)
+        return nexum_pb2.StartExecutionsResponse(
+            execution_ids=[f"exec-{json.loads(raw)['i']}" for raw in request.input_jsons],
+        )
+
+    def FetchBlob(self, request, context):
+        self.blob_reads.append((request.offset, request.length))
+        data = self.blobs.get(request.blob_id)
+        if data is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, "no blob")
+        end = request.offset + (request.length or len(data))
+        return nexum_pb2.FetchBlobResponse(data=data[request.offset:end], total_size=len(data))
+
+    def UploadPayload(self, request_iterator, context):
+        data = b""
+        for chunk in request_iterator:
+            self.upload_chunks.append(len(chunk.data))
+            data += chunk.data
+        blob_id = f"upload-{len(self.blobs)}"
+        self.blobs[blob_id] = data
+        return nexum_pb2.UploadPayloadResponse(blob_id=blob_id, size=len(data))
+
+    def DownloadPayload(self, request, context):
+        data = self.blobs[request.blob_id]
+        for start in range(0, len(data), 4):
+            yield nexum_pb2.PayloadChunk(data=data[start:start + 4])
+
+    def StartExecution(self, request, context):
+        self.started.append(request)
+        return nexum_pb2.StartResponse(execution_id="exec-1")
+
+    def GetStatus(self, request, context):
+        pointer = {"__nexum_claim_check__": True, "blob_id": "exec-1-scrape", "size": 0, "path": ""}
+        return nexum_pb2.StatusResponse(
+            status="COMPLETED",
+            completed_nodes_json=json.dumps({"scrape": pointer, "small": {"ok": True}}),
+        )
+
+    def WatchExecution(self, request, context):
+        yield nexum_pb2.StatusResponse(status="RUNNING", completed_nodes_json="{}")
+        if request.execution_id == "exec-slow":
+            # 終わらない実行: クライアント側のタイムアウトを待つ
+            while context.is_active():
+                time.sleep(0.01)
+            return
+        time.sleep(0.02)
+        if request.execution_id == "exec-binary":
+            # バイナリコーデックの出力: JSON 側はプレースホルダ、実体は node_payloads
+            yield nexum_pb2.StatusResponse(
+                status="COMPLETED",
+                completed_nodes_json=json.dumps({"a": {"__nexum_payload__": True}, "b": {"value": 2}}),
+                node_payloads={"a": nexum_pb2.Payload(content_type="application/json", data=b'{"value": 1}')},
+            )
+            return
+        yield nexum_pb2.StatusResponse(
+            status="COMPLETED",
+            completed_nodes_json=json.dumps({"a": {"value": 1}}),
+        )
+
+
+@pytest.fixture
+def servicer():
+    return StubServicer()
+
+
+@pytest.fixture
+def server_port(servicer):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    nexum_pb2_grpc.add_NexumServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    yield port
+    server.stop(None)
+
+
+# ──────────────────────────────────────────────────────────────────
+# 1. wait_for: WatchExecution ストリームで終了を待つ
+# ──────────────────────────────────────────────────────────────────
+
+def test_wait_for_returns_terminal_status(server_port):
+    """終了ステータスが届いた時点で completedNodes と共に返る"""
+    client = NexumClient(port=server_port)
+    try:
+        status = client.wait_for("exec-1", timeout=5)
+    finally:
+        client.close()
+    assert status == {"status": "COMPLETED", "completedNodes": {"a": {"value": 1}}}
+
+
+def test_wait_for_timeout_raises(server_port):
+    """タイムアウトまでに終わらなければ TimeoutError"""
+    client = NexumClient(port=server_port)
+    try:
+        with pytest.raises(TimeoutError):
+            client.wait_for("exec-slow", timeout=0.2)
+    finally:
+        client.close()
+
+
+def test_async_wait_for(server_port):
+    """AsyncNexumClient.wait_for も同じ結果を返す"""
+    async def scenario():
+        client = AsyncNexumClient(port=server_port)
+        try:
+            done = await client.wait_for("exec-1", timeout=5)
+            with pytest.raises(TimeoutError):
+                await client.wait_for("exec-slow", timeout=0.2)
+            return done
+        finally:
+            await client.close()
+
+    assert asyncio.run(scenario())["status"] == "COMPLETED"
+
+
+# ──────────────────────────────────────────────────────────────────
+# 2. start_executions: まとめて投入し、入力順の ID を返す
+# ──────────────────────────────────────────────────────────────────
+
+def test_start_executions_batches_inputs(server_port, servicer):
+    """2500 件は batch_size=1000 で 3 回の RPC に分割され、ID は入力順"""
+    client = NexumClient(port=server_port)
+    try:
+        ids = client.start_executions("wf", ({"i": i} for i in range(2500)), "h1")
+    finally:
+        client.close()
+    assert ids == [f"exec-{i}" for i in range(2500)]
+    assert servicer.start_batches == [1000, 1000, 500]
+
+
+def test_async_start_executions(server_port, servicer):
+    """AsyncNexumClient.start_executions も同様にバッチ送信する"""
+    async def scenario():
+        client = AsyncNexumClient(port=server_port)
+        try:
+            return await client.start_executions("wf", [{"i": i} for i in range(5)], "h1", batch_size=2)
+        finally:
+            await client.close()
+
+    assert asyncio.run(scenario()) == [f"exec-{i}" for i in range(5)]
+    assert servicer.start_batches == [2, 2, 1]
+
+
+def test_start_executions_sends_idempotency_keys(server_port, servicer):
+    """idempotency_keys は入力と同じ順でバッチに分割して送られる"""
+    client = NexumClient(port=server_port)
+    try:
+        client.start_executions(
+            "wf", [{"i": i} for i in range(3)], "h1",
+            idempotency_keys=[f"k{i}" for i in range(3)], batch_size=2,
+        )
+    finally:
+        client.close()
+    assert servicer.start_batches == [2, 1]
+    assert servicer.start_keys == ["k0", "k1", "k2"]
+
+
+def test_wait_for_decodes_node_payloads(server_port):
+    """node_payloads の出力はコーデックでデコードされ、プレースホルダを置き換える"""
+    client = NexumClient(port=server_port)
+    try:
+        status = client.wait_for("exec-binary", timeout=5)
+    finally:
+        client.close()
+    assert status["completedNodes"] == {"a": {"value": 1}, "b": {"value": 2}}
+
+
+# ──────────────────────────────────────────────────────────────────
+# 3. FetchBlob: ローカルにないクレームチェックは範囲読み出しで取得する
+# ──────────────────────────────────────────────────────────────────
+
+def test_blob_store_fetches_remote_blob_in_chunks(server_port, servicer, monkeypatch):
+    """パスが見えないブロブは FetchBlob をチャンクごとに呼んで組み立てる"""
+    monkeypatch.setattr(blobs, "FETCH_CHUNK_SIZE", 8)
+    body = json.dumps({"text": "y" * 20}).encode()
+    servicer.blobs["exec-1-fetch"] = body
+    pointer = {"__nexum_claim_check__": True, "blob_id": "exec-1-fetch", "size": len(body), "path": "/nonexistent/x.json"}
+
+    store = BlobStore(port=server_port)
+    try:
+        assert store.load(pointer) == {"text": "y" * 20}
+        assert servicer.blob_reads == [(0, 8), (8, 8), (16, 8), (24, 8)]
+        assert store.read(pointer, offset=2, length=6) == body[2:8]
+    finally:
+        store.close()
+
+
+# ──────────────────────────────────────────────────────────────────
+# 4. UploadPayload / DownloadPayload: 大きな入力は分割送信、ステータスの実体は分割受信
+# ──────────────────────────────────────────────────────────────────
+
+def test_large_input_is_streamed_in_chunks(server_port, servicer, monkeypatch):
+    """閾値を超える入力は UploadPayload で送り、StartRequest には blob_id だけを載せる"""
+    monkeypatch.setattr(client_module, "STREAM_THRESHOLD", 50)
+    monkeypatch.setattr(client_module, "UPLOAD_CHUNK_SIZE", 16)
+    big = {"text": "z" * 60}
+    client = NexumClient(port=server_port)
+    try:
+        client.start_execution("wf", {"small": 1})
+        client.start_execution("wf", big)
+    finally:
+        client.close()
+
+    small_req, big_req = servicer.started
+    assert json.loads(small_req.input_json) == {"small": 1} and not small_req.input_blob_id
+    assert big_req.input_json == "" and big_req.input_blob_id == "upload-0"
+    assert json.loads(servicer.blobs["upload-0"]) == big
+    assert servicer.upload_chunks == [16, 16, 16, 16, 8]
+
+
+def test_status_downloads_claim_checked_outputs(server_port, servicer):
+    """ステータスのクレームチェックは DownloadPayload で実体に置き換わる"""
+    servicer.blobs["exec-1-scrape"] = json.dumps({"html": "<p>" * 5}).encode()
+
+    async def scenario():
+        async_client = AsyncNexumClient(port=server_port)
+        try:
+            return await async_client.get_status("exec-1")
+        finally:
+            await async_client.close()
+
+    expected = {"scrape": {"html": "<p>" * 5}, "small": {"ok": True}}
+    assert asyncio.run(scenario())["completedNodes"] == expected
+    client = NexumClient(port=server_port)
+    try:
+        assert client.get_status("exec-1")["completedNodes"] == expected
+    finally:
+        client.close()
+
+
+# ──────────────────────────────────────────────────────────────────
+# 5. 圧縮: gzip チャネルでも同じ RPC が通る
+# ──────────────────────────────────────────────────────────────────
+
+def test_gzip_channel_round_trips(server_port, servicer):
+    """compression="gzip" のクライアントで送った入力がそのまま届き、未対応の方式は拒否する"""
+    client = NexumClient(port=server_port, compression="gzip")
+    try:
+        client.start_execution("wf", {"text": "abc " * 1000})
+    finally:
+        client.close()
+    assert json.loads(servicer.started[0].input_json) == {"text": "abc " * 1000}
+    with pytest.raises(ValueError, match="zstd"):
+        NexumClient(port=server_port, compression="zstd")
@@ -0,0 +1,96 @@
+"""
+test_codec.py — ペイロードコーデック (json / orjson / msgpack) のユニットテスト
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import BaseModel
+
+from nexum.builder import workflow
+from nexum.codec import Codec, decode_payload, get_codec, register_codec
+from nexum.proto import nexum_pb2
+
+
+class Shot(BaseModel):
+    url: str
+    png: bytes
+    taken_at: datetime
+
+
+SHOT = Shot(url="https://example.com", png=b"\x89PNG\x00\xff", taken_at=datetime(2026, 1, 2, tzinfo=timezone.utc))
+
+
+# ──────────────────────────────────────────────────────────────────
+# 1. 各コーデックの往復
+# ──────────────────────────────────────────────────────────────────
+
+def test_json_codec_round_trip():
+    codec = get_codec("json")
+    data = codec.encode({"a": [1, 2], "b": "é"})
+    assert codec.content_type == "application/json"
+    assert codec.decode(data) == {"a": [1, 2], "b": "é"}
+    assert codec.decode(codec.encode(SHOT.model_copy(update={"png": b"png"})))["url"] == "https://example.com"
+
+
+def test_orjson_codec_is_plain_json():
+    """orjson は同じ JSON ワイヤ形式 (content_type も同じ)"""
+    pytest.importorskip("orjson")
+    codec = get_codec("orjson")
+    assert codec.content_type == "application/json"
+    data = codec.encode({"when": datetime(2026, 1, 2, tzinfo=timezone.utc), "n": 1})
+    assert json.loads(data) == {"when": "2026-01-02T00:00:00+00:00", "n": 1}
+
+
+def test_msgpack_codec_keeps_bytes_binary():
+    """msgpack では bytes フィールドが base64 化されずそのまま往復し、モデルで再検証できる"""
+    pytest.importorskip("msgpack")
+    codec = get_codec("msgpack")
+    data = codec.encode(SHOT)
+    assert b"\x89PNG\x00\xff" in data
+    assert Shot.model_validate(codec.decode(data)) == SHOT
+
+
+# ──────────────────────────────────────────────────────────────────
+# 2. レジストリと content_type によるデコード
+# ──────────────────────────────────────────────────────────────────
+
+def test_decode_payload_by_content_type():
+    pytest.importorskip("msgpack")
+    packed = get_codec("msgpack").encode({"v": 1})
+    assert decode_payload(nexum_pb2.Payload(content_type="application/msgpack", data=packed)) == {"v": 1}
+    assert decode_payload(nexum_pb2.Payload(content_type="", data=b'{"v": 2}')) == {"v": 2}
+    with pytest.raises(ValueError):
+        decode_payload(nexum_pb2.Payload(content_type="application/x-unknown", data=b""))
+
+
+def test_custom_codec_registration():
+    """register_codec で独自コーデックを追加でき、workflow(codec=...) で選べる"""
+    class ReprCodec(Codec):
+        name = "repr-test"
+        content_type = "application/x-repr-test"
+
+        def encode(self, value):
+            return repr(value).encode()
+
+        def decode(self, data):
+            return data.decode()
+
+    register_codec(ReprCodec())
+    assert decode_payload(nexum_pb2.Payload(content_type="application/x-repr-test", data=b"[1]")) == "[1]"
+    wf = workflow("wf-custom-codec", codec="repr-test").compute("c", None, lambda ctx: 1).build()
+    assert wf.codec.name == "repr-test"
+    assert json.loads(wf.ir_json)["content_type"] == "application/x-repr-test"
+
+    with pytest.raises(ValueError):
+        get_codec("nope")
+
+
+def test_json_codec_keeps_version_hash():
+    """既定 (json) と orjson は IR に content_type を加えないので version_hash は変わらない"""
+    pytest.importorskip("orjson")
+    plain = workflow("wf-codec").compute("c", None, lambda ctx: 1).build()
+    fast = workflow("wf-codec", codec="orjson").compute("c", None, lambda ctx: 1).build()
+    assert plain.version_hash == fast.version_hash
+    assert "content_type" not in json.loads(plain.ir_json)
@@ -0,0 +1,156 @@
+"""
+test_context.py — ContextView の依存出力の遅延検証とキャッシュのユニットテスト
+"""
+
+import asyncio
+import threading
+
+import pytest
+from pydantic import BaseModel
+
+from nexum.context import ContextView, DependencyCache, map_error
+
+
+validations = {"count": 0}
+
+
+class CountingOut(BaseModel):
+    value: int
+
+    def model_post_init(self, __context):
+        validations["count"] += 1
+
+
+@pytest.fixture(autouse=True)
+def reset_counter():
+    validations["count"] = 0
+
+
+def make_ctx(outputs, execution_id="exec-1", cache=None):
+    models = {node_id: CountingOut for node_id in outputs}
+    return ContextView({}, outputs, models, execution_id=execution_id, cache=cache)
+
+
+# ──────────────────────────────────────────────────────────────────
+# 1. 遅延検証: get() した依存だけを一度だけ検証する
+# ──────────────────────────────────────────────────────────────────
+
+def test_validates_only_accessed_dependencies_once():
+    """10 個の依存のうち読んだ 1 つだけが検証され、2 回目の get() は同じオブジェクト"""
+    ctx = make_ctx({f"n{i}": {"value": i} for i in range(10)})
+    assert validations["count"] == 0
+
+    first = ctx.get("n3")
+    assert isinstance(first, CountingOut) and first.value == 3
+    assert ctx.get("n3") is first
+    assert validations["count"] == 1
+
+
+def test_invalid_or_unmodelled_outputs_are_returned_raw():
+    """モデルに合わない出力やモデルのないノードは生の値のまま返る"""
+    ctx = ContextView({}, {"bad": {"text": "x"}, "plain": {"a": 1}}, {"bad": CountingOut})
+    assert ctx.get("bad") == {"text": "x"}
+    assert ctx.get("plain") == {"a": 1}
+    with pytest.raises(KeyError):
+        ctx.get("missing")
+
+
+# ──────────────────────────────────────────────────────────────────
+# 2. DependencyCache: (execution_id, node_id) ごとに検証済みオブジェクトを共有
+# ──────────────────────────────────────────────────────────────────
+
+def test_cache_shares_validated_outputs_across_tasks():
+    """同じ実行の後続タスクはキャッシュ済みオブジェクトを再利用し、別の実行は再検証する"""
+    cache = DependencyCache(16)
+    outputs = {"a": {"value": 1}}
+    a1 = make_ctx(outputs, cache=cache).get("a")
+    a2 = make_ctx(outputs, cache=cache).get("a")
+    assert a1 is a2
+    assert validations["count"] == 1
+
+    make_ctx(outputs, execution_id="exec-2", cache=cache).get("a")
+    assert validations["count"] == 2
+
+
+def test_cache_evicts_least_recently_used():
+    """max_entries を超えると最も長く使われていないエントリから捨てる"""
+    cache = DependencyCache(2)
+    cache.put(("e", "a"), 1)
+    cache.put(("e", "b"), 2)
+    assert cache.get(("e", "a")) == 1
+    cache.put(("e", "c"), 3)
+    assert len(cache) == 2
+    assert cache.get(("e", "a")) == 1
+    assert cache.get(("e", "c")) == 3
+    assert ("e", "b") not in cache
+
+
+# ──────────────────────────────────────────────────────────────────
+# 3. クレームチェック: ポインタは get() されたときだけブロブから読む
+# ──────────────────────────────────────────────────────────────────
+
+class RecordingBlobs:
+    def __init__(self, values):
+        self.values = values
+        self.loads = []
+
+    def load(self, pointer):
+        self.loads.append((pointer["blob_id"], threading.current_thread() is threading.main_thread()))
+        return self.values[pointer["blob_id"]]
+
+    def is_local(self, pointer):
+        return pointer["blob_id"].startswith("local-")
+
+
+def pointer(blob_id):
+    return {"__nexum_claim_check__": True, "blob_id": blob_id, "size": 1, "path": ""}
+
+
+def test_claim_checks_are_loaded_on_first_get_only():
+    """読まれた依存のブロブだけを読み込み、検証済みキャッシュがあれば再読込しない"""
+    blobs = RecordingBlobs({"e-a": {"value": 1}, "e-b": {"value": 2}})
+    cache = DependencyCache(16)
+    outputs = {"a": pointer("e-a"), "b": pointer("e-b")}
+    models = {"a": CountingOut, "b": CountingOut}
+
+    ctx = ContextView({}, outputs, models, execution_id="exec-1", cache=cache, blobs=blobs)
+    assert ctx.get("a") == CountingOut(value=1)
+    assert ctx.get("a").value == 1
+    assert blobs.loads == [("e-a", True)]
+
+    ContextView({}, outputs, models, execution_id="exec-1", cache=cache, blobs=blobs).get("a")
+    assert blobs.loads == [("e-a", True)]
+
+
+def test_aget_reads_claim_checks_off_the_event_loop():
+    """aget() は読んだ依存のブロブだけをスレッドで読み、キャッシュ済みの依存は読まない"""
+    blobs = RecordingBlobs({"e-a": {"value": 1}, "e-b": {"value": 2}, "local-c": {"value": 3}})
+    cache = DependencyCache(16)
+    cache.put(("exec-1", "b"), CountingOut(value=2))
+    outputs = {"a": pointer("e-a"), "b": pointer("e-b"), "c": pointer("local-c"), "d": pointer("e-d")}
+    models = {"a": CountingOut, "b": CountingOut, "c": CountingOut}
+
+    async def handler(ctx):
+        return [(await ctx.aget(n)).value for n in "abc"] + [(await ctx.aget("a")).value]
+
+    ctx = ContextView({}, outputs, models, execution_id="exec-1", cache=cache, blobs=blobs)
+    assert ctx.has_remote_blobs()
+    assert asyncio.run(handler(ctx)) == [1, 2, 3, 1]
+    assert blobs.loads == [("e-a", False), ("local-c", False)]
+    assert not ContextView({}, {"c": pointer("local-c")}, blobs=blobs).has_remote_blobs()
+
+
+# ──────────────────────────────────────────────────────────────────
+# 4. MAP 結果: 失敗した項目は None になり、get_map_errors に理由が残る
+# ──────────────────────────────────────────────────────────────────
+
+def test_map_results_and_errors():
+    """項目の位置はそのままで、成功した結果だけがモデルに検証される"""
+    ctx = make_ctx({"square": [{"value": 1}, map_error(ValueError("bad row")), {"value": 9}]})
+    assert ctx.get_map_results("square") == [CountingOut(value=1), None, CountingOut(value=9)]
+    assert ctx.get_map_errors("square") == {1: "ValueError: bad row"}
+    with pytest.raises(TypeError):
+        ctx.get_map_errors("missing")
+    folded = make_ctx({"square": {"__nexum_map_summary__": True, "item_count": 3}})
+    with pytest.raises(TypeError, match="folding REDUCE"):
+        folded.get_map_results("square")
@@ -0,0 +1,137 @@
+"""
+test_limiter.py — AdaptiveLimiter (AIMD 同時実行数制御) のユニットテスト
+"""
+
+import asyncio
+
+import pytest
+
+from nexum.limiter import AdaptiveLimiter, is_overload_error
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class HttpError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# ──────────────────────────────────────────────────────────────────
+# 1. エラーの分類
+# ──────────────────────────────────────────────────────────────────
+
+def test_is_overload_error():
+    """タイムアウト・429/503・RateLimit 系の例外だけが過負荷とみなされる"""
+    assert is_overload_error(asyncio.TimeoutError())
+    assert is_overload_error(TimeoutError())
+    assert is_overload_error(HttpError(429))
+    assert is_overload_error(HttpError(503))
+    assert is_overload_error(RateLimitError())
+    assert not is_overload_error(HttpError(400))
+    assert not is_overload_error(ValueError("bad input"))
+
+
+# ──────────────────────────────────────────────────────────────────
+# 2. 加算増加 / 乗算減少
+# ──────────────────────────────────────────────────────────────────
+
+def test_grows_while_healthy_and_in_use():
+    """上限まで使っている間、健全な完了ごとに 1 ずつ増え、max_limit で止まる"""
+    async def scenario():
+        limiter = AdaptiveLimiter(min_limit=2, max_limit=5)
+        for _ in range(10):
+            while not limiter.locked():
+                await limiter.acquire()
+            limiter.record(0.0, 0.1)
+            limiter.release()
+        return limiter.limit
+
+    assert run(scenario()) == 5
+
+
+def test_does_not_grow_when_idle():
+    """上限の半分も使っていなければ増やさない"""
+    async def scenario():
+        limiter = AdaptiveLimiter(min_limit=2, max_limit=50, initial_limit=10)
+        for _ in range(20):
+            await limiter.acquire()
+            limiter.record(0.0, 0.1)
+            limiter.release()
+        return limiter.limit
+
+    assert run(scenario()) == 10
+
+
+def test_backs_off_once_per_round():
+    """過負荷エラーで半減し、減少より前に開始したタスクのエラーでは再度減らさない"""
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = AdaptiveLimiter(min_limit=2, max_limit=64, initial_limit=32)
+        started = loop.time()
+        limiter.record(started, 0.1, HttpError(429))
+        after_first = limiter.limit
+        for _ in range(5):
+            limiter.record(started, 0.1, RateLimitError())
+        after_burst = limiter.limit
+        await asyncio.sleep(0.001)
+        limiter.record(loop.time(), 0.1, asyncio.TimeoutError())
+        return after_first, after_burst, limiter.limit
+
+    assert run(scenario()) == (16, 16, 8)
+
+
+def test_other_errors_leave_limit_unchanged():
+    """通常の失敗では上限は変わらない"""
+    async def scenario():
+        limiter = AdaptiveLimiter(min_limit=2, max_limit=64, initial_limit=16)
+        limiter.record(asyncio.get_running_loop().time(), 0.1, ValueError("bad input"))
+        return limiter.limit
+
+    assert run(scenario()) == 16
+
+
+def test_latency_spike_backs_off_to_min():
+    """平滑化レイテンシの latency_tolerance 倍を超えると減少し、min_limit を下回らない"""
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        limiter = AdaptiveLimiter(min_limit=3, max_limit=64, initial_limit=8)
+        limiter.record(loop.time(), 0.1)
+        for _ in range(4):
+            await asyncio.sleep(0.001)
+            limiter.record(loop.time(), 1.0)
+        return limiter.limit
+
+    assert run(scenario()) == 3
+
+
+# ──────────────────────────────────────────────────────────────────
+# 3. セマフォとしての振る舞い
+# ──────────────────────────────────────────────────────────────────
+
+def test_acquire_waits_for_release_and_growth():
+    """上限に達した acquire は release か上限の増加で起こされる"""
+    async def scenario():
+        limiter = AdaptiveLimiter(min_limit=1, max_limit=2)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        limiter.record(0.0, 0.1)  # 上限使用中の健全な完了 → 上限 2
+        await asyncio.wait_for(waiter, 1.0)
+        return limiter.limit, limiter.inflight
+
+    assert run(scenario()) == (2, 2)
+
+
+def test_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(min_limit=10, max_limit=5)
+    with pytest.raises(ValueError):
+        AdaptiveLimiter(backoff=1.5)
@@ -0,0 +1,1107 @@
+"""
+test_worker.py — Python SDK Worker のユニットテスト (gRPC サーバー不要)
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+import grpc
+import pytest
+from pydantic import BaseModel
+
+from nexum.builder import workflow
+from nexum.codec import decode_payload
+from nexum.limiter import AdaptiveLimiter
+from nexum.proto import nexum_pb2
+from nexum.worker import Worker
+
+
+class ValueOut(BaseModel):
+    value: int
+
+
+class PidOut(BaseModel):
+    pid: int
+    value: int
+
+
+def double_in_process(ctx):
+    # executor="process" のハンドラーはモジュールレベルに置く (pickle 可能であること)
+    return PidOut(pid=os.getpid(), value=ctx.get("a").value * 2 + ctx.input["n"])
+
+
+# ── テスト用のフェイククライアント ───────────────────────────────
+
+class FakeClient:
+    """AsyncNexumClient と同じインターフェースを持つインメモリ実装"""
+
+    def __init__(self, tasks):
+        self.ready = list(tasks)
+        self.completed: dict[str, object] = {}
+        self.raw_outputs: dict[str, object] = {}
+        self.uploads: dict[str, bytes] = {}
+        self.failed: dict[str, str] = {}
+        self.polls = 0
+        self.lease_calls = 0
+        self.outstanding = 0
+        self.peak_outstanding = 0
+        self.single_acks = 0
+        self.batches: list[int] = []
+        self.wait_timeouts: list[int] = []
+        self.poll_task_hashes: list[list[str]] = []
+        self.heartbeats: list[tuple[str, str]] = []
+        self.ended: set[str] = set()
+        self.released: list[str] = []
+        self.map_pages: list[tuple[str, list, int]] = []
+        self.map_pending: list[int] = []
+        self.map_results: list = []
+        self.map_landed: list[int] = []
+        self.map_reads: list[tuple[str, int, int, str]] = []
+        self.map_errors: list[grpc.StatusCode] = []
+        self._arrived: asyncio.Event | None = None
+
+    def push(self, task):
+        """タスクを後から投入し、ロングポーリング中の呼び出しを起こす"""
+        self.ready.append(task)
+        if self._arrived is not None:
+            self._arrived.set()
+
+    def _lease(self):
+        self.outstanding += 1
+        self.peak_outstanding = max(self.peak_outstanding, self.outstanding)
+
+    async def poll_task(self, worker_id, version_hash="", wait_timeout_ms=0, *, version_hashes=None, lazy_blobs=False):
+        hashes = list(version_hashes or [])
+        if version_hash:
+            hashes.append(version_hash)
+        self.poll_task_hashes.append(hashes)
+        tasks = await self.poll_tasks(worker_id, hashes, 1, wait_timeout_ms, lazy_blobs=lazy_blobs)
+        return tasks[0] if tasks else nexum_pb2.PollResponse(has_task=False)
+
+    async def poll_tasks(self, worker_id, version_hashes, max_tasks, wait_timeout_ms=0, *, lazy_blobs=False):
+        self.polls += 1
+        self.wait_timeouts.append(wait_timeout_ms)
+        await asyncio.sleep(0)
+        if wait_timeout_ms and not any(t["version_hash"] in version_hashes for t in self.ready):
+            self._arrived = self._arrived or asyncio.Event()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), wait_timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            self._arrived.clear()
+        leased = []
+        for t in list(self.ready):
+            if len(leased) == max_tasks:
+                break
+            if t["version_hash"] in version_hashes:
+                self.ready.remove(t)
+                self._lease()
+                leased.append(make_task(**t))
+        if leased:
+            self.lease_calls += 1
+        return leased
+
+    async def heartbeat(self, task_id, worker_id, progress=""):
+        await asyncio.sleep(0)
+        self.heartbeats.append((task_id, progress))
+        return task_id not in self.ended
+
+    async def release_tasks(self, worker_id, task_ids):
+        await asyncio.sleep(0)
+        self.outstanding -= len(task_ids)
+        self.released.extend(task_ids)
+        return len(task_ids)
+
+    async def complete_task(self, task_id, output):
+        await asyncio.sleep(0)
+        self.single_acks += 1
+        self._complete(task_id, output)
+
+    async def fail_task(self, task_id, error):
+        await asyncio.sleep(0)
+        self.single_acks += 1
+        self._fail(task_id, error)
+
+    async def complete_tasks(self, items):
+        await asyncio.sleep(0)
+        self.batches.append(len(items))
+        for task_id, output in items:
+            self._complete(task_id, output)
+        return [nexum_pb2.TaskAck(task_id=task_id, ok=True) for task_id, _ in items]
+
+    async def fail_tasks(self, items):
+        await asyncio.sleep(0)
+        self.batches.append(len(items))
+        for task_id, error in items:
+            self._fail(task_id, error)
+        return [nexum_pb2.TaskAck(task_id=task_id, ok=True) for task_id, _ in items]
+
+    async def upload_payload(self, data):
+        await asyncio.sleep(0)
+        blob_id = f"upload-{len(self.uploads)}"
+        self.uploads[blob_id] = data
+        return nexum_pb2.UploadPayloadResponse(blob_id=blob_id, size=len(data))
+
+    async def append_map_items(self, task_id, worker_id, items_json, offset):
+        await asyncio.sleep(0)
+        if self.map_errors:
+            raise grpc.aio.AioRpcError(self.map_errors.pop(0), details=f"append to {task_id} rejected")
+        page = json.loads(items_json)
+        self.map_pages.append((task_id, page, offset))
+        pending = self.map_pending.pop(0) if self.map_pending else 0
+        return nexum_pb2.AppendMapItemsResponse(item_count=offset + len(page), pending=pending)
+
+    async def read_map_results(self, task_id, worker_id, from_index, limit=0, partial_json=""):
+        await asyncio.sleep(0)
+        self.map_reads.append((task_id, from_index, limit, partial_json))
+        if task_id in self.ended:
+            raise grpc.aio.AioRpcError(grpc.StatusCode.FAILED_PRECONDITION, details=f"execution of {task_id} ended")
+        landed = self.map_landed.pop(0) if self.map_landed else len(self.map_results)
+        chunk = self.map_results[from_index:min(landed, from_index + limit)]
+        return nexum_pb2.ReadMapResultsResponse(
+            results_json=[json.dumps(r) for r in chunk],
+            item_count=len(self.map_results),
+            done=from_index + len(chunk) == len(self.map_results),
+        )
+
+    def _complete(self, task_id, output):
+        self.outstanding -= 1
+        self.raw_outputs[task_id] = output
+        if isinstance(output, nexum_pb2.Payload):
+            output = decode_payload(output)
+        elif isinstance(output, nexum_pb2.UploadPayloadResponse):
+            output = self.uploads[output.blob_id].decode()
+        self.completed[task_id] = json.loads(output) if isinstance(output, str) else output
+
+    def _fail(self, task_id, error):
+        self.outstanding -= 1
+        self.failed[task_id] = error
+
+    async def get_status(self, execution_id):
+        return {"status": "RUNNING", "completedNodes": {}}
+
+    async def close(self):
+        pass
+
+
+def make_task(task_id, node_id, input_data=None, deps=None, **extra):
+    return nexum_pb2.PollResponse(
+        has_task=True,
+        task_id=task_id,
+        execution_id="exec-1",
+        node_id=node_id,
+        input_json=json.dumps({"input": input_data or {}, "deps": deps or {}}),
+        **extra,
+    )
+
+
+def task_for(wf, task_id, node_id, **fields):
+    """ワークフローに紐づくフェイクタスクを作る"""
+    return {"workflow_id": wf.workflow_id, "version_hash": wf.version_hash,
+            "task_id": task_id, "node_id": node_id, **fields}
+
+
+def make_worker(workflows, fake, **kwargs):
+    w = Worker(workflows, poll_interval=0.001, **kwargs)
+    w._make_client = lambda: fake
+    return w
+
+
+async def run_until(w, predicate, timeout=2.0):
+    w._running = True
+    runner = asyncio.create_task(w._run())
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.005)
+    w._running = False
+    runner.cancel()
+    try:
+        await runner
+    except asyncio.CancelledError:
+        pass
+
+
+# ──────────────────────────────────────────────────────────────────
+# 1. 基本動作: ポーリング → 実行 → 完了報告
+# ──────────────────────────────────────────────────────────────────
+
+def test_worker_completes_task_with_deps():
+    """依存ノードの出力が Pydantic モデルとして渡され、結果が完了報告される"""
+    wf = (
+        workflow("worker-basic")
+        .compute("a", ValueOut, lambda ctx: ValueOut(value=1))
+        .compute("b", ValueOut, lambda ctx: ValueOut(value=ctx.get("a").value + ctx.input["n"]))
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-b", "b", input_data={"n": 41}, deps={"a": {"value": 1}}),
+    ])
+    w = make_worker([wf], fake)
+    asyncio.run(run_until(w, lambda: "t-b" in fake.completed))
+    assert fake.completed["t-b"] == {"value": 42}
+
+
+def test_worker_reports_handler_failure():
+    """ハンドラーが例外を投げると fail_task が呼ばれる"""
+    def boom(ctx):
+        raise ValueError("boom")
+
+    wf = workflow("worker-fail").effect("x", ValueOut, boom).build()
+    fake = FakeClient([task_for(wf, "t-x", "x")])
+    w = make_worker([wf], fake)
+    asyncio.run(run_until(w, lambda: "t-x" in fake.failed))
+    assert "boom" in fake.failed["t-x"]
+
+
+# ──────────────────────────────────────────────────────────────────
+# 2. 非同期トランスポート: RPC 中もハンドラーが並行して進む
+# ──────────────────────────────────────────────────────────────────
+
+def test_async_handlers_overlap():
+    """async EFFECT ハンドラーがイベントループ上で並行実行される"""
+    active = {"now": 0, "peak": 0}
+
+    async def io_bound(ctx):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.05)
+        active["now"] -= 1
+        return ValueOut(value=0)
+
+    wf = workflow("worker-io").effect("io", ValueOut, io_bound).build()
+    fake = FakeClient([
+        task_for(wf, f"t-{i}", "io")
+        for i in range(8)
+    ])
+    w = make_worker([wf], fake, concurrency=8)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 8))
+    assert len(fake.completed) == 8
+    assert active["peak"] > 1
+
+
+# ──────────────────────────────────────────────────────────────────
+# 3. スロット単位のポーリング: 空きスロット以上はリースしない
+# ──────────────────────────────────────────────────────────────────
+
+def test_never_leases_more_than_concurrency():
+    """concurrency=3 なら同時にリースされるタスクは最大 3 件"""
+    async def slow(ctx):
+        await asyncio.sleep(0.02)
+        return ValueOut(value=0)
+
+    wf = workflow("worker-slots").effect("s", ValueOut, slow).build()
+    fake = FakeClient([
+        task_for(wf, f"t-{i}", "s")
+        for i in range(12)
+    ])
+    w = make_worker([wf], fake, concurrency=3)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 12))
+    assert len(fake.completed) == 12
+    assert fake.peak_outstanding == 3
+
+
+def test_batch_poll_fills_free_slots_in_one_round_trip():
+    """poll_batch_size を指定すると空きスロット分をまとめてリースする"""
+    async def slow(ctx):
+        await asyncio.sleep(0.02)
+        return ValueOut(value=0)
+
+    wf = workflow("worker-batch").effect("s", ValueOut, slow).build()
+    fake = FakeClient([
+        task_for(wf, f"t-{i}", "s")
+        for i in range(16)
+    ])
+    w = make_worker([wf], fake, concurrency=8, poll_batch_size=8)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 16))
+    assert len(fake.completed) == 16
+    assert fake.peak_outstanding <= 8
+    assert fake.lease_calls < 16
+
+
+# ──────────────────────────────────────────────────────────────────
+# 4. 完了報告のバッチ化: N 件または M ミリ秒でまとめて送信
+# ──────────────────────────────────────────────────────────────────
+
+def test_completion_buffer_batches_results():
+    """completion_batch_size を指定すると完了/失敗が CompleteTasks/FailTasks にまとめられ、取りこぼさない"""
+    def handler(ctx):
+        if ctx.input["n"] % 5 == 0:
+            raise ValueError("bad item")
+        return ValueOut(value=ctx.input["n"])
+
+    wf = workflow("worker-ack-batch").compute("c", ValueOut, handler).build()
+    fake = FakeClient([
+        task_for(wf, f"t-{i}", "c", input_data={"n": i})
+        for i in range(20)
+    ])
+    w = make_worker([wf], fake, concurrency=8, completion_batch_size=8, completion_flush_ms=20)
+    asyncio.run(run_until(w, lambda: len(fake.completed) + len(fake.failed) == 20))
+    assert len(fake.completed) == 16
+    assert len(fake.failed) == 4
+    assert fake.completed["t-3"] == {"value": 3}
+    assert fake.single_acks == 0
+    assert len(fake.batches) < 20
+    assert max(fake.batches) <= 8
+
+
+def test_completion_buffer_falls_back_when_batch_rpc_fails(monkeypatch):
+    """CompleteTasks が失敗し続けると 1 件ずつ送り直し、それも届かない結果はタスクを失敗にする"""
+    monkeypatch.setattr(sys.modules[Worker.__module__], "BATCH_SEND_ATTEMPTS", 2)
+    wf = workflow("worker-ack-retry").compute("c", ValueOut, lambda ctx: ValueOut(value=ctx.input["n"])).build()
+    fake = FakeClient([task_for(wf, f"t-{i}", "c", input_data={"n": i}) for i in range(3)])
+    batch_calls = []
+
+    async def broken_batch(items):
+        batch_calls.append(len(items))
+        raise ConnectionError("unavailable")
+
+    single = fake.complete_task
+
+    async def flaky_single(task_id, output):
+        if task_id == "t-2":
+            raise ConnectionError("unavailable")
+        await single(task_id, output)
+
+    fake.complete_tasks = broken_batch
+    fake.complete_task = flaky_single
+    w = make_worker([wf], fake, concurrency=3, completion_batch_size=3, completion_flush_ms=5)
+    asyncio.run(run_until(w, lambda: len(fake.completed) + len(fake.failed) == 3))
+
+    assert batch_calls == [3, 3]
+    assert fake.completed == {"t-0": {"value": 0}, "t-1": {"value": 1}}
+    assert "Result not delivered" in fake.failed["t-2"]
+
+
+# ──────────────────────────────────────────────────────────────────
+# 5. ロングポーリング: 空振りでスリープせず、到着したタスクをすぐ受け取る
+# ──────────────────────────────────────────────────────────────────
+
+def test_long_poll_dispatches_without_poll_interval():
+    """long_poll_timeout を指定すると poll_interval を待たずに新着タスクを実行する"""
+    wf = workflow("worker-long-poll").compute("c", ValueOut, lambda ctx: ValueOut(value=7)).build()
+    fake = FakeClient([])
+    w = Worker([wf], concurrency=1, poll_interval=30.0, long_poll_timeout=5.0)
+    w._make_client = lambda: fake
+
+    async def scenario():
+        async def feed():
+            await asyncio.sleep(0.05)
+            fake.push(task_for(wf, "t-late", "c"))
+
+        feeder = asyncio.create_task(feed())
+        await run_until(w, lambda: "t-late" in fake.completed, timeout=1.0)
+        await feeder
+
+    asyncio.run(scenario())
+    assert fake.completed["t-late"] == {"value": 7}
+    assert set(fake.wait_timeouts) == {5000}
+
+
+# ──────────────────────────────────────────────────────────────────
+# 6. 複数バージョンを 1 リクエストでポーリング
+# ──────────────────────────────────────────────────────────────────
+
+def test_single_poll_covers_all_versions():
+    """ワークフロー数に関係なく 1 回の PollTask で全 version_hash を問い合わせ、workflow_id で振り分ける"""
+    wfs = [
+        workflow(f"worker-multi-{i}").compute("c", ValueOut, lambda ctx, i=i: ValueOut(value=i)).build()
+        for i in range(5)
+    ]
+    fake = FakeClient([
+        task_for(wfs[-1], "t-last", "c"),
+        task_for(wfs[2], "t-mid", "c"),
+    ])
+    w = make_worker(wfs, fake, concurrency=1)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 2))
+    assert fake.completed == {"t-last": {"value": 4}, "t-mid": {"value": 2}}
+    # 同じ形のワークフローは version_hash を共有するので重複は送らない
+    expected = sorted({wf.version_hash for wf in wfs})
+    assert all(sorted(h) == expected for h in fake.poll_task_hashes)
+    assert fake.polls == len(fake.poll_task_hashes)
+
+
+# ──────────────────────────────────────────────────────────────────
+# 7. executor: 同期ハンドラーをスレッド / プロセスプールで実行
+# ──────────────────────────────────────────────────────────────────
+
+def test_process_executor_runs_handler_in_child_process():
+    """executor="process" のハンドラーは別プロセスで動き、deps/input が ContextView として渡る"""
+    wf = (
+        workflow("worker-process")
+        .compute("a", ValueOut, lambda ctx: ValueOut(value=1))
+        .compute("b", PidOut, double_in_process, executor="process")
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-b", "b", input_data={"n": 40}, deps={"a": {"value": 1}}),
+    ])
+    w = make_worker([wf], fake, process_pool_size=1)
+    asyncio.run(run_until(w, lambda: "t-b" in fake.completed, timeout=30.0))
+    assert fake.completed["t-b"]["value"] == 42
+    assert fake.completed["t-b"]["pid"] != os.getpid()
+    assert w._process_pool is None
+
+
+def test_thread_executor_keeps_event_loop_free():
+    """executor="thread" ならブロッキングする同期ハンドラー同士が並行に進む"""
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def blocking(ctx):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return ValueOut(value=0)
+
+    wf = workflow("worker-thread").compute("c", ValueOut, blocking, executor="thread").build()
+    fake = FakeClient([task_for(wf, f"t-{i}", "c") for i in range(4)])
+    w = make_worker([wf], fake, concurrency=4)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 4))
+    assert len(fake.completed) == 4
+    assert active["peak"] > 1
+
+
+def test_executor_validation():
+    """不正な executor 指定は定義時 / Worker 生成時にエラーになる"""
+    async def async_handler(ctx):
+        return ValueOut(value=0)
+
+    with pytest.raises(ValueError):
+        workflow("bad-executor").compute("c", ValueOut, double_in_process, executor="gpu")
+    with pytest.raises(ValueError):
+        workflow("bad-async").effect("e", ValueOut, async_handler, executor="process")
+
+    wf = workflow("bad-lambda").compute("c", ValueOut, lambda ctx: ValueOut(value=0), executor="process").build()
+    with pytest.raises(ValueError, match="pickled"):
+        Worker([wf])
+
+
+# ──────────────────────────────────────────────────────────────────
+# 8. ハートビート: 実行中はリースを延長し、進捗を送る
+# ──────────────────────────────────────────────────────────────────
+
+def test_heartbeats_while_handler_runs():
+    """lease_seconds の 1/3 ごとに Heartbeat を送り、ctx.report_progress の値が載る"""
+    async def long_running(ctx):
+        for step in range(4):
+            ctx.report_progress({"step": step})
+            await asyncio.sleep(0.2)
+        return ValueOut(value=4)
+
+    wf = workflow("worker-heartbeat").effect("e", ValueOut, long_running, lease_seconds=1).build()
+    assert json.loads(wf.ir_json)["nodes"]["e"]["lease_seconds"] == 1
+    fake = FakeClient([task_for(wf, "t-e", "e", lease_seconds=1)])
+    w = make_worker([wf], fake)
+    asyncio.run(run_until(w, lambda: "t-e" in fake.completed))
+    assert fake.completed["t-e"] == {"value": 4}
+    assert len(fake.heartbeats) >= 2
+    assert {task_id for task_id, _ in fake.heartbeats} == {"t-e"}
+    # 最初のハートビート (約 0.33 秒後) には step 1 の進捗が載る
+    assert json.loads(fake.heartbeats[0][1]) == {"step": 1}
+
+    # 完了後はハートビートが止まる
+    sent = len(fake.heartbeats)
+    asyncio.run(asyncio.sleep(0.5))
+    assert len(fake.heartbeats) == sent
+
+
+def test_handler_is_abandoned_when_heartbeat_is_refused():
+    """サーバーがハートビートを拒否したら (実行の終了・リース切れ) ハンドラーを取り消し、完了も失敗も送らない"""
+    cancelled = []
+
+    async def stuck(ctx):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return ValueOut(value=1)
+
+    wf = workflow("worker-heartbeat-refused").effect("e", ValueOut, stuck, lease_seconds=1).build()
+    fake = FakeClient([task_for(wf, "t-e", "e", lease_seconds=1)])
+    fake.ended.add("t-e")
+    w = make_worker([wf], fake)
+    asyncio.run(run_until(w, lambda: bool(fake.heartbeats) and not w._inflight))
+
+    assert cancelled == [True]
+    assert fake.heartbeats == [("t-e", "")]
+    assert "t-e" not in fake.completed and "t-e" not in fake.failed
+
+
+# ──────────────────────────────────────────────────────────────────
+# 9. グレースフルシャットダウン: run() / shutdown() でドレインする
+# ──────────────────────────────────────────────────────────────────
+
+async def start_then_shutdown(w, predicate, **shutdown_kwargs):
+    """run() を開始し、predicate が成り立った時点で shutdown() する"""
+    runner = asyncio.create_task(w.run(handle_signals=False))
+    deadline = asyncio.get_running_loop().time() + 2.0
+    while not predicate() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.005)
+    await w.shutdown(**shutdown_kwargs)
+    await asyncio.wait_for(runner, 2.0)
+
+
+def test_shutdown_drains_inflight_handlers():
+    """shutdown() はリースを止め、実行中のハンドラの完了を待ってから返る"""
+    started = []
+
+    async def slow(ctx):
+        started.append(ctx.input)
+        await asyncio.sleep(0.1)
+        return ValueOut(value=1)
+
+    wf = workflow("worker-drain").effect("e", ValueOut, slow).build()
+    fake = FakeClient([task_for(wf, f"t-{i}", "e") for i in range(2)])
+    w = make_worker([wf], fake, concurrency=2, completion_batch_size=8, completion_flush_ms=1000)
+    asyncio.run(start_then_shutdown(w, lambda: len(started) == 2))
+    # バッファ中の完了報告もフラッシュされている
+    assert set(fake.completed) == {"t-0", "t-1"}
+    assert fake.released == []
+    assert fake.outstanding == 0
+
+    # 停止後に投入されたタスクはリースされない
+    fake.push(task_for(wf, "t-late", "e"))
+    asyncio.run(asyncio.sleep(0.05))
+    assert "t-late" not in fake.completed
+
+
+def test_shutdown_releases_handlers_past_drain_timeout():
+    """drain_timeout を超えたハンドラはキャンセルされ、タスクは READY に返される"""
+
+    async def stuck(ctx):
+        await asyncio.sleep(10)
+        return ValueOut(value=0)
+
+    wf = workflow("worker-drain-timeout").effect("e", ValueOut, stuck).build()
+    fake = FakeClient([task_for(wf, "t-stuck", "e")])
+    w = make_worker([wf], fake, drain_timeout=0.05)
+    asyncio.run(start_then_shutdown(w, lambda: fake.outstanding == 1))
+    assert fake.released == ["t-stuck"]
+    assert fake.completed == {} and fake.failed == {}
+    assert fake.outstanding == 0
+
+
+def test_shutdown_does_not_wait_out_a_long_poll():
+    """ロングポーリング中でも shutdown() は drain_timeout 以内に返る"""
+    wf = workflow("worker-drain-long-poll").compute("c", ValueOut, lambda ctx: ValueOut(value=1)).build()
+    fake = FakeClient([])
+    w = make_worker([wf], fake, long_poll_timeout=30.0, drain_timeout=0.1)
+
+    async def scenario():
+        runner = asyncio.create_task(w.run(handle_signals=False))
+        while not fake.polls:
+            await asyncio.sleep(0.005)
+        started = asyncio.get_running_loop().time()
+        await asyncio.wait_for(w.shutdown(), 2.0)
+        await asyncio.wait_for(runner, 2.0)
+        return asyncio.get_running_loop().time() - started
+
+    assert asyncio.run(scenario()) < 0.5
+    assert fake.wait_timeouts[0] == 30_000
+
+
+def test_shutdown_releases_tasks_leased_by_inflight_poll():
+    """シャットダウン中に返ってきたロングポーリングのタスクは実行せず返却する"""
+    ran = []
+    wf = workflow("worker-drain-poll").compute("c", ValueOut, lambda ctx: ran.append(1) or ValueOut(value=1)).build()
+    fake = FakeClient([])
+    w = make_worker([wf], fake, long_poll_timeout=1.0)
+
+    async def scenario():
+        runner = asyncio.create_task(w.run(handle_signals=False))
+        while not fake.polls:
+            await asyncio.sleep(0.005)
+        stopping = asyncio.create_task(w.shutdown())
+        await asyncio.sleep(0.01)
+        fake.push(task_for(wf, "t-c", "c"))
+        await asyncio.wait_for(stopping, 2.0)
+        await asyncio.wait_for(runner, 2.0)
+
+    asyncio.run(scenario())
+    assert ran == []
+    assert fake.released == ["t-c"]
+    assert fake.outstanding == 0
+
+
+def test_sigterm_triggers_graceful_shutdown():
+    """run() 中の SIGTERM は shutdown() を起動し、実行中のタスクを完了させて終了する"""
+    async def slow(ctx):
+        await asyncio.sleep(0.05)
+        return ValueOut(value=1)
+
+    wf = workflow("worker-sigterm").effect("e", ValueOut, slow).build()
+    fake = FakeClient([task_for(wf, "t-e", "e")])
+    w = make_worker([wf], fake)
+
+    async def scenario():
+        runner = asyncio.create_task(w.run())
+        while fake.outstanding == 0:
+            await asyncio.sleep(0.005)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.wait_for(runner, 2.0)
+
+    asyncio.run(scenario())
+    assert fake.completed == {"t-e": {"value": 1}}
+
+
+# ──────────────────────────────────────────────────────────────────
+# 10. 適応的な同時実行数: AdaptiveLimiter がセマフォを置き換える
+# ──────────────────────────────────────────────────────────────────
+
+def test_adaptive_limiter_grows_then_backs_off_on_rate_limit():
+    """健全な間は同時実行数が増え、429 を受けると減る。現在値は metrics() で見える"""
+    class TooManyRequests(Exception):
+        status_code = 429
+
+    active = {"now": 0, "peak": 0}
+    throttled = {"on": False}
+
+    async def call_llm(ctx):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        try:
+            await asyncio.sleep(0.01)
+            if throttled["on"]:
+                raise TooManyRequests("slow down")
+            return ValueOut(value=1)
+        finally:
+            active["now"] -= 1
+
+    wf = workflow("worker-adaptive").effect("e", ValueOut, call_llm).build()
+    fake = FakeClient([task_for(wf, f"t-{i}", "e") for i in range(60)])
+    limiter = AdaptiveLimiter(min_limit=2, max_limit=16)
+    w = make_worker([wf], fake, limiter=limiter, poll_batch_size=16)
+    assert w.metrics() == {"concurrency_limit": 2, "inflight": 0}
+
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 60))
+    assert len(fake.completed) == 60
+    assert limiter.limit > 2
+    assert 2 < active["peak"] <= 16
+    grown = limiter.limit
+
+    throttled["on"] = True
+    for i in range(20):
+        fake.push(task_for(wf, f"t-429-{i}", "e"))
+    asyncio.run(run_until(w, lambda: len(fake.failed) == 20))
+    assert limiter.limit < grown
+    assert w.metrics()["concurrency_limit"] == limiter.limit
+
+
+def test_pollers_follow_the_adaptive_limit_not_its_ceiling():
+    """ポーラー数は max_limit ではなく現在の上限に合わせて増え、上限が下がれば減る"""
+    wf = workflow("worker-adaptive-pollers").effect("e", ValueOut, lambda ctx: ValueOut(value=1)).build()
+    fake = FakeClient([])
+    limiter = AdaptiveLimiter(min_limit=2, max_limit=200)
+    w = make_worker([wf], fake, limiter=limiter)
+    counts = []
+
+    async def scenario():
+        w._running = True
+        runner = asyncio.create_task(w._run())
+        await asyncio.sleep(0.02)
+        counts.append(len(w._pollers))
+        limiter._limit = 6.0
+        w._resize_pollers()
+        await asyncio.sleep(0.02)
+        counts.append(len(w._pollers))
+        limiter._limit = 3.0
+        await asyncio.sleep(0.05)
+        counts.append(len(w._pollers))
+        w._running = False
+        runner.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+    assert counts == [2, 6, 3]
+
+
+# ──────────────────────────────────────────────────────────────────
+# 11. 依存出力: 読んだものだけ検証し、dependency_cache_size で実行内共有
+# ──────────────────────────────────────────────────────────────────
+
+def test_dependency_outputs_validated_lazily_and_cached():
+    """同じ実行の後続タスクが読む依存出力は一度だけ検証され、読まれない依存は検証されない"""
+    seen = []
+    wf = (
+        workflow("worker-dep-cache")
+        .compute("a", ValueOut, lambda ctx: ValueOut(value=1))
+        .compute("b", ValueOut, lambda ctx: ValueOut(value=2))
+        .compute("c", ValueOut, lambda ctx: seen.append(ctx.get("a")) or ValueOut(value=3))
+        .compute("d", ValueOut, lambda ctx: seen.append(ctx.get("a")) or ValueOut(value=4))
+        .build()
+    )
+    deps = {"a": {"value": 1}, "b": {"value": 2}}
+    fake = FakeClient([
+        task_for(wf, "t-c", "c", deps=deps),
+        task_for(wf, "t-d", "d", deps=deps),
+    ])
+    w = make_worker([wf], fake, dependency_cache_size=64)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 2))
+    assert len(seen) == 2
+    assert isinstance(seen[0], ValueOut) and seen[0] is seen[1]
+    assert ("exec-1", "b") not in w._dependency_cache
+
+
+# ──────────────────────────────────────────────────────────────────
+# 12. 出力: 一度だけシリアライズした JSON 文字列をそのまま送る
+# ──────────────────────────────────────────────────────────────────
+
+def test_outputs_are_sent_as_serialized_json():
+    """モデル出力は model_dump_json() の文字列、モデルなしの出力も JSON 文字列のまま完了報告される"""
+    class Doc(BaseModel):
+        text: str
+        tags: list[str]
+
+    wf = (
+        workflow("worker-output-json")
+        .compute("doc", Doc, lambda ctx: Doc(text=ctx.input["text"], tags=["a", "b"]))
+        .compute("echo", None, lambda ctx: "plain string")
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-doc", "doc", input_data={"text": "é" * 3}),
+        task_for(wf, "t-echo", "echo"),
+    ])
+    w = make_worker([wf], fake)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 2))
+    assert fake.raw_outputs["t-doc"] == Doc(text="ééé", tags=["a", "b"]).model_dump_json()
+    assert fake.raw_outputs["t-echo"] == '"plain string"'
+    assert fake.completed["t-echo"] == "plain string"
+
+
+# ──────────────────────────────────────────────────────────────────
+# 13. コーデック: codec="msgpack" のワークフローはバイナリ Payload で送受信する
+# ──────────────────────────────────────────────────────────────────
+
+def test_msgpack_workflow_sends_and_receives_payloads():
+    """出力は application/msgpack の Payload、dep_payloads の依存出力はデコードされて ctx.get() に渡る"""
+    msgpack = pytest.importorskip("msgpack")
+
+    class Embedding(BaseModel):
+        vector: bytes
+
+    seen = []
+    wf = (
+        workflow("worker-msgpack", codec="msgpack")
+        .compute("embed", Embedding, lambda ctx: Embedding(vector=b"\x00\xff" * 4))
+        .compute("use", ValueOut, lambda ctx: seen.append(ctx.get("embed")) or ValueOut(value=1))
+        .build()
+    )
+    dep = nexum_pb2.Payload(content_type="application/msgpack", data=msgpack.packb({"vector": b"\x01\x02"}))
+    fake = FakeClient([
+        task_for(wf, "t-embed", "embed"),
+        task_for(wf, "t-use", "use", dep_payloads={"embed": dep}),
+    ])
+    w = make_worker([wf], fake)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 2))
+
+    raw = fake.raw_outputs["t-embed"]
+    assert isinstance(raw, nexum_pb2.Payload) and raw.content_type == "application/msgpack"
+    assert msgpack.unpackb(raw.data) == {"vector": b"\x00\xff" * 4}
+    assert seen == [Embedding(vector=b"\x01\x02")]
+
+
+# ──────────────────────────────────────────────────────────────────
+# 14. 結果キャッシュ: compute(cache=True) は同じ入力でハンドラーを再実行しない
+# ──────────────────────────────────────────────────────────────────
+
+def test_cached_compute_skips_handler_on_identical_inputs():
+    """同じ依存出力を持つ 2 回目のタスクはキャッシュから完了し、依存が変わればまた実行する"""
+    calls = []
+
+    def embed(ctx):
+        calls.append(ctx.get("fetch"))
+        return ValueOut(value=len(calls))
+
+    wf = (
+        workflow("worker-result-cache")
+        .compute("embed", ValueOut, embed, cache=True)
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-1", "embed", deps={"fetch": {"text": "a", "n": 1}}),
+        task_for(wf, "t-2", "embed", deps={"fetch": {"n": 1, "text": "a"}}),
+        task_for(wf, "t-3", "embed", deps={"fetch": {"text": "b", "n": 1}}),
+    ])
+    w = make_worker([wf], fake, concurrency=1)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 3))
+
+    assert len(calls) == 2
+    assert fake.completed["t-2"] == fake.completed["t-1"] == {"value": 1}
+    assert fake.completed["t-3"] == {"value": 2}
+    metrics = w.metrics()
+    assert metrics["cache_hits"] == 1 and metrics["cache_misses"] == 2
+
+
+# ──────────────────────────────────────────────────────────────────
+# 15. クレームチェック: 大きな依存出力はハンドラーが読んだときにファイルから解決する
+# ──────────────────────────────────────────────────────────────────
+
+def test_claim_checked_dependency_is_resolved_lazily(tmp_path):
+    """ポインタのまま届いた依存は ctx.get() でファイルから読まれ、読まない依存はそのまま"""
+    body = json.dumps({"value": 42}).encode()
+    (tmp_path / "exec-1-big.json").write_bytes(body)
+    big = {"__nexum_claim_check__": True, "blob_id": "exec-1-big", "size": len(body), "path": "/elsewhere/x.json"}
+    unread = {"__nexum_claim_check__": True, "blob_id": "exec-1-unread", "size": 10, "path": "/elsewhere/y.json"}
+
+    seen = []
+    wf = (
+        workflow("worker-claim-check")
+        .compute("big", ValueOut, lambda ctx: ValueOut(value=0))
+        .compute("unread", ValueOut, lambda ctx: ValueOut(value=0))
+        .compute("use", ValueOut, lambda ctx: seen.append(ctx.get("big")) or ValueOut(value=1))
+        .build()
+    )
+    fake = FakeClient([task_for(wf, "t-use", "use", deps={"big": big, "unread": unread})])
+    w = make_worker([wf], fake, blob_dir=str(tmp_path))
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 1))
+
+    assert seen == [ValueOut(value=42)]
+    assert fake.completed["t-use"] == {"value": 1}
+
+
+# ──────────────────────────────────────────────────────────────────
+# 16. 大きな出力・入力: 閾値を超える出力は UploadPayload でストリーム送信する
+# ──────────────────────────────────────────────────────────────────
+
+def test_large_outputs_are_uploaded_and_large_inputs_loaded(tmp_path):
+    """閾値を超える JSON 出力は参照付きで完了し、クレームチェックの入力は実行前に読み込まれる"""
+    body = json.dumps({"urls": ["https://example.com"] * 3}).encode()
+    (tmp_path / "upload-in.json").write_bytes(body)
+    streamed_input = {"__nexum_claim_check__": True, "blob_id": "upload-in", "size": len(body), "path": "/elsewhere"}
+
+    class Page(BaseModel):
+        html: str
+
+    seen = []
+    wf = (
+        workflow("worker-upload")
+        .compute("small", Page, lambda ctx: Page(html="ok"))
+        .compute("scrape", Page, lambda ctx: seen.append(ctx.input) or Page(html="x" * 500))
+        .build()
+    )
+    fake = FakeClient([task_for(wf, "t-small", "small"), task_for(wf, "t-scrape", "scrape", input_data=streamed_input)])
+    w = make_worker([wf], fake, blob_dir=str(tmp_path), upload_threshold=100)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 2))
+
+    assert seen == [{"urls": ["https://example.com"] * 3}]
+    assert isinstance(fake.raw_outputs["t-scrape"], nexum_pb2.UploadPayloadResponse)
+    assert fake.completed["t-scrape"] == {"html": "x" * 500}
+    assert isinstance(fake.raw_outputs["t-small"], str)
+    assert list(fake.uploads) == ["upload-0"]
+
+
+# ──────────────────────────────────────────────────────────────────
+# 17. MAP / REDUCE: コーディネーターが項目を列挙し、サブタスクが 1 項目ずつ処理する
+# ──────────────────────────────────────────────────────────────────
+
+def test_map_coordinator_subtasks_and_reduce():
+    """項目リストとサブタスク結果はコーデックに関係なく JSON のまま返り、REDUCE はモデルで結果を読む"""
+    seen = []
+    wf = (
+        workflow("worker-map", codec="msgpack")
+        .map("square", lambda ctx: list(range(ctx.input["n"])), lambda ctx, item, i: ValueOut(value=item * item + i),
+             output_model=ValueOut)
+        .reduce("total", ValueOut,
+                lambda ctx: seen.append(ctx.get_map_results("square")) or ValueOut(value=len(seen[0])))
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-map", "square", input_data={"n": 3}, node_type="MAP"),
+        task_for(wf, "t-sub", "square", node_type="MAP_SUBTASK", is_map_subtask=True,
+                 map_item_json="4", map_index=2, map_total=3),
+        task_for(wf, "t-reduce", "total", deps={"square": [{"value": 0}, {"value": 2}, {"value": 6}]}),
+    ])
+    w = make_worker([wf], fake, upload_threshold=1)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 3))
+
+    assert fake.raw_outputs["t-map"] == "[0,1,2]"
+    assert fake.raw_outputs["t-sub"] == '{"value":18}'
+    assert seen == [[ValueOut(value=0), ValueOut(value=2), ValueOut(value=6)]]
+    assert isinstance(fake.raw_outputs["t-reduce"], nexum_pb2.Payload)
+    assert fake.completed["t-reduce"] == {"value": 3}
+    assert not fake.uploads
+
+
+# ──────────────────────────────────────────────────────────────────
+# 18. MAP batch_size: 1 回の呼び出しで複数項目を処理し、項目ごとに失敗を記録する
+# ──────────────────────────────────────────────────────────────────
+
+def test_map_batch_handler_records_per_item_failures():
+    """返された例外はその項目だけの失敗マーカーになり、件数が合わない戻り値はタスクを失敗させる"""
+    calls = []
+
+    def score(ctx, rows, start):
+        calls.append((list(rows), start))
+        return [ValueError(f"row {start + i}") if r < 0 else {"value": r * 10} for i, r in enumerate(rows)]
+
+    wf = (
+        workflow("worker-map-batch")
+        .map("score", lambda ctx: [], score, output_model=ValueOut, batch_size=3)
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-batch", "score", node_type="MAP_SUBTASK", is_map_subtask=True,
+                 map_item_json="[1,-2,3]", map_index=3, map_total=6),
+        task_for(wf, "t-short", "score", node_type="MAP_SUBTASK", is_map_subtask=True,
+                 map_item_json="[1,2]", map_index=0, map_total=6),
+    ])
+    wf.get_node("score").handler = lambda ctx, rows, start: score(ctx, rows, start) if start else [{"value": 1}]
+    w = make_worker([wf], fake, concurrency=1)
+    asyncio.run(run_until(w, lambda: len(fake.completed) + len(fake.failed) == 2))
+
+    assert calls == [([1, -2, 3], 3)]
+    assert fake.completed["t-batch"] == [
+        {"value": 10},
+        {"__nexum_map_error__": True, "error": "ValueError: row 4"},
+        {"value": 30},
+    ]
+    assert "2 results" in fake.failed["t-short"]
+
+
+# ──────────────────────────────────────────────────────────────────
+# 19. ストリーミング MAP: ジェネレーターの項目をページ単位で送り、未処理が多い間は待つ
+# ──────────────────────────────────────────────────────────────────
+
+def test_map_generator_is_streamed_in_pages_with_backpressure():
+    """最後のページは CompleteTask で送られ、pending が max_pending を超えると空ページで様子を見る"""
+    pulled = []
+
+    def urls(ctx):
+        for i in range(5):
+            pulled.append(i)
+            yield f"https://example.com/{i}"
+
+    async def lines(ctx):
+        for i in range(3):
+            yield i
+
+    wf = (
+        workflow("worker-map-stream")
+        .map("fetch", urls, lambda ctx, url, i: url, page_size=2, max_pending=3)
+        .map("parse", lines, lambda ctx, line, i: line, page_size=10, depends_on=[])
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-fetch", "fetch", node_type="MAP"),
+        task_for(wf, "t-parse", "parse", node_type="MAP"),
+    ])
+    fake.map_pending = [5, 4, 1]
+    w = make_worker([wf], fake, concurrency=1)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 2))
+
+    assert fake.map_pages == [
+        ("t-fetch", ["https://example.com/0", "https://example.com/1"], 0),
+        ("t-fetch", [], 2),
+        ("t-fetch", [], 2),
+        ("t-fetch", ["https://example.com/2", "https://example.com/3"], 2),
+    ]
+    assert fake.completed["t-fetch"] == ["https://example.com/4"]
+    assert pulled == [0, 1, 2, 3, 4]
+    assert fake.completed["t-parse"] == [0, 1, 2]
+
+
+# ──────────────────────────────────────────────────────────────────
+# 20. fold REDUCE: 届いた結果をチャンクごとに畳み込み、累積値をチェックポイントする
+# ──────────────────────────────────────────────────────────────────
+
+def test_fold_reduce_consumes_results_in_chunks_and_resumes():
+    """未着の結果は待ち、次の読み出しで累積値を送り、再リースされたタスクはチェックポイントから再開する"""
+    chunks = []
+
+    def add(ctx, acc, results):
+        chunks.append(results)
+        return acc + sum(r.value for r in results if r is not None)
+
+    wf = (
+        workflow("worker-fold")
+        .map("square", lambda ctx: [], lambda ctx, item, i: item, output_model=ValueOut)
+        .reduce("total", ValueOut, lambda ctx, acc: ValueOut(value=acc), fold=add, initial=0, fold_chunk=2)
+        .build()
+    )
+    fake = FakeClient([
+        task_for(wf, "t-fold", "total"),
+        task_for(wf, "t-resume", "total", checkpoint_json='{"next_index": 4, "acc": 8}'),
+    ])
+    fake.map_results = [{"value": 1}, {"__nexum_map_error__": True, "error": "ValueError: x"},
+                        {"value": 3}, {"value": 4}, {"value": 5}]
+    fake.map_landed = [0, 3]
+    w = make_worker([wf], fake, concurrency=1)
+    asyncio.run(run_until(w, lambda: len(fake.completed) == 2))
+
+    assert fake.map_reads == [
+        ("t-fold", 0, 2, ""),
+        ("t-fold", 0, 2, ""),
+        ("t-fold", 2, 2, "1"),
+        ("t-fold", 4, 2, "8"),
+        ("t-resume", 4, 2, ""),
+    ]
+    assert chunks[:3] == [[ValueOut(value=1), None], [ValueOut(value=3), ValueOut(value=4)], [ValueOut(value=5)]]
+    assert fake.completed == {"t-fold": {"value": 13}, "t-resume": {"value": 13}}
+
+
+# ──────────────────────────────────────────────────────────────────
+# 21. ストリーミング MAP: 競合したページは送り直し、リースを失ったコーディネーターは手を引く
+# ──────────────────────────────────────────────────────────────────
+
+def test_map_page_is_resent_after_conflict_and_abandoned_after_lease_loss():
+    """ABORTED は同じページを同じ offset で再送し、FAILED_PRECONDITION ではタスクを完了も失敗もさせない"""
+    wf = (
+        workflow("worker-map-lease")
+        .map("fetch", lambda ctx: iter(range(4)), lambda ctx, item, i: item, page_size=2)
+        .build()
+    )
+    fake = FakeClient([task_for(wf, "t-retry", "fetch", node_type="MAP")])
+    fake.map_errors = [grpc.StatusCode.ABORTED]
+    w = make_worker([wf], fake, concurrency=1)
+    asyncio.run(run_until(w, lambda: "t-retry" in fake.completed))
+    assert fake.map_pages == [("t-retry", [0, 1], 0)]
+    assert fake.completed["t-retry"] == [2, 3]
+
+    fake = FakeClient([task_for(wf, "t-lost", "fetch", node_type="MAP")])
+    fake.map_errors = [grpc.StatusCode.FAILED_PRECONDITION]
+    w = make_worker([wf], fake, concurrency=1)
+    asyncio.run(run_until(w, lambda: not fake.map_errors and not w._inflight))
+    assert fake.map_pages == []
+    assert fake.completed == {} and fake.failed == {}
+
+
+# ──────────────────────────────────────────────────────────────────
+# 22. fold REDUCE: 実行が終わった (MAP の項目が失敗した) ら読み出しをやめる
+# ──────────────────────────────────────────────────────────────────
+
+def test_fold_reduce_stops_when_execution_fails():
+    """未着の結果を待っている間に ReadMapResults が FAILED_PRECONDITION を返すと、完了も失敗もせずに手を引く"""
+    wf = (
+        workflow("worker-fold-failed")
+        .map("square", lambda ctx: [], lambda ctx, item, i: item, output_model=ValueOut)
+        .reduce("total", ValueOut, lambda ctx, acc: ValueOut(value=acc), fold=lambda ctx, acc, rs: acc, initial=0)
+        .build()
+    )
+    fake = FakeClient([task_for(wf, "t-fold", "total")])
+    fake.map_results = [{"value": 1}, {"value": 2}]
+    fake.map_landed = [0, 0]
+    w = make_worker([wf], fake, concurrency=1)
+
+    async def fail_after_two_reads():
+        runner = asyncio.create_task(run_until(w, lambda: len(fake.map_reads) == 3 and not w._inflight))
+        while len(fake.map_reads) < 2:
+            await asyncio.sleep(0.001)
+        fake.ended.add("t-fold")
+        await runner
+
+    asyncio.run(fail_after_two_reads())
+    assert [r[1] for r in fake.map_reads] == [0, 0, 0]
+    assert fake.completed == {} and fake.failed == {}